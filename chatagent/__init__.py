@@ -3,6 +3,7 @@
 __version__ = "0.1.0"
 
 from .agent import ChatAgent
+from .async_agent import AsyncChatAgent
 from .skills import SkillManager
 
-__all__ = ["ChatAgent", "SkillManager"]
+__all__ = ["ChatAgent", "AsyncChatAgent", "SkillManager"]
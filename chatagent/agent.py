@@ -1,12 +1,17 @@
 """Main agent logic for ChatAgent."""
 
 import json
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 from .llm import LLMClient
 from .tools import (
+    Tool,
     ToolRegistry,
     ReadFileTool,
     WriteFileTool,
@@ -15,14 +20,29 @@ from .tools import (
     FindFilesTool,
     SearchTextTool,
     ShellTool,
+    ShellJobStatusTool,
+    ShellJobOutputTool,
+    ShellJobKillTool,
     WebFetchTool,
     GoogleSearchTool,
     SaveMemoryTool,
     CLIHelpAgentTool,
     CodebaseInvestigatorTool,
     ActivateSkillTool,
+    SearchSkillsTool,
 )
+from .tools.file_cache import get_file_cache
+from .tools.result_cache import ToolResultCache, record_modification, recording
 from .skills import SkillManager
+from .context import CHARS_PER_TOKEN, ContextWindowManager, describe_tokens
+from .retrieval import MemoryRecall, format_memory
+from .loop_detection import DEFAULT_STOP_AFTER, STOP_MESSAGE, LoopDetector
+
+# Skills listed in the system prompt per turn when there are more than this
+DEFAULT_SKILLS_IN_PROMPT = 5
+
+# User messages (latest first) matched against skills to pick the listed ones
+SKILL_QUERY_MESSAGES = 2
 
 
 class ChatAgent:
@@ -34,6 +54,9 @@ class ChatAgent:
         base_url: Optional[str] = None,
         model: Optional[str] = None,
         confirmation_callback: Optional[Callable[[str, str, Dict[str, Any]], bool]] = None,
+        max_parallel_tools: int = 4,
+        context_budget: Optional[int] = None,
+        auto_compact: bool = True,
     ):
         """Initialize chat agent.
 
@@ -43,22 +66,132 @@ class ChatAgent:
             model: Model name to use
             confirmation_callback: Optional callback for tool confirmation.
                                    Takes (tool_name, tool_description, tool_args) and returns bool
+            max_parallel_tools: Maximum number of concurrency-safe tool calls
+                                executed at the same time within one turn
+            context_budget: Token budget for each request (system prompt + history).
+                            Defaults to CHATAGENT_CONTEXT_BUDGET or 100000.
+            auto_compact: Whether to compact history automatically when the
+                          budget is exceeded
         """
-        self.llm = LLMClient(api_key=api_key, base_url=base_url, model=model)
+        # Seconds spent in each startup phase, in order
+        self.startup_timings: Dict[str, float] = {}
+        started = time.perf_counter()
+
+        self.llm = self._create_llm_client(api_key=api_key, base_url=base_url, model=model)
+        started = self._record_startup("LLM client", started)
         self.skill_manager = SkillManager()
+        # Pick up added, edited or removed skills between turns ("off" disables it)
+        watch = os.getenv("CHATAGENT_SKILL_WATCH", "auto").lower()
+        if watch not in ("off", "0", "false", "no"):
+            self.skill_manager.watch(use_inotify=watch != "poll")
+        # Skills listed in the system prompt (None lists every skill)
+        setting = os.getenv("CHATAGENT_SKILLS_IN_PROMPT", str(DEFAULT_SKILLS_IN_PROMPT)).lower()
+        self.skills_in_prompt: Optional[int] = None if setting == "all" else max(0, int(setting))
+        self.selected_skills: List[str] = []
+        started = self._record_startup("skills", started)
         self.memory_tool = SaveMemoryTool()
+        self.memory_recall = MemoryRecall.from_env(self.memory_tool.store)
+        self.recalled_memories: List[Dict[str, Any]] = []
+        started = self._record_startup("memory", started)
+        self.shell_tool = ShellTool()
         self.confirmation_callback = confirmation_callback
+        self.max_parallel_tools = max(1, max_parallel_tools)
+        self._tool_executor: Optional[ThreadPoolExecutor] = None
 
         # Initialize tool registry
         self.tools = ToolRegistry()
         self._register_tools()
+        # Tools offered to the model (None offers every tool)
+        self.tool_profile = "all"
+        self.active_tools: Optional[List[str]] = None
+        self.set_tool_profile(os.getenv("CHATAGENT_TOOL_PROFILE", "all"))
+        # Results of repeated identical calls of cacheable tools ("off" disables it)
+        self.tool_cache: Optional[ToolResultCache] = None
+        if os.getenv("CHATAGENT_TOOL_CACHE", "on").lower() not in ("off", "0", "false", "no"):
+            self.tool_cache = ToolResultCache()
+        started = self._record_startup("tools", started)
 
         # Conversation history
         self.messages: List[Dict[str, Any]] = []
+        self.conversation_id = uuid.uuid4().hex[:12]
+
+        # Context window management
+        self.context = ContextWindowManager(
+            max_tokens=context_budget or int(os.getenv("CHATAGENT_CONTEXT_BUDGET", "100000"))
+        )
+        self.auto_compact = auto_compact
+        self.conversation_summary: Optional[str] = None
+
+        # Repeated tool calls within a turn get a corrective hint and, after
+        # CHATAGENT_LOOP_STOP_AFTER wasted iterations in a row, end the turn
+        # (0 only adds hints, "off" disables detection)
+        stop_after = os.getenv("CHATAGENT_LOOP_STOP_AFTER", str(DEFAULT_STOP_AFTER)).lower()
+        self.loop_detector: Optional[LoopDetector] = None
+        if stop_after not in ("off", "false", "no"):
+            self.loop_detector = LoopDetector(stop_after=int(stop_after))
+        self.wasted_iterations = 0
+        self.stopped_turns = 0
 
         # Load project instructions if available
         self.project_instructions = self._load_project_instructions()
 
+        # Memoized system prompt segments: name -> (inputs, text)
+        self._prompt_segments: Dict[str, Tuple[Any, str]] = {}
+        # When the current turn started (the date shown in the system prompt)
+        self.turn_started: Optional[datetime] = None
+        # Mark the stable system prompt prefix with a cache_control breakpoint
+        self.prompt_cache_control = os.getenv("CHATAGENT_PROMPT_CACHE_CONTROL", "off").lower() in ("on", "1", "true", "yes")
+        self._record_startup("project instructions", started)
+        self.llm.logger.info(self.describe_startup())
+
+    def _record_startup(self, phase: str, started: float) -> float:
+        """Record the duration of a startup phase.
+
+        Args:
+            phase: Phase name
+            started: ``time.perf_counter()`` when the phase started
+
+        Returns:
+            Start time of the next phase
+        """
+        now = time.perf_counter()
+        self.startup_timings[phase] = now - started
+        return now
+
+    def describe_startup(self) -> str:
+        """Describe how long startup took, phase by phase.
+
+        Returns:
+            One-line timing breakdown
+        """
+        total = sum(self.startup_timings.values())
+        phases = []
+        for phase, seconds in self.startup_timings.items():
+            text = f"{phase} {seconds * 1000:.0f} ms"
+            if phase == "skills" and self.skill_manager.load_stats:
+                stats = self.skill_manager.load_stats
+                text += f" ({stats['skills']} skills: {stats['cached']} cached, {stats['parsed']} parsed)"
+            phases.append(text)
+        return f"Startup: {total * 1000:.0f} ms - " + ", ".join(phases)
+
+    def _create_llm_client(
+        self,
+        api_key: Optional[str],
+        base_url: Optional[str],
+        model: Optional[str],
+    ) -> LLMClient:
+        """Create the LLM client used by this agent.
+
+        Args:
+            api_key: API key for LLM service
+            base_url: Base URL for API endpoint
+            model: Model name to use
+
+        Returns:
+            LLM client instance
+        """
+        return LLMClient(api_key=api_key, base_url=base_url, model=model)
+
     def _load_project_instructions(self) -> Optional[str]:
         """Load project-specific instructions from CHATAGENT.md.
 
@@ -86,13 +219,17 @@ class ChatAgent:
             ReadFolderTool(),
             FindFilesTool(),
             SearchTextTool(),
-            ShellTool(),
+            self.shell_tool,
+            ShellJobStatusTool(self.shell_tool.jobs),
+            ShellJobOutputTool(self.shell_tool.jobs),
+            ShellJobKillTool(self.shell_tool.jobs),
             WebFetchTool(),
             GoogleSearchTool(),
             self.memory_tool,
             CLIHelpAgentTool(),
             CodebaseInvestigatorTool(),
             ActivateSkillTool(self.skill_manager),
+            SearchSkillsTool(self.skill_manager),
         ]
 
         for tool in tools_to_register:
@@ -104,28 +241,101 @@ class ChatAgent:
         Returns:
             System prompt string
         """
-        # Get current date and time
-        now = datetime.now()
-        current_date = now.strftime("%Y-%m-%d")
-        current_time = now.strftime("%H:%M:%S")
-        current_datetime = now.strftime("%Y-%m-%d %H:%M:%S")
-        day_of_week = now.strftime("%A")
+        stable, volatile = self._system_prompt_segments()
+        return stable + volatile
+
+    def _system_prompt_segments(self) -> Tuple[str, str]:
+        """Build the system prompt as a stable prefix and a volatile tail.
 
+        The prefix (instructions and, when every skill is listed, the skill
+        list) only changes when project instructions or skills change, so
+        providers can reuse their prompt cache for it. Everything that changes
+        between turns comes last: the conversation summary, the skills
+        selected for this turn, the date, recalled memories and active skills.
+        The date is taken when the turn starts, so the whole prompt stays
+        identical across the tool iterations of a turn.
+
+        Returns:
+            (stable prefix, volatile tail)
+        """
+        stable = self._prompt_segment("instructions", self.project_instructions, self._build_instructions)
+        volatile = ""
+
+        # Add available skills section (only the relevant ones when there are many)
+        available_skills = self.skill_manager.list_available_skills()
+        if available_skills:
+            listed = available_skills
+            if self.skills_in_prompt is not None and len(available_skills) > self.skills_in_prompt:
+                listed = [name for name in self.selected_skills if name in self.skill_manager.available_skills]
+            listed = sorted(listed)
+            hidden = len(available_skills) - len(listed)
+
+            skills = self._prompt_segment(
+                "skills",
+                (self.skill_manager.version, tuple(listed), hidden),
+                lambda: self._build_skills_section(listed, hidden),
+            )
+            if hidden:
+                volatile += skills
+            else:
+                stable += skills
+
+        # Add summary of compacted conversation turns if any
+        if self.conversation_summary:
+            volatile += "\n\n=== Conversation Summary ===\n"
+            volatile += "Earlier parts of this conversation were compacted. Summary:\n\n"
+            volatile += self.conversation_summary
+
+        now = self.turn_started or datetime.now()
+        volatile += f"\n\nCurrent Date and Time: {now.strftime('%Y-%m-%d %H:%M:%S')} ({now.strftime('%A')})"
+
+        # Add saved memories relevant to the current user message
+        if self.recalled_memories:
+            volatile += "\n\n=== Relevant Memories ===\n"
+            volatile += "Saved memories that may be relevant to the user's latest message:\n\n"
+            volatile += "\n".join(format_memory(memory) for memory in self.recalled_memories)
+
+        # Add active skills context if any
+        skills_context = self.skill_manager.get_skills_context()
+        if skills_context:
+            volatile += "\n\n" + skills_context
+
+        return stable, volatile
+
+    def _prompt_segment(self, name: str, key: Any, build: Callable[[], str]) -> str:
+        """Get a memoized system prompt segment.
+
+        Args:
+            name: Segment name
+            key: Inputs of the segment; it is rebuilt only when they change
+            build: Function building the segment
+
+        Returns:
+            Segment text
+        """
+        cached = self._prompt_segments.get(name)
+        if cached is None or cached[0] != key:
+            cached = (key, build())
+            self._prompt_segments[name] = cached
+        return cached[1]
+
+    def _build_instructions(self) -> str:
+        """Build the agent (and project) instructions that start the system prompt.
+
+        Returns:
+            Instructions text
+        """
         # Start with project-specific instructions if available
         if self.project_instructions:
-            prompt = f"""=== Project Instructions ===
+            return f"""=== Project Instructions ===
 
 {self.project_instructions}
 
 === Agent Instructions ===
 
-You are ChatAgent, a helpful AI assistant with access to various tools and skills.
-
-Current Date and Time: {current_datetime} ({day_of_week})"""
-        else:
-            prompt = f"""You are ChatAgent, a helpful AI assistant with access to various tools and skills.
+You are ChatAgent, a helpful AI assistant with access to various tools and skills."""
 
-Current Date and Time: {current_datetime} ({day_of_week})
+        return """You are ChatAgent, a helpful AI assistant with access to various tools and skills.
 
 You can help users with:
 - Reading, writing, and editing files
@@ -151,26 +361,33 @@ Be proactive in using tools when they would be helpful. For example:
 
 Always be helpful, accurate, and efficient."""
 
-        # Add available skills section
-        available_skills = self.skill_manager.list_available_skills()
-        if available_skills:
-            prompt += "\n\n=== Available Skills ===\n"
-            prompt += "You have access to specialized skills. Use the 'activate_skill' tool to activate them when needed.\n\n"
+    def _build_skills_section(self, listed: List[str], hidden: int) -> str:
+        """Build the available skills section of the system prompt.
 
-            for skill_name in sorted(available_skills):
-                skill_info = self.skill_manager.get_skill_info(skill_name)
-                if skill_info:
-                    description = skill_info.get('description', 'No description available')
-                    prompt += f"• {skill_name}: {description}\n"
+        Args:
+            listed: Names of the skills to describe, sorted
+            hidden: Number of available skills not listed
 
-            prompt += "\nWhen the user's request matches a skill's description, use the activate_skill tool before proceeding with the task."
+        Returns:
+            Skills section text
+        """
+        section = "\n\n=== Available Skills ===\n"
+        section += "You have access to specialized skills. Use the 'activate_skill' tool to activate them when needed.\n\n"
 
-        # Add active skills context if any
-        skills_context = self.skill_manager.get_skills_context()
-        if skills_context:
-            prompt += "\n\n" + skills_context
+        for skill_name in listed:
+            skill_info = self.skill_manager.get_skill_info(skill_name)
+            if skill_info:
+                description = skill_info.get('description', 'No description available')
+                section += f"• {skill_name}: {description}\n"
 
-        return prompt
+        if hidden:
+            section += (
+                f"\n{'These are the skills most relevant to the conversation; ' if listed else ''}"
+                f"{hidden} more skills are available. Use the 'search_skills' tool to find one that fits the task.\n"
+            )
+
+        section += "\nWhen the user's request matches a skill's description, use the activate_skill tool before proceeding with the task."
+        return section
 
     def add_message(self, role: str, content: str):
         """Add a message to conversation history.
@@ -181,10 +398,481 @@ Always be helpful, accurate, and efficient."""
         """
         self.messages.append({"role": role, "content": content})
 
+    def _prepare_turn(self, user_message: str) -> None:
+        """Apply skill changes and select the memories and skills shown in the system prompt for this turn.
+
+        Args:
+            user_message: User's message
+        """
+        self.turn_started = datetime.now()
+        if self.loop_detector is not None:
+            self.loop_detector.reset()
+        changes = self.skill_manager.check_for_changes()
+        if any(changes.values()):
+            described = "; ".join(f"{kind}: {', '.join(names)}" for kind, names in changes.items() if names)
+            self.llm.logger.info(f"Skills reloaded ({described})")
+
+        self.recalled_memories = self.memory_recall.recall(user_message)
+        if self.recalled_memories:
+            keys = ", ".join(memory["key"] for memory in self.recalled_memories)
+            self.llm.logger.info(f"Recalled {len(self.recalled_memories)} memories: {keys}")
+
+        if self.skills_in_prompt:
+            recent = [m["content"] for m in self.messages if m["role"] == "user" and isinstance(m.get("content"), str)]
+            query = " ".join(recent[-SKILL_QUERY_MESSAGES:] or [user_message])
+            ranked = self.skill_manager.search_skills(query, limit=self.skills_in_prompt)
+            self.selected_skills = [name for name, _ in ranked]
+
     def clear_history(self):
-        """Clear conversation history and deactivate all skills."""
+        """Clear conversation history, deactivate all skills and reset the shell session."""
         self.messages = []
+        self.conversation_summary = None
+        self.recalled_memories = []
+        self.turn_started = None
+        self.selected_skills = []
+        self.llm.forget_conversation(self.conversation_id)
+        self.conversation_id = uuid.uuid4().hex[:12]
         self.skill_manager.clear_active_skills()
+        self.shell_tool.reset_session()
+        if self.tool_cache is not None:
+            self.tool_cache.clear()
+
+    def close(self) -> None:
+        """Release the processes and threads owned by this agent.
+
+        Stops the persistent shell session, background shell jobs (deleting
+        their logs), the skills directory watcher and the tool thread pool.
+        The agent should not be used afterwards.
+        """
+        self.shell_tool.close()
+        self.shell_tool.jobs.close()
+        self.skill_manager.unwatch()
+        if self._tool_executor is not None:
+            self._tool_executor.shutdown(wait=False)
+            self._tool_executor = None
+
+    def __enter__(self) -> "ChatAgent":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def get_context_tokens(self) -> int:
+        """Estimate the tokens the next request will use for its messages.
+
+        Returns:
+            Estimated token count of system prompt plus history
+        """
+        return self.context.count_tokens(self._messages_with_system())
+
+    def _summary_candidates(self, force: bool) -> List[Dict[str, Any]]:
+        """Get the older turns that should be folded into the summary.
+
+        Args:
+            force: Summarize even if the history is within budget
+
+        Returns:
+            Older messages to summarize (empty if none or not needed)
+        """
+        if not force and not self.context.is_over_budget(self._messages_with_system()):
+            return []
+        older, _ = self.context.split_recent(self.messages)
+        return older
+
+    def _apply_summary(self, summary: str, older: List[Dict[str, Any]]) -> None:
+        """Replace older turns by their summary.
+
+        Args:
+            summary: Summary text produced by the LLM
+            older: The messages that were summarized (a prefix of history)
+        """
+        self.conversation_summary = summary
+        self.messages = self.messages[len(older):]
+
+    def _finish_compaction(self, tokens_before: int, stubbed: int, summarized: int) -> Dict[str, int]:
+        """Drop oldest turns if still over budget and report what was done.
+
+        Args:
+            tokens_before: Estimated tokens before compaction started
+            stubbed: Number of tool results replaced by stubs
+            summarized: Number of messages folded into the summary
+
+        Returns:
+            Compaction statistics
+        """
+        dropped = 0
+        if self.context.is_over_budget(self._messages_with_system()):
+            system_tokens = self.context.estimate_tokens({"content": self._build_system_prompt()})
+            self.messages, dropped = self.context.drop_oldest_turns(self.messages, system_tokens)
+
+        stats = {
+            "tokens_before": tokens_before,
+            "tokens_after": self.get_context_tokens(),
+            "stubbed": stubbed,
+            "summarized": summarized,
+            "dropped": dropped,
+        }
+        self.llm.logger.info(
+            f"Compacted context: {stats['tokens_before']} -> {stats['tokens_after']} tokens "
+            f"(stubbed={stubbed}, summarized={summarized}, dropped={dropped})"
+        )
+        return stats
+
+    def _summarize(self, older: List[Dict[str, Any]]) -> str:
+        """Ask the LLM to summarize older conversation turns.
+
+        Args:
+            older: Messages to summarize
+
+        Returns:
+            Summary text
+        """
+        response = self.llm.chat(
+            messages=self.context.build_summary_request(older, self.conversation_summary or ""),
+            temperature=0.2,
+        )
+        return response.choices[0].message.content or ""
+
+    def compact(self, force: bool = False) -> Dict[str, int]:
+        """Compact conversation history to fit the token budget.
+
+        Large tool results in older turns are replaced by stubs first. If the
+        history is still over budget (or ``force`` is set), older turns are
+        replaced by an LLM-generated summary. Whole turns are dropped only as
+        a last resort. Recent turns are always kept verbatim.
+
+        Args:
+            force: Summarize older turns even if the history is within budget
+
+        Returns:
+            Compaction statistics (tokens_before, tokens_after, stubbed, summarized, dropped)
+        """
+        tokens_before = self.get_context_tokens()
+        self.messages, stubbed = self.context.stub_tool_results(self.messages)
+
+        summarized = 0
+        older = self._summary_candidates(force)
+        if older:
+            try:
+                self._apply_summary(self._summarize(older), older)
+                summarized = len(older)
+            except Exception as e:
+                self.llm.logger.warning(f"Could not summarize conversation: {e}")
+
+        return self._finish_compaction(tokens_before, stubbed, summarized)
+
+    def _maybe_compact(self) -> None:
+        """Compact history automatically if it exceeds the token budget."""
+        if self.auto_compact and self.context.is_over_budget(self._messages_with_system()):
+            self.compact()
+
+    def _messages_with_system(self) -> List[Dict[str, Any]]:
+        """Prepend a freshly built system prompt to the conversation history.
+
+        The prompt is rebuilt each time so that skills activated by a tool call
+        are visible to the next LLM iteration. With ``prompt_cache_control``
+        the stable prefix is sent as its own text part carrying an Anthropic
+        style ``cache_control`` breakpoint.
+
+        Returns:
+            Messages ready to send to the LLM
+        """
+        stable, volatile = self._system_prompt_segments()
+        if not self.prompt_cache_control:
+            return [{"role": "system", "content": stable + volatile}] + self.messages
+
+        content: List[Dict[str, Any]] = [{"type": "text", "text": stable, "cache_control": {"type": "ephemeral"}}]
+        if volatile:
+            content.append({"type": "text", "text": volatile})
+        return [{"role": "system", "content": content}] + self.messages
+
+    def _append_assistant_tool_calls(self, assistant_message: Any) -> None:
+        """Record an assistant message that requested tool calls.
+
+        Args:
+            assistant_message: Message object returned by the LLM
+        """
+        self.messages.append({
+            "role": "assistant",
+            "content": assistant_message.content or "",
+            "tool_calls": [
+                {
+                    "id": tc.id,
+                    "type": "function",
+                    "function": {
+                        "name": tc.function.name,
+                        "arguments": tc.function.arguments,
+                    },
+                }
+                for tc in assistant_message.tool_calls
+            ],
+        })
+
+    def _confirm_tool_call(self, tool: Any, function_name: str, function_args: Dict[str, Any]) -> bool:
+        """Ask the user to confirm a tool call when the tool requires it.
+
+        Args:
+            tool: Tool instance about to run
+            function_name: Name of the tool
+            function_args: Parsed tool arguments
+
+        Returns:
+            True if the tool may run, False if the user declined
+        """
+        if not (tool.requires_confirmation and self.confirmation_callback):
+            return True
+
+        self.llm.logger.info(f"Tool {function_name} requires confirmation")
+        confirmed = self.confirmation_callback(
+            function_name,
+            tool.description,
+            function_args
+        )
+
+        if confirmed:
+            self.llm.logger.info(f"Tool {function_name} execution confirmed by user")
+        else:
+            self.llm.logger.info(f"Tool {function_name} execution cancelled by user")
+        return confirmed
+
+    def _run_tool(self, tool: Any, function_name: str, function_args: Dict[str, Any]) -> str:
+        """Run an already confirmed tool, converting exceptions into results.
+
+        Cacheable tools reuse the result of an identical earlier call while
+        the files it read are unchanged.
+
+        Args:
+            tool: Tool instance to run
+            function_name: Name of the tool
+            function_args: Parsed tool arguments
+
+        Returns:
+            Tool result (or error message) as string
+        """
+        cached = self._cached_tool_result(tool, function_name, function_args)
+        if cached is not None:
+            return cached
+
+        started = time.perf_counter()
+        with recording() as dependencies:
+            try:
+                result = tool.execute(**function_args)
+            except Exception as e:
+                result = f"Error executing {function_name}: {str(e)}"
+        self._finish_tool_call(tool, function_name, function_args, dependencies, result, time.perf_counter() - started)
+        return result
+
+    def _cached_tool_result(self, tool: Any, function_name: str, function_args: Dict[str, Any]) -> Optional[str]:
+        """Look up the result of an identical earlier call of a cacheable tool.
+
+        Args:
+            tool: Tool instance about to run
+            function_name: Name of the tool
+            function_args: Parsed tool arguments
+
+        Returns:
+            Cached result, or None if the tool has to run
+        """
+        if self.tool_cache is None or not isinstance(tool, Tool) or tool.cache_ttl is None:
+            return None
+        result = self.tool_cache.get(function_name, function_args)
+        if result is not None:
+            self.llm.logger.info(f"Tool {function_name} result served from cache")
+            self.llm.record_tool_call(function_name, 0.0, result, self.conversation_id, cached=True)
+        return result
+
+    def _finish_tool_call(
+        self,
+        tool: Any,
+        function_name: str,
+        function_args: Dict[str, Any],
+        dependencies: Dict[str, Tuple[int, int]],
+        result: str,
+        latency: float,
+    ) -> None:
+        """Record a tool execution and update the tool result cache.
+
+        Results of cacheable tools are stored; tools that are not read-only
+        drop the cached results that depend on what they may have modified,
+        and are counted by ``record_modification`` for lazily refreshed indexes.
+
+        Args:
+            tool: Tool instance that ran
+            function_name: Name of the tool
+            function_args: Parsed tool arguments
+            dependencies: Files and directories the call read
+            result: Tool result
+            latency: Execution time in seconds
+        """
+        self.llm.record_tool_call(function_name, latency, result, self.conversation_id)
+        if not isinstance(tool, Tool):
+            return
+        if not tool.read_only:
+            record_modification()
+        if self.tool_cache is None:
+            return
+        if tool.cache_ttl is not None:
+            self.tool_cache.put(function_name, function_args, tool.cache_ttl, dependencies, result)
+        if not tool.read_only:
+            dropped = self.tool_cache.invalidate(tool.modified_paths(**function_args))
+            if dropped:
+                self.llm.logger.info(f"Tool {function_name} invalidated {dropped} cached tool result(s)")
+
+    def _execute_tool_call(self, function_name: str, arguments: str) -> str:
+        """Execute a single tool call, asking for confirmation when required.
+
+        Args:
+            function_name: Name of the tool to run
+            arguments: JSON-encoded tool arguments
+
+        Returns:
+            Tool result (or error/cancellation message) as string
+        """
+        try:
+            function_args = json.loads(arguments) if arguments else {}
+            tool = self._get_active_tool(function_name)
+
+            if not self._confirm_tool_call(tool, function_name, function_args):
+                return f"Tool execution cancelled by user. The user declined to execute {function_name}."
+        except Exception as e:
+            return f"Error executing {function_name}: {str(e)}"
+
+        return self._run_tool(tool, function_name, function_args)
+
+    def _execute_tool_calls(self, tool_calls: List[Any]) -> List[str]:
+        """Execute all tool calls requested in one turn.
+
+        Consecutive concurrency-safe tool calls are run together on a bounded
+        thread pool; any other tool call acts as a barrier and runs on its own,
+        so writes are never reordered relative to the reads around them.
+        Confirmation prompts are always shown one at a time, in request order,
+        before a tool is dispatched.
+
+        Args:
+            tool_calls: Tool call objects from the assistant message
+
+        Returns:
+            Tool results, in the same order as ``tool_calls``
+        """
+        results: List[Optional[str]] = [None] * len(tool_calls)
+        batch: List[tuple] = []
+
+        def flush_batch():
+            if not batch:
+                return
+            if len(batch) == 1:
+                index, tool, name, args = batch[0]
+                results[index] = self._run_tool(tool, name, args)
+            else:
+                self.llm.logger.info(f"Running {len(batch)} tool call(s) concurrently")
+                if self._tool_executor is None:
+                    self._tool_executor = ThreadPoolExecutor(
+                        max_workers=self.max_parallel_tools,
+                        thread_name_prefix="chatagent-tool",
+                    )
+                futures = [
+                    (index, self._tool_executor.submit(self._run_tool, tool, name, args))
+                    for index, tool, name, args in batch
+                ]
+                for index, future in futures:
+                    results[index] = future.result()
+            batch.clear()
+
+        for index, tool_call in enumerate(tool_calls):
+            function_name = tool_call.function.name
+            try:
+                tool = self._get_active_tool(function_name)
+            except KeyError as e:
+                flush_batch()
+                results[index] = f"Error executing {function_name}: {str(e)}"
+                continue
+
+            if not tool.concurrency_safe:
+                flush_batch()
+                results[index] = self._execute_tool_call(function_name, tool_call.function.arguments)
+                continue
+
+            try:
+                arguments = tool_call.function.arguments
+                function_args = json.loads(arguments) if arguments else {}
+                if not self._confirm_tool_call(tool, function_name, function_args):
+                    results[index] = f"Tool execution cancelled by user. The user declined to execute {function_name}."
+                    continue
+            except Exception as e:
+                results[index] = f"Error executing {function_name}: {str(e)}"
+                continue
+
+            batch.append((index, tool, function_name, function_args))
+
+        flush_batch()
+        return results
+
+    def _append_tool_result(self, tool_call_id: str, function_name: str, result: str) -> None:
+        """Add a tool result to the conversation history.
+
+        Args:
+            tool_call_id: ID of the tool call this result answers
+            function_name: Name of the tool that produced the result
+            result: Tool result content
+        """
+        self.messages.append({
+            "role": "tool",
+            "tool_call_id": tool_call_id,
+            "name": function_name,
+            "content": result,
+        })
+
+    def _check_for_loop(self, tool_calls: List[Any], results: List[str]) -> bool:
+        """Check a tool iteration for loops, hinting the model when it repeats itself.
+
+        The hint is appended to the iteration's last tool result, which must
+        already be in the history.
+
+        Args:
+            tool_calls: Tool call objects from the assistant message
+            results: Tool results, in the same order
+
+        Returns:
+            True if the turn should stop
+        """
+        if self.loop_detector is None:
+            return False
+        hint = self.loop_detector.observe(tool_calls, results)
+        if hint:
+            self.llm.logger.warning(f"Wasted tool iteration {self.loop_detector.iterations}: {hint}")
+            self.messages[-1]["content"] += "\n\n" + hint
+        return self.loop_detector.should_stop
+
+    def _finish_turn(self, assistant_content: str, iterations: int, stopped: bool = False) -> str:
+        """Add the final response of a turn to the history and record the turn.
+
+        Args:
+            assistant_content: Final response
+            iterations: LLM calls made in the turn
+            stopped: Whether loop detection ended the turn
+
+        Returns:
+            The final response
+        """
+        self.add_message("assistant", assistant_content)
+        wasted = self.loop_detector.wasted if self.loop_detector is not None else 0
+        self.wasted_iterations += wasted
+        self.stopped_turns += stopped
+        self.llm.record_turn(iterations, wasted, stopped, self.conversation_id)
+        return assistant_content
+
+    def _stop_looping_turn(self, iterations: int) -> str:
+        """End a turn in which the model keeps repeating the same tool calls.
+
+        Args:
+            iterations: LLM calls made in the turn
+
+        Returns:
+            The final response
+        """
+        wasted = self.loop_detector.wasted
+        self.llm.logger.warning(f"Stopping turn after {iterations} iterations ({wasted} wasted): tool calls keep repeating")
+        return self._finish_turn(STOP_MESSAGE.format(wasted=wasted), iterations, stopped=True)
 
     def chat(self, user_message: str, max_iterations: int = 100) -> str:
         """Process user message and generate response.
@@ -198,26 +886,24 @@ Always be helpful, accurate, and efficient."""
         """
         # Add user message
         self.add_message("user", user_message)
+        self._prepare_turn(user_message)
 
-        # Build system prompt (dynamically to include active skills)
-        system_prompt = self._build_system_prompt()
-
-        # Prepare messages with system prompt
-        messages_with_system = [
-            {"role": "system", "content": system_prompt}
-        ] + self.messages
-
-        # Get tools in OpenAI format
-        tools = self.tools.to_openai_format()
+        # Get tools in OpenAI format (memoized by the registry)
+        tools = self.tools.to_openai_format(self.active_tools)
 
         # Call LLM and handle multiple rounds of tool calls
         iteration = 0
         while iteration < max_iterations:
             iteration += 1
             self.llm.logger.info(f"LLM iteration {iteration}/{max_iterations}")
+            self._maybe_compact()
 
-            # Call LLM
-            response = self.llm.chat(messages=messages_with_system, tools=tools)
+            # Call LLM (system prompt is rebuilt in case skills were activated)
+            response = self.llm.chat(
+                messages=self._messages_with_system(),
+                tools=tools,
+                conversation_id=self.conversation_id,
+            )
 
             # Process response
             assistant_message = response.choices[0].message
@@ -225,81 +911,101 @@ Always be helpful, accurate, and efficient."""
             # Check if tool calls are needed
             if assistant_message.tool_calls:
                 self.llm.logger.info(f"Processing {len(assistant_message.tool_calls)} tool call(s) in iteration {iteration}")
-                # Add assistant message with tool calls
-                self.messages.append({
-                    "role": "assistant",
-                    "content": assistant_message.content or "",
-                    "tool_calls": [
-                        {
-                            "id": tc.id,
-                            "type": "function",
-                            "function": {
-                                "name": tc.function.name,
-                                "arguments": tc.function.arguments,
-                            },
-                        }
-                        for tc in assistant_message.tool_calls
-                    ],
-                })
-
-                # Execute tool calls
-                for tool_call in assistant_message.tool_calls:
-                    function_name = tool_call.function.name
-                    function_args = json.loads(tool_call.function.arguments)
-
-                    # Execute tool
-                    try:
-                        tool = self.tools.get(function_name)
-
-                        # Check if tool requires confirmation
-                        if tool.requires_confirmation and self.confirmation_callback:
-                            self.llm.logger.info(f"Tool {function_name} requires confirmation")
-                            confirmed = self.confirmation_callback(
-                                function_name,
-                                tool.description,
-                                function_args
-                            )
-
-                            if not confirmed:
-                                self.llm.logger.info(f"Tool {function_name} execution cancelled by user")
-                                result = f"Tool execution cancelled by user. The user declined to execute {function_name}."
-                            else:
-                                self.llm.logger.info(f"Tool {function_name} execution confirmed by user")
-                                result = tool.execute(**function_args)
-                        else:
-                            # No confirmation needed or no callback provided
-                            result = tool.execute(**function_args)
-                    except Exception as e:
-                        result = f"Error executing {function_name}: {str(e)}"
-
-                    # Add tool result to messages
-                    self.messages.append({
-                        "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "name": function_name,
-                        "content": result,
-                    })
+                self._append_assistant_tool_calls(assistant_message)
 
-                # Update messages for next iteration
-                # Rebuild system prompt in case skills were activated
-                system_prompt = self._build_system_prompt()
-                messages_with_system = [
-                    {"role": "system", "content": system_prompt}
-                ] + self.messages
+                # Execute tool calls (results keep the original tool_call order)
+                results = self._execute_tool_calls(assistant_message.tool_calls)
+                for tool_call, result in zip(assistant_message.tool_calls, results):
+                    self._append_tool_result(tool_call.id, tool_call.function.name, result)
+                if self._check_for_loop(assistant_message.tool_calls, results):
+                    return self._stop_looping_turn(iteration)
 
                 # Continue loop to check if more tool calls are needed
             else:
                 # No more tool calls, we have the final response
                 self.llm.logger.info(f"Reached final response in iteration {iteration}")
-                assistant_content = assistant_message.content or ""
-                self.add_message("assistant", assistant_content)
-                return assistant_content
+                return self._finish_turn(assistant_message.content or "", iteration)
 
         # If we hit max iterations, return what we have
         self.llm.logger.warning(f"Maximum tool call iterations ({max_iterations}) reached")
-        assistant_content = assistant_message.content or "Maximum tool call iterations reached."
-        self.add_message("assistant", assistant_content)
-        return assistant_content
+        return self._finish_turn(assistant_message.content or "Maximum tool call iterations reached.", iteration)
+
+    def chat_stream(self, user_message: str, max_iterations: int = 100) -> Iterator[Dict[str, Any]]:
+        """Process user message and stream the response as it is generated.
+
+        This is the streaming counterpart of ``chat``: the tool-call loop is
+        identical, but text is yielded as soon as the provider sends it.
+
+        Args:
+            user_message: User's message
+            max_iterations: Maximum number of tool call iterations to prevent infinite loops
+
+        Yields:
+            Event dictionaries:
+            - {"type": "text", "content": str} for each text delta
+            - {"type": "tool_call", "id": str, "name": str, "arguments": str}
+              for each assembled tool call, before it is executed
+            - {"type": "tool_result", "id": str, "name": str, "content": str}
+              after each tool call has run
+            - {"type": "done", "content": str} once, with the final response
+        """
+        self.add_message("user", user_message)
+        self._prepare_turn(user_message)
+
+        tools = self.tools.to_openai_format(self.active_tools)
+
+        iteration = 0
+        assistant_message = None
+        while iteration < max_iterations:
+            iteration += 1
+            self.llm.logger.info(f"LLM iteration {iteration}/{max_iterations} (streaming)")
+            self._maybe_compact()
+
+            response = None
+            for event in self.llm.chat_stream(
+                messages=self._messages_with_system(),
+                tools=tools,
+                conversation_id=self.conversation_id,
+            ):
+                if event["type"] == "text":
+                    yield event
+                elif event["type"] == "tool_call":
+                    tool_call = event["tool_call"]
+                    yield {
+                        "type": "tool_call",
+                        "id": tool_call["id"],
+                        "name": tool_call["function"]["name"],
+                        "arguments": tool_call["function"]["arguments"],
+                    }
+                elif event["type"] == "response":
+                    response = event["response"]
+
+            assistant_message = response.choices[0].message
+
+            if assistant_message.tool_calls:
+                self.llm.logger.info(f"Processing {len(assistant_message.tool_calls)} tool call(s) in iteration {iteration}")
+                self._append_assistant_tool_calls(assistant_message)
+
+                results = self._execute_tool_calls(assistant_message.tool_calls)
+                for tool_call, result in zip(assistant_message.tool_calls, results):
+                    self._append_tool_result(tool_call.id, tool_call.function.name, result)
+                    yield {
+                        "type": "tool_result",
+                        "id": tool_call.id,
+                        "name": tool_call.function.name,
+                        "content": result,
+                    }
+                if self._check_for_loop(assistant_message.tool_calls, results):
+                    yield {"type": "done", "content": self._stop_looping_turn(iteration)}
+                    return
+            else:
+                self.llm.logger.info(f"Reached final response in iteration {iteration}")
+                yield {"type": "done", "content": self._finish_turn(assistant_message.content or "", iteration)}
+                return
+
+        self.llm.logger.warning(f"Maximum tool call iterations ({max_iterations}) reached")
+        assistant_content = (assistant_message.content if assistant_message else None) or "Maximum tool call iterations reached."
+        yield {"type": "done", "content": self._finish_turn(assistant_content, iteration)}
 
     def get_conversation_summary(self) -> str:
         """Get a summary of the conversation.
@@ -312,7 +1018,43 @@ Always be helpful, accurate, and efficient."""
 
         summary = f"Total messages: {len(self.messages)}\n"
         summary += f"Current model: {self.llm.model}\n"
+        summary += f"Context: ~{describe_tokens(self.get_context_tokens())} / {describe_tokens(self.context.max_tokens)} tokens\n"
         summary += f"Active skills: {len(self.skill_manager.get_active_skills())}\n"
+        summary += (
+            f"Tools: {len(self.active_tools) if self.active_tools is not None else len(self.tools.tools)} "
+            f"of {len(self.tools.tools)} ({self.tool_profile} profile, ~{self.get_tool_tokens()} tokens)\n"
+        )
+        if self.skill_manager.watch_backend:
+            summary += (
+                f"Skill watcher: {self.skill_manager.watch_backend} "
+                f"({self.skill_manager.reload_count} reloads)\n"
+            )
+        summary += f"{self.describe_startup()}\n"
+
+        cache = get_file_cache().stats()
+        summary += (
+            f"File cache: {cache['hits']} hits / {cache['misses']} misses "
+            f"({cache['entries']} files, {cache['bytes'] / 1024 / 1024:.1f} / {cache['max_bytes'] / 1024 / 1024:.0f} MB)\n"
+        )
+
+        if self.loop_detector is not None:
+            summary += (
+                f"Wasted tool iterations: {self.wasted_iterations} "
+                f"({self.stopped_turns} turns stopped early)\n"
+            )
+        if self.tool_cache is not None:
+            tool_cache = self.tool_cache.stats()
+            summary += (
+                f"Tool result cache: {tool_cache['hits']} hits / {tool_cache['misses']} misses "
+                f"({tool_cache['entries']} results)\n"
+            )
+
+        usage = getattr(self.llm, "usage_totals", None)
+        if isinstance(usage, dict) and usage["prompt_tokens"]:
+            summary += (
+                f"Prompt cache: {usage['cached_tokens']:,} of {usage['prompt_tokens']:,} prompt tokens cached "
+                f"({usage['cached_tokens'] / usage['prompt_tokens']:.0%})\n"
+            )
 
         if self.skill_manager.get_active_skills():
             summary += "Active: " + ", ".join(self.skill_manager.get_active_skills().keys())
@@ -341,6 +1083,50 @@ Always be helpful, accurate, and efficient."""
         self.llm.logger.info(f"Model changed from {old_model} to {model}")
         return f"Model changed from {old_model} to {model}"
 
+    def set_tool_profile(self, profile: str) -> str:
+        """Choose which tools are offered to the model from the next request on.
+
+        Args:
+            profile: Profile name ("all", "read-only", "no-web"), or several
+                     joined with "+" (e.g. "read-only+no-web")
+
+        Returns:
+            Status message
+
+        Raises:
+            ValueError: If the profile is unknown
+        """
+        names = self.tools.select(profile)
+        self.tool_profile = profile
+        self.active_tools = None if len(names) == len(self.tools.tools) else names
+        message = f"Tool profile set to {profile}: {len(names)} of {len(self.tools.tools)} tools (~{self.get_tool_tokens()} tokens)"
+        self.llm.logger.info(message)
+        return message
+
+    def get_tool_tokens(self) -> int:
+        """Estimate the prompt tokens of the tool definitions sent with each request.
+
+        Returns:
+            Estimated token count
+        """
+        return len(self.tools.to_json(self.active_tools)) // CHARS_PER_TOKEN
+
+    def _get_active_tool(self, name: str) -> Any:
+        """Get a tool the model is allowed to call.
+
+        Args:
+            name: Tool name
+
+        Returns:
+            Tool instance
+
+        Raises:
+            KeyError: If the tool does not exist or is not in the active profile
+        """
+        if self.active_tools is not None and name not in self.active_tools:
+            raise KeyError(f"Tool '{name}' is not available with the '{self.tool_profile}' tool profile")
+        return self.tools.get(name)
+
     def list_available_models(self) -> List[str]:
         """List commonly available models.
 
@@ -0,0 +1,355 @@
+"""Asynchronous agent for embedding ChatAgent in asyncio services."""
+
+import asyncio
+import inspect
+import json
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Union
+
+import httpx
+
+from .agent import ChatAgent
+from .llm import AsyncLLMClient
+from .tools import GoogleSearchTool, WebFetchTool
+from .tools.http_client import HTTPCache, create_async_http_client
+from .tools.result_cache import recording
+
+
+class AsyncChatAgent(ChatAgent):
+    """Chat agent whose tool loop runs on the asyncio event loop.
+
+    Prompt construction, tool registration and conversation history are shared
+    with ``ChatAgent``. LLM requests go through ``AsyncLLMClient`` and tools run
+    through ``Tool.aexecute``, so a single process can drive many conversations
+    concurrently. Pass the same ``llm`` and ``http_client`` to every agent to
+    share their connection pools.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        model: Optional[str] = None,
+        confirmation_callback: Optional[
+            Callable[[str, str, Dict[str, Any]], Union[bool, Awaitable[bool]]]
+        ] = None,
+        max_parallel_tools: int = 4,
+        context_budget: Optional[int] = None,
+        auto_compact: bool = True,
+        llm: Optional[AsyncLLMClient] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ):
+        """Initialize async chat agent.
+
+        Args:
+            api_key: API key for LLM service
+            base_url: Base URL for API endpoint
+            model: Model name to use
+            confirmation_callback: Optional callback for tool confirmation.
+                                   May be a plain function or a coroutine function.
+            max_parallel_tools: Maximum number of concurrency-safe tool calls
+                                executed at the same time within one turn
+            context_budget: Token budget for each request (system prompt + history)
+            auto_compact: Whether to compact history automatically when the
+                          budget is exceeded
+            llm: Optional shared async LLM client (created if omitted)
+            http_client: Optional shared HTTP client for web tools (created if omitted)
+        """
+        self._shared_llm = llm
+        self._owns_http_client = http_client is None
+        self.http_client = http_client or create_async_http_client(HTTPCache.from_env())
+
+        super().__init__(
+            api_key=api_key,
+            base_url=base_url,
+            model=model,
+            confirmation_callback=confirmation_callback,
+            max_parallel_tools=max_parallel_tools,
+            context_budget=context_budget,
+            auto_compact=auto_compact,
+        )
+
+    def _create_llm_client(
+        self,
+        api_key: Optional[str],
+        base_url: Optional[str],
+        model: Optional[str],
+    ) -> AsyncLLMClient:
+        """Create (or reuse) the async LLM client used by this agent."""
+        if self._shared_llm is not None:
+            return self._shared_llm
+        return AsyncLLMClient(api_key=api_key, base_url=base_url, model=model)
+
+    def _register_tools(self):
+        """Register all tools, wiring web tools to the shared HTTP client."""
+        super()._register_tools()
+        self.tools.register(WebFetchTool(async_client=self.http_client))
+        self.tools.register(GoogleSearchTool(async_client=self.http_client))
+
+    async def _aconfirm_tool_call(self, tool: Any, function_name: str, function_args: Dict[str, Any]) -> bool:
+        """Ask for confirmation, awaiting the callback if it is a coroutine."""
+        if not (tool.requires_confirmation and self.confirmation_callback):
+            return True
+
+        self.llm.logger.info(f"Tool {function_name} requires confirmation")
+        confirmed = self.confirmation_callback(function_name, tool.description, function_args)
+        if inspect.isawaitable(confirmed):
+            confirmed = await confirmed
+
+        if confirmed:
+            self.llm.logger.info(f"Tool {function_name} execution confirmed by user")
+        else:
+            self.llm.logger.info(f"Tool {function_name} execution cancelled by user")
+        return bool(confirmed)
+
+    async def _arun_tool(self, tool: Any, function_name: str, function_args: Dict[str, Any]) -> str:
+        """Run an already confirmed tool, converting exceptions into results."""
+        cached = self._cached_tool_result(tool, function_name, function_args)
+        if cached is not None:
+            return cached
+
+        started = time.perf_counter()
+        # Worker threads started by aexecute copy this context, so they record here too
+        with recording() as dependencies:
+            try:
+                result = await tool.aexecute(**function_args)
+            except Exception as e:
+                result = f"Error executing {function_name}: {str(e)}"
+        self._finish_tool_call(tool, function_name, function_args, dependencies, result, time.perf_counter() - started)
+        return result
+
+    async def _aexecute_tool_calls(self, tool_calls: List[Any]) -> List[str]:
+        """Execute all tool calls requested in one turn.
+
+        Follows the same rules as ``ChatAgent._execute_tool_calls``:
+        consecutive concurrency-safe calls run together (bounded by
+        ``max_parallel_tools``), other calls run alone, confirmations are
+        requested one at a time and results keep the original order.
+
+        Args:
+            tool_calls: Tool call objects from the assistant message
+
+        Returns:
+            Tool results, in the same order as ``tool_calls``
+        """
+        results: List[Optional[str]] = [None] * len(tool_calls)
+        batch: List[tuple] = []
+        semaphore = asyncio.Semaphore(self.max_parallel_tools)
+
+        async def run_bounded(tool, name, args):
+            async with semaphore:
+                return await self._arun_tool(tool, name, args)
+
+        async def flush_batch():
+            if not batch:
+                return
+            if len(batch) > 1:
+                self.llm.logger.info(f"Running {len(batch)} tool call(s) concurrently")
+            outputs = await asyncio.gather(
+                *(run_bounded(tool, name, args) for _, tool, name, args in batch)
+            )
+            for (index, _, _, _), output in zip(batch, outputs):
+                results[index] = output
+            batch.clear()
+
+        for index, tool_call in enumerate(tool_calls):
+            function_name = tool_call.function.name
+
+            try:
+                arguments = tool_call.function.arguments
+                function_args = json.loads(arguments) if arguments else {}
+                tool = self._get_active_tool(function_name)
+            except Exception as e:
+                await flush_batch()
+                results[index] = f"Error executing {function_name}: {str(e)}"
+                continue
+
+            if not tool.concurrency_safe:
+                await flush_batch()
+
+            try:
+                if not await self._aconfirm_tool_call(tool, function_name, function_args):
+                    results[index] = f"Tool execution cancelled by user. The user declined to execute {function_name}."
+                    continue
+            except Exception as e:
+                results[index] = f"Error executing {function_name}: {str(e)}"
+                continue
+
+            if tool.concurrency_safe:
+                batch.append((index, tool, function_name, function_args))
+            else:
+                results[index] = await self._arun_tool(tool, function_name, function_args)
+
+        await flush_batch()
+        return results
+
+    async def _asummarize(self, older: List[Dict[str, Any]]) -> str:
+        """Ask the LLM to summarize older conversation turns."""
+        response = await self.llm.chat(
+            messages=self.context.build_summary_request(older, self.conversation_summary or ""),
+            temperature=0.2,
+        )
+        return response.choices[0].message.content or ""
+
+    async def compact(self, force: bool = False) -> Dict[str, int]:
+        """Compact conversation history to fit the token budget.
+
+        Same policy as ``ChatAgent.compact``, with the summary request awaited.
+
+        Args:
+            force: Summarize older turns even if the history is within budget
+
+        Returns:
+            Compaction statistics (tokens_before, tokens_after, stubbed, summarized, dropped)
+        """
+        tokens_before = self.get_context_tokens()
+        self.messages, stubbed = self.context.stub_tool_results(self.messages)
+
+        summarized = 0
+        older = self._summary_candidates(force)
+        if older:
+            try:
+                self._apply_summary(await self._asummarize(older), older)
+                summarized = len(older)
+            except Exception as e:
+                self.llm.logger.warning(f"Could not summarize conversation: {e}")
+
+        return self._finish_compaction(tokens_before, stubbed, summarized)
+
+    async def _amaybe_compact(self) -> None:
+        """Compact history automatically if it exceeds the token budget."""
+        if self.auto_compact and self.context.is_over_budget(self._messages_with_system()):
+            await self.compact()
+
+    async def chat(self, user_message: str, max_iterations: int = 100) -> str:
+        """Process user message and generate response.
+
+        Args:
+            user_message: User's message
+            max_iterations: Maximum number of tool call iterations to prevent infinite loops
+
+        Returns:
+            Assistant's response
+        """
+        self.add_message("user", user_message)
+        self._prepare_turn(user_message)
+
+        tools = self.tools.to_openai_format(self.active_tools)
+
+        iteration = 0
+        assistant_message = None
+        while iteration < max_iterations:
+            iteration += 1
+            self.llm.logger.info(f"LLM iteration {iteration}/{max_iterations} (async)")
+            await self._amaybe_compact()
+
+            response = await self.llm.chat(
+                messages=self._messages_with_system(),
+                tools=tools,
+                conversation_id=self.conversation_id,
+            )
+            assistant_message = response.choices[0].message
+
+            if assistant_message.tool_calls:
+                self.llm.logger.info(f"Processing {len(assistant_message.tool_calls)} tool call(s) in iteration {iteration}")
+                self._append_assistant_tool_calls(assistant_message)
+
+                results = await self._aexecute_tool_calls(assistant_message.tool_calls)
+                for tool_call, result in zip(assistant_message.tool_calls, results):
+                    self._append_tool_result(tool_call.id, tool_call.function.name, result)
+                if self._check_for_loop(assistant_message.tool_calls, results):
+                    return self._stop_looping_turn(iteration)
+            else:
+                self.llm.logger.info(f"Reached final response in iteration {iteration}")
+                return self._finish_turn(assistant_message.content or "", iteration)
+
+        self.llm.logger.warning(f"Maximum tool call iterations ({max_iterations}) reached")
+        assistant_content = (assistant_message.content if assistant_message else None) or "Maximum tool call iterations reached."
+        return self._finish_turn(assistant_content, iteration)
+
+    async def chat_stream(self, user_message: str, max_iterations: int = 100) -> AsyncIterator[Dict[str, Any]]:
+        """Process user message and stream the response as it is generated.
+
+        Yields the same events as ``ChatAgent.chat_stream``.
+
+        Args:
+            user_message: User's message
+            max_iterations: Maximum number of tool call iterations to prevent infinite loops
+
+        Yields:
+            Event dictionaries (``text``, ``tool_call``, ``tool_result`` and a final ``done``)
+        """
+        self.add_message("user", user_message)
+        self._prepare_turn(user_message)
+
+        tools = self.tools.to_openai_format(self.active_tools)
+
+        iteration = 0
+        assistant_message = None
+        while iteration < max_iterations:
+            iteration += 1
+            self.llm.logger.info(f"LLM iteration {iteration}/{max_iterations} (async streaming)")
+            await self._amaybe_compact()
+
+            response = None
+            async for event in self.llm.chat_stream(
+                messages=self._messages_with_system(),
+                tools=tools,
+                conversation_id=self.conversation_id,
+            ):
+                if event["type"] == "text":
+                    yield event
+                elif event["type"] == "tool_call":
+                    tool_call = event["tool_call"]
+                    yield {
+                        "type": "tool_call",
+                        "id": tool_call["id"],
+                        "name": tool_call["function"]["name"],
+                        "arguments": tool_call["function"]["arguments"],
+                    }
+                elif event["type"] == "response":
+                    response = event["response"]
+
+            assistant_message = response.choices[0].message
+
+            if assistant_message.tool_calls:
+                self.llm.logger.info(f"Processing {len(assistant_message.tool_calls)} tool call(s) in iteration {iteration}")
+                self._append_assistant_tool_calls(assistant_message)
+
+                results = await self._aexecute_tool_calls(assistant_message.tool_calls)
+                for tool_call, result in zip(assistant_message.tool_calls, results):
+                    self._append_tool_result(tool_call.id, tool_call.function.name, result)
+                    yield {
+                        "type": "tool_result",
+                        "id": tool_call.id,
+                        "name": tool_call.function.name,
+                        "content": result,
+                    }
+                if self._check_for_loop(assistant_message.tool_calls, results):
+                    yield {"type": "done", "content": self._stop_looping_turn(iteration)}
+                    return
+            else:
+                self.llm.logger.info(f"Reached final response in iteration {iteration}")
+                yield {"type": "done", "content": self._finish_turn(assistant_message.content or "", iteration)}
+                return
+
+        self.llm.logger.warning(f"Maximum tool call iterations ({max_iterations}) reached")
+        assistant_content = (assistant_message.content if assistant_message else None) or "Maximum tool call iterations reached."
+        yield {"type": "done", "content": self._finish_turn(assistant_content, iteration)}
+
+    async def aclose(self) -> None:
+        """Release the processes, threads and network resources owned by this agent.
+
+        Shared clients passed in by the caller are left open.
+        """
+        await asyncio.to_thread(self.close)
+        if self._owns_http_client:
+            await self.http_client.aclose()
+        if self._shared_llm is None:
+            await self.llm.aclose()
+
+    async def __aenter__(self) -> "AsyncChatAgent":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
@@ -1,18 +1,29 @@
 """CLI interface for ChatAgent."""
 
+import argparse
 import os
 import sys
-from typing import Optional
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
 
 import readchar
-from rich.console import Console
+from rich.console import Console, Group
+from rich.live import Live
 from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.prompt import Confirm, Prompt
+from rich.text import Text
 from rich.theme import Theme
 from dotenv import load_dotenv
 
 from .agent import ChatAgent
+from .stats import run_stats
+from .tools.base import TOOL_PROFILES
+from .tools.code_index import CodeIndex
+from .tools.search_index import TrigramIndex
 
 # Custom theme for the CLI
 custom_theme = Theme({
@@ -24,6 +35,9 @@ custom_theme = Theme({
 
 console = Console(theme=custom_theme)
 
+# Lines of a running shell command's output shown under the spinner
+SHELL_OUTPUT_LINES = 6
+
 
 class ChatAgentCLI:
     """CLI interface for ChatAgent."""
@@ -35,6 +49,11 @@ class ChatAgentCLI:
         # Track session-wide confirmation preferences
         self.allow_all_tools = False  # "Yes to all" mode
         self.current_status = None  # Track active status context
+        self.status_message = "Thinking..."
+        self.shell_output: deque = deque(maxlen=SHELL_OUTPUT_LINES + 1)
+
+        # Stream responses token by token unless disabled via CHATAGENT_STREAM=false
+        self.streaming = os.getenv("CHATAGENT_STREAM", "true").strip().lower() not in ("0", "false", "no", "off")
 
         self.agent = ChatAgent(
             api_key=os.getenv("OPENAI_API_KEY"),
@@ -42,6 +61,38 @@ class ChatAgentCLI:
             model=os.getenv("OPENAI_MODEL"),
             confirmation_callback=self.confirm_tool_execution,
         )
+        self.agent.shell_tool.output_callback = self.show_shell_output
+
+    def set_status(self, message: str) -> None:
+        """Change the spinner message and clear any shell output shown under it.
+
+        Args:
+            message: New status message
+        """
+        self.status_message = message
+        self.shell_output.clear()
+        if self.current_status:
+            self.current_status.update(f"[bold yellow]{message}")
+
+    def show_shell_output(self, text: str) -> None:
+        """Show the latest lines of a running shell command under the spinner.
+
+        Args:
+            text: Output text as it arrives (may contain partial lines)
+        """
+        lines = text.split("\n")
+        if self.shell_output:
+            self.shell_output[-1] += lines.pop(0)
+        self.shell_output.extend(lines)
+
+        if self.current_status:
+            # Show only what follows the last carriage return (progress bars)
+            visible = [line.rsplit("\r", 1)[-1] for line in self.shell_output]
+            visible = [line for line in visible if line.strip()][-SHELL_OUTPUT_LINES:]
+            self.current_status.update(Group(
+                Text(self.status_message, style="bold yellow"),
+                Text("\n".join(visible), style="dim", no_wrap=True, overflow="ellipsis"),
+            ))
 
     def confirm_tool_execution(self, tool_name: str, tool_description: str, tool_args: dict) -> bool:
         """Prompt user to confirm tool execution with menu options.
@@ -139,7 +190,9 @@ A CLI chat agent with tools and skills support.
 **Commands:**
 - `/help` - Show help message
 - `/model` - List or switch models
+- `/tools` - Show or switch the tool profile
 - `/clear` - Clear conversation and reset confirmation
+- `/compact` - Compact conversation history
 - `/status` - Show conversation status
 - `/skills` - List available skills
 - `/memory` - Show saved memories
@@ -157,6 +210,7 @@ A CLI chat agent with tools and skills support.
 Type your message to start chatting, or `/help` for more information!
 """
         console.print(Panel(Markdown(welcome), title="Welcome", border_style="cyan"))
+        console.print(f"[dim]{self.agent.describe_startup()}[/dim]")
 
     def print_help(self):
         """Print help message."""
@@ -170,8 +224,13 @@ All commands start with `/`:
 - `/model` - List available models or switch model
   - `/model` - Show current model and available models
   - `/model <name>` - Switch to specified model
+- `/tools` - Show the tools offered to the model
+  - `/tools <profile>` - Offer only some tools: `all`, `read-only`, `no-web`, or combined (`read-only+no-web`)
 - `/clear` - Clear conversation history and reset confirmation mode
   - Also resets "allow all" mode to prompt for each tool
+  - Starts a new shell session for `run_shell_command`
+- `/compact` - Summarize older turns to shrink the context window
+  - History is also compacted automatically when it exceeds the token budget
 - `/status` - Show conversation status
 - `/skills` - List available skills
 - `/memory` - Show saved memories
@@ -181,19 +240,21 @@ All commands start with `/`:
 
 **Available Tools:**
 The agent has access to the following tools:
-- `read_file` - Read file contents
+- `read_file` - Read file contents (supports line/byte ranges and paging)
 - `write_file` - Write content to files
 - `replace` - Edit files by replacing text
 - `list_directory` - List directory contents
 - `glob` - Find files matching patterns
 - `search_file_content` - Search text in files
-- `run_shell_command` - Execute shell commands
+- `run_shell_command` - Execute shell commands (in a persistent shell session)
+- `shell_job_status` / `shell_job_output` / `shell_job_kill` - Manage background commands
 - `web_fetch` - Fetch web content
 - `google_web_search` - Search the web
 - `save_memory` - Save important information
 - `activate_skill` - Activate Claude skills
+- `search_skills` - Find skills relevant to a task
 - `cli_help` - Get CLI help
-- `codebase_investigator` - Investigate codebases
+- `codebase_investigator` - Investigate codebases, find definitions and callers
 
 **Skills:**
 Type `/skills` to see available skills, or ask the agent to activate a specific skill.
@@ -242,6 +303,20 @@ Type `/skills` to see available skills, or ask the agent to activate a specific
             console.print("[info]Tool Confirmation:[/info] [yellow]Prompt for each tool[/yellow]")
         console.print()
 
+    def compact_history(self):
+        """Compact conversation history and report the savings."""
+        with console.status("[bold yellow]Compacting conversation...", spinner="dots"):
+            stats = self.agent.compact(force=True)
+
+        console.print(
+            f"\n[success]Context compacted:[/success] ~{stats['tokens_before']} → ~{stats['tokens_after']} tokens"
+        )
+        console.print(
+            f"[info]Summarized messages:[/info] {stats['summarized']}  "
+            f"[info]Stubbed tool results:[/info] {stats['stubbed']}  "
+            f"[info]Dropped messages:[/info] {stats['dropped']}\n"
+        )
+
     def show_memories(self):
         """Show saved memories."""
         memories = self.agent.memory_tool.get_all_memories()
@@ -305,6 +380,93 @@ Type `/skills` to see available skills, or ask the agent to activate a specific
             result = self.agent.set_model(args)
             console.print(f"\n[success]{result}[/success]\n")
 
+    def handle_tools_command(self, args: str):
+        """Handle tools command.
+
+        Args:
+            args: Command arguments (tool profile or empty to show the tools)
+        """
+        args = args.strip()
+
+        if args:
+            try:
+                result = self.agent.set_tool_profile(args)
+            except ValueError as e:
+                console.print(f"\n[error]{e}[/error]\n")
+                return
+            console.print(f"\n[success]{result}[/success]\n")
+            return
+
+        active = self.agent.active_tools
+        console.print(f"\n[info]Tool Profile:[/info] [cyan]{self.agent.tool_profile}[/cyan] (~{self.agent.get_tool_tokens()} tokens)\n")
+        for tool in self.agent.tools.list_tools():
+            marker = "[green]✓[/green]" if active is None or tool.name in active else "[dim]-[/dim]"
+            console.print(f"  {marker} {tool.name}")
+        console.print(f"\n[info]Usage:[/info] /tools <profile>  ({', '.join(TOOL_PROFILES)}, combine with +)\n")
+
+    def stream_response(self, user_input: str) -> str:
+        """Send a message to the agent and render the reply as it streams in.
+
+        Text deltas are drawn incrementally as Markdown. While the agent waits
+        for the model or runs tools, the "Thinking..." spinner is shown instead;
+        it is the spinner (not the live Markdown view) that confirmation prompts
+        pause, since tool calls always arrive after the text of a turn.
+
+        Args:
+            user_input: User's message
+
+        Returns:
+            Final assistant response
+        """
+        status = console.status("[bold yellow]Thinking...", spinner="dots")
+        self.current_status = status
+        self.set_status("Thinking...")
+        live = None
+        buffer = ""
+        final = ""
+
+        status.start()
+        try:
+            for event in self.agent.chat_stream(user_input):
+                event_type = event["type"]
+
+                if event_type == "text":
+                    if live is None:
+                        status.stop()
+                        live = Live(
+                            Markdown(""),
+                            console=console,
+                            refresh_per_second=12,
+                            vertical_overflow="visible",
+                        )
+                        live.start()
+                    buffer += event["content"]
+                    live.update(Markdown(buffer))
+
+                elif event_type == "tool_call":
+                    if live is not None:
+                        live.stop()
+                        live = None
+                        buffer = ""
+                    self.set_status(f"Running {event['name']}...")
+                    status.start()
+
+                elif event_type == "tool_result":
+                    self.set_status("Thinking...")
+
+                elif event_type == "done":
+                    final = event["content"]
+        finally:
+            if live is not None:
+                live.stop()
+            status.stop()
+
+        # Nothing was streamed (e.g. iteration limit reached): show the final text
+        if not buffer and final:
+            console.print(Markdown(final))
+
+        return final
+
     def run(self):
         """Run the CLI."""
         self.print_welcome()
@@ -342,6 +504,10 @@ Type `/skills` to see available skills, or ask the agent to activate a specific
                         console.print("[info]Tool confirmation reset to prompt mode.[/info]\n")
                         continue
 
+                    elif command == "compact":
+                        self.compact_history()
+                        continue
+
                     elif command == "status":
                         self.show_status()
                         continue
@@ -358,6 +524,10 @@ Type `/skills` to see available skills, or ask the agent to activate a specific
                         self.handle_model_command(args)
                         continue
 
+                    elif command == "tools":
+                        self.handle_tools_command(args)
+                        continue
+
                     elif command == "reset-confirm":
                         if self.allow_all_tools:
                             self.allow_all_tools = False
@@ -373,7 +543,12 @@ Type `/skills` to see available skills, or ask the agent to activate a specific
 
                 # Process with agent
                 console.print("\n[bold green]Assistant[/bold green]")
+                if self.streaming:
+                    self.stream_response(user_input)
+                    continue
+
                 self.current_status = console.status("[bold yellow]Thinking...", spinner="dots")
+                self.set_status("Thinking...")
                 with self.current_status:
                     response = self.agent.chat(user_input)
 
@@ -388,9 +563,110 @@ Type `/skills` to see available skills, or ask the agent to activate a specific
                 console.print(f"\n[error]Error: {str(e)}[/error]\n")
                 continue
 
+        self.agent.close()
+
+
+def stats_main(argv: List[str]) -> int:
+    """Run ``chatagent stats``: summarize a structured interaction log.
+
+    Args:
+        argv: Arguments after the ``stats`` subcommand
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(
+        prog="chatagent stats",
+        description="Show latency percentiles, token throughput and the slowest tools.",
+    )
+    parser.add_argument(
+        "logs",
+        nargs="*",
+        default=[os.getenv("CHATAGENT_INTERACTION_LOG", "chatagent.jsonl")],
+        help="JSONL interaction log(s) (default: chatagent.jsonl)",
+    )
+    parser.add_argument("--top", type=int, default=10, help="number of slowest tools to show")
+    parser.add_argument("--no-rotated", action="store_true", help="ignore compressed rotated backups")
+    args = parser.parse_args(argv)
+
+    return run_stats(args.logs, top=args.top, include_rotated=not args.no_rotated, console=console)
+
+
+def index_main(argv: List[str]) -> int:
+    """Run ``chatagent index``: build or inspect the search and code indexes.
+
+    Args:
+        argv: Arguments after the ``index`` subcommand
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(
+        prog="chatagent index",
+        description="Manage the trigram index used by search_file_content and the code index used by codebase_investigator.",
+    )
+    parser.add_argument("action", choices=["build", "status"], help="build/refresh the index, or show its status")
+    parser.add_argument("directory", nargs="?", default=".", help="root directory of the index (default: .)")
+    args = parser.parse_args(argv)
+
+    directory = Path(args.directory).expanduser()
+    if not directory.is_dir():
+        console.print(f"[error]Not a directory: {args.directory}[/error]")
+        return 1
+
+    index = TrigramIndex(directory)
+    code_index = CodeIndex(directory)
+
+    if args.action == "build":
+        started = time.perf_counter()
+        with console.status("[bold yellow]Indexing files...", spinner="dots") as status:
+            stats = index.update(progress=lambda seen: status.update(f"[bold yellow]Indexing files... {seen:,} seen"))
+        console.print(
+            f"[success]Index updated[/success] in {time.perf_counter() - started:.1f}s: "
+            f"{stats['added']} added, {stats['updated']} updated, "
+            f"{stats['removed']} removed, {stats['unchanged']} unchanged"
+        )
+        started = time.perf_counter()
+        with console.status("[bold yellow]Indexing symbols...", spinner="dots") as status:
+            stats = code_index.update(progress=lambda seen: status.update(f"[bold yellow]Indexing symbols... {seen:,} files seen"))
+        console.print(
+            f"[success]Code index updated[/success] in {time.perf_counter() - started:.1f}s: "
+            f"{stats['added']} added, {stats['updated']} updated, "
+            f"{stats['removed']} removed, {stats['unchanged']} unchanged"
+        )
+
+    info = index.status()
+    if not info["exists"]:
+        console.print(f"[warning]No index for {info['root']}.[/warning] Run [cyan]chatagent index build {args.directory}[/cyan]")
+        return 1
+
+    updated_at = datetime.fromtimestamp(info["updated_at"]).strftime("%Y-%m-%d %H:%M:%S") if info["updated_at"] else "never"
+    console.print(f"[info]Root:[/info] {info['root']}")
+    console.print(f"[info]Index file:[/info] {info['index_file']} ({info['size_bytes'] / 1024 / 1024:.1f} MB)")
+    console.print(
+        f"[info]Files:[/info] {info['files']:,} ({info['text_files']:,} text, "
+        f"{info['binary_files']:,} binary, {info['large_files']:,} too large to index)"
+    )
+    console.print(f"[info]Stale rows:[/info] {info['stale_rows']:,}")
+    console.print(f"[info]Last updated:[/info] {updated_at}")
+
+    code_info = code_index.status()
+    if code_info["exists"]:
+        languages = ", ".join(f"{count:,} {language}" for language, count in code_info["languages"].items()) or "no"
+        console.print(
+            f"[info]Code index:[/info] {languages} files, {code_info['symbols']:,} symbols, "
+            f"{code_info['calls']:,} call sites ({len(code_info['parse_errors'])} files failed to parse)"
+        )
+    return 0
+
 
 def main():
     """Main entry point."""
+    if len(sys.argv) > 1 and sys.argv[1] == "stats":
+        sys.exit(stats_main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "index":
+        sys.exit(index_main(sys.argv[2:]))
+
     try:
         cli = ChatAgentCLI()
         cli.run()
@@ -0,0 +1,223 @@
+"""Token-budgeted management of the conversation context window."""
+
+from typing import Any, Dict, List, Tuple
+
+# Rough characters-per-token ratio for English text and code
+CHARS_PER_TOKEN = 4
+
+# Fixed per-message overhead (role, separators) added by chat templates
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Prefix marking tool results that have already been replaced by a stub
+STUB_PREFIX = "[Compacted tool result"
+
+SUMMARY_SYSTEM_PROMPT = """You compress chat transcripts between a user and an AI assistant that uses tools.
+
+Write a concise summary that preserves everything needed to continue the conversation:
+- The user's goals, requests and stated preferences
+- Decisions made and conclusions reached
+- Files, paths, commands, URLs and identifiers that were referenced
+- Important tool findings (facts, errors, values) and what is still pending
+
+Use short bullet points. Do not add commentary or invent details."""
+
+
+class ContextWindowManager:
+    """Keeps the conversation history within a token budget.
+
+    History is split into turns (a user message plus everything that follows
+    it). The most recent turns are always kept verbatim. When the budget is
+    exceeded, large tool results in older turns are first replaced by short
+    stubs; if that is not enough, older turns are replaced by a summary.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 100000,
+        keep_recent_turns: int = 4,
+        stub_min_chars: int = 400,
+    ):
+        """Initialize context window manager.
+
+        Args:
+            max_tokens: Token budget for the full request (system prompt + history)
+            keep_recent_turns: Number of most recent turns never compacted
+            stub_min_chars: Tool results shorter than this are left untouched
+        """
+        self.max_tokens = max_tokens
+        self.keep_recent_turns = max(1, keep_recent_turns)
+        self.stub_min_chars = stub_min_chars
+
+    def estimate_tokens(self, message: Dict[str, Any]) -> int:
+        """Estimate the number of tokens a message costs.
+
+        Args:
+            message: Message dictionary
+
+        Returns:
+            Estimated token count
+        """
+        chars = len(str(message.get("content") or ""))
+        for tool_call in message.get("tool_calls") or []:
+            function = tool_call.get("function", {})
+            chars += len(function.get("name", "")) + len(function.get("arguments", ""))
+        return chars // CHARS_PER_TOKEN + MESSAGE_OVERHEAD_TOKENS
+
+    def count_tokens(self, messages: List[Dict[str, Any]]) -> int:
+        """Estimate the number of tokens in a list of messages.
+
+        Args:
+            messages: Message dictionaries
+
+        Returns:
+            Estimated token count
+        """
+        return sum(self.estimate_tokens(message) for message in messages)
+
+    def is_over_budget(self, messages: List[Dict[str, Any]]) -> bool:
+        """Check whether messages exceed the token budget.
+
+        Args:
+            messages: Message dictionaries
+
+        Returns:
+            True if the estimated token count exceeds the budget
+        """
+        return self.count_tokens(messages) > self.max_tokens
+
+    def split_recent(self, messages: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Split history into older turns and the recent turns kept verbatim.
+
+        The split always falls on a user message, so tool results are never
+        separated from the assistant message that requested them.
+
+        Args:
+            messages: Conversation history (without system prompt)
+
+        Returns:
+            Tuple of (older_messages, recent_messages)
+        """
+        user_indices = [i for i, message in enumerate(messages) if message.get("role") == "user"]
+        if len(user_indices) <= self.keep_recent_turns:
+            return [], list(messages)
+
+        split = user_indices[-self.keep_recent_turns]
+        return list(messages[:split]), list(messages[split:])
+
+    def stub_tool_results(self, messages: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+        """Replace large tool results in older turns with short stubs.
+
+        Args:
+            messages: Conversation history (without system prompt)
+
+        Returns:
+            Tuple of (new_messages, number_of_results_stubbed)
+        """
+        older, recent = self.split_recent(messages)
+        stubbed = 0
+        compacted = []
+
+        for message in older:
+            content = message.get("content")
+            if (
+                message.get("role") == "tool"
+                and isinstance(content, str)
+                and len(content) >= self.stub_min_chars
+                and not content.startswith(STUB_PREFIX)
+            ):
+                first_line = content.split("\n", 1)[0][:120]
+                message = dict(message)
+                message["content"] = (
+                    f"{STUB_PREFIX} from {message.get('name', 'tool')}: "
+                    f"{len(content)} chars omitted. First line: {first_line}]"
+                )
+                stubbed += 1
+            compacted.append(message)
+
+        return compacted + recent, stubbed
+
+    def format_transcript(self, messages: List[Dict[str, Any]], previous_summary: str = "") -> str:
+        """Render messages as plain text for the summarizer.
+
+        Args:
+            messages: Messages to summarize
+            previous_summary: Summary of even older turns, if any
+
+        Returns:
+            Transcript text
+        """
+        parts = []
+        if previous_summary:
+            parts.append(f"[Summary of earlier conversation]\n{previous_summary}")
+
+        for message in messages:
+            role = message.get("role", "unknown")
+            content = str(message.get("content") or "")
+            if role == "tool":
+                # Tool output can be huge; the summary only needs its gist
+                if len(content) > 2000:
+                    content = content[:2000] + " [...]"
+                parts.append(f"[tool result: {message.get('name', 'tool')}]\n{content}")
+            elif message.get("tool_calls"):
+                calls = ", ".join(
+                    f"{tc['function']['name']}({tc['function']['arguments']})"
+                    for tc in message["tool_calls"]
+                )
+                text = f"{content}\n" if content else ""
+                parts.append(f"[{role}]\n{text}[called tools: {calls}]")
+            else:
+                parts.append(f"[{role}]\n{content}")
+
+        return "\n\n".join(parts)
+
+    def build_summary_request(self, messages: List[Dict[str, Any]], previous_summary: str = "") -> List[Dict[str, Any]]:
+        """Build the LLM request that summarizes older turns.
+
+        Args:
+            messages: Messages to summarize
+            previous_summary: Summary of even older turns, if any
+
+        Returns:
+            Messages to send to the LLM
+        """
+        return [
+            {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+            {"role": "user", "content": self.format_transcript(messages, previous_summary)},
+        ]
+
+    def drop_oldest_turns(self, messages: List[Dict[str, Any]], reserved_tokens: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        """Drop whole turns from the start of history until within budget.
+
+        Used as a last resort when no summary can be produced. Recent turns
+        are never dropped.
+
+        Args:
+            messages: Conversation history (without system prompt)
+            reserved_tokens: Tokens already used by the system prompt
+
+        Returns:
+            Tuple of (new_messages, number_of_messages_dropped)
+        """
+        older, recent = self.split_recent(messages)
+        dropped = 0
+        while older and self.count_tokens(older + recent) + reserved_tokens > self.max_tokens:
+            # Remove one full turn: the leading user message and its follow-ups
+            end = 1
+            while end < len(older) and older[end].get("role") != "user":
+                end += 1
+            dropped += end
+            older = older[end:]
+        return older + recent, dropped
+
+
+def describe_tokens(count: int) -> str:
+    """Format a token count for display.
+
+    Args:
+        count: Token count
+
+    Returns:
+        Human readable string (e.g. "12.3k")
+    """
+    return f"{count / 1000:.1f}k" if count >= 1000 else str(count)
+
@@ -1,5 +1,6 @@
 """LLM client module."""
 
 from .client import LLMClient
+from .async_client import AsyncLLMClient
 
-__all__ = ["LLMClient"]
+__all__ = ["LLMClient", "AsyncLLMClient"]
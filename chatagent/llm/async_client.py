@@ -0,0 +1,130 @@
+"""Asynchronous OpenAI-compatible LLM client."""
+
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from openai import AsyncOpenAI, BadRequestError
+
+from .client import LLMClient, StreamAccumulator
+
+
+class AsyncLLMClient(LLMClient):
+    """OpenAI-compatible LLM client built on ``AsyncOpenAI``.
+
+    Request construction and logging are shared with ``LLMClient``; only the
+    network calls are awaited. A single instance can be shared by many
+    ``AsyncChatAgent`` conversations so they reuse one connection pool.
+    """
+
+    def _create_client(self) -> Any:
+        """Create the underlying async OpenAI SDK client.
+
+        Returns:
+            AsyncOpenAI client instance
+        """
+        return AsyncOpenAI(
+            api_key=self.api_key,
+            base_url=self.base_url,
+        )
+
+    async def chat(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        conversation_id: Optional[str] = None,
+    ) -> Any:
+        """Send chat request to LLM.
+
+        Args:
+            messages: List of message dictionaries
+            tools: Optional list of tool definitions
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            conversation_id: Identifier used to log only new messages of a conversation
+
+        Returns:
+            Response from the LLM
+        """
+        request_id = self._next_request_id()
+        kwargs = self._build_request(messages, tools, temperature, max_tokens)
+
+        self._log_request(request_id, kwargs, conversation_id)
+        started = time.perf_counter()
+
+        try:
+            response = await self.client.chat.completions.create(**kwargs)
+            self._log_response(request_id, response)
+            self._record_llm_call(request_id, kwargs, conversation_id, started, response=response)
+            return response
+
+        except Exception as e:
+            self.logger.error(f"[{request_id}] API call failed: {str(e)}")
+            self._record_llm_call(request_id, kwargs, conversation_id, started, error=e)
+            raise
+
+    async def chat_stream(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        conversation_id: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Send a streaming chat request to the LLM.
+
+        Yields the same events as ``LLMClient.chat_stream``.
+
+        Args:
+            messages: List of message dictionaries
+            tools: Optional list of tool definitions
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            conversation_id: Identifier used to log only new messages of a conversation
+
+        Yields:
+            Event dictionaries (``text``, ``tool_call`` and a final ``response``)
+        """
+        request_id = self._next_request_id()
+        kwargs = self._build_request(messages, tools, temperature, max_tokens, stream=True)
+
+        self._log_request(request_id, kwargs, conversation_id)
+        started = time.perf_counter()
+        first_token = None
+
+        try:
+            try:
+                stream = await self.client.chat.completions.create(**kwargs)
+            except BadRequestError as e:
+                retry_kwargs = self._without_stream_options(e, kwargs)
+                if retry_kwargs is None:
+                    raise
+                kwargs = retry_kwargs
+                stream = await self.client.chat.completions.create(**kwargs)
+            accumulator = StreamAccumulator(self.model)
+
+            async for chunk in stream:
+                text = accumulator.add_chunk(chunk)
+                if text:
+                    if first_token is None:
+                        first_token = time.perf_counter()
+                    yield {"type": "text", "content": text}
+
+            response = accumulator.build_response()
+            self._log_response(request_id, response)
+            self._record_llm_call(request_id, kwargs, conversation_id, started, response=response, first_token=first_token)
+
+            for tool_call in accumulator.tool_calls():
+                yield {"type": "tool_call", "tool_call": tool_call}
+
+            yield {"type": "response", "response": response}
+
+        except Exception as e:
+            self.logger.error(f"[{request_id}] API call failed: {str(e)}")
+            self._record_llm_call(request_id, kwargs, conversation_id, started, error=e, first_token=first_token)
+            raise
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP connection pool."""
+        await self.client.close()
@@ -1,12 +1,152 @@
 """OpenAI-compatible LLM client."""
 
+import atexit
 import json
 import logging
 import os
+import queue
+import time
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from openai import OpenAI
+from openai import BadRequestError, OpenAI
+from openai.types.chat import ChatCompletion
+
+from .interaction_log import InteractionLog
+
+
+LOG_MODES = ("full", "delta")
+
+# Background listener writing queued log records to disk (one per process)
+_log_listener: Optional[QueueListener] = None
+
+
+def _stop_log_listener() -> None:
+    """Flush and stop the background log listener."""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
+atexit.register(_stop_log_listener)
+
+
+def cached_prompt_tokens(usage: Any) -> Optional[int]:
+    """Get how many prompt tokens the provider served from its prompt cache.
+
+    OpenAI reports ``prompt_tokens_details.cached_tokens``; Anthropic-style
+    endpoints report ``cache_read_input_tokens``.
+
+    Args:
+        usage: Usage object of a response
+
+    Returns:
+        Cached prompt tokens, or None if the provider does not report them
+    """
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached = getattr(details, "cached_tokens", None)
+    if cached is None:
+        cached = getattr(usage, "cache_read_input_tokens", None)
+    return cached
+
+
+class StreamAccumulator:
+    """Assemble streamed chat completion chunks into a complete response."""
+
+    def __init__(self, model: str):
+        """Initialize accumulator.
+
+        Args:
+            model: Model name to report if the stream does not include one
+        """
+        self.model = model
+        self.response_id = ""
+        self.created = 0
+        self.finish_reason: Optional[str] = None
+        self.usage: Any = None
+        self.content_parts: List[str] = []
+        self.tool_call_parts: Dict[int, Dict[str, Any]] = {}
+
+    def add_chunk(self, chunk: Any) -> Optional[str]:
+        """Merge one streamed chunk.
+
+        Args:
+            chunk: Chat completion chunk from the API
+
+        Returns:
+            Text delta carried by the chunk, if any
+        """
+        self.response_id = chunk.id or self.response_id
+        self.model = chunk.model or self.model
+        self.created = chunk.created or self.created
+        if getattr(chunk, "usage", None):
+            self.usage = chunk.usage
+
+        if not chunk.choices:
+            return None
+
+        choice = chunk.choices[0]
+        if choice.finish_reason:
+            self.finish_reason = choice.finish_reason
+
+        delta = choice.delta
+        if delta is None:
+            return None
+
+        for tc_delta in delta.tool_calls or []:
+            entry = self.tool_call_parts.setdefault(
+                tc_delta.index,
+                {"id": "", "type": "function", "function": {"name": "", "arguments": ""}},
+            )
+            if tc_delta.id:
+                entry["id"] = tc_delta.id
+            if tc_delta.function:
+                if tc_delta.function.name:
+                    entry["function"]["name"] += tc_delta.function.name
+                if tc_delta.function.arguments:
+                    entry["function"]["arguments"] += tc_delta.function.arguments
+
+        if delta.content:
+            self.content_parts.append(delta.content)
+            return delta.content
+        return None
+
+    def tool_calls(self) -> List[Dict[str, Any]]:
+        """Get the assembled tool calls, ordered by index.
+
+        Returns:
+            List of tool call dictionaries in OpenAI format
+        """
+        return [self.tool_call_parts[index] for index in sorted(self.tool_call_parts)]
+
+    def build_response(self) -> ChatCompletion:
+        """Build a ChatCompletion equivalent to the non-streaming response.
+
+        Returns:
+            Assembled chat completion
+        """
+        tool_calls = self.tool_calls()
+        message: Dict[str, Any] = {
+            "role": "assistant",
+            "content": "".join(self.content_parts) or None,
+        }
+        if tool_calls:
+            message["tool_calls"] = tool_calls
+
+        return ChatCompletion.construct(
+            id=self.response_id,
+            object="chat.completion",
+            created=self.created,
+            model=self.model,
+            choices=[{
+                "index": 0,
+                "finish_reason": self.finish_reason or ("tool_calls" if tool_calls else "stop"),
+                "message": message,
+            }],
+            usage=self.usage.model_dump() if self.usage is not None else None,
+        )
 
 
 class LLMClient:
@@ -18,6 +158,10 @@ class LLMClient:
         base_url: Optional[str] = None,
         model: str = "claude-sonnet-4-5",
         log_file: str = "chatagent.log",
+        log_mode: Optional[str] = None,
+        async_logging: bool = True,
+        interaction_log: Optional[str] = None,
+        stream_usage: Optional[bool] = None,
     ):
         """Initialize LLM client.
 
@@ -26,22 +170,71 @@ class LLMClient:
             base_url: Base URL for the API endpoint
             model: Model name to use
             log_file: Path to log file for LLM interactions
+            log_mode: "delta" logs only messages added since the previous request
+                      of the same conversation; "full" logs every message of every
+                      request. Defaults to CHATAGENT_LOG_MODE or "delta".
+            async_logging: Write log records from a background thread so requests
+                           never wait on disk I/O
+            interaction_log: Path of the structured JSONL log (one record per LLM
+                             call and tool execution). Defaults to
+                             CHATAGENT_INTERACTION_LOG or "chatagent.jsonl";
+                             "off" disables it.
+            stream_usage: Ask streamed responses for a final usage chunk
+                          (``stream_options``). Defaults to
+                          CHATAGENT_STREAM_USAGE ("off" disables it); turned
+                          off automatically if the endpoint rejects it.
         """
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         self.base_url = base_url or os.getenv("OPENAI_BASE_URL")
         self.model = model or os.getenv("OPENAI_MODEL", "claude-sonnet-4-5")
 
-        self.client = OpenAI(
-            api_key=self.api_key,
-            base_url=self.base_url,
-        )
+        self.client = self._create_client()
+
+        if stream_usage is None:
+            stream_usage = os.getenv("CHATAGENT_STREAM_USAGE", "on").lower() not in ("off", "0", "false", "no")
+        self.stream_usage = stream_usage
+
+        self.log_mode = (log_mode or os.getenv("CHATAGENT_LOG_MODE", "delta")).lower()
+        if self.log_mode not in LOG_MODES:
+            raise ValueError(f"Unknown log mode '{self.log_mode}'. Expected one of: {', '.join(LOG_MODES)}")
+
+        # Per-conversation history already written to the log: conversation_id ->
+        # (system prompt fingerprint, [messages], [message fingerprints], request_id)
+        self._logged_conversations: Dict[str, Tuple[Optional[int], List[Dict[str, Any]], List[int], str]] = {}
+        # Tool list of the previous request (callers reuse one memoized list)
+        self._logged_tools: Optional[List[Dict[str, Any]]] = None
 
         # Setup logging
         self.logger = logging.getLogger("chatagent.llm")
         self.logger.setLevel(logging.DEBUG)
+        self._log_queue: Optional[queue.Queue] = None
+        self._setup_logging(log_file, async_logging)
+
+        # Structured JSONL log for latency / token analysis (`chatagent stats`)
+        interaction_log = interaction_log or os.getenv("CHATAGENT_INTERACTION_LOG", "chatagent.jsonl")
+        self.interactions: Optional[InteractionLog] = None
+        if interaction_log.strip().lower() not in ("", "off", "none", "false"):
+            self.interactions = InteractionLog(interaction_log)
+
+        # Request counter for tracking
+        self.request_count = 0
+        # Prompt tokens sent and served from the provider's prompt cache
+        self.usage_totals: Dict[str, int] = {"prompt_tokens": 0, "cached_tokens": 0}
+
+        self.logger.info(f"LLMClient initialized with model: {self.model}")
+
+    def _setup_logging(self, log_file: str, async_logging: bool) -> None:
+        """Attach the file handler, optionally behind a queue.
+
+        Args:
+            log_file: Path to log file for LLM interactions
+            async_logging: Route records through a QueueHandler/QueueListener
+        """
+        global _log_listener
 
         # Remove existing handlers to avoid duplicates
         self.logger.handlers.clear()
+        _stop_log_listener()
 
         # File handler for detailed logs
         file_handler = logging.FileHandler(log_file, encoding="utf-8")
@@ -54,41 +247,76 @@ class LLMClient:
         )
         file_handler.setFormatter(file_formatter)
 
-        self.logger.addHandler(file_handler)
+        if not async_logging:
+            self.logger.addHandler(file_handler)
+            return
+
+        self._log_queue = queue.Queue(-1)
+        self.logger.addHandler(QueueHandler(self._log_queue))
+        _log_listener = QueueListener(self._log_queue, file_handler, respect_handler_level=True)
+        _log_listener.start()
 
-        # Request counter for tracking
-        self.request_count = 0
+    def flush_logs(self) -> None:
+        """Block until all queued log records have been written."""
+        if self._log_queue is not None and _log_listener is not None:
+            self._log_queue.join()
+        for handler in self.logger.handlers:
+            handler.flush()
+        if self.interactions is not None:
+            self.interactions.flush()
 
-        self.logger.info(f"LLMClient initialized with model: {self.model}")
+    def _create_client(self) -> Any:
+        """Create the underlying OpenAI SDK client.
 
-    def chat(
+        Returns:
+            OpenAI client instance
+        """
+        return OpenAI(
+            api_key=self.api_key,
+            base_url=self.base_url,
+        )
+
+    def _next_request_id(self) -> str:
+        """Allocate the identifier used to correlate request and response logs.
+
+        Returns:
+            Request identifier
+        """
+        self.request_count += 1
+        return f"req_{self.request_count}"
+
+    def _build_request(
         self,
         messages: List[Dict[str, Any]],
-        tools: Optional[List[Dict[str, Any]]] = None,
-        temperature: float = 0.7,
-        max_tokens: Optional[int] = None,
-    ) -> Any:
-        """Send chat request to LLM.
+        tools: Optional[List[Dict[str, Any]]],
+        temperature: float,
+        max_tokens: Optional[int],
+        stream: bool = False,
+    ) -> Dict[str, Any]:
+        """Build chat completion request parameters.
 
         Args:
             messages: List of message dictionaries
             tools: Optional list of tool definitions
             temperature: Sampling temperature
             max_tokens: Maximum tokens to generate
+            stream: Whether to request a streamed response
 
         Returns:
-            Response from the LLM
+            Keyword arguments for ``chat.completions.create``
         """
-        self.request_count += 1
-        request_id = f"req_{self.request_count}"
-
-        # Build request parameters
         kwargs = {
             "model": self.model,
             "messages": messages,
             "temperature": temperature,
         }
 
+        if stream:
+            kwargs["stream"] = True
+            if self.stream_usage:
+                # Ask for a final usage chunk so streamed calls report token counts
+                kwargs["stream_options"] = {"include_usage": True}
+
         if tools:
             kwargs["tools"] = tools
             kwargs["tool_choice"] = "auto"
@@ -96,8 +324,58 @@ class LLMClient:
         if max_tokens:
             kwargs["max_tokens"] = max_tokens
 
+        return kwargs
+
+    def _without_stream_options(self, error: Exception, kwargs: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Get request parameters to retry with if the endpoint rejected ``stream_options``.
+
+        Some OpenAI-compatible servers answer 400 to the parameter. It is then
+        dropped for this request and every later one.
+
+        Args:
+            error: Exception raised by ``chat.completions.create``
+            kwargs: Request parameters that failed
+
+        Returns:
+            Parameters without ``stream_options``, or None if the error is unrelated
+        """
+        if "stream_options" not in kwargs or not isinstance(error, BadRequestError):
+            return None
+        if "stream_options" not in str(error):
+            return None
+
+        self.stream_usage = False
+        self.logger.warning("Endpoint rejected stream_options; streaming without usage reports")
+        return {key: value for key, value in kwargs.items() if key != "stream_options"}
+
+    def chat(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        conversation_id: Optional[str] = None,
+    ) -> Any:
+        """Send chat request to LLM.
+
+        Args:
+            messages: List of message dictionaries
+            tools: Optional list of tool definitions
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            conversation_id: Identifier used to log only new messages of a conversation
+
+        Returns:
+            Response from the LLM
+        """
+        request_id = self._next_request_id()
+
+        # Build request parameters
+        kwargs = self._build_request(messages, tools, temperature, max_tokens)
+
         # Log request
-        self._log_request(request_id, kwargs)
+        self._log_request(request_id, kwargs, conversation_id)
+        started = time.perf_counter()
 
         try:
             # Make API call
@@ -105,20 +383,295 @@ class LLMClient:
 
             # Log response
             self._log_response(request_id, response)
+            self._record_llm_call(request_id, kwargs, conversation_id, started, response=response)
 
             return response
 
         except Exception as e:
             # Log error
             self.logger.error(f"[{request_id}] API call failed: {str(e)}")
+            self._record_llm_call(request_id, kwargs, conversation_id, started, error=e)
+            raise
+
+    def chat_stream(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        conversation_id: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Send a streaming chat request to the LLM.
+
+        Text deltas are yielded as soon as the provider sends them. Tool call
+        fragments are assembled by index and yielded once the stream ends, since
+        their arguments are only complete at that point.
+
+        Args:
+            messages: List of message dictionaries
+            tools: Optional list of tool definitions
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            conversation_id: Identifier used to log only new messages of a conversation
+
+        Yields:
+            Event dictionaries:
+            - {"type": "text", "content": str} for each text delta
+            - {"type": "tool_call", "tool_call": dict} for each assembled tool call
+            - {"type": "response", "response": ChatCompletion} once, at the end,
+              holding the fully assembled response
+        """
+        request_id = self._next_request_id()
+        kwargs = self._build_request(messages, tools, temperature, max_tokens, stream=True)
+
+        self._log_request(request_id, kwargs, conversation_id)
+        started = time.perf_counter()
+        first_token = None
+
+        try:
+            try:
+                stream = self.client.chat.completions.create(**kwargs)
+            except BadRequestError as e:
+                retry_kwargs = self._without_stream_options(e, kwargs)
+                if retry_kwargs is None:
+                    raise
+                kwargs = retry_kwargs
+                stream = self.client.chat.completions.create(**kwargs)
+            accumulator = StreamAccumulator(self.model)
+
+            for chunk in stream:
+                text = accumulator.add_chunk(chunk)
+                if text:
+                    if first_token is None:
+                        first_token = time.perf_counter()
+                    yield {"type": "text", "content": text}
+
+            response = accumulator.build_response()
+            self._log_response(request_id, response)
+            self._record_llm_call(request_id, kwargs, conversation_id, started, response=response, first_token=first_token)
+
+            for tool_call in accumulator.tool_calls():
+                yield {"type": "tool_call", "tool_call": tool_call}
+
+            yield {"type": "response", "response": response}
+
+        except Exception as e:
+            self.logger.error(f"[{request_id}] API call failed: {str(e)}")
+            self._record_llm_call(request_id, kwargs, conversation_id, started, error=e, first_token=first_token)
             raise
 
-    def _log_request(self, request_id: str, kwargs: Dict[str, Any]) -> None:
+    def _record_llm_call(
+        self,
+        request_id: str,
+        kwargs: Dict[str, Any],
+        conversation_id: Optional[str],
+        started: float,
+        response: Any = None,
+        error: Optional[Exception] = None,
+        first_token: Optional[float] = None,
+    ) -> None:
+        """Write the structured record of one LLM call.
+
+        Args:
+            request_id: Unique request identifier
+            kwargs: Request parameters
+            conversation_id: Conversation the request belongs to
+            started: ``time.perf_counter()`` value taken before the call
+            response: API response, if the call succeeded
+            error: Exception raised by the call, if it failed
+            first_token: ``time.perf_counter()`` value of the first streamed text delta
+        """
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            self.usage_totals["prompt_tokens"] += getattr(usage, "prompt_tokens", None) or 0
+            self.usage_totals["cached_tokens"] += cached_prompt_tokens(usage) or 0
+
+        if self.interactions is None:
+            return
+
+        record: Dict[str, Any] = {
+            "request_id": request_id,
+            "conversation_id": conversation_id,
+            "model": kwargs.get("model"),
+            "stream": bool(kwargs.get("stream")),
+            "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+            "messages": len(kwargs.get("messages", [])),
+        }
+        if first_token is not None:
+            record["ttft_ms"] = round((first_token - started) * 1000, 1)
+
+        if error is not None:
+            record["error"] = f"{type(error).__name__}: {error}"
+        elif response is not None:
+            record["prompt_tokens"] = getattr(usage, "prompt_tokens", None)
+            record["cached_tokens"] = cached_prompt_tokens(usage)
+            record["completion_tokens"] = getattr(usage, "completion_tokens", None)
+            choice = response.choices[0] if response.choices else None
+            record["finish_reason"] = choice.finish_reason if choice else None
+            tool_calls = (choice.message.tool_calls if choice else None) or []
+            record["tool_calls"] = [tc.function.name for tc in tool_calls]
+
+        self.interactions.record("llm_call", **record)
+
+    def record_tool_call(
+        self,
+        tool_name: str,
+        latency: float,
+        result: str,
+        conversation_id: Optional[str] = None,
+        cached: bool = False,
+    ) -> None:
+        """Write the structured record of one tool execution.
+
+        Args:
+            tool_name: Name of the executed tool
+            latency: Execution time in seconds
+            result: Tool result returned to the model
+            conversation_id: Conversation the call belongs to
+            cached: Whether the result was served from the tool result cache
+        """
+        if self.interactions is None:
+            return
+
+        self.interactions.record(
+            "tool_call",
+            request_id=f"req_{self.request_count}",
+            conversation_id=conversation_id,
+            tool=tool_name,
+            latency_ms=round(latency * 1000, 1),
+            result_chars=len(result),
+            error=result.startswith("Error"),
+            cached=cached,
+        )
+
+    def record_turn(
+        self,
+        iterations: int,
+        wasted_iterations: int,
+        stopped: bool,
+        conversation_id: Optional[str] = None,
+    ) -> None:
+        """Write the structured record of one user turn.
+
+        Args:
+            iterations: LLM calls made in the turn
+            wasted_iterations: Tool iterations that only repeated earlier calls
+            stopped: Whether the turn was stopped early by loop detection
+            conversation_id: Conversation the turn belongs to
+        """
+        if self.interactions is None:
+            return
+
+        self.interactions.record(
+            "turn",
+            request_id=f"req_{self.request_count}",
+            conversation_id=conversation_id,
+            iterations=iterations,
+            wasted_iterations=wasted_iterations,
+            stopped=stopped,
+        )
+
+    def forget_conversation(self, conversation_id: str) -> None:
+        """Drop delta-logging state for a conversation that has ended.
+
+        Args:
+            conversation_id: Conversation identifier
+        """
+        self._logged_conversations.pop(conversation_id, None)
+
+    def _message_fingerprint(self, message: Dict[str, Any]) -> int:
+        """Compute a fingerprint identifying a message's content.
+
+        Args:
+            message: Message dictionary
+
+        Returns:
+            Hash of the serialized message
+        """
+        return hash(json.dumps(message, sort_keys=True, ensure_ascii=False, default=str))
+
+    def _select_messages_to_log(
+        self,
+        request_id: str,
+        messages: List[Dict[str, Any]],
+        conversation_id: Optional[str],
+    ) -> Tuple[List[Tuple[int, Dict[str, Any]]], Optional[str]]:
+        """Pick the messages that still need to be written to the log.
+
+        In delta mode, messages already logged for the same conversation are
+        skipped: the system prompt is logged only when it changes, and the rest
+        of the history only from the first message that differs from the
+        previous request (so compaction or edits are still captured).
+
+        Callers resend the same message dicts as the history grows, so a
+        message that is the very object sent last time reuses its fingerprint;
+        only the system prompt and new or replaced messages are serialized.
+        Messages must therefore not be modified in place once sent.
+
+        Args:
+            request_id: Unique request identifier
+            messages: Messages sent in this request
+            conversation_id: Conversation the request belongs to
+
+        Returns:
+            Tuple of ((index, message) pairs to log, reference note or None)
+        """
+        if self.log_mode != "delta" or not conversation_id:
+            return list(enumerate(messages)), None
+
+        has_system = bool(messages) and messages[0].get("role") == "system"
+        start = 1 if has_system else 0
+        system_fingerprint = self._message_fingerprint(messages[0]) if has_system else None
+        history = messages[start:]
+
+        previous = self._logged_conversations.get(conversation_id)
+        previous_messages, previous_fingerprints = (previous[1], previous[2]) if previous else ([], [])
+
+        fingerprints: List[int] = []
+        common = None
+        for i, message in enumerate(history):
+            if i < len(previous_messages) and message is previous_messages[i]:
+                fingerprints.append(previous_fingerprints[i])
+            else:
+                fingerprints.append(self._message_fingerprint(message))
+            if common is None and (i >= len(previous_fingerprints) or fingerprints[i] != previous_fingerprints[i]):
+                common = i
+        if common is None:
+            common = len(history)
+
+        self._logged_conversations[conversation_id] = (system_fingerprint, list(history), fingerprints, request_id)
+
+        if previous is None:
+            return list(enumerate(messages)), f"Conversation: {conversation_id} (first request, offset 0)"
+
+        previous_system, _, _, previous_request_id = previous
+
+        selected = []
+        system_changed = has_system and system_fingerprint != previous_system
+        if system_changed:
+            selected.append((0, messages[0]))
+        selected.extend((start + i, messages[start + i]) for i in range(common, len(history)))
+
+        offset = start + common
+        note = (
+            f"Conversation: {conversation_id} (offset {offset}; messages 1-{offset} "
+            f"already logged up to {previous_request_id}"
+            f"{', system prompt changed' if system_changed else ''})"
+        )
+        return selected, note
+
+    def _log_request(
+        self,
+        request_id: str,
+        kwargs: Dict[str, Any],
+        conversation_id: Optional[str] = None,
+    ) -> None:
         """Log LLM request details.
 
         Args:
             request_id: Unique request identifier
             kwargs: Request parameters
+            conversation_id: Conversation the request belongs to (enables delta logging)
         """
         self.logger.info("=" * 80)
         self.logger.info(f"[{request_id}] LLM REQUEST")
@@ -127,13 +680,18 @@ class LLMClient:
         # Log basic info
         self.logger.info(f"Model: {kwargs.get('model')}")
         self.logger.info(f"Temperature: {kwargs.get('temperature')}")
+        if kwargs.get('stream'):
+            self.logger.info("Stream: True")
         if kwargs.get('max_tokens'):
             self.logger.info(f"Max Tokens: {kwargs.get('max_tokens')}")
 
-        # Log messages with full content
+        # Log messages with full content (only new ones in delta mode)
         messages = kwargs.get('messages', [])
-        self.logger.info(f"\nMessages ({len(messages)} total):")
-        for i, msg in enumerate(messages):
+        to_log, reference = self._select_messages_to_log(request_id, messages, conversation_id)
+        self.logger.info(f"\nMessages ({len(messages)} total, {len(to_log)} logged):")
+        if reference:
+            self.logger.info(reference)
+        for i, msg in to_log:
             role = msg.get('role', 'unknown')
             content = msg.get('content', '')
 
@@ -181,11 +739,14 @@ class LLMClient:
 
         # Log tools if present
         tools = kwargs.get('tools')
-        if tools:
+        if tools and self.log_mode == "delta" and tools is self._logged_tools:
+            self.logger.info(f"\nTools ({len(tools)} available, unchanged)")
+        elif tools:
             self.logger.info(f"\nTools ({len(tools)} available):")
             for tool in tools:
                 tool_name = tool.get('function', {}).get('name', 'unknown')
                 self.logger.info(f"  - {tool_name}")
+        self._logged_tools = tools
 
     def _log_response(self, request_id: str, response: Any) -> None:
         """Log LLM response details.
@@ -215,6 +776,9 @@ class LLMClient:
             usage = response.usage
             self.logger.info(f"\nToken Usage:")
             self.logger.info(f"  Prompt Tokens: {usage.prompt_tokens}")
+            cached = cached_prompt_tokens(usage)
+            if cached is not None:
+                self.logger.info(f"  Cached Prompt Tokens: {cached}")
             self.logger.info(f"  Completion Tokens: {usage.completion_tokens}")
             self.logger.info(f"  Total Tokens: {usage.total_tokens}")
 
@@ -0,0 +1,101 @@
+"""Structured JSONL log of LLM calls and tool executions."""
+
+import atexit
+import gzip
+import json
+import logging
+import os
+import queue
+import shutil
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Dict, Optional
+
+
+def _gzip_namer(name: str) -> str:
+    """Name rotated files with a .gz suffix (chatagent.jsonl.1.gz, ...)."""
+    return name + ".gz"
+
+
+def _gzip_rotator(source: str, dest: str) -> None:
+    """Compress a rotated log file."""
+    with open(source, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+class InteractionLog:
+    """Writes one JSON record per LLM call or tool execution.
+
+    Records are queued and written by a background thread. The file is rotated
+    by size and rotated files are gzip-compressed. ``chatagent stats`` reads
+    both the live file and its compressed backups.
+    """
+
+    # Listener of the most recently created log (one per process, like the text log)
+    _listener: Optional[QueueListener] = None
+
+    def __init__(
+        self,
+        path: str = "chatagent.jsonl",
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+    ):
+        """Initialize interaction log.
+
+        Args:
+            path: Path of the JSONL file
+            max_bytes: Rotate once the file reaches this size
+            backup_count: Number of compressed backups to keep
+        """
+        self.path = path
+        self.logger = logging.getLogger("chatagent.interactions")
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        self.logger.handlers.clear()
+
+        if InteractionLog._listener is not None:
+            InteractionLog._listener.stop()
+            InteractionLog._listener = None
+
+        file_handler = RotatingFileHandler(
+            path,
+            maxBytes=max_bytes,
+            backupCount=backup_count,
+            encoding="utf-8",
+            delay=True,
+        )
+        file_handler.namer = _gzip_namer
+        file_handler.rotator = _gzip_rotator
+        file_handler.setFormatter(logging.Formatter("%(message)s"))
+
+        self._queue: queue.Queue = queue.Queue(-1)
+        self.logger.addHandler(QueueHandler(self._queue))
+        InteractionLog._listener = QueueListener(self._queue, file_handler)
+        InteractionLog._listener.start()
+
+    def record(self, record_type: str, **fields: Any) -> None:
+        """Write one record.
+
+        Args:
+            record_type: Record type ("llm_call" or "tool_call")
+            **fields: Record fields (must be JSON serializable)
+        """
+        data: Dict[str, Any] = {"ts": datetime.now().isoformat(timespec="milliseconds"), "type": record_type}
+        data.update(fields)
+        self.logger.info(json.dumps(data, ensure_ascii=False, default=str))
+
+    def flush(self) -> None:
+        """Block until all queued records have been written."""
+        if InteractionLog._listener is not None:
+            self._queue.join()
+
+    @classmethod
+    def stop(cls) -> None:
+        """Flush and stop the background writer."""
+        if cls._listener is not None:
+            cls._listener.stop()
+            cls._listener = None
+
+
+atexit.register(InteractionLog.stop)
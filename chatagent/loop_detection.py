@@ -0,0 +1,139 @@
+"""Detection of unproductive tool-call loops within a turn."""
+
+import json
+from typing import Any, List, Optional, Set, Tuple
+
+# Consecutive wasted iterations after which the turn is stopped
+DEFAULT_STOP_AFTER = 3
+
+# Hints appended to the last tool result of a wasted iteration
+REPEAT_HINT = (
+    "[Loop detected: {calls} already returned exactly this result earlier in this turn. "
+    "Repeating it will not change the outcome. Use the result you have, try a different "
+    "approach, or answer the user.]"
+)
+ERROR_HINT = (
+    "[Loop detected: {calls} keeps failing the same way. Do not retry it unchanged; fix "
+    "the arguments, use a different tool, or explain the problem to the user.]"
+)
+CYCLE_HINT = (
+    "[Loop detected: these tool calls and results repeat those of {period} iterations ago, "
+    "so the work is going in circles. Break the cycle: use what you have learned or answer the user.]"
+)
+
+# Final response of a turn stopped by the detector
+STOP_MESSAGE = (
+    "I stopped because I kept repeating the same tool calls without making progress "
+    "({wasted} wasted iterations). Please clarify the request or suggest another approach."
+)
+
+# (call key, result hash) pair; the key is the tool name plus normalized arguments
+Outcome = Tuple[str, int]
+
+
+def call_key(name: str, arguments: Optional[str]) -> str:
+    """Build a key identifying a tool call independently of argument order.
+
+    Args:
+        name: Tool name
+        arguments: JSON-encoded tool arguments
+
+    Returns:
+        Key identifying the call
+    """
+    try:
+        normalized = json.dumps(json.loads(arguments) if arguments else {}, sort_keys=True, ensure_ascii=False)
+    except (TypeError, ValueError):
+        normalized = arguments or ""
+    return f"{name}({normalized})"
+
+
+class LoopDetector:
+    """Tracks the tool calls of one turn and flags iterations that make no progress.
+
+    An iteration is wasted when every call in it was already made earlier in
+    the turn with the same result, or failed earlier with the same
+    arguments. Longer cycles (A, B, A, B) are wasted by the same rule and are
+    reported with their period. Every wasted iteration gets a corrective
+    hint, so a model that ignored one is told again; after ``stop_after``
+    consecutive wasted iterations the turn should stop.
+    """
+
+    def __init__(self, stop_after: int = DEFAULT_STOP_AFTER):
+        """Initialize loop detector.
+
+        Args:
+            stop_after: Consecutive wasted iterations after which ``should_stop``
+                        is set (0 only adds hints)
+        """
+        self.stop_after = max(0, stop_after)
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the calls of the previous turn."""
+        self.iterations = 0
+        self.wasted = 0
+        self.streak = 0
+        self.should_stop = False
+        self._outcomes: Set[Outcome] = set()
+        # Keys of calls that returned an error
+        self._failed: Set[str] = set()
+        # Outcomes of each iteration, in order
+        self._history: List[frozenset] = []
+
+    def observe(self, tool_calls: List[Any], results: List[str]) -> Optional[str]:
+        """Record one iteration's tool calls and their results.
+
+        Args:
+            tool_calls: Tool call objects from the assistant message
+            results: Tool results, in the same order
+
+        Returns:
+            Hint to append to the iteration's last tool result, or None
+        """
+        self.iterations += 1
+        calls = [
+            (call_key(tool_call.function.name, tool_call.function.arguments), result)
+            for tool_call, result in zip(tool_calls, results)
+        ]
+        outcomes = [(key, hash(result)) for key, result in calls]
+        failing = [key for key, result in calls if result.startswith("Error") and key in self._failed]
+        repeated = [
+            key for (key, result), outcome in zip(calls, outcomes)
+            if outcome in self._outcomes and not result.startswith("Error")
+        ]
+        signature = frozenset(outcomes)
+        period = self._cycle_period(signature)
+        wasted = bool(calls) and len(repeated) + len(failing) == len(calls)
+
+        self._outcomes.update(outcomes)
+        self._failed.update(key for key, result in calls if result.startswith("Error"))
+        self._history.append(signature)
+
+        if not wasted:
+            self.streak = 0
+            return None
+
+        self.wasted += 1
+        self.streak += 1
+        if self.stop_after and self.streak >= self.stop_after:
+            self.should_stop = True
+        if failing:
+            return ERROR_HINT.format(calls=", ".join(dict.fromkeys(failing)))
+        if period > 1:
+            return CYCLE_HINT.format(period=period)
+        return REPEAT_HINT.format(calls=", ".join(dict.fromkeys(repeated)))
+
+    def _cycle_period(self, signature: frozenset) -> int:
+        """Find how many iterations ago the same calls and results were last seen.
+
+        Args:
+            signature: Outcomes of the current iteration
+
+        Returns:
+            Distance to the last identical iteration, or 0 if there was none
+        """
+        for distance, previous in enumerate(reversed(self._history), 1):
+            if previous == signature:
+                return distance
+        return 0
@@ -0,0 +1,193 @@
+"""Lexical (BM25) retrieval of saved memories for the system prompt."""
+
+import math
+import os
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from .context import CHARS_PER_TOKEN
+
+# Memories injected per user message, and the tokens they may use at most
+DEFAULT_RECALL_TOP_K = 5
+DEFAULT_RECALL_TOKENS = 500
+
+_WORD = re.compile(r"[^\W_]+")
+
+# Words too common to say anything about relevance
+STOPWORDS = frozenset(
+    """
+    a an and are as at be but by can could did do does for from had has have how i if in into is
+    it its me my no not of on or our so than that the their them then there these they this to
+    was we were what when where which who why will with would you your
+    """.split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase search terms.
+
+    Underscores and punctuation separate words ("user_preference" gives
+    "user" and "preference"), stopwords are dropped and a plural "s" is
+    stripped ("preferences" matches "preference").
+
+    Args:
+        text: Text to split
+
+    Returns:
+        Terms in order of appearance
+    """
+    return [
+        word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith("ss") else word
+        for word in _WORD.findall(text.lower())
+        if word not in STOPWORDS
+    ]
+
+
+class BM25Index:
+    """In-memory Okapi BM25 index over a fixed list of documents."""
+
+    def __init__(self, documents: List[List[str]], k1: float = 1.5, b: float = 0.75):
+        """Build the index.
+
+        Args:
+            documents: Terms of every document (see ``tokenize``)
+            k1: Term frequency saturation
+            b: Document length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self.size = len(documents)
+        self.lengths = [len(terms) for terms in documents]
+        self.average_length = (sum(self.lengths) / self.size) if self.size else 0.0
+        # term -> [(document index, term frequency)]
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}
+        for index, terms in enumerate(documents):
+            for term, count in Counter(terms).items():
+                self.postings.setdefault(term, []).append((index, count))
+
+    def idf(self, term: str) -> float:
+        """Inverse document frequency of a term (never negative)."""
+        frequency = len(self.postings.get(term, ()))
+        return math.log(1 + (self.size - frequency + 0.5) / (frequency + 0.5))
+
+    def search(self, query: List[str], limit: Optional[int] = None) -> List[Tuple[int, float]]:
+        """Rank documents against query terms.
+
+        Args:
+            query: Query terms (see ``tokenize``)
+            limit: Maximum number of results
+
+        Returns:
+            (document index, score) of documents sharing a term with the query,
+            best first
+        """
+        scores: Dict[int, float] = {}
+        for term in set(query):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = self.idf(term)
+            for index, count in postings:
+                norm = 1 - self.b + self.b * self.lengths[index] / (self.average_length or 1)
+                scores[index] = scores.get(index, 0.0) + idf * count * (self.k1 + 1) / (count + self.k1 * norm)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit] if limit is not None else ranked
+
+
+def _memory_terms(memory: Dict[str, Any]) -> List[str]:
+    """Search terms of a memory: its key, value and tags."""
+    return tokenize(" ".join([memory.get("key", ""), str(memory.get("value", "")), *memory.get("tags", [])]))
+
+
+def format_memory(memory: Dict[str, Any]) -> str:
+    """Render a memory as one bullet for the system prompt."""
+    line = f"• {memory['key']}: {memory['value']}"
+    if memory.get("tags"):
+        line += f" (tags: {', '.join(memory['tags'])})"
+    return line
+
+
+class MemoryRecall:
+    """Select the saved memories relevant to a user message.
+
+    Memories are ranked with BM25 against the message; the best ``top_k``
+    that fit in ``token_budget`` are returned. The index is kept between
+    turns and only rebuilt when the store's fingerprint changes.
+    """
+
+    def __init__(self, store: Any, top_k: int = DEFAULT_RECALL_TOP_K, token_budget: int = DEFAULT_RECALL_TOKENS):
+        """Initialize recall.
+
+        Args:
+            store: Memory store (see ``chatagent.tools.memory_store``)
+            top_k: Maximum memories returned per message (0 disables recall)
+            token_budget: Maximum estimated tokens of the returned memories
+        """
+        self.store = store
+        self.top_k = top_k
+        self.token_budget = token_budget
+        self.builds = 0
+        self._fingerprint: Any = None
+        self._memories: List[Dict[str, Any]] = []
+        self._index = BM25Index([])
+
+    @classmethod
+    def from_env(cls, store: Any) -> "MemoryRecall":
+        """Create recall configured by the environment.
+
+        CHATAGENT_MEMORY_RECALL sets top-k ("off" disables recall) and
+        CHATAGENT_MEMORY_RECALL_TOKENS the token budget.
+        """
+        setting = os.getenv("CHATAGENT_MEMORY_RECALL", str(DEFAULT_RECALL_TOP_K)).lower()
+        top_k = 0 if setting in ("off", "0", "false", "no") else int(setting)
+        token_budget = int(os.getenv("CHATAGENT_MEMORY_RECALL_TOKENS", str(DEFAULT_RECALL_TOKENS)))
+        return cls(store, top_k=top_k, token_budget=token_budget)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether recall returns anything at all."""
+        return self.top_k > 0 and self.token_budget > 0
+
+    def _refresh(self) -> None:
+        """Rebuild the index if memories changed since it was built."""
+        fingerprint = self.store.fingerprint()
+        if fingerprint == self._fingerprint:
+            return
+        self._memories = self.store.all()
+        self._index = BM25Index([_memory_terms(memory) for memory in self._memories])
+        self._fingerprint = fingerprint
+        self.builds += 1
+
+    def recall(self, query: str) -> List[Dict[str, Any]]:
+        """Get the memories most relevant to ``query``.
+
+        Args:
+            query: User message
+
+        Returns:
+            Memories, most relevant first (empty if none share a term with it)
+        """
+        if not self.enabled:
+            return []
+        terms = tokenize(query)
+        if not terms:
+            return []
+        try:
+            self._refresh()
+        except Exception:
+            return []
+
+        selected: List[Dict[str, Any]] = []
+        remaining = self.token_budget
+        for index, _ in self._index.search(terms):
+            memory = self._memories[index]
+            tokens = len(format_memory(memory)) // CHARS_PER_TOKEN + 1
+            if tokens > remaining:
+                continue
+            selected.append(memory)
+            remaining -= tokens
+            if len(selected) >= self.top_k:
+                break
+        return selected
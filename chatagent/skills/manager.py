@@ -1,23 +1,58 @@
 """Skills manager for handling Claude skills."""
 
+import os
 import re
+import time
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from ..retrieval import BM25Index, tokenize
+from .manifest import SkillManifest, default_manifest_path
+from .watcher import DEFAULT_POLL_INTERVAL, SkillWatcher
+
+# Default of ``SkillManager(manifest_path=...)``: the per-directory cache file
+_DEFAULT_MANIFEST: Any = object()
 
 
 class SkillManager:
-    """Manager for Claude skills."""
+    """Manager for Claude skills.
+
+    Skill metadata is read from a manifest cache, so only SKILL.md files whose
+    mtime or size changed are parsed at startup; skill bodies are read only
+    when a skill is activated. A BM25 index over each skill's name, title and
+    description is built at load time for ``search_skills``. Reloads, and
+    changes picked up by ``watch``/``check_for_changes``, only process the
+    SKILL.md files that were added, changed or deleted.
+    """
 
-    def __init__(self, skills_dir: Optional[str] = None):
+    def __init__(self, skills_dir: Optional[str] = None, manifest_path: Union[Path, str, None] = _DEFAULT_MANIFEST):
         """Initialize skill manager.
 
         Args:
             skills_dir: Directory containing skill subdirectories.
                        Each subdirectory should contain a SKILL.md file.
                        If None, looks for 'skills' directory in current working directory.
+            manifest_path: Manifest cache file (defaults to one per skills
+                           directory in ~/.cache/chatagent/skills); None keeps
+                           the manifest in memory only
         """
         self.active_skills: Dict[str, dict] = {}
         self.available_skills: Dict[str, dict] = {}
+        # SKILL.md path -> (mtime_ns, size, body) of bodies loaded on activation
+        self._bodies: Dict[str, Tuple[int, int, str]] = {}
+        # Counts and duration of the last skill load
+        self.load_stats: Dict[str, Any] = {}
+        # Search index over the available skills, in _index_names order
+        self._index = BM25Index([])
+        self._index_names: List[str] = []
+        # Incremented whenever the available skills change
+        self.version = 0
+        # SKILL.md path -> (mtime_ns, size, skill name) of the loaded skills
+        self._files: Dict[str, Tuple[int, int, str]] = {}
+        # Reloads that changed something, and what the last one changed
+        self.reload_count = 0
+        self.last_reload: Dict[str, List[str]] = {}
+        self._watcher: Optional[SkillWatcher] = None
 
         # Determine skills directory
         if skills_dir is None:
@@ -34,6 +69,10 @@ class SkillManager:
             skills_dir = Path(skills_dir)
 
         self.skills_dir = Path(skills_dir)
+        if manifest_path is _DEFAULT_MANIFEST:
+            manifest_path = default_manifest_path(self.skills_dir)
+        self.manifest_path = Path(manifest_path) if manifest_path is not None else None
+        self._manifest = SkillManifest(self.manifest_path)
         self._load_skills()
 
     def _parse_yaml_frontmatter(self, content: str) -> tuple[Dict[str, str], str]:
@@ -72,54 +111,163 @@ class SkillManager:
 
         return frontmatter, remaining_content
 
+    def _parse_skill(self, skill_md_path: Path, default_name: str) -> Dict[str, Any]:
+        """Parse the metadata of one SKILL.md file.
+
+        Args:
+            skill_md_path: Path of the SKILL.md file
+            default_name: Name used when the frontmatter has none
+
+        Returns:
+            Skill data (without the full body)
+        """
+        with open(skill_md_path, "r", encoding="utf-8") as f:
+            content = f.read()
+
+        # Parse YAML frontmatter
+        frontmatter, body_content = self._parse_yaml_frontmatter(content)
+
+        # Extract skill name (prefer from frontmatter, fallback to directory name)
+        skill_name = frontmatter.get("name", default_name)
+
+        # Extract first heading from body as title if available
+        title_match = re.search(r'^#\s+(.+)$', body_content, re.MULTILINE)
+        title = title_match.group(1) if title_match else skill_name
+
+        return {
+            "name": skill_name,
+            "title": title,
+            "description": frontmatter.get("description", ""),
+            "path": str(skill_md_path),
+            "content": body_content[:500],  # Store first 500 chars as preview
+            "frontmatter": frontmatter,
+        }
+
+    def _skill_md_paths(self) -> List[str]:
+        """List the SKILL.md path of every skill subdirectory, in name order."""
+        try:
+            entries = sorted(os.scandir(self.skills_dir), key=lambda entry: entry.name)
+        except OSError:
+            # If directory doesn't exist, there are no skills
+            return []
+        return [os.path.join(entry.path, "SKILL.md") for entry in entries if entry.is_dir()]
+
     def _load_skills(self):
-        """Load skill definitions from SKILL.md files in subdirectories."""
-        if not self.skills_dir.exists():
-            # If directory doesn't exist, use empty skills dict
-            return
-
-        # Scan all subdirectories for SKILL.md files
-        for skill_dir in self.skills_dir.iterdir():
-            if not skill_dir.is_dir():
-                continue
+        """Load skill definitions from SKILL.md files in subdirectories.
 
-            skill_md_path = skill_dir / "SKILL.md"
-            if not skill_md_path.exists():
-                continue
+        Files unchanged since the last load are kept and others are served
+        from the manifest cache when possible; ``load_stats`` records how many
+        skills were cached or parsed and how long it took.
+        """
+        started = time.perf_counter()
+        skill_mds = self._skill_md_paths()
+        stale = set(self._files) - set(skill_mds)
+        changes, cached, parsed = self._update_skills(skill_mds + sorted(stale))
+
+        self._manifest.retain(set(self._files))
+        self._manifest.save()
+        self.load_stats = {
+            "skills": len(self.available_skills),
+            "cached": cached,
+            "parsed": parsed,
+            "seconds": time.perf_counter() - started,
+        }
+        return changes
+
+    def _update_skills(self, skill_mds: List[str]) -> Tuple[Dict[str, List[str]], int, int]:
+        """Bring the skills defined by some SKILL.md files up to date.
 
+        Changed files are parsed again, missing ones are removed and active
+        skills are refreshed in place.
+
+        Args:
+            skill_mds: SKILL.md paths to check
+
+        Returns:
+            (changed skill names by "added", "updated" and "removed", number of
+            skills unchanged or served from the manifest, number parsed)
+        """
+        changes: Dict[str, List[str]] = {"added": [], "updated": [], "removed": []}
+        cached = parsed = 0
+
+        for skill_md in skill_mds:
+            known = self._files.get(skill_md)
             try:
-                # Read SKILL.md file
-                with open(skill_md_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-
-                # Parse YAML frontmatter
-                frontmatter, body_content = self._parse_yaml_frontmatter(content)
-
-                # Extract skill name (prefer from frontmatter, fallback to directory name)
-                skill_name = frontmatter.get("name", skill_dir.name)
-
-                # Extract description from frontmatter
-                description = frontmatter.get("description", "")
-
-                # Extract first heading from body as title if available
-                title_match = re.search(r'^#\s+(.+)$', body_content, re.MULTILINE)
-                title = title_match.group(1) if title_match else skill_name
-
-                # Store skill data
-                self.available_skills[skill_name] = {
-                    "name": skill_name,
-                    "title": title,
-                    "description": description,
-                    "path": str(skill_md_path),
-                    "content": body_content[:500],  # Store first 500 chars as preview
-                    "frontmatter": frontmatter,
-                }
-
-            except (IOError, UnicodeDecodeError) as e:
-                # Skip invalid skill files
-                print(f"Warning: Could not load skill from {skill_md_path}: {e}")
+                st = os.stat(skill_md)
+            except OSError:
+                st = None
+            if st is not None and known and known[0] == st.st_mtime_ns and known[1] == st.st_size:
+                cached += 1
+                continue
+
+            skill = self._manifest.get(skill_md, st) if st is not None else None
+            if skill is not None:
+                cached += 1
+            elif st is not None:
+                try:
+                    skill = self._parse_skill(Path(skill_md), os.path.basename(os.path.dirname(skill_md)))
+                except (IOError, UnicodeDecodeError) as e:
+                    # Skip invalid skill files
+                    print(f"Warning: Could not load skill from {skill_md}: {e}")
+                else:
+                    self._manifest.put(skill_md, st, skill)
+                    parsed += 1
+
+            # Forget what the file defined before (its skill may have been renamed)
+            if known and (skill is None or known[2] != skill["name"]):
+                self._files.pop(skill_md)
+                if self.available_skills.get(known[2], {}).get("path") == skill_md:
+                    del self.available_skills[known[2]]
+                    self.active_skills.pop(known[2], None)
+                    changes["removed"].append(known[2])
+                    known = None
+            if skill is None:
                 continue
 
+            name = skill["name"]
+            changes["updated" if known or name in self.available_skills else "added"].append(name)
+            self._files[skill_md] = (st.st_mtime_ns, st.st_size, name)
+            self.available_skills[name] = skill
+            if name in self.active_skills:
+                self.active_skills[name]["skill_info"] = skill
+
+        # A skill renamed away and back within one update is an update
+        for name in set(changes["removed"]) & set(changes["added"]):
+            changes["removed"].remove(name)
+            changes["added"].remove(name)
+            changes["updated"].append(name)
+        if any(changes.values()):
+            self._build_index()
+        return changes, cached, parsed
+
+    def _build_index(self) -> None:
+        """Index the name, title and description of every available skill."""
+        self.version += 1
+        self._index_names = sorted(self.available_skills)
+        self._index = BM25Index([
+            tokenize(" ".join([
+                name,
+                self.available_skills[name].get("title", ""),
+                self.available_skills[name].get("description", ""),
+            ]))
+            for name in self._index_names
+        ])
+
+    def search_skills(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Rank skills by relevance to ``query`` (BM25 over name, title and description).
+
+        Args:
+            query: Task description or keywords
+            limit: Maximum number of skills
+
+        Returns:
+            (skill name, score) of skills sharing a term with the query, best first
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        return [(self._index_names[index], score) for index, score in self._index.search(terms, limit)]
+
     def list_available_skills(self) -> List[str]:
         """List all available skills.
 
@@ -210,6 +358,11 @@ class SkillManager:
         message += f"Task: {task_description}\n"
         message += f"Documentation: {skill_info.get('path', 'N/A')}\n"
 
+        # Load the skill's instructions now that they are needed
+        body = self.get_skill_body(skill_name)
+        if body:
+            message += f"\n=== Skill Instructions ===\n{body}\n"
+
         # List available resource files
         resources = self._list_skill_resources(skill_name)
         if resources["references"] or resources["assets"]:
@@ -226,7 +379,7 @@ class SkillManager:
                 for asset_path in sorted(resources["assets"]):
                     message += f"  - {asset_path}\n"
 
-        message += "\nThe skill is now active. You can reference its documentation for detailed usage."
+        message += "\nThe skill is now active. Follow its instructions above and read resource files as needed."
 
         return message
 
@@ -278,13 +431,71 @@ class SkillManager:
 
         return context
 
-    def reload_skills(self):
+    def reload_skills(self) -> Dict[str, List[str]]:
         """Reload skill definitions from disk.
 
-        Useful for adding new skills without restarting the application.
+        Only new, changed or deleted SKILL.md files are processed, so this is
+        cheap when little changed.
+
+        Returns:
+            Changed skill names by "added", "updated" and "removed"
         """
-        self.available_skills.clear()
-        self._load_skills()
+        changes = self._load_skills()
+        self._record_reload(changes)
+        return changes
+
+    def watch(self, poll_interval: float = DEFAULT_POLL_INTERVAL, use_inotify: bool = True) -> str:
+        """Start watching the skills directory for changes.
+
+        Changes are applied by ``check_for_changes``.
+
+        Args:
+            poll_interval: Seconds between rescans when inotify is unavailable
+            use_inotify: Whether to use inotify when available
+
+        Returns:
+            Backend in use ("inotify" or "poll")
+        """
+        self.unwatch()
+        self._watcher = SkillWatcher(self.skills_dir, poll_interval=poll_interval, use_inotify=use_inotify)
+        return self._watcher.backend
+
+    @property
+    def watch_backend(self) -> Optional[str]:
+        """How the skills directory is watched ("inotify" or "poll"), or None."""
+        return self._watcher.backend if self._watcher is not None else None
+
+    def unwatch(self) -> None:
+        """Stop watching the skills directory."""
+        if self._watcher is not None:
+            self._watcher.close()
+            self._watcher = None
+
+    def check_for_changes(self) -> Dict[str, List[str]]:
+        """Apply skill changes reported by the watcher since the last check.
+
+        Returns:
+            Changed skill names by "added", "updated" and "removed" (all
+            empty if nothing changed or the directory is not watched)
+        """
+        if self._watcher is None:
+            return {"added": [], "updated": [], "removed": []}
+        pending = self._watcher.pending()
+        if pending is None:
+            changes = self._load_skills()
+        elif pending:
+            changes, _, _ = self._update_skills(pending)
+            self._manifest.save()
+        else:
+            return {"added": [], "updated": [], "removed": []}
+        self._record_reload(changes)
+        return changes
+
+    def _record_reload(self, changes: Dict[str, List[str]]) -> None:
+        """Count a reload that changed at least one skill."""
+        if any(changes.values()):
+            self.reload_count += 1
+            self.last_reload = changes
 
     def get_skill_content(self, skill_name: str) -> Optional[str]:
         """Get full content of a skill's SKILL.md file.
@@ -304,3 +515,32 @@ class SkillManager:
                 return f.read()
         except IOError:
             return None
+
+    def get_skill_body(self, skill_name: str) -> Optional[str]:
+        """Get the instructions of a skill (its SKILL.md without frontmatter).
+
+        Bodies are read on first use and kept until the file changes.
+
+        Args:
+            skill_name: Name of the skill
+
+        Returns:
+            Skill body or None if not found
+        """
+        skill_info = self.get_skill_info(skill_name)
+        if not skill_info or 'path' not in skill_info:
+            return None
+
+        path = skill_info['path']
+        try:
+            st = os.stat(path)
+            cached = self._bodies.get(path)
+            if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                return cached[2]
+            with open(path, 'r', encoding='utf-8') as f:
+                _, body = self._parse_yaml_frontmatter(f.read())
+        except (IOError, UnicodeDecodeError):
+            return None
+
+        self._bodies[path] = (st.st_mtime_ns, st.st_size, body)
+        return body
@@ -0,0 +1,100 @@
+"""Persistent cache of parsed skill metadata."""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+MANIFEST_VERSION = 1
+
+
+def default_manifest_path(skills_dir: Path) -> Optional[Path]:
+    """Get where the manifest of ``skills_dir`` is cached.
+
+    Manifests live in CHATAGENT_SKILL_CACHE_DIR (default
+    ``~/.cache/chatagent/skills``); CHATAGENT_SKILL_CACHE=off disables them.
+
+    Args:
+        skills_dir: Skills directory
+
+    Returns:
+        Manifest path, or None if caching is disabled
+    """
+    if os.getenv("CHATAGENT_SKILL_CACHE", "on").lower() in ("off", "0", "false", "no"):
+        return None
+    configured = os.getenv("CHATAGENT_SKILL_CACHE_DIR")
+    cache_dir = Path(configured).expanduser() if configured else Path.home() / ".cache" / "chatagent" / "skills"
+    root = Path(skills_dir).expanduser().resolve()
+    digest = hashlib.sha1(str(root).encode("utf-8")).hexdigest()[:12]
+    return cache_dir / f"{root.parent.name or 'root'}-{digest}.json"
+
+
+class SkillManifest:
+    """Skill metadata keyed by SKILL.md path and validated by mtime and size.
+
+    Holds what the skill list needs (name, title, description, path,
+    frontmatter and a short preview) but never skill bodies. Saved as one
+    JSON file, written atomically so concurrent sessions never see a torn file.
+    """
+
+    def __init__(self, path: Optional[Path]):
+        """Load the manifest.
+
+        Args:
+            path: Manifest file (None keeps the manifest in memory only)
+        """
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.dirty = False
+        if path is None:
+            return
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == MANIFEST_VERSION:
+                self.entries = data.get("entries", {})
+        except (OSError, ValueError):
+            pass
+
+    def get(self, skill_md: str, st: os.stat_result) -> Optional[Dict[str, Any]]:
+        """Get the cached skill data of a SKILL.md that has not changed since.
+
+        Args:
+            skill_md: Path of the SKILL.md file
+            st: Its current stat result
+
+        Returns:
+            Skill data, or None if missing or stale
+        """
+        entry = self.entries.get(skill_md)
+        if entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            return entry["skill"]
+        return None
+
+    def put(self, skill_md: str, st: os.stat_result, skill: Dict[str, Any]) -> None:
+        """Record freshly parsed skill data."""
+        self.entries[skill_md] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "skill": skill}
+        self.dirty = True
+
+    def retain(self, skill_mds: set) -> None:
+        """Forget SKILL.md files that no longer exist."""
+        stale = set(self.entries) - skill_mds
+        for skill_md in stale:
+            del self.entries[skill_md]
+        self.dirty = self.dirty or bool(stale)
+
+    def save(self) -> None:
+        """Write the manifest if it changed (errors are ignored: the cache is optional)."""
+        if self.path is None or not self.dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": MANIFEST_VERSION, "entries": self.entries}, f)
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+        except OSError:
+            pass
@@ -0,0 +1,164 @@
+"""Detect changes to skill directories, with inotify or by polling."""
+
+import ctypes
+import ctypes.util
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Seconds between rescans when inotify is unavailable
+DEFAULT_POLL_INTERVAL = 2.0
+
+# inotify constants (see inotify(7))
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+# Events on the skills directory (skills added or removed) and inside each skill
+ROOT_EVENTS = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+SKILL_EVENTS = IN_CLOSE_WRITE | IN_MODIFY | IN_ATTRIB | IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_ONLYDIR
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _load_inotify() -> Optional[ctypes.CDLL]:
+    """Get a libc exposing inotify, or None (non-Linux systems)."""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        libc.inotify_init1, libc.inotify_add_watch  # noqa: B018 - raise AttributeError if missing
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class SkillWatcher:
+    """Report which SKILL.md files may have changed since the last check.
+
+    On Linux the skills directory and every skill subdirectory are watched
+    with inotify, and the kernel queues events between checks. Elsewhere (or
+    if inotify fails) ``pending`` asks for a full rescan at most every
+    ``poll_interval`` seconds; the rescan itself compares mtimes and sizes.
+    """
+
+    def __init__(self, skills_dir: Path, poll_interval: float = DEFAULT_POLL_INTERVAL, use_inotify: bool = True):
+        """Start watching.
+
+        Args:
+            skills_dir: Skills directory
+            poll_interval: Seconds between rescans when polling
+            use_inotify: Whether to try inotify before falling back to polling
+        """
+        self.skills_dir = Path(skills_dir)
+        self.poll_interval = poll_interval
+        self.backend = "poll"
+        self._fd: Optional[int] = None
+        self._libc: Optional[ctypes.CDLL] = None
+        # Watch descriptor -> watched directory (None is the skills directory)
+        self._watches: Dict[int, Optional[str]] = {}
+        self._last_poll = time.monotonic()
+
+        libc = _load_inotify() if use_inotify else None
+        if libc is not None and self.skills_dir.is_dir():
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if fd >= 0:
+                self._libc, self._fd = libc, fd
+                if self._add_watch(str(self.skills_dir), ROOT_EVENTS, None):
+                    self.backend = "inotify"
+                    for entry in os.scandir(self.skills_dir):
+                        if entry.is_dir():
+                            self._add_watch(entry.path, SKILL_EVENTS, entry.path)
+                else:
+                    self.close()
+
+    def _add_watch(self, path: str, mask: int, key: Optional[str]) -> bool:
+        """Watch a directory; returns whether it worked."""
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), mask)
+        if wd < 0:
+            return False
+        self._watches[wd] = key
+        return True
+
+    def pending(self) -> Optional[List[str]]:
+        """Collect changes since the last call.
+
+        Returns:
+            SKILL.md paths that may have changed (empty if nothing did), or
+            None if every skill should be rescanned
+        """
+        if self.backend != "inotify":
+            now = time.monotonic()
+            if now - self._last_poll < self.poll_interval:
+                return []
+            self._last_poll = now
+            return None
+
+        changed = set()
+        rescan = lost = False
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            except OSError:
+                rescan = True
+                break
+            if not data:
+                break
+
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                name = os.fsdecode(data[offset + _EVENT_HEADER.size:offset + _EVENT_HEADER.size + length].rstrip(b"\0"))
+                offset += _EVENT_HEADER.size + length
+
+                if mask & IN_Q_OVERFLOW:
+                    rescan = True
+                    continue
+                watched = self._watches.get(wd, "")
+                if mask & IN_IGNORED:
+                    self._watches.pop(wd, None)
+                    continue
+                if watched is None:
+                    # The skills directory itself: a skill directory was added or removed
+                    if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                        rescan = lost = True
+                    elif mask & IN_ISDIR and name:
+                        skill_dir = os.path.join(self.skills_dir, name)
+                        if mask & (IN_CREATE | IN_MOVED_TO):
+                            self._add_watch(skill_dir, SKILL_EVENTS, skill_dir)
+                        changed.add(os.path.join(skill_dir, "SKILL.md"))
+                elif watched and name == "SKILL.md":
+                    changed.add(os.path.join(watched, name))
+
+        if lost:
+            # The skills directory is gone; poll until it comes back
+            self.close()
+        return None if rescan else sorted(changed)
+
+    def close(self) -> None:
+        """Stop watching."""
+        if self._fd is not None:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+        self._fd = None
+        self._watches.clear()
+        self.backend = "poll"
+
+    def __del__(self):
+        self.close()
@@ -0,0 +1,249 @@
+"""Latency and throughput statistics from the structured interaction log."""
+
+import glob
+import gzip
+import json
+import os
+from typing import Any, Dict, Iterator, List, Optional
+
+from rich.console import Console
+from rich.table import Table
+
+
+def log_files(path: str) -> List[str]:
+    """List a log file and its rotated backups, oldest first.
+
+    Args:
+        path: Path of the live JSONL log (e.g. chatagent.jsonl)
+
+    Returns:
+        Existing files: path.N.gz ... path.1.gz, then path itself
+    """
+    backups = []
+    for backup in glob.glob(glob.escape(path) + ".*.gz"):
+        suffix = backup[len(path) + 1:-len(".gz")]
+        if suffix.isdigit():
+            backups.append((int(suffix), backup))
+
+    files = [backup for _, backup in sorted(backups, reverse=True)]
+    if os.path.exists(path):
+        files.append(path)
+    return files
+
+
+def read_records(paths: List[str]) -> Iterator[Dict[str, Any]]:
+    """Read records from JSONL files (plain or gzip-compressed).
+
+    Lines that are not valid JSON (e.g. a partially written last line) are skipped.
+
+    Args:
+        paths: Files to read
+
+    Yields:
+        Record dictionaries
+    """
+    for path in paths:
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Compute a percentile with linear interpolation.
+
+    Args:
+        values: Sample values
+        pct: Percentile between 0 and 100
+
+    Returns:
+        Percentile value, or None for an empty sample
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def compute_stats(records: List[Dict[str, Any]], top: int = 10) -> Dict[str, Any]:
+    """Aggregate LLM and tool records.
+
+    Args:
+        records: Records from the interaction log
+        top: Number of tools to report in ``slowest_tools``
+
+    Returns:
+        Dictionary with ``llm`` (calls, errors, latency percentiles, ttft
+        percentiles, token totals, prompt cache ratio, tokens/sec),
+        ``slowest_tools`` (per-tool count, cached results, p50/p95/max latency
+        of executed calls and mean result size, slowest p95 first) and
+        ``turns`` (user turns, LLM iterations per turn, iterations wasted on
+        repeated tool calls, turns stopped early)
+    """
+    llm_calls = [r for r in records if r.get("type") == "llm_call"]
+    succeeded = [r for r in llm_calls if not r.get("error")]
+    latencies = [r["latency_ms"] for r in succeeded if r.get("latency_ms") is not None]
+    ttfts = [r["ttft_ms"] for r in succeeded if r.get("ttft_ms") is not None]
+
+    # Throughput is measured only over calls that report usage
+    with_usage = [r for r in succeeded if r.get("completion_tokens") is not None and r.get("latency_ms")]
+    completion_tokens = sum(r["completion_tokens"] for r in with_usage)
+    generation_seconds = sum(r["latency_ms"] for r in with_usage) / 1000
+
+    # Prompt cache hit ratio over calls whose provider reports cached tokens
+    with_cache = [r for r in succeeded if r.get("cached_tokens") is not None and r.get("prompt_tokens")]
+    cached_prompt = sum(r["cached_tokens"] for r in with_cache)
+    reported_prompt = sum(r["prompt_tokens"] for r in with_cache)
+
+    llm = {
+        "calls": len(llm_calls),
+        "errors": len(llm_calls) - len(succeeded),
+        "latency_ms": {p: percentile(latencies, p) for p in (50, 95, 99)},
+        "ttft_ms": {p: percentile(ttfts, p) for p in (50, 95, 99)},
+        "prompt_tokens": sum(r.get("prompt_tokens") or 0 for r in succeeded),
+        "cached_tokens": sum(r.get("cached_tokens") or 0 for r in succeeded),
+        "cache_ratio": cached_prompt / reported_prompt if reported_prompt else None,
+        "completion_tokens": sum(r.get("completion_tokens") or 0 for r in succeeded),
+        "tokens_per_sec": completion_tokens / generation_seconds if generation_seconds else None,
+    }
+
+    by_tool: Dict[str, List[Dict[str, Any]]] = {}
+    for record in records:
+        if record.get("type") == "tool_call":
+            by_tool.setdefault(record.get("tool", "unknown"), []).append(record)
+
+    tools = []
+    for name, calls in by_tool.items():
+        # Latency is measured over executed calls, not results served from the cache
+        cached = sum(1 for c in calls if c.get("cached"))
+        executed = [c for c in calls if not c.get("cached")] or calls
+        tool_latencies = [c.get("latency_ms") or 0 for c in executed]
+        tools.append({
+            "tool": name,
+            "calls": len(calls),
+            "cached": cached,
+            "errors": sum(1 for c in calls if c.get("error")),
+            "p50_ms": percentile(tool_latencies, 50),
+            "p95_ms": percentile(tool_latencies, 95),
+            "max_ms": max(tool_latencies),
+            "mean_result_chars": sum(c.get("result_chars") or 0 for c in calls) / len(calls),
+        })
+    tools.sort(key=lambda t: t["p95_ms"], reverse=True)
+
+    turn_records = [r for r in records if r.get("type") == "turn"]
+    iterations = [r.get("iterations") or 0 for r in turn_records]
+    turns = {
+        "turns": len(turn_records),
+        "iterations": {p: percentile(iterations, p) for p in (50, 95)},
+        "max_iterations": max(iterations, default=None),
+        "wasted_iterations": sum(r.get("wasted_iterations") or 0 for r in turn_records),
+        "stopped": sum(1 for r in turn_records if r.get("stopped")),
+    }
+
+    return {"llm": llm, "slowest_tools": tools[:top], "turns": turns}
+
+
+def _ms(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:,.0f} ms"
+
+
+def print_stats(stats: Dict[str, Any], console: Console) -> None:
+    """Render statistics as tables.
+
+    Args:
+        stats: Result of ``compute_stats``
+        console: Console to print to
+    """
+    llm = stats["llm"]
+    table = Table(title="LLM calls", show_header=False)
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", justify="right")
+    table.add_row("Calls", f"{llm['calls']} ({llm['errors']} failed)")
+    for p in (50, 95, 99):
+        table.add_row(f"Latency p{p}", _ms(llm["latency_ms"][p]))
+    if llm["ttft_ms"][50] is not None:
+        for p in (50, 95, 99):
+            table.add_row(f"Time to first token p{p}", _ms(llm["ttft_ms"][p]))
+    table.add_row("Prompt tokens", f"{llm['prompt_tokens']:,}")
+    ratio = llm["cache_ratio"]
+    table.add_row("Cached prompt tokens", f"{llm['cached_tokens']:,}" + ("" if ratio is None else f" ({ratio:.0%})"))
+    table.add_row("Completion tokens", f"{llm['completion_tokens']:,}")
+    tps = llm["tokens_per_sec"]
+    table.add_row("Completion tokens/sec", "-" if tps is None else f"{tps:,.1f}")
+    console.print(table)
+
+    turns = stats["turns"]
+    if turns["turns"]:
+        table = Table(title="Turns", show_header=False)
+        table.add_column("Metric", style="cyan")
+        table.add_column("Value", justify="right")
+        table.add_row("Turns", f"{turns['turns']} ({turns['stopped']} stopped early)")
+        table.add_row("Iterations p50 / p95 / max", " / ".join(
+            f"{value:,.0f}" for value in (turns["iterations"][50], turns["iterations"][95], turns["max_iterations"])
+        ))
+        table.add_row("Wasted iterations", f"{turns['wasted_iterations']:,}")
+        console.print(table)
+
+    if not stats["slowest_tools"]:
+        return
+
+    tools = Table(title="Slowest tools (by p95 latency)")
+    tools.add_column("Tool", style="cyan")
+    tools.add_column("Calls", justify="right")
+    tools.add_column("Errors", justify="right")
+    tools.add_column("p50", justify="right")
+    tools.add_column("p95", justify="right")
+    tools.add_column("Max", justify="right")
+    tools.add_column("Avg result", justify="right")
+    for tool in stats["slowest_tools"]:
+        tools.add_row(
+            tool["tool"],
+            f"{tool['calls']} ({tool['cached']} cached)" if tool["cached"] else str(tool["calls"]),
+            str(tool["errors"]),
+            _ms(tool["p50_ms"]),
+            _ms(tool["p95_ms"]),
+            _ms(tool["max_ms"]),
+            f"{tool['mean_result_chars']:,.0f} chars",
+        )
+    console.print(tools)
+
+
+def run_stats(paths: List[str], top: int = 10, include_rotated: bool = True, console: Optional[Console] = None) -> int:
+    """Entry point of ``chatagent stats``.
+
+    Args:
+        paths: Interaction log files
+        top: Number of slowest tools to show
+        include_rotated: Also read the compressed backups of each file
+        console: Console to print to
+
+    Returns:
+        Process exit code
+    """
+    console = console or Console()
+
+    files: List[str] = []
+    for path in paths:
+        found = log_files(path) if include_rotated else ([path] if os.path.exists(path) else [])
+        if not found:
+            console.print(f"[red]Log file not found: {path}[/red]")
+            return 1
+        files.extend(found)
+
+    records = list(read_records(files))
+    if not records:
+        console.print("[yellow]No records found.[/yellow]")
+        return 0
+
+    console.print(f"[dim]{len(records)} records from {len(files)} file(s)[/dim]")
+    print_stats(compute_stats(records, top=top), console)
+    return 0
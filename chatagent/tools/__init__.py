@@ -4,10 +4,11 @@ from .base import Tool, ToolRegistry
 from .file_ops import EditTool, ReadFileTool, ReadFolderTool, WriteFileTool
 from .search import FindFilesTool, SearchTextTool
 from .shell import ShellTool
+from .shell_jobs import ShellJobKillTool, ShellJobOutputTool, ShellJobStatusTool
 from .web import GoogleSearchTool, WebFetchTool
 from .memory import SaveMemoryTool
 from .agents import CLIHelpAgentTool, CodebaseInvestigatorTool
-from .skill import ActivateSkillTool
+from .skill import ActivateSkillTool, SearchSkillsTool
 
 __all__ = [
     "Tool",
@@ -19,10 +20,14 @@ __all__ = [
     "FindFilesTool",
     "SearchTextTool",
     "ShellTool",
+    "ShellJobStatusTool",
+    "ShellJobOutputTool",
+    "ShellJobKillTool",
     "GoogleSearchTool",
     "WebFetchTool",
     "SaveMemoryTool",
     "CLIHelpAgentTool",
     "CodebaseInvestigatorTool",
     "ActivateSkillTool",
+    "SearchSkillsTool",
 ]
@@ -1,8 +1,13 @@
 """Agent tools for specialized tasks."""
 
-from typing import Any, Dict
+import time
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, Optional, Tuple
 
 from .base import Tool
+from .code_index import CodeIndex
+from .result_cache import modification_count
+from .walker import matches_glob, walk_files
 
 
 class CLIHelpAgentTool(Tool):
@@ -29,6 +34,11 @@ class CLIHelpAgentTool(Tool):
             "required": ["question"],
         }
 
+    @property
+    def concurrency_safe(self) -> bool:
+        """Returning help text has no side effects."""
+        return True
+
     def execute(self, question: str) -> str:
         """Provide CLI help."""
         help_text = f"""
@@ -69,7 +79,31 @@ For more detailed information, refer to the documentation or ask specific questi
 
 
 class CodebaseInvestigatorTool(Tool):
-    """Tool for investigating codebase structure and content."""
+    """Tool for investigating codebase structure and content.
+
+    Besides an overview of the directory, it answers symbol queries (where is
+    X defined, who calls X, who imports X, what is in this file) from a
+    persistent ``CodeIndex``, which is brought up to date incrementally before
+    a query. The update (a walk of the whole indexed tree) is skipped if the
+    same index was updated less than ``UPDATE_INTERVAL`` seconds ago and no
+    tool call has modified files since.
+    """
+
+    # Results listed per query at most
+    MAX_RESULTS = 100
+    # Seconds an index counts as fresh after an update, unless files were modified
+    UPDATE_INTERVAL = 10.0
+
+    def __init__(self, index_dir: Optional[Path] = None):
+        """Initialize tool.
+
+        Args:
+            index_dir: Directory holding index databases (defaults to the
+                       search index directory)
+        """
+        self.index_dir = index_dir
+        # Index file -> (monotonic time, modification count) of its last update
+        self._updated: Dict[str, Tuple[float, int]] = {}
 
     @property
     def name(self) -> str:
@@ -77,7 +111,13 @@ class CodebaseInvestigatorTool(Tool):
 
     @property
     def description(self) -> str:
-        return "Analyze and investigate codebase structure, find files, search code, and understand project organization. Use this for complex codebase exploration tasks."
+        return (
+            "Analyze and investigate codebase structure, find files, search code, and understand project organization. "
+            "Use query='definition', 'callers', 'imports', 'outline' or 'search' to look up where a symbol is defined, "
+            "who calls or imports it, what a file defines, or symbols matching a name, from an index of Python "
+            "definitions, imports and call sites (definitions only for JS/TS, Go, Rust, Java and Ruby). "
+            "Much faster than repeated text searches."
+        )
 
     @property
     def parameters(self) -> Dict[str, Any]:
@@ -98,70 +138,176 @@ class CodebaseInvestigatorTool(Tool):
                     "items": {"type": "string"},
                     "description": "File patterns to focus on (e.g., ['*.py', '*.js'])",
                 },
+                "query": {
+                    "type": "string",
+                    "enum": ["overview", "definition", "callers", "imports", "outline", "search"],
+                    "description": (
+                        "overview: directory structure and index summary (default); definition: where 'name' is "
+                        "defined; callers: call sites of 'name'; imports: where 'name' is imported; outline: "
+                        "symbols defined in file 'name'; search: symbols whose name contains 'name'"
+                    ),
+                    "default": "overview",
+                },
+                "name": {
+                    "type": "string",
+                    "description": "Symbol for the query (e.g. 'ShellTool' or 'ShellTool.execute'), or a file path for outline",
+                },
             },
             "required": ["task"],
         }
 
+    @property
+    def concurrency_safe(self) -> bool:
+        """Investigating a codebase has no side effects outside its index."""
+        return True
+
     def execute(
-        self, task: str, directory: str = ".", file_patterns: list = None
+        self,
+        task: str,
+        directory: str = ".",
+        file_patterns: list = None,
+        query: str = "overview",
+        name: Optional[str] = None,
     ) -> str:
         """Investigate codebase."""
-        from pathlib import Path
-
         try:
             path = Path(directory).expanduser()
             if not path.exists():
                 return f"Error: Directory {directory} does not exist"
 
-            results = []
-            results.append(f"Codebase Investigation Task: {task}")
-            results.append(f"Directory: {directory}")
-            results.append("")
-
-            # Analyze directory structure
-            results.append("=== Directory Structure ===")
-            dirs = set()
-            files_by_ext = {}
-
-            patterns = file_patterns or ["*"]
-            for pattern in patterns:
-                for item in path.rglob(pattern):
-                    if item.is_file():
-                        ext = item.suffix or "no_extension"
-                        files_by_ext[ext] = files_by_ext.get(ext, 0) + 1
-
-                        # Track directories
-                        parent = item.parent
-                        if parent != path:
-                            dirs.add(parent.relative_to(path))
-
-            # Report findings
-            results.append(f"Total directories: {len(dirs)}")
-            results.append(f"File types found:")
-            for ext, count in sorted(files_by_ext.items(), key=lambda x: x[1], reverse=True):
-                results.append(f"  {ext}: {count} files")
-
-            results.append("")
-            results.append("=== Key Directories ===")
-            for d in sorted(dirs)[:20]:  # Limit to 20 directories
-                results.append(f"  {d}/")
-
-            # Provide suggestions based on task
-            results.append("")
-            results.append("=== Suggestions ===")
-            if "python" in task.lower() or any(p.endswith(".py") for p in (patterns or [])):
-                results.append("- Use 'glob' with pattern '**/*.py' to find all Python files")
-                results.append("- Use 'search_file_content' to search for specific code patterns")
-                results.append("- Check for 'requirements.txt', 'setup.py', or 'pyproject.toml'")
-            elif "javascript" in task.lower() or "js" in task.lower():
-                results.append("- Use 'glob' with pattern '**/*.js' to find JavaScript files")
-                results.append("- Look for 'package.json' for project dependencies")
-            else:
-                results.append("- Use 'glob' to find files by pattern")
-                results.append("- Use 'search_file_content' to search within files")
-                results.append("- Use 'read_file' to examine specific files")
-
-            return "\n".join(results)
+            if query and query != "overview":
+                if not name:
+                    return f"Error: query '{query}' needs a name"
+                return self._lookup(path, query, name)
+            return self._overview(task, path, directory, file_patterns)
 
         except Exception as e:
             return f"Error investigating codebase: {str(e)}"
+
+    def _open_index(self, path: Path) -> Tuple[CodeIndex, str]:
+        """Get the up-to-date index covering ``path`` and the path prefix of ``path`` in it."""
+        index, prefix = CodeIndex.for_directory(path, self.index_dir)
+        key = str(index.index_file)
+        modifications = modification_count()
+        last = self._updated.get(key)
+        if last is None or last[1] != modifications or time.monotonic() - last[0] >= self.UPDATE_INTERVAL:
+            index.update()
+            self._updated[key] = (time.monotonic(), modifications)
+        return index, prefix
+
+    def _lookup(self, path: Path, query: str, name: str) -> str:
+        """Answer a symbol query from the code index."""
+        started = time.perf_counter()
+        index, prefix = self._open_index(path)
+
+        if query == "definition":
+            rows = index.definitions(name, prefix)
+            title = f"Definitions of '{name}'"
+            lines = [f"{r['path']}:{r['line']}-{r['end_line']}  {r['kind']} {r['qualname']}: {r['signature']}" for r in rows]
+        elif query == "callers":
+            rows = index.callers(name, prefix)
+            title = f"Calls of '{name}' (matched by name)"
+            lines = [f"{r['path']}:{r['line']}  in {r['caller']}" for r in rows]
+        elif query == "imports":
+            rows = index.importers(name, prefix)
+            title = f"Imports of '{name}'"
+            lines = [
+                f"{r['path']}:{r['line']}  "
+                + (f"from {r['module']} import {r['name']}" if r["name"] else f"import {r['module']}")
+                + (f" as {r['alias']}" if r["alias"] else "")
+                for r in rows
+            ]
+        elif query == "outline":
+            target = Path(name).expanduser()
+            if not target.is_absolute():
+                target = path / target
+            rel_path = target.resolve().relative_to(index.root).as_posix()
+            rows = index.outline(rel_path)
+            title = f"Symbols in {rel_path}"
+            lines = [
+                f"{r['line']}-{r['end_line']}  {'    ' * r['qualname'].count('.')}{r['signature']}"
+                for r in rows
+            ]
+        elif query == "search":
+            rows = index.search(name, prefix)
+            title = f"Symbols matching '{name}'"
+            lines = [f"{r['path']}:{r['line']}  {r['kind']} {r['qualname']}: {r['signature']}" for r in rows]
+        else:
+            return f"Error: Unknown query '{query}'"
+
+        elapsed = (time.perf_counter() - started) * 1000
+        if not lines:
+            return f"{title}: none found in {index.root} ({elapsed:.0f} ms)"
+
+        result = [f"{title} ({len(lines)}, {elapsed:.0f} ms):"]
+        result.extend(f"  {line}" for line in lines[:self.MAX_RESULTS])
+        if len(lines) > self.MAX_RESULTS:
+            result.append(f"  ... {len(lines) - self.MAX_RESULTS} more not shown; narrow the query with 'directory'")
+        return "\n".join(result)
+
+    def _overview(self, task: str, path: Path, directory: str, file_patterns: Optional[list]) -> str:
+        """Summarize the directory structure and the code index."""
+        results = []
+        results.append(f"Codebase Investigation Task: {task}")
+        results.append(f"Directory: {directory}")
+        results.append("")
+
+        # Analyze directory structure
+        results.append("=== Directory Structure ===")
+        dirs = set()
+        files_by_ext = {}
+
+        patterns = file_patterns or ["*"]
+        for rel_path, _ in walk_files(path):
+            # Each pattern matches at any depth, like rglob
+            if not any(matches_glob(rel_path, "**/" + pattern) for pattern in patterns):
+                continue
+
+            item = PurePosixPath(rel_path)
+            ext = item.suffix or "no_extension"
+            files_by_ext[ext] = files_by_ext.get(ext, 0) + 1
+
+            # Track directories
+            if item.parent != PurePosixPath("."):
+                dirs.add(item.parent)
+
+        # Report findings
+        results.append(f"Total directories: {len(dirs)}")
+        results.append(f"File types found:")
+        for ext, count in sorted(files_by_ext.items(), key=lambda x: x[1], reverse=True):
+            results.append(f"  {ext}: {count} files")
+
+        results.append("")
+        results.append("=== Key Directories ===")
+        for d in sorted(dirs)[:20]:  # Limit to 20 directories
+            results.append(f"  {d}/")
+
+        # Summarize the code index
+        index, prefix = self._open_index(path)
+        info = index.status(prefix)
+        results.append("")
+        results.append("=== Code Index ===")
+        languages = ", ".join(f"{language}: {count}" for language, count in info["languages"].items()) or "none"
+        results.append(f"Indexed source files: {languages}")
+        results.append(f"Symbols: {info['symbols']}, imports: {info['imports']}, call sites: {info['calls']}")
+        if info["parse_errors"]:
+            results.append(f"Files that failed to parse: {', '.join(info['parse_errors'][:10])}")
+
+        # Provide suggestions based on task
+        results.append("")
+        results.append("=== Suggestions ===")
+        results.append("- Use this tool with query='definition' or 'callers' and a name to locate code")
+        results.append("- Use query='outline' with a file path to see what a file defines")
+        if "python" in task.lower() or any(p.endswith(".py") for p in (patterns or [])):
+            results.append("- Use 'glob' with pattern '**/*.py' to find all Python files")
+            results.append("- Use 'search_file_content' to search for specific code patterns")
+            results.append("- Check for 'requirements.txt', 'setup.py', or 'pyproject.toml'")
+        elif "javascript" in task.lower() or "js" in task.lower():
+            results.append("- Use 'glob' with pattern '**/*.js' to find JavaScript files")
+            results.append("- Look for 'package.json' for project dependencies")
+        else:
+            results.append("- Use 'glob' to find files by pattern")
+            results.append("- Use 'search_file_content' to search within files")
+            results.append("- Use 'read_file' to examine specific files")
+
+        return "\n".join(results)
@@ -1,7 +1,12 @@
 """Base tool classes."""
 
+import asyncio
+import json
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional
+
+# cache_ttl of tools whose results only go stale when the files they read change
+CACHE_UNTIL_CHANGED = float("inf")
 
 
 class Tool(ABC):
@@ -34,6 +39,65 @@ class Tool(ABC):
         """
         return False
 
+    @property
+    def concurrency_safe(self) -> bool:
+        """Whether this tool may run concurrently with other tool calls.
+
+        Only tools that do not modify state (files, memory, skills, processes)
+        should return True; they are then executed on a thread pool when the
+        model requests several of them in one turn.
+
+        Returns:
+            True if the tool is safe to run concurrently, False otherwise
+        """
+        return False
+
+    @property
+    def read_only(self) -> bool:
+        """Whether this tool leaves files, memory, skills and processes untouched.
+
+        Defaults to ``concurrency_safe``, which already requires that.
+
+        Returns:
+            True if the tool is read-only, False otherwise
+        """
+        return self.concurrency_safe
+
+    @property
+    def uses_network(self) -> bool:
+        """Whether this tool accesses the network.
+
+        Returns:
+            True if the tool makes network requests, False otherwise
+        """
+        return False
+
+    @property
+    def cache_ttl(self) -> Optional[float]:
+        """Seconds a result may be reused for an identical call in the session.
+
+        Tools whose result only depends on their arguments and on the files
+        they read (recorded with ``result_cache.record_path``) return
+        CACHE_UNTIL_CHANGED; tools reading remote data return a TTL.
+
+        Returns:
+            TTL in seconds, or None if results must not be reused
+        """
+        return None
+
+    def modified_paths(self, **kwargs) -> Optional[List[str]]:
+        """Files a call with these parameters may have modified.
+
+        Used to drop cached results that depend on them.
+
+        Args:
+            **kwargs: Tool parameters
+
+        Returns:
+            Modified file paths, or None if any file may have changed
+        """
+        return [] if self.read_only else None
+
     @abstractmethod
     def execute(self, **kwargs) -> str:
         """Execute the tool with given parameters.
@@ -46,6 +110,21 @@ class Tool(ABC):
         """
         pass
 
+    async def aexecute(self, **kwargs) -> str:
+        """Execute the tool asynchronously.
+
+        The default implementation runs ``execute`` in a worker thread so it
+        never blocks the event loop. Tools doing network or process I/O
+        override this with a native async implementation.
+
+        Args:
+            **kwargs: Tool parameters
+
+        Returns:
+            Tool execution result as string
+        """
+        return await asyncio.to_thread(self.execute, **kwargs)
+
     def to_openai_format(self) -> Dict[str, Any]:
         """Convert tool to OpenAI function format.
 
@@ -62,12 +141,29 @@ class Tool(ABC):
         }
 
 
+# Tool profiles: name -> which tools are offered to the model. Profiles can
+# be combined with "+" ("read-only+no-web" offers tools matching both).
+TOOL_PROFILES: Dict[str, Callable[[Tool], bool]] = {
+    "all": lambda tool: True,
+    "read-only": lambda tool: tool.read_only,
+    "no-web": lambda tool: not tool.uses_network,
+}
+
+
 class ToolRegistry:
-    """Registry for managing tools."""
+    """Registry for managing tools.
+
+    OpenAI-format definitions are built once per tool subset and reused
+    until a tool is registered, so every request of a conversation sends the
+    same (identical) tools block.
+    """
 
     def __init__(self):
         """Initialize tool registry."""
         self.tools: Dict[str, Tool] = {}
+        # Memoized definitions and their JSON, per tool subset (None is every tool)
+        self._definitions: Dict[Optional[FrozenSet[str]], List[Dict[str, Any]]] = {}
+        self._json: Dict[Optional[FrozenSet[str]], bytes] = {}
 
     def register(self, tool: Tool) -> None:
         """Register a tool.
@@ -76,6 +172,8 @@ class ToolRegistry:
             tool: Tool to register
         """
         self.tools[tool.name] = tool
+        self._definitions.clear()
+        self._json.clear()
 
     def get(self, name: str) -> Tool:
         """Get a tool by name.
@@ -99,10 +197,57 @@ class ToolRegistry:
         """
         return list(self.tools.values())
 
-    def to_openai_format(self) -> List[Dict[str, Any]]:
-        """Convert all tools to OpenAI format.
+    def select(self, profile: str) -> List[str]:
+        """Get the names of the tools in a profile.
+
+        Args:
+            profile: Profile name from TOOL_PROFILES, or several joined with "+"
+
+        Returns:
+            Tool names, in registration order
+
+        Raises:
+            ValueError: If a profile is unknown
+        """
+        names = [name.strip() for name in profile.split("+")]
+        unknown = [name for name in names if name not in TOOL_PROFILES]
+        if unknown:
+            raise ValueError(f"Unknown tool profile '{unknown[0]}'. Available profiles: {', '.join(TOOL_PROFILES)}")
+        filters = [TOOL_PROFILES[name] for name in names]
+        return [name for name, tool in self.tools.items() if all(keep(tool) for keep in filters)]
+
+    def to_openai_format(self, names: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Convert tools to OpenAI format.
+
+        The list is memoized and shared between calls; do not modify it.
+
+        Args:
+            names: Tools to include (None includes every tool)
+
+        Returns:
+            List of tool definitions, in registration order
+        """
+        key = None if names is None else frozenset(names)
+        definitions = self._definitions.get(key)
+        if definitions is None:
+            definitions = [
+                tool.to_openai_format() for name, tool in self.tools.items() if key is None or name in key
+            ]
+            self._definitions[key] = definitions
+        return definitions
+
+    def to_json(self, names: Optional[Iterable[str]] = None) -> bytes:
+        """Serialize tool definitions to compact JSON, once per tool subset.
+
+        Args:
+            names: Tools to include (None includes every tool)
 
         Returns:
-            List of tool definitions
+            UTF-8 encoded JSON array of tool definitions
         """
-        return [tool.to_openai_format() for tool in self.tools.values()]
+        key = None if names is None else frozenset(names)
+        data = self._json.get(key)
+        if data is None:
+            data = json.dumps(self.to_openai_format(key), separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+            self._json[key] = data
+        return data
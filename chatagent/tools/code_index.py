@@ -0,0 +1,543 @@
+"""Persistent symbol index behind codebase_investigator."""
+
+import ast
+import multiprocessing
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .file_cache import get_file_cache
+from .search_index import MAX_INDEXED_FILE_SIZE, index_file_for
+from .walker import walk_files
+
+INDEX_VERSION = 1
+
+# Parse changed files in worker processes when at least this many need parsing
+PARALLEL_THRESHOLD = 200
+
+# Symbol patterns for languages without a Python-style parser: (kind, regex)
+_JS_PATTERNS = [
+    ("class", r"^\s*(?:export\s+)?(?:default\s+)?(?:abstract\s+)?class\s+([A-Za-z_$][\w$]*)"),
+    ("function", r"^\s*(?:export\s+)?(?:default\s+)?(?:async\s+)?function\s*\*?\s*([A-Za-z_$][\w$]*)"),
+    ("function", r"^\s*(?:export\s+)?(?:const|let|var)\s+([A-Za-z_$][\w$]*)\s*=\s*(?:async\s+)?(?:function\b|\([^)]*\)\s*=>|[A-Za-z_$][\w$]*\s*=>)"),
+    ("interface", r"^\s*(?:export\s+)?interface\s+([A-Za-z_$][\w$]*)"),
+    ("type", r"^\s*(?:export\s+)?type\s+([A-Za-z_$][\w$]*)\s*="),
+]
+REGEX_LANGUAGES: Dict[str, Tuple[str, List[Tuple[str, str]]]] = {
+    ".js": ("javascript", _JS_PATTERNS),
+    ".jsx": ("javascript", _JS_PATTERNS),
+    ".mjs": ("javascript", _JS_PATTERNS),
+    ".cjs": ("javascript", _JS_PATTERNS),
+    ".ts": ("typescript", _JS_PATTERNS),
+    ".tsx": ("typescript", _JS_PATTERNS),
+    ".go": ("go", [
+        ("function", r"^func\s+(?:\([^)]*\)\s*)?([A-Za-z_]\w*)"),
+        ("type", r"^type\s+([A-Za-z_]\w*)"),
+    ]),
+    ".rs": ("rust", [
+        ("function", r"^\s*(?:pub(?:\([^)]*\))?\s+)?(?:const\s+)?(?:async\s+)?(?:unsafe\s+)?fn\s+([A-Za-z_]\w*)"),
+        ("type", r"^\s*(?:pub(?:\([^)]*\))?\s+)?(?:struct|enum|trait|type|union)\s+([A-Za-z_]\w*)"),
+    ]),
+    ".java": ("java", [
+        ("class", r"^\s*(?:(?:public|private|protected|abstract|final|static|sealed)\s+)*(?:class|interface|enum|record)\s+([A-Za-z_]\w*)"),
+    ]),
+    ".rb": ("ruby", [
+        ("class", r"^\s*(?:class|module)\s+([A-Z]\w*)"),
+        ("function", r"^\s*def\s+(?:self\.)?([A-Za-z_]\w*[?!]?)"),
+    ]),
+}
+_COMPILED = {
+    suffix: (language, [(kind, re.compile(pattern)) for kind, pattern in patterns])
+    for suffix, (language, patterns) in REGEX_LANGUAGES.items()
+}
+
+# Suffixes of indexed files
+INDEXED_SUFFIXES = {".py", ".pyi", *REGEX_LANGUAGES}
+
+# One writer per index file within the process; SQLite locking covers other processes
+_update_locks: Dict[str, threading.Lock] = {}
+_update_locks_guard = threading.Lock()
+
+
+class _PythonVisitor(ast.NodeVisitor):
+    """Collect definitions, imports and call sites of a Python module."""
+
+    def __init__(self):
+        self.scope: List[str] = []
+        self.kinds: List[str] = []
+        # (name, qualname, kind, line, end line, signature)
+        self.symbols: List[Tuple[str, str, str, int, int, str]] = []
+        # (module, imported name or None, alias, line)
+        self.imports: List[Tuple[str, Optional[str], Optional[str], int]] = []
+        # (caller qualname, callee name, line)
+        self.calls: List[Tuple[str, str, int]] = []
+
+    def _add(self, node: ast.AST, name: str, kind: str, signature: str) -> None:
+        qualname = ".".join(self.scope + [name])
+        self.symbols.append((name, qualname, kind, node.lineno, getattr(node, "end_lineno", None) or node.lineno, signature))
+
+    def _enter(self, node: ast.AST, name: str, kind: str) -> None:
+        self.scope.append(name)
+        self.kinds.append(kind)
+        self.generic_visit(node)
+        self.scope.pop()
+        self.kinds.pop()
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        bases = ", ".join(ast.unparse(base) for base in node.bases)
+        self._add(node, node.name, "class", f"class {node.name}({bases})" if bases else f"class {node.name}")
+        self._enter(node, node.name, "class")
+
+    def _visit_function(self, node: Any, prefix: str) -> None:
+        kind = "method" if self.kinds and self.kinds[-1] == "class" else "function"
+        self._add(node, node.name, kind, f"{prefix}def {node.name}({ast.unparse(node.args)})")
+        self._enter(node, node.name, kind)
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        self._visit_function(node, "")
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+        self._visit_function(node, "async ")
+
+    def _visit_targets(self, node: ast.AST, targets: List[ast.AST]) -> None:
+        if not self.scope or self.kinds[-1] == "class":
+            for target in targets:
+                if isinstance(target, ast.Name):
+                    self._add(node, target.id, "variable", ast.unparse(node).split("\n", 1)[0][:120])
+        self.generic_visit(node)
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        self._visit_targets(node, node.targets)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
+        self._visit_targets(node, [node.target])
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            self.imports.append((alias.name, None, alias.asname, node.lineno))
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        module = "." * node.level + (node.module or "")
+        for alias in node.names:
+            self.imports.append((module, alias.name, alias.asname, node.lineno))
+
+    def visit_Call(self, node: ast.Call) -> None:
+        func = node.func
+        name = func.id if isinstance(func, ast.Name) else func.attr if isinstance(func, ast.Attribute) else None
+        if name:
+            self.calls.append((".".join(self.scope) or "<module>", name, node.lineno))
+        self.generic_visit(node)
+
+
+def extract_symbols(rel_path: str, text: str) -> Dict[str, Any]:
+    """Extract the symbols of one source file.
+
+    Python files are parsed with ``ast`` (definitions, imports and call sites);
+    other supported languages only get definitions, found with regexes.
+
+    Args:
+        rel_path: Path of the file (its suffix selects the language)
+        text: File contents
+
+    Returns:
+        Dictionary with language, status ("ok" or a parse error) and lists of
+        symbols, imports and calls
+    """
+    suffix = os.path.splitext(rel_path)[1].lower()
+    result: Dict[str, Any] = {"language": "python", "status": "ok", "symbols": [], "imports": [], "calls": []}
+
+    if suffix in (".py", ".pyi"):
+        visitor = _PythonVisitor()
+        try:
+            visitor.visit(ast.parse(text, filename=rel_path))
+        except (SyntaxError, ValueError, RecursionError) as e:
+            result["status"] = f"error: {e}"
+            return result
+        result.update(symbols=visitor.symbols, imports=visitor.imports, calls=visitor.calls)
+        return result
+
+    language, patterns = _COMPILED[suffix]
+    result["language"] = language
+    for number, line in enumerate(text.splitlines(), 1):
+        for kind, pattern in patterns:
+            match = pattern.match(line)
+            if match:
+                result["symbols"].append((match.group(1), match.group(1), kind, number, number, line.strip()[:200]))
+                break
+    return result
+
+
+def _unreadable(error: OSError) -> Dict[str, Any]:
+    """Extraction result of a file that could not be read."""
+    return {"language": "unknown", "status": f"error: {error}", "symbols": [], "imports": [], "calls": []}
+
+
+def _extract_path(args: Tuple[str, str]) -> Dict[str, Any]:
+    """Read and extract one file (runs in worker processes)."""
+    rel_path, path = args
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return extract_symbols(rel_path, f.read())
+    except OSError as e:
+        return _unreadable(e)
+
+
+class CodeIndex:
+    """On-disk index of the definitions, imports and call sites below a root.
+
+    Stored in SQLite next to the trigram search indexes. ``update`` only
+    re-parses files whose mtime or size changed, parsing in worker processes
+    when many files changed at once. Lookups are plain indexed queries.
+    """
+
+    def __init__(self, root: Path, index_dir: Optional[Path] = None):
+        """Initialize index.
+
+        Args:
+            root: Root directory of the indexed tree
+            index_dir: Directory holding index databases
+        """
+        self.root = Path(root).expanduser().resolve()
+        self.index_file = index_file_for(self.root, index_dir).with_suffix(".code.db")
+
+    @classmethod
+    def for_directory(cls, directory: Path, index_dir: Optional[Path] = None) -> Tuple["CodeIndex", str]:
+        """Get the index covering ``directory``, reusing one built for an ancestor.
+
+        Args:
+            directory: Directory being investigated
+            index_dir: Directory holding index databases
+
+        Returns:
+            (index, path prefix of ``directory`` within the index root)
+        """
+        directory = Path(directory).expanduser().resolve()
+        for root in (directory, *directory.parents):
+            index = cls(root, index_dir)
+            if index.exists():
+                relative = directory.relative_to(root).as_posix()
+                return index, "" if relative == "." else relative + "/"
+        return cls(directory, index_dir), ""
+
+    def exists(self) -> bool:
+        """Check whether the index has been built."""
+        return self.index_file.exists()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open (and if needed create) the index database."""
+        self.index_file.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.index_file, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                language TEXT NOT NULL,
+                status TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS symbols (
+                path TEXT NOT NULL,
+                name TEXT NOT NULL,
+                qualname TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                line INTEGER NOT NULL,
+                end_line INTEGER NOT NULL,
+                signature TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS symbols_name ON symbols(name);
+            CREATE INDEX IF NOT EXISTS symbols_path ON symbols(path);
+            CREATE TABLE IF NOT EXISTS imports (
+                path TEXT NOT NULL,
+                module TEXT NOT NULL,
+                name TEXT,
+                alias TEXT,
+                line INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS imports_name ON imports(name);
+            CREATE INDEX IF NOT EXISTS imports_module ON imports(module);
+            CREATE INDEX IF NOT EXISTS imports_path ON imports(path);
+            CREATE TABLE IF NOT EXISTS calls (
+                path TEXT NOT NULL,
+                caller TEXT NOT NULL,
+                callee TEXT NOT NULL,
+                line INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS calls_callee ON calls(callee);
+            CREATE INDEX IF NOT EXISTS calls_path ON calls(path);
+            """
+        )
+        version = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if version is None:
+            conn.execute("INSERT INTO meta VALUES ('version', ?)", (str(INDEX_VERSION),))
+            conn.execute("INSERT INTO meta VALUES ('root', ?)", (str(self.root),))
+            conn.commit()
+        elif int(version[0]) != INDEX_VERSION:
+            conn.close()
+            self.index_file.unlink()
+            return self._connect()
+        return conn
+
+    def _lock(self) -> threading.Lock:
+        with _update_locks_guard:
+            return _update_locks.setdefault(str(self.index_file), threading.Lock())
+
+    def update(self, progress: Optional[Callable[[int], None]] = None) -> Dict[str, int]:
+        """Bring the index up to date with the files on disk.
+
+        Args:
+            progress: Optional callback receiving the number of files seen so far
+
+        Returns:
+            Counts of added, updated, removed and unchanged files
+        """
+        stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+
+        with self._lock():
+            conn = self._connect()
+            try:
+                known = {
+                    path: (mtime_ns, size)
+                    for path, mtime_ns, size in conn.execute("SELECT path, mtime_ns, size FROM files")
+                }
+
+                changed: List[Tuple[str, os.stat_result]] = []
+                seen = 0
+                for rel_path, entry in walk_files(self.root):
+                    if os.path.splitext(rel_path)[1].lower() not in INDEXED_SUFFIXES:
+                        continue
+                    st = entry.stat()
+                    seen += 1
+                    if progress and seen % 1000 == 0:
+                        progress(seen)
+                    if st.st_size > MAX_INDEXED_FILE_SIZE:
+                        continue
+
+                    previous = known.pop(rel_path, None)
+                    if previous == (st.st_mtime_ns, st.st_size):
+                        stats["unchanged"] += 1
+                        continue
+                    stats["updated" if previous else "added"] += 1
+                    changed.append((rel_path, st))
+
+                for rel_path, st in changed:
+                    self._delete_file(conn, rel_path)
+                for (rel_path, st), extracted in zip(changed, self._extract_all(changed)):
+                    self._insert_file(conn, rel_path, st, extracted)
+
+                for rel_path in known:
+                    self._delete_file(conn, rel_path)
+                    conn.execute("DELETE FROM files WHERE path = ?", (rel_path,))
+                    stats["removed"] += 1
+
+                conn.execute("INSERT OR REPLACE INTO meta VALUES ('updated_at', ?)", (str(time.time()),))
+                conn.commit()
+            finally:
+                conn.close()
+
+        return stats
+
+    def _extract_all(self, changed: List[Tuple[str, os.stat_result]]) -> List[Dict[str, Any]]:
+        """Extract the symbols of changed files, in worker processes if there are many."""
+        jobs = [(rel_path, str(self.root / rel_path)) for rel_path, _ in changed]
+        if len(jobs) >= PARALLEL_THRESHOLD and (os.cpu_count() or 1) > 1:
+            try:
+                # Forking a process that runs threads (log listener, tool pool) is unsafe
+                with ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn")) as pool:
+                    return list(pool.map(_extract_path, jobs, chunksize=32))
+            except (OSError, RuntimeError):
+                pass  # no worker processes available: parse here
+
+        cache = get_file_cache()
+        results = []
+        for rel_path, path in jobs:
+            try:
+                text = cache.read_text(path)
+            except UnicodeDecodeError:
+                with open(path, "r", encoding="utf-8", errors="replace") as f:
+                    text = f.read()
+            except OSError as e:
+                results.append(_unreadable(e))
+                continue
+            results.append(extract_symbols(rel_path, text))
+        return results
+
+    def _delete_file(self, conn: sqlite3.Connection, rel_path: str) -> None:
+        """Remove the rows extracted from one file."""
+        for table in ("symbols", "imports", "calls"):
+            conn.execute(f"DELETE FROM {table} WHERE path = ?", (rel_path,))
+
+    def _insert_file(self, conn: sqlite3.Connection, rel_path: str, st: os.stat_result, extracted: Dict[str, Any]) -> None:
+        """Store the rows extracted from one file."""
+        conn.execute(
+            "INSERT OR REPLACE INTO files (path, mtime_ns, size, language, status) VALUES (?, ?, ?, ?, ?)",
+            (rel_path, st.st_mtime_ns, st.st_size, extracted["language"], extracted["status"]),
+        )
+        conn.executemany(
+            "INSERT INTO symbols (path, name, qualname, kind, line, end_line, signature) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(rel_path, *symbol) for symbol in extracted["symbols"]],
+        )
+        conn.executemany(
+            "INSERT INTO imports (path, module, name, alias, line) VALUES (?, ?, ?, ?, ?)",
+            [(rel_path, *item) for item in extracted["imports"]],
+        )
+        conn.executemany(
+            "INSERT INTO calls (path, caller, callee, line) VALUES (?, ?, ?, ?)",
+            [(rel_path, *call) for call in extracted["calls"]],
+        )
+
+    def _query(self, sql: str, params: tuple) -> List[sqlite3.Row]:
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _split(name: str) -> Tuple[str, str]:
+        """Split "Class.method" into ("method", "Class.method"); plain names give ("name", "")."""
+        name = name.strip()
+        return name.rsplit(".", 1)[-1], name if "." in name else ""
+
+    def definitions(self, name: str, prefix: str = "") -> List[sqlite3.Row]:
+        """Find where a symbol is defined.
+
+        Args:
+            name: Symbol name, optionally qualified ("ShellTool.execute")
+            prefix: Only return results in files below this path prefix
+
+        Returns:
+            Rows with path, qualname, kind, line, end_line and signature
+        """
+        base, qualified = self._split(name)
+        sql = "SELECT path, qualname, kind, line, end_line, signature FROM symbols WHERE name = ? AND path LIKE ? ESCAPE '\\'"
+        params: tuple = (base, _like_prefix(prefix))
+        if qualified:
+            sql += " AND (qualname = ? OR qualname LIKE ? ESCAPE '\\')"
+            params += (qualified, "%." + _escape_like(qualified))
+        return self._query(sql + " ORDER BY kind = 'variable', path, line", params)
+
+    def callers(self, name: str, prefix: str = "") -> List[sqlite3.Row]:
+        """Find the call sites of a function or method.
+
+        Calls are matched by the called name only ("obj.execute(...)" counts
+        as a call of every ``execute``), as Python is not statically typed.
+
+        Args:
+            name: Function name (a qualified name is reduced to its last part)
+            prefix: Only return results in files below this path prefix
+
+        Returns:
+            Rows with path, caller and line
+        """
+        base, _ = self._split(name)
+        return self._query(
+            "SELECT path, caller, line FROM calls WHERE callee = ? AND path LIKE ? ESCAPE '\\' ORDER BY path, line",
+            (base, _like_prefix(prefix)),
+        )
+
+    def importers(self, name: str, prefix: str = "") -> List[sqlite3.Row]:
+        """Find the imports of a name or module.
+
+        Args:
+            name: Imported name or module (dotted module names match their last part too)
+            prefix: Only return results in files below this path prefix
+
+        Returns:
+            Rows with path, module, name, alias and line
+        """
+        base, _ = self._split(name)
+        return self._query(
+            "SELECT path, module, name, alias, line FROM imports "
+            "WHERE (name = ? OR module = ? OR module LIKE ? ESCAPE '\\') AND path LIKE ? ESCAPE '\\' "
+            "ORDER BY path, line",
+            (base, name.strip(), "%." + _escape_like(base), _like_prefix(prefix)),
+        )
+
+    def outline(self, rel_path: str) -> List[sqlite3.Row]:
+        """List the symbols defined in one file, in source order.
+
+        Args:
+            rel_path: File path relative to the index root
+
+        Returns:
+            Rows with qualname, kind, line, end_line and signature
+        """
+        return self._query(
+            "SELECT qualname, kind, line, end_line, signature FROM symbols WHERE path = ? ORDER BY line",
+            (rel_path,),
+        )
+
+    def search(self, pattern: str, prefix: str = "", limit: int = 1000) -> List[sqlite3.Row]:
+        """Find symbols whose name contains ``pattern`` (case-insensitive).
+
+        Args:
+            pattern: Part of a symbol name
+            prefix: Only return results in files below this path prefix
+            limit: Maximum number of results
+
+        Returns:
+            Rows with path, qualname, kind, line and signature
+        """
+        return self._query(
+            "SELECT path, qualname, kind, line, signature FROM symbols "
+            "WHERE name LIKE ? ESCAPE '\\' AND kind != 'variable' AND path LIKE ? ESCAPE '\\' "
+            "ORDER BY length(name), path, line LIMIT ?",
+            ("%" + _escape_like(pattern.strip()) + "%", _like_prefix(prefix), limit),
+        )
+
+    def status(self, prefix: str = "") -> Dict[str, Any]:
+        """Describe the index.
+
+        Args:
+            prefix: Only count files below this path prefix
+
+        Returns:
+            Dictionary with root, index file, files per language, number of
+            symbols, imports and calls, files that failed to parse and the last
+            update time
+        """
+        info: Dict[str, Any] = {"root": str(self.root), "index_file": str(self.index_file), "exists": self.exists()}
+        if not info["exists"]:
+            return info
+
+        like = _like_prefix(prefix)
+        conn = self._connect()
+        try:
+            info["languages"] = dict(conn.execute(
+                "SELECT language, COUNT(*) FROM files WHERE path LIKE ? ESCAPE '\\' GROUP BY language ORDER BY 2 DESC",
+                (like,),
+            ).fetchall())
+            for table in ("symbols", "imports", "calls"):
+                info[table] = conn.execute(
+                    f"SELECT COUNT(*) FROM {table} WHERE path LIKE ? ESCAPE '\\'", (like,)
+                ).fetchone()[0]
+            info["parse_errors"] = [
+                path for (path,) in conn.execute(
+                    "SELECT path FROM files WHERE status != 'ok' AND path LIKE ? ESCAPE '\\' ORDER BY path", (like,)
+                )
+            ]
+            row = conn.execute("SELECT value FROM meta WHERE key = 'updated_at'").fetchone()
+            info["updated_at"] = float(row[0]) if row else None
+        finally:
+            conn.close()
+        return info
+
+
+def _escape_like(text: str) -> str:
+    """Escape LIKE wildcards."""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _like_prefix(prefix: str) -> str:
+    """LIKE pattern matching paths below ``prefix``."""
+    return _escape_like(prefix) + "%"
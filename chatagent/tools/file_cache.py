@@ -0,0 +1,172 @@
+"""Process-wide cache of decoded file contents shared by the file tools."""
+
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# Default memory cap, overridable with CHATAGENT_FILE_CACHE_MB
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def _normalize_newlines(text: str) -> str:
+    """Translate newlines like reading a file in text mode does."""
+    if "\r" not in text:
+        return text
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+class FileContentCache:
+    """LRU cache of file contents keyed by (path, mtime_ns, size).
+
+    Contents are stored decoded (UTF-8, universal newlines), exactly as
+    ``open(path, encoding="utf-8").read()`` would return them, so tools can use
+    a cached entry in place of reading the file. Every lookup stats the file and
+    only serves the entry if its mtime and size are unchanged. Files that fail
+    to decode are remembered too, so binaries are not re-read on every search.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        """Initialize cache.
+
+        Args:
+            max_bytes: Approximate memory cap for cached contents
+        """
+        self.max_bytes = max_bytes
+        # Files larger than this are read directly and never cached
+        self.max_entry_bytes = max_bytes // 8
+        self.hits = 0
+        self.misses = 0
+        self._bytes = 0
+        # path -> (mtime_ns, size, text or decode error, memory cost)
+        self._entries: "OrderedDict[str, Tuple[int, int, Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def cacheable(self, size: int) -> bool:
+        """Check whether a file of ``size`` bytes would be cached."""
+        return size <= self.max_entry_bytes
+
+    def read_text(self, path: str) -> str:
+        """Read a file's text, from the cache when it is still current.
+
+        Args:
+            path: File path
+
+        Returns:
+            Decoded file contents
+
+        Raises:
+            OSError: If the file cannot be read
+            UnicodeDecodeError: If the file is not valid UTF-8
+        """
+        key = os.path.abspath(path)
+        st = os.stat(key)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                value = entry[2]
+                if isinstance(value, UnicodeDecodeError):
+                    raise value
+                return value
+            self.misses += 1
+
+        try:
+            with open(key, "r", encoding="utf-8") as f:
+                text = f.read()
+        except UnicodeDecodeError as e:
+            self._store(key, st, e, 100)
+            raise
+
+        self._store(key, st, text, sys.getsizeof(text))
+        return text
+
+    def update(self, path: str, text: str) -> None:
+        """Record contents just written to a file.
+
+        Args:
+            path: File path
+            text: Text that was written (in text mode, UTF-8)
+        """
+        key = os.path.abspath(path)
+        try:
+            st = os.stat(key)
+        except OSError:
+            self.invalidate(key)
+            return
+        text = _normalize_newlines(text)
+        self._store(key, st, text, sys.getsizeof(text))
+
+    def invalidate(self, path: str) -> None:
+        """Drop a file from the cache.
+
+        Args:
+            path: File path
+        """
+        key = os.path.abspath(path)
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry[3]
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def _store(self, key: str, st: os.stat_result, value: Any, cost: int) -> None:
+        """Insert an entry and evict least recently used ones over the cap."""
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[3]
+            if cost > self.max_entry_bytes:
+                return
+
+            self._entries[key] = (st.st_mtime_ns, st.st_size, value, cost)
+            self._bytes += cost
+            while self._bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted[3]
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache statistics.
+
+        Returns:
+            Dictionary with hits, misses, entries, bytes and max_bytes
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+_file_cache: Optional[FileContentCache] = None
+_file_cache_lock = threading.Lock()
+
+
+def get_file_cache() -> FileContentCache:
+    """Get the process-wide file content cache.
+
+    The memory cap is read from CHATAGENT_FILE_CACHE_MB on first use.
+
+    Returns:
+        Shared cache instance
+    """
+    global _file_cache
+    with _file_cache_lock:
+        if _file_cache is None:
+            configured = os.getenv("CHATAGENT_FILE_CACHE_MB")
+            max_bytes = int(float(configured) * 1024 * 1024) if configured else DEFAULT_MAX_BYTES
+            _file_cache = FileContentCache(max_bytes)
+        return _file_cache
@@ -1,14 +1,31 @@
 """File operation tools."""
 
 import os
+from bisect import bisect_right
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
-from .base import Tool
+from .base import CACHE_UNTIL_CHANGED, Tool
+from .file_cache import get_file_cache
+from .line_index import get_line_index
+from .result_cache import record_path
+
+
+# Largest read returned in one tool result; bigger reads are paginated
+MAX_READ_BYTES = 100_000
+
+# Lines returned by a ranged read when no limit is given
+DEFAULT_READ_LINES = 2000
 
 
 class ReadFileTool(Tool):
-    """Tool for reading file contents."""
+    """Tool for reading file contents.
+
+    Small files are returned whole. Larger reads are served by line range
+    (``offset``/``limit``, or ``mode="tail"``) or byte range through a cached
+    line-offset index, and never return more than ``MAX_READ_BYTES``: when a
+    read is cut short, the result ends with a cursor to continue from.
+    """
 
     @property
     def name(self) -> str:
@@ -16,7 +33,11 @@ class ReadFileTool(Tool):
 
     @property
     def description(self) -> str:
-        return "Read the contents of a file. Returns the file content as text."
+        return (
+            "Read the contents of a file. Returns the file content as text. Large files are "
+            "returned in pages: use offset/limit (lines), mode='tail', byte_offset/byte_limit, "
+            "or the cursor from a previous truncated read to page through them."
+        )
 
     @property
     def parameters(self) -> Dict[str, Any]:
@@ -26,21 +47,166 @@ class ReadFileTool(Tool):
                 "file_path": {
                     "type": "string",
                     "description": "Path to the file to read (can be absolute or relative)",
-                }
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": "Line number to start reading from (1-based)",
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": f"Maximum number of lines to read (default {DEFAULT_READ_LINES} for ranged reads)",
+                },
+                "mode": {
+                    "type": "string",
+                    "enum": ["head", "tail"],
+                    "description": "Read the first (head) or last (tail) 'limit' lines of the file",
+                },
+                "byte_offset": {
+                    "type": "integer",
+                    "description": "Byte position to start reading from (for files with very long lines)",
+                },
+                "byte_limit": {
+                    "type": "integer",
+                    "description": f"Maximum number of bytes to read (at most {MAX_READ_BYTES})",
+                },
+                "cursor": {
+                    "type": "string",
+                    "description": "Continuation cursor returned by a previous truncated read",
+                },
             },
             "required": ["file_path"],
         }
 
-    def execute(self, file_path: str) -> str:
+    @property
+    def concurrency_safe(self) -> bool:
+        """Reading files has no side effects."""
+        return True
+
+    def execute(
+        self,
+        file_path: str,
+        offset: Optional[int] = None,
+        limit: Optional[int] = None,
+        mode: Optional[str] = None,
+        byte_offset: Optional[int] = None,
+        byte_limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> str:
         """Read file contents."""
         try:
             path = Path(file_path).expanduser()
-            with open(path, "r", encoding="utf-8") as f:
-                content = f.read()
-            return f"File: {file_path}\n\n{content}"
+
+            if cursor:
+                kind, _, position = cursor.partition(":")
+                if kind not in ("line", "byte") or not position.isdigit():
+                    return f"Error: Invalid cursor '{cursor}'"
+                if kind == "line":
+                    offset = int(position)
+                else:
+                    byte_offset = int(position)
+
+            if byte_offset is not None or byte_limit is not None:
+                return self._read_bytes(file_path, path, byte_offset or 0, byte_limit)
+
+            ranged = offset is not None or limit is not None or mode is not None
+            if not ranged and path.stat().st_size <= MAX_READ_BYTES:
+                content = get_file_cache().read_text(str(path))
+                return f"File: {file_path}\n\n{content}"
+
+            return self._read_lines(file_path, path, offset, limit, mode)
         except Exception as e:
             return f"Error reading file: {str(e)}"
 
+    def _read_lines(
+        self,
+        file_path: str,
+        path: Path,
+        offset: Optional[int],
+        limit: Optional[int],
+        mode: Optional[str],
+    ) -> str:
+        """Read a range of lines, paginating if it is too large.
+
+        Args:
+            file_path: Path as given by the caller (used in messages)
+            path: Resolved path
+            offset: First line (1-based)
+            limit: Maximum number of lines
+            mode: "head" or "tail"
+
+        Returns:
+            Tool result
+        """
+        if mode not in (None, "head", "tail"):
+            return f"Error: Unknown mode '{mode}'. Use 'head' or 'tail'"
+        if (offset is not None and offset < 1) or (limit is not None and limit < 1):
+            return "Error: offset and limit must be positive"
+
+        index = get_line_index(str(path))
+        total = index.line_count
+        limit = limit or DEFAULT_READ_LINES
+
+        if mode == "tail":
+            start = max(0, total - limit)
+        else:
+            start = (offset or 1) - 1
+            if start and start >= total:
+                return f"Error: offset {offset} is beyond the end of {file_path} ({total} lines)"
+        end = min(start + limit, total)
+
+        # Shrink the range to the byte budget, keeping whole lines
+        first_byte = index.offsets[start]
+        budget_end = bisect_right(index.offsets, first_byte + MAX_READ_BYTES, start, end + 1) - 1
+        if budget_end == start and end > start:
+            # A single line longer than the budget: fall back to a byte range
+            return self._read_bytes(file_path, path, first_byte, MAX_READ_BYTES)
+        end = min(end, budget_end)
+
+        content = index.read_bytes(*index.byte_range(start, end)).decode("utf-8")
+
+        header = f"File: {file_path} (lines {start + 1}-{end} of {total})" if total else f"File: {file_path} (empty)"
+        result = f"{header}\n\n{content}"
+        if end < total:
+            result += (
+                f"\n\n[Truncated: {total - end} more line(s). "
+                f"To continue, call read_file with cursor=\"line:{end + 1}\"]"
+            )
+        return result
+
+    def _read_bytes(self, file_path: str, path: Path, start: int, length: Optional[int]) -> str:
+        """Read a byte range, decoding it leniently.
+
+        Args:
+            file_path: Path as given by the caller (used in messages)
+            path: Resolved path
+            start: First byte
+            length: Maximum number of bytes (capped at ``MAX_READ_BYTES``)
+
+        Returns:
+            Tool result
+        """
+        if start < 0 or (length is not None and length < 1):
+            return "Error: byte_offset must be >= 0 and byte_limit must be positive"
+
+        size = path.stat().st_size
+        if start and start >= size:
+            return f"Error: byte_offset {start} is beyond the end of {file_path} ({size} bytes)"
+
+        end = min(size, start + min(length or MAX_READ_BYTES, MAX_READ_BYTES))
+        with open(path, "rb") as f:
+            f.seek(start)
+            data = f.read(end - start)
+
+        # Ranges may split multi-byte characters at either end
+        content = data.decode("utf-8", errors="replace")
+        result = f"File: {file_path} (bytes {start}-{end} of {size})\n\n{content}"
+        if end < size:
+            result += (
+                f"\n\n[Truncated: {size - end} more byte(s). "
+                f"To continue, call read_file with cursor=\"byte:{end}\"]"
+            )
+        return result
+
 
 class WriteFileTool(Tool):
     """Tool for writing content to a file."""
@@ -75,6 +241,10 @@ class WriteFileTool(Tool):
         """File writing requires user confirmation to prevent data loss."""
         return True
 
+    def modified_paths(self, file_path: str = "", **kwargs) -> Optional[List[str]]:
+        """The written file."""
+        return [str(Path(file_path).expanduser())]
+
     def execute(self, file_path: str, content: str) -> str:
         """Write content to file."""
         try:
@@ -82,6 +252,7 @@ class WriteFileTool(Tool):
             path.parent.mkdir(parents=True, exist_ok=True)
             with open(path, "w", encoding="utf-8") as f:
                 f.write(content)
+            get_file_cache().update(str(path), content)
             return f"Successfully wrote to {file_path}"
         except Exception as e:
             return f"Error writing file: {str(e)}"
@@ -119,12 +290,16 @@ class EditTool(Tool):
             "required": ["file_path", "old_text", "new_text"],
         }
 
+    def modified_paths(self, file_path: str = "", **kwargs) -> Optional[List[str]]:
+        """The edited file."""
+        return [str(Path(file_path).expanduser())]
+
     def execute(self, file_path: str, old_text: str, new_text: str) -> str:
         """Replace text in file."""
         try:
             path = Path(file_path).expanduser()
-            with open(path, "r", encoding="utf-8") as f:
-                content = f.read()
+            cache = get_file_cache()
+            content = cache.read_text(str(path))
 
             if old_text not in content:
                 return f"Error: Old text not found in {file_path}"
@@ -133,6 +308,7 @@ class EditTool(Tool):
 
             with open(path, "w", encoding="utf-8") as f:
                 f.write(new_content)
+            cache.update(str(path), new_content)
 
             return f"Successfully edited {file_path}"
         except Exception as e:
@@ -168,6 +344,16 @@ class ReadFolderTool(Tool):
             "required": [],
         }
 
+    @property
+    def concurrency_safe(self) -> bool:
+        """Listing directories has no side effects."""
+        return True
+
+    @property
+    def cache_ttl(self) -> Optional[float]:
+        """Listings stay valid until a listed directory or file changes."""
+        return CACHE_UNTIL_CHANGED
+
     def execute(self, directory_path: str = ".", recursive: bool = False) -> str:
         """List directory contents."""
         try:
@@ -179,21 +365,25 @@ class ReadFolderTool(Tool):
                 return f"Error: {directory_path} is not a directory"
 
             results = []
+            record_path(str(path))
             if recursive:
                 for item in path.rglob("*"):
                     rel_path = item.relative_to(path)
                     if item.is_dir():
+                        record_path(str(item))
                         results.append(f"[DIR]  {rel_path}/")
                     else:
-                        size = item.stat().st_size
-                        results.append(f"[FILE] {rel_path} ({size} bytes)")
+                        stat = item.stat()
+                        record_path(str(item), stat)
+                        results.append(f"[FILE] {rel_path} ({stat.st_size} bytes)")
             else:
                 for item in sorted(path.iterdir()):
                     if item.is_dir():
                         results.append(f"[DIR]  {item.name}/")
                     else:
-                        size = item.stat().st_size
-                        results.append(f"[FILE] {item.name} ({size} bytes)")
+                        stat = item.stat()
+                        record_path(str(item), stat)
+                        results.append(f"[FILE] {item.name} ({stat.st_size} bytes)")
 
             return f"Directory: {directory_path}\n\n" + "\n".join(results)
         except Exception as e:
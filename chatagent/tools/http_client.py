@@ -0,0 +1,560 @@
+"""Pooled HTTP clients and an on-disk HTTP response cache for the web tools."""
+
+import email.utils
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+# Default cache location, size cap and freshness for responses without caching headers
+DEFAULT_CACHE_MAX_BYTES = 100 * 1024 * 1024
+DEFAULT_CACHE_TTL = 300.0
+
+# Connection pool limits of the shared clients
+POOL_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60.0)
+
+# Responses with these status codes are stored
+CACHEABLE_STATUS = {200, 203, 300, 301, 308, 404, 410}
+
+
+def http2_available() -> bool:
+    """Check whether HTTP/2 support (the optional ``h2`` package) is installed."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def default_cache_dir() -> Path:
+    """Directory of the HTTP cache (CHATAGENT_HTTP_CACHE_DIR or ~/.cache/chatagent/http)."""
+    configured = os.getenv("CHATAGENT_HTTP_CACHE_DIR")
+    if configured:
+        return Path(configured).expanduser()
+    return Path.home() / ".cache" / "chatagent" / "http"
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """Parse a Cache-Control header into a directive -> argument mapping.
+
+    Args:
+        value: Header value
+
+    Returns:
+        Lower-cased directives; directives without an argument map to None
+    """
+    directives: Dict[str, Optional[str]] = {}
+    for part in (value or "").split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') or None
+    return directives
+
+
+def _parse_date(value: Optional[str]) -> Optional[float]:
+    """Parse an HTTP date into a timestamp."""
+    if not value:
+        return None
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+class CacheEntry:
+    """A stored response: status, headers, body and when it was stored."""
+
+    def __init__(self, meta: Dict[str, Any], body: bytes):
+        """Initialize entry.
+
+        Args:
+            meta: Stored metadata (url, status, headers, stored_at, vary)
+            body: Raw (still content-encoded) response body
+        """
+        self.meta = meta
+        self.body = body
+
+    @property
+    def headers(self) -> List[Tuple[str, str]]:
+        """Stored response headers."""
+        return [tuple(pair) for pair in self.meta["headers"]]
+
+    def header(self, name: str) -> Optional[str]:
+        """Get a stored header value (case-insensitive)."""
+        name = name.lower()
+        for key, value in self.meta["headers"]:
+            if key.lower() == name:
+                return value
+        return None
+
+    def freshness_lifetime(self, default_ttl: float) -> float:
+        """Seconds the response may be served without revalidation.
+
+        Uses ``max-age``, then ``Expires``, falling back to ``default_ttl``.
+        """
+        directives = parse_cache_control(self.header("cache-control"))
+        if "no-cache" in directives:
+            return 0.0
+        if directives.get("max-age") is not None:
+            try:
+                return float(directives["max-age"])
+            except ValueError:
+                return 0.0
+        expires = _parse_date(self.header("expires"))
+        if expires is not None:
+            date = _parse_date(self.header("date")) or self.meta["stored_at"]
+            return max(0.0, expires - date)
+        return default_ttl
+
+    def age(self) -> float:
+        """Current age of the response in seconds."""
+        try:
+            initial = float(self.header("age") or 0)
+        except ValueError:
+            initial = 0.0
+        return initial + time.time() - self.meta["stored_at"]
+
+    def is_fresh(self, default_ttl: float) -> bool:
+        """Whether the entry can be served without contacting the server."""
+        return self.age() < self.freshness_lifetime(default_ttl)
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers that revalidate this entry."""
+        headers = {}
+        if self.header("etag"):
+            headers["If-None-Match"] = self.header("etag")
+        if self.header("last-modified"):
+            headers["If-Modified-Since"] = self.header("last-modified")
+        return headers
+
+
+class HTTPCache:
+    """On-disk cache of GET responses keyed by URL.
+
+    Every entry is a ``<key>.json`` metadata file plus a ``<key>.body`` file.
+    Responses are stored unless marked ``no-store``; a stale entry with an
+    ETag or Last-Modified is revalidated with a conditional request, and a
+    ``304 Not Modified`` refreshes it. Once the cache grows past ``max_bytes``
+    the least recently used entries are removed.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        ttl: float = DEFAULT_CACHE_TTL,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+    ):
+        """Initialize cache.
+
+        Args:
+            directory: Cache directory (defaults to ``default_cache_dir()``)
+            ttl: Freshness lifetime in seconds for responses that do not specify one
+            max_bytes: Size cap of the cache on disk
+        """
+        self.directory = Path(directory) if directory else default_cache_dir()
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional["HTTPCache"]:
+        """Create a cache configured by environment variables.
+
+        CHATAGENT_HTTP_CACHE ("off" disables the cache), CHATAGENT_HTTP_CACHE_DIR,
+        CHATAGENT_HTTP_CACHE_TTL (seconds) and CHATAGENT_HTTP_CACHE_MB.
+
+        Returns:
+            Cache, or None if disabled
+        """
+        if os.getenv("CHATAGENT_HTTP_CACHE", "on").strip().lower() in ("off", "0", "false", "no"):
+            return None
+        ttl = float(os.getenv("CHATAGENT_HTTP_CACHE_TTL", DEFAULT_CACHE_TTL))
+        configured_mb = os.getenv("CHATAGENT_HTTP_CACHE_MB")
+        max_bytes = int(float(configured_mb) * 1024 * 1024) if configured_mb else DEFAULT_CACHE_MAX_BYTES
+        return cls(ttl=ttl, max_bytes=max_bytes)
+
+    def _key(self, url: str) -> str:
+        """File name stem of a URL's entry."""
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+
+    def get(self, request: httpx.Request) -> Optional[CacheEntry]:
+        """Load the stored response for a request, if any.
+
+        Args:
+            request: Outgoing request
+
+        Returns:
+            Entry, or None if missing, unreadable or the Vary headers differ
+        """
+        stem = self.directory / self._key(str(request.url))
+        try:
+            meta = json.loads(stem.with_suffix(".json").read_text(encoding="utf-8"))
+            body = stem.with_suffix(".body").read_bytes()
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != str(request.url) or len(body) != meta.get("size"):
+            return None
+        for name, value in meta.get("vary", {}).items():
+            if request.headers.get(name) != value:
+                return None
+
+        # Touch the entry so eviction removes least recently used ones first
+        try:
+            os.utime(stem.with_suffix(".json"))
+        except OSError:
+            pass
+        return CacheEntry(meta, body)
+
+    def storable(self, request: httpx.Request, response: httpx.Response) -> bool:
+        """Whether a response may be stored."""
+        if request.method != "GET" or response.status_code not in CACHEABLE_STATUS:
+            return False
+        if "no-store" in parse_cache_control(request.headers.get("cache-control")):
+            return False
+        if "no-store" in parse_cache_control(response.headers.get("cache-control")):
+            return False
+        return response.headers.get("vary", "").strip() != "*"
+
+    def put(self, request: httpx.Request, status_code: int, headers: List[Tuple[str, str]], body: bytes) -> None:
+        """Store a response.
+
+        Args:
+            request: Request the response answers
+            status_code: Response status
+            headers: Response headers
+            body: Raw response body
+        """
+        vary = {}
+        for header in headers:
+            if header[0].lower() == "vary":
+                for name in header[1].split(","):
+                    name = name.strip().lower()
+                    if name:
+                        vary[name] = request.headers.get(name)
+
+        meta = {
+            "url": str(request.url),
+            "status": status_code,
+            "headers": [list(pair) for pair in headers],
+            "stored_at": time.time(),
+            "size": len(body),
+            "vary": vary,
+        }
+        self._write(self._key(str(request.url)), meta, body)
+
+    def refresh(self, entry: CacheEntry, not_modified: httpx.Response) -> None:
+        """Update an entry after the server answered ``304 Not Modified``.
+
+        Args:
+            entry: Revalidated entry
+            not_modified: The 304 response, whose headers replace stored ones
+        """
+        updated = {key.lower() for key in not_modified.headers.keys()} - {"content-length", "transfer-encoding"}
+        headers = [pair for pair in entry.meta["headers"] if pair[0].lower() not in updated]
+        headers += [[key, value] for key, value in not_modified.headers.multi_items() if key.lower() in updated]
+        entry.meta["headers"] = headers
+        entry.meta["stored_at"] = time.time()
+        self._write(self._key(entry.meta["url"]), entry.meta, None)
+
+    def _write(self, key: str, meta: Dict[str, Any], body: Optional[bytes]) -> None:
+        """Write an entry atomically and enforce the size cap."""
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            stem = self.directory / key
+            if body is not None:
+                temp = stem.with_suffix(f".body.{os.getpid()}.tmp")
+                temp.write_bytes(body)
+                os.replace(temp, stem.with_suffix(".body"))
+            temp = stem.with_suffix(f".json.{os.getpid()}.tmp")
+            temp.write_text(json.dumps(meta), encoding="utf-8")
+            os.replace(temp, stem.with_suffix(".json"))
+            self._evict()
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache fits its cap."""
+        entries = []
+        total = 0
+        for meta_path in self.directory.glob("*.json"):
+            body_path = meta_path.with_suffix(".body")
+            try:
+                size = meta_path.stat().st_size + body_path.stat().st_size
+                used = meta_path.stat().st_mtime
+            except OSError:
+                continue
+            entries.append((used, size, meta_path, body_path))
+            total += size
+
+        for _, size, meta_path, body_path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            for path in (meta_path, body_path):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            total -= size
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            for path in self.directory.glob("*"):
+                if path.suffix in (".json", ".body"):
+                    path.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit, revalidation and miss counts."""
+        return {"hits": self.hits, "revalidated": self.revalidated, "misses": self.misses}
+
+
+def _cached_response(entry: CacheEntry, request: httpx.Request, state: str) -> httpx.Response:
+    """Build a response from a cache entry."""
+    response = httpx.Response(
+        status_code=entry.meta["status"],
+        headers=entry.headers,
+        content=entry.body,
+        request=request,
+    )
+    response.extensions["chatagent_cache"] = state
+    return response
+
+
+class _CacheLookup:
+    """Cache decisions shared by the sync and async transports."""
+
+    cache: HTTPCache
+
+    def _prepare(self, request: httpx.Request) -> Tuple[Optional[CacheEntry], Optional[httpx.Response]]:
+        """Look up a request.
+
+        Returns:
+            (stale entry being revalidated, response served from cache)
+        """
+        if request.method != "GET":
+            return None, None
+        directives = parse_cache_control(request.headers.get("cache-control"))
+        if "no-store" in directives:
+            return None, None
+
+        entry = self.cache.get(request)
+        if entry is None:
+            self.cache.misses += 1
+            return None, None
+        if "no-cache" not in directives and entry.is_fresh(self.cache.ttl):
+            self.cache.hits += 1
+            return None, _cached_response(entry, request, "hit")
+
+        validators = entry.validators()
+        if not validators:
+            self.cache.misses += 1
+            return None, None
+        for name, value in validators.items():
+            request.headers[name] = value
+        return entry, None
+
+    def _after(self, request: httpx.Request, entry: Optional[CacheEntry], response: httpx.Response) -> Optional[httpx.Response]:
+        """Handle a 304 answer to a revalidation."""
+        if entry is not None and response.status_code == 304:
+            self.cache.revalidated += 1
+            self.cache.refresh(entry, response)
+            return _cached_response(entry, request, "revalidated")
+        if entry is not None:
+            self.cache.misses += 1
+        return None
+
+
+class _TeeStream(httpx.SyncByteStream):
+    """Pass a response body through, storing it once it was read completely."""
+
+    def __init__(self, stream: httpx.SyncByteStream, on_complete, limit: int):
+        self._stream = stream
+        self._on_complete = on_complete
+        self._limit = limit
+        self._chunks: Optional[List[bytes]] = []
+        self._size = 0
+
+    def __iter__(self):
+        for chunk in self._stream:
+            if self._chunks is not None:
+                self._size += len(chunk)
+                if self._size > self._limit:
+                    self._chunks = None
+                else:
+                    self._chunks.append(chunk)
+            yield chunk
+        if self._chunks is not None:
+            self._on_complete(b"".join(self._chunks))
+            self._chunks = None
+
+    def close(self) -> None:
+        self._chunks = None
+        self._stream.close()
+
+
+class _AsyncTeeStream(httpx.AsyncByteStream):
+    """Async version of ``_TeeStream``."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_complete, limit: int):
+        self._stream = stream
+        self._on_complete = on_complete
+        self._limit = limit
+        self._chunks: Optional[List[bytes]] = []
+        self._size = 0
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            if self._chunks is not None:
+                self._size += len(chunk)
+                if self._size > self._limit:
+                    self._chunks = None
+                else:
+                    self._chunks.append(chunk)
+            yield chunk
+        if self._chunks is not None:
+            self._on_complete(b"".join(self._chunks))
+            self._chunks = None
+
+    async def aclose(self) -> None:
+        self._chunks = None
+        await self._stream.aclose()
+
+
+class CachingTransport(httpx.BaseTransport, _CacheLookup):
+    """Transport that serves GET requests from an ``HTTPCache`` when it can.
+
+    Bodies are stored as they are streamed to the caller, so a response that
+    is abandoned half-way (or exceeds an eighth of the cache) is not stored.
+    """
+
+    def __init__(self, cache: HTTPCache, transport: Optional[httpx.BaseTransport] = None, **kwargs):
+        """Initialize transport.
+
+        Args:
+            cache: Response cache
+            transport: Transport performing the requests (an ``HTTPTransport``
+                created with ``kwargs`` if omitted)
+            **kwargs: Options for the default ``HTTPTransport``
+        """
+        self.cache = cache
+        self.transport = transport or httpx.HTTPTransport(**kwargs)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        entry, cached = self._prepare(request)
+        if cached is not None:
+            return cached
+
+        response = self.transport.handle_request(request)
+        revalidated = self._after(request, entry, response)
+        if revalidated is not None:
+            response.close()
+            return revalidated
+
+        if self.cache.storable(request, response):
+            status, headers = response.status_code, response.headers.multi_items()
+            response.stream = _TeeStream(
+                response.stream,
+                lambda body: self.cache.put(request, status, headers, body),
+                self.cache.max_bytes // 8,
+            )
+        return response
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class AsyncCachingTransport(httpx.AsyncBaseTransport, _CacheLookup):
+    """Async version of ``CachingTransport``."""
+
+    def __init__(self, cache: HTTPCache, transport: Optional[httpx.AsyncBaseTransport] = None, **kwargs):
+        """Initialize transport.
+
+        Args:
+            cache: Response cache
+            transport: Transport performing the requests (an
+                ``AsyncHTTPTransport`` created with ``kwargs`` if omitted)
+            **kwargs: Options for the default ``AsyncHTTPTransport``
+        """
+        self.cache = cache
+        self.transport = transport or httpx.AsyncHTTPTransport(**kwargs)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        entry, cached = self._prepare(request)
+        if cached is not None:
+            return cached
+
+        response = await self.transport.handle_async_request(request)
+        revalidated = self._after(request, entry, response)
+        if revalidated is not None:
+            await response.aclose()
+            return revalidated
+
+        if self.cache.storable(request, response):
+            status, headers = response.status_code, response.headers.multi_items()
+            response.stream = _AsyncTeeStream(
+                response.stream,
+                lambda body: self.cache.put(request, status, headers, body),
+                self.cache.max_bytes // 8,
+            )
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+def create_http_client(cache: Optional[HTTPCache] = None, timeout: float = 30.0) -> httpx.Client:
+    """Create a pooled client for the web tools.
+
+    HTTP/2 is used when the optional ``h2`` package is installed.
+
+    Args:
+        cache: Response cache (None to disable caching)
+        timeout: Default timeout in seconds
+
+    Returns:
+        Client that follows redirects
+    """
+    options = {"http2": http2_available(), "limits": POOL_LIMITS}
+    transport = CachingTransport(cache, **options) if cache else httpx.HTTPTransport(**options)
+    return httpx.Client(transport=transport, follow_redirects=True, timeout=timeout)
+
+
+def create_async_http_client(cache: Optional[HTTPCache] = None, timeout: float = 30.0) -> httpx.AsyncClient:
+    """Create a pooled async client for the web tools.
+
+    Args:
+        cache: Response cache (None to disable caching)
+        timeout: Default timeout in seconds
+
+    Returns:
+        Async client that follows redirects
+    """
+    options = {"http2": http2_available(), "limits": POOL_LIMITS}
+    transport = AsyncCachingTransport(cache, **options) if cache else httpx.AsyncHTTPTransport(**options)
+    return httpx.AsyncClient(transport=transport, follow_redirects=True, timeout=timeout)
+
+
+_http_client: Optional[httpx.Client] = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client() -> httpx.Client:
+    """Get the process-wide pooled client used by the web tools.
+
+    It is created on first use, with the cache configured by
+    ``HTTPCache.from_env()``.
+
+    Returns:
+        Shared client
+    """
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            _http_client = create_http_client(HTTPCache.from_env())
+        return _http_client
@@ -0,0 +1,103 @@
+"""Line-offset index for serving ranged reads of large files."""
+
+import mmap
+import os
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Tuple
+
+# Number of line indexes kept in memory
+MAX_CACHED_INDEXES = 16
+
+
+class LineIndex:
+    """Byte offset of the start of every line in a file.
+
+    Built once by scanning the file through ``mmap``; afterwards any line range
+    can be read with a single seek, however large the file.
+    """
+
+    def __init__(self, path: str):
+        """Build the index.
+
+        Args:
+            path: File to index
+        """
+        self.path = path
+        st = os.stat(path)
+        self.mtime_ns = st.st_mtime_ns
+        self.size = st.st_size
+
+        # offsets[i] is where line i (0-based) starts; the last entry is the file size
+        self.offsets = array("Q", [0])
+        if self.size:
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                find = mm.find
+                append = self.offsets.append
+                position = find(b"\n")
+                while position != -1:
+                    append(position + 1)
+                    position = find(b"\n", position + 1)
+            if self.offsets[-1] != self.size:
+                self.offsets.append(self.size)
+
+    @property
+    def line_count(self) -> int:
+        """Number of lines in the file."""
+        return len(self.offsets) - 1
+
+    def is_current(self, st: os.stat_result) -> bool:
+        """Check whether the index still describes the file on disk."""
+        return st.st_mtime_ns == self.mtime_ns and st.st_size == self.size
+
+    def byte_range(self, start: int, end: int) -> Tuple[int, int]:
+        """Byte range of lines ``start`` to ``end`` (0-based, end exclusive)."""
+        return self.offsets[start], self.offsets[end]
+
+    def read_bytes(self, start: int, end: int) -> bytes:
+        """Read a byte range of the file.
+
+        Args:
+            start: First byte
+            end: Byte after the last one
+
+        Returns:
+            File contents in the range
+        """
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            return f.read(end - start)
+
+
+_cache: "OrderedDict[str, LineIndex]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def get_line_index(path: str) -> LineIndex:
+    """Get the line index of a file, rebuilding it if the file changed.
+
+    Indexes are cached per path (least recently used first out) and validated
+    against the file's mtime and size on every call.
+
+    Args:
+        path: File path
+
+    Returns:
+        Up-to-date line index
+    """
+    key = os.path.abspath(path)
+    st = os.stat(key)
+    with _cache_lock:
+        index = _cache.get(key)
+        if index is not None and index.is_current(st):
+            _cache.move_to_end(key)
+            return index
+
+    index = LineIndex(key)
+    with _cache_lock:
+        _cache[key] = index
+        _cache.move_to_end(key)
+        while len(_cache) > MAX_CACHED_INDEXES:
+            _cache.popitem(last=False)
+    return index
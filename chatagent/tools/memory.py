@@ -1,29 +1,28 @@
 """Memory tool for saving important information."""
 
-import json
 from pathlib import Path
-from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
 from .base import Tool
+from .memory_store import open_memory_store
 
 
 class SaveMemoryTool(Tool):
-    """Tool for saving important information to memory."""
+    """Tool for saving important information to memory.
 
-    def __init__(self, memory_file: str = ".chatagent_memory.json"):
+    Memories are stored in a SQLite database; memories from an older
+    ``.chatagent_memory.json`` next to it are imported on first use. Passing a
+    ``.json`` path keeps using the JSON file instead.
+    """
+
+    def __init__(self, memory_file: str = ".chatagent_memory.db"):
         """Initialize memory tool.
 
         Args:
-            memory_file: Path to the memory file
+            memory_file: Path to the memory database (or a legacy ``.json`` file)
         """
         self.memory_file = Path(memory_file).expanduser()
-        self._ensure_memory_file()
-
-    def _ensure_memory_file(self):
-        """Ensure memory file exists."""
-        if not self.memory_file.exists():
-            self.memory_file.write_text(json.dumps({"memories": []}, indent=2))
+        self.store = open_memory_store(self.memory_file)
 
     @property
     def name(self) -> str:
@@ -55,39 +54,14 @@ class SaveMemoryTool(Tool):
             "required": ["key", "value"],
         }
 
+    def modified_paths(self, **kwargs) -> Optional[List[str]]:
+        """Saving a memory only writes the memory file."""
+        return [str(self.memory_file)]
+
     def execute(self, key: str, value: str, tags: list = None) -> str:
         """Save information to memory."""
         try:
-            # Load existing memories
-            with open(self.memory_file, "r") as f:
-                data = json.load(f)
-
-            memories = data.get("memories", [])
-
-            # Create new memory entry
-            memory = {
-                "key": key,
-                "value": value,
-                "timestamp": datetime.now().isoformat(),
-                "tags": tags or [],
-            }
-
-            # Update or append
-            updated = False
-            for i, m in enumerate(memories):
-                if m.get("key") == key:
-                    memories[i] = memory
-                    updated = True
-                    break
-
-            if not updated:
-                memories.append(memory)
-
-            # Save back to file
-            data["memories"] = memories
-            with open(self.memory_file, "w") as f:
-                json.dump(data, f, indent=2)
-
+            updated = self.store.save(key, value, tags)
             action = "Updated" if updated else "Saved"
             return f"{action} memory: {key}"
 
@@ -101,29 +75,20 @@ class SaveMemoryTool(Tool):
             List of memory entries
         """
         try:
-            with open(self.memory_file, "r") as f:
-                data = json.load(f)
-            return data.get("memories", [])
+            return self.store.all()
         except Exception:
             return []
 
-    def search_memories(self, query: str) -> list:
-        """Search memories by key or tags.
+    def search_memories(self, query: str) -> List[Dict[str, Any]]:
+        """Search memories by key, value or tags.
 
         Args:
             query: Search query
 
         Returns:
-            List of matching memories
+            List of matching memories, best match first
         """
-        memories = self.get_all_memories()
-        query_lower = query.lower()
-
-        results = []
-        for memory in memories:
-            if query_lower in memory.get("key", "").lower():
-                results.append(memory)
-            elif any(query_lower in tag.lower() for tag in memory.get("tags", [])):
-                results.append(memory)
-
-        return results
+        try:
+            return self.store.search(query)
+        except Exception:
+            return []
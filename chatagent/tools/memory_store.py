@@ -0,0 +1,293 @@
+"""Storage backends for saved memories."""
+
+import json
+import re
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+SCHEMA_VERSION = 1
+
+# Words of a search query; underscores split words like FTS5's tokenizer does
+_QUERY_WORD = re.compile(r"[^\W_]+")
+
+
+def _memory(key: str, value: str, tags: Optional[List[str]], timestamp: Optional[str] = None) -> Dict[str, Any]:
+    """Build a memory entry."""
+    return {
+        "key": key,
+        "value": value,
+        "timestamp": timestamp or datetime.now().isoformat(),
+        "tags": list(tags or []),
+    }
+
+
+class JSONMemoryStore:
+    """Memories kept in one JSON file, rewritten on every save.
+
+    Only suitable for a handful of memories and a single process; kept for
+    callers that explicitly point the memory tool at a ``.json`` file.
+    """
+
+    def __init__(self, path: Path):
+        """Initialize store.
+
+        Args:
+            path: Path of the JSON file
+        """
+        self.path = Path(path).expanduser()
+        if not self.path.exists():
+            self.path.write_text(json.dumps({"memories": []}, indent=2))
+
+    def save(self, key: str, value: str, tags: Optional[List[str]] = None) -> bool:
+        """Save a memory, replacing any memory with the same key.
+
+        Returns:
+            True if an existing memory was updated
+        """
+        with open(self.path, "r") as f:
+            data = json.load(f)
+        memories = data.get("memories", [])
+        memory = _memory(key, value, tags)
+
+        updated = False
+        for i, m in enumerate(memories):
+            if m.get("key") == key:
+                memories[i] = memory
+                updated = True
+                break
+        if not updated:
+            memories.append(memory)
+
+        data["memories"] = memories
+        with open(self.path, "w") as f:
+            json.dump(data, f, indent=2)
+        return updated
+
+    def all(self) -> List[Dict[str, Any]]:
+        """Get all memories, oldest first."""
+        with open(self.path, "r") as f:
+            return json.load(f).get("memories", [])
+
+    def fingerprint(self) -> Any:
+        """Value that changes whenever memories change."""
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def search(self, query: str) -> List[Dict[str, Any]]:
+        """Find memories whose key or tags contain ``query``."""
+        query_lower = query.lower()
+        return [
+            memory for memory in self.all()
+            if query_lower in memory.get("key", "").lower()
+            or any(query_lower in tag.lower() for tag in memory.get("tags", []))
+        ]
+
+
+class SQLiteMemoryStore:
+    """Memories kept in a SQLite database.
+
+    The database runs in WAL mode, so several chatagent processes can read
+    and save memories at the same time. Keys are unique, saves are single
+    transactional upserts, and an FTS5 table over key, value and tags (kept in
+    sync by triggers) serves ``search``.
+
+    On first use, memories from the legacy JSON file are imported once; the
+    JSON file itself is left untouched.
+    """
+
+    def __init__(self, path: Path, legacy_json: Optional[Path] = None):
+        """Initialize store.
+
+        Args:
+            path: Path of the database
+            legacy_json: JSON memory file to import on first use
+        """
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            self._create_schema(conn)
+            if legacy_json is not None:
+                self._migrate(conn, Path(legacy_json).expanduser())
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database (in autocommit mode; transactions are explicit)."""
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        """Create tables, the FTS index and its triggers."""
+        conn.executescript(
+            f"""
+            BEGIN IMMEDIATE;
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS memories (
+                id INTEGER PRIMARY KEY,
+                key TEXT NOT NULL UNIQUE,
+                value TEXT NOT NULL,
+                tags TEXT NOT NULL DEFAULT '[]',
+                timestamp TEXT NOT NULL
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts USING fts5(
+                key, value, tags, content='memories', content_rowid='id'
+            );
+            CREATE TRIGGER IF NOT EXISTS memories_ai AFTER INSERT ON memories BEGIN
+                INSERT INTO memories_fts(rowid, key, value, tags) VALUES (new.id, new.key, new.value, new.tags);
+            END;
+            CREATE TRIGGER IF NOT EXISTS memories_ad AFTER DELETE ON memories BEGIN
+                INSERT INTO memories_fts(memories_fts, rowid, key, value, tags)
+                VALUES ('delete', old.id, old.key, old.value, old.tags);
+            END;
+            CREATE TRIGGER IF NOT EXISTS memories_au AFTER UPDATE ON memories BEGIN
+                INSERT INTO memories_fts(memories_fts, rowid, key, value, tags)
+                VALUES ('delete', old.id, old.key, old.value, old.tags);
+                INSERT INTO memories_fts(rowid, key, value, tags) VALUES (new.id, new.key, new.value, new.tags);
+            END;
+            INSERT OR IGNORE INTO meta VALUES ('version', '{SCHEMA_VERSION}');
+            COMMIT;
+            """
+        )
+
+    def _migrate(self, conn: sqlite3.Connection, legacy_json: Path) -> None:
+        """Import the legacy JSON file once; memories already in the database win."""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("SELECT 1 FROM meta WHERE key = 'json_migrated'").fetchone() is None:
+                memories = []
+                if legacy_json.exists():
+                    with open(legacy_json, "r") as f:
+                        memories = json.load(f).get("memories", [])
+                conn.executemany(
+                    "INSERT INTO memories (key, value, tags, timestamp) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(key) DO NOTHING",
+                    [
+                        (
+                            m["key"],
+                            str(m.get("value", "")),
+                            json.dumps(m.get("tags") or []),
+                            m.get("timestamp") or datetime.now().isoformat(),
+                        )
+                        for m in memories
+                        if m.get("key")
+                    ],
+                )
+                conn.execute(
+                    "INSERT INTO meta VALUES ('json_migrated', ?)",
+                    (f"{legacy_json} ({len(memories)} memories)",),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def save(self, key: str, value: str, tags: Optional[List[str]] = None) -> bool:
+        """Save a memory, replacing any memory with the same key.
+
+        Returns:
+            True if an existing memory was updated
+        """
+        memory = _memory(key, value, tags)
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                updated = conn.execute("SELECT 1 FROM memories WHERE key = ?", (key,)).fetchone() is not None
+                conn.execute(
+                    "INSERT INTO memories (key, value, tags, timestamp) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value, tags = excluded.tags, "
+                    "timestamp = excluded.timestamp",
+                    (key, value, json.dumps(memory["tags"]), memory["timestamp"]),
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+        return updated
+
+    def _rows(self, sql: str, params: tuple = ()) -> List[Dict[str, Any]]:
+        """Run a query returning (key, value, tags, timestamp) rows as memories."""
+        conn = self._connect()
+        try:
+            rows = conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+        return [_memory(key, value, json.loads(tags), timestamp) for key, value, tags, timestamp in rows]
+
+    def all(self) -> List[Dict[str, Any]]:
+        """Get all memories, oldest first."""
+        return self._rows("SELECT key, value, tags, timestamp FROM memories ORDER BY id")
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Find memories whose key, value or tags contain every word of ``query``.
+
+        Words match as prefixes ("pref" finds "user_preference").
+
+        Args:
+            query: Search words
+            limit: Maximum number of results
+
+        Returns:
+            Matching memories, best match first
+        """
+        words = _QUERY_WORD.findall(query)
+        if not words:
+            return []
+        match = " AND ".join('"' + word.replace('"', '""') + '"*' for word in words)
+        return self._rows(
+            "SELECT m.key, m.value, m.tags, m.timestamp FROM memories_fts "
+            "JOIN memories m ON m.id = memories_fts.rowid "
+            "WHERE memories_fts MATCH ? ORDER BY bm25(memories_fts) LIMIT ?",
+            (match, -1 if limit is None else limit),
+        )
+
+    def fingerprint(self) -> Any:
+        """Value that changes whenever memories change.
+
+        Saves always write a new timestamp, so the row count plus the newest
+        id and timestamp catch inserts, updates and deletes.
+        """
+        conn = self._connect()
+        try:
+            return conn.execute(
+                "SELECT COUNT(*), COALESCE(MAX(id), 0), COALESCE(MAX(timestamp), '') FROM memories"
+            ).fetchone()
+        finally:
+            conn.close()
+
+    def count(self) -> int:
+        """Number of saved memories."""
+        conn = self._connect()
+        try:
+            return conn.execute("SELECT COUNT(*) FROM memories").fetchone()[0]
+        finally:
+            conn.close()
+
+
+def open_memory_store(path: Path) -> Any:
+    """Open the memory store at ``path``.
+
+    A ``.json`` path opens the legacy JSON store. Any other path opens a
+    SQLite store, which imports the JSON file next to it (same name with a
+    ``.json`` suffix) on first use.
+
+    Args:
+        path: Path of the memory file
+
+    Returns:
+        JSONMemoryStore or SQLiteMemoryStore
+    """
+    path = Path(path).expanduser()
+    if path.suffix == ".json":
+        return JSONMemoryStore(path)
+    return SQLiteMemoryStore(path, legacy_json=path.with_suffix(".json"))
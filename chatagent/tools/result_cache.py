@@ -0,0 +1,214 @@
+"""Session cache of tool results for repeated identical tool calls."""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+# Entries kept per session (least recently used ones are evicted)
+DEFAULT_MAX_ENTRIES = 256
+
+# Files and directories read by the tool call running in this context:
+# absolute path -> (mtime_ns, size) when first read
+_dependencies: ContextVar[Optional[Dict[str, Tuple[int, int]]]] = ContextVar("tool_dependencies", default=None)
+
+# Tool calls so far that may have modified files (see ``record_modification``)
+_modifications = 0
+_modifications_lock = threading.Lock()
+
+
+def record_path(path: str, st: Optional[os.stat_result] = None) -> None:
+    """Note that the running tool call's result depends on a file or directory.
+
+    Called by the file tools (and the directory walker) for what they read. A
+    no-op unless a cacheable tool call is being recorded.
+
+    Args:
+        path: File or directory path
+        st: Its stat result, if already known
+    """
+    dependencies = _dependencies.get()
+    if dependencies is None:
+        return
+    key = os.path.abspath(path)
+    if key in dependencies:
+        return
+    try:
+        st = st or os.stat(key)
+    except OSError:
+        return
+    dependencies[key] = (st.st_mtime_ns, st.st_size)
+
+
+def record_modification() -> None:
+    """Note that a tool call may have modified files.
+
+    Lets lazily refreshed indexes (such as the code index behind
+    codebase_investigator) know they have to look at the file system again.
+    """
+    global _modifications
+    with _modifications_lock:
+        _modifications += 1
+
+
+def modification_count() -> int:
+    """Get how many tool calls so far may have modified files."""
+    return _modifications
+
+
+@contextmanager
+def recording() -> Iterator[Dict[str, Tuple[int, int]]]:
+    """Record the files and directories read within the block.
+
+    Yields:
+        Recorded dependencies, filled in as they are read
+    """
+    dependencies: Dict[str, Tuple[int, int]] = {}
+    token = _dependencies.set(dependencies)
+    try:
+        yield dependencies
+    finally:
+        _dependencies.reset(token)
+
+
+def _ancestors(path: str) -> Iterator[str]:
+    """Yield a path and each of its parent directories."""
+    path = os.path.abspath(path)
+    while True:
+        yield path
+        parent = os.path.dirname(path)
+        if parent == path:
+            return
+        path = parent
+
+
+class ToolResultCache:
+    """Results of cacheable tool calls, keyed by tool name and arguments.
+
+    A tool opts in with ``Tool.cache_ttl``. An entry is served again for an
+    identical call (same arguments in any order, same working directory) while
+    its TTL has not expired and every file and directory the original call
+    read still has the same mtime and size. Writes and shell commands drop
+    the entries they may affect through ``invalidate``. Thread-safe, since
+    concurrency-safe tool calls run on a thread pool.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """Initialize cache.
+
+        Args:
+            max_entries: Maximum number of cached results
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # key -> (expires at (monotonic), dependencies, result)
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Tuple[int, int]], str]]" = OrderedDict()
+
+    @staticmethod
+    def key(name: str, arguments: Dict[str, Any]) -> str:
+        """Build the cache key of a call.
+
+        Args:
+            name: Tool name
+            arguments: Parsed tool arguments
+
+        Returns:
+            Key identifying the call
+        """
+        normalized = {k: v for k, v in arguments.items() if v is not None}
+        return json.dumps([name, os.getcwd(), normalized], sort_keys=True, ensure_ascii=False, default=str)
+
+    def get(self, name: str, arguments: Dict[str, Any]) -> Optional[str]:
+        """Get the cached result of a call if it is still valid.
+
+        Args:
+            name: Tool name
+            arguments: Parsed tool arguments
+
+        Returns:
+            Cached result, or None
+        """
+        key = self.key(name, arguments)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, dependencies, result = entry
+                if time.monotonic() < expires and self._unchanged(dependencies):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return result
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, name: str, arguments: Dict[str, Any], ttl: float, dependencies: Dict[str, Tuple[int, int]], result: str) -> None:
+        """Cache the result of a call (error results are not cached).
+
+        Args:
+            name: Tool name
+            arguments: Parsed tool arguments
+            ttl: Seconds the result stays valid
+            dependencies: Files and directories the call read (see ``recording``)
+            result: Tool result
+        """
+        if result.startswith("Error"):
+            return
+        key = self.key(name, arguments)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, dict(dependencies), result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, paths: Optional[Iterable[str]] = None) -> int:
+        """Drop entries that a change to the file system may have affected.
+
+        Args:
+            paths: Files that were modified; entries that read one of them or
+                   one of their parent directories are dropped. None drops
+                   every entry that read the file system.
+
+        Returns:
+            Number of entries dropped
+        """
+        touched = None if paths is None else {ancestor for path in paths for ancestor in _ancestors(path)}
+        with self._lock:
+            stale = [
+                key for key, (_, dependencies, _) in self._entries.items()
+                if dependencies and (touched is None or touched.intersection(dependencies))
+            ]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache statistics.
+
+        Returns:
+            Dictionary with hits, misses and entries
+        """
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+    @staticmethod
+    def _unchanged(dependencies: Dict[str, Tuple[int, int]]) -> bool:
+        """Check that recorded files and directories still have the same mtime and size."""
+        for path, (mtime_ns, size) in dependencies.items():
+            try:
+                st = os.stat(path)
+            except OSError:
+                return False
+            if st.st_mtime_ns != mtime_ns or st.st_size != size:
+                return False
+        return True
+
@@ -1,11 +1,69 @@
 """Search tools."""
 
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict
-import fnmatch
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import io
+import os
 import re
 
-from .base import Tool
+from .base import CACHE_UNTIL_CHANGED, Tool
+from .file_cache import get_file_cache
+from .result_cache import record_path
+from .search_index import find_index, required_literals
+from .walker import BINARY_SNIFF_BYTES, glob_depth, matches_glob, walk_files
+
+
+# Maximum number of matches returned by search_file_content
+MAX_RESULTS = 100
+
+
+def _search_file(path: str, matcher: Callable[[str], bool], limit: int) -> Tuple[List[Tuple[int, str]], int]:
+    """Search one file line by line.
+
+    Files small enough for the shared content cache are read through it; larger
+    ones are streamed from disk. Binary files (NUL bytes in the header) and
+    files that are not valid UTF-8 are skipped.
+
+    Args:
+        path: File to search
+        matcher: Returns True for matching lines
+        limit: Maximum number of matching lines to keep
+
+    Returns:
+        (kept (line number, line) pairs, total number of matching lines)
+    """
+    matches: List[Tuple[int, str]] = []
+    count = 0
+    cache = get_file_cache()
+    try:
+        if cache.cacheable(os.stat(path).st_size):
+            text = cache.read_text(path)
+            if "\0" in text[:BINARY_SNIFF_BYTES]:
+                return [], 0
+            lines: Iterator[str] = io.StringIO(text)
+            for line_num, line in enumerate(lines, 1):
+                if matcher(line):
+                    count += 1
+                    if len(matches) < limit:
+                        matches.append((line_num, line.rstrip()))
+            return matches, count
+
+        with open(path, "rb") as raw:
+            if b"\0" in raw.read(BINARY_SNIFF_BYTES):
+                return [], 0
+            raw.seek(0)
+            with io.TextIOWrapper(raw, encoding="utf-8") as f:
+                for line_num, line in enumerate(f, 1):
+                    if matcher(line):
+                        count += 1
+                        if len(matches) < limit:
+                            matches.append((line_num, line.rstrip()))
+    except (UnicodeDecodeError, OSError):
+        # Skip binary files or files we can't read
+        pass
+    return matches, count
 
 
 class FindFilesTool(Tool):
@@ -37,6 +95,16 @@ class FindFilesTool(Tool):
             "required": ["pattern"],
         }
 
+    @property
+    def concurrency_safe(self) -> bool:
+        """Finding files has no side effects."""
+        return True
+
+    @property
+    def cache_ttl(self) -> Optional[float]:
+        """Matches stay valid until a walked directory changes."""
+        return CACHE_UNTIL_CHANGED
+
     def execute(self, pattern: str, directory: str = ".") -> str:
         """Find files matching pattern."""
         try:
@@ -44,17 +112,12 @@ class FindFilesTool(Tool):
             if not path.exists():
                 return f"Error: Directory {directory} does not exist"
 
-            matches = []
-            if "**" in pattern:
-                # Recursive search
-                for item in path.rglob(pattern.replace("**/", "")):
-                    if item.is_file():
-                        matches.append(str(item.relative_to(path)))
-            else:
-                # Non-recursive search
-                for item in path.glob(pattern):
-                    if item.is_file():
-                        matches.append(str(item.relative_to(path)))
+            # '**' patterns search recursively, others only as deep as the pattern
+            matches = [
+                rel_path
+                for rel_path, _ in walk_files(path, max_depth=glob_depth(pattern))
+                if matches_glob(rel_path, pattern)
+            ]
 
             if not matches:
                 return f"No files found matching pattern: {pattern}"
@@ -65,7 +128,35 @@ class FindFilesTool(Tool):
 
 
 class SearchTextTool(Tool):
-    """Tool for searching text content in files."""
+    """Tool for searching text content in files.
+
+    Files are streamed from the shared walker (which skips ignored files) and
+    searched on a thread pool; the search stops as soon as ``max_results``
+    matches are found and estimates the total from the files scanned so far.
+    If a trigram index has been built for the searched directory (or one of its
+    parents, see ``chatagent index build``), it is refreshed incrementally and
+    used to pick the candidate files instead of walking the tree.
+    """
+
+    def __init__(
+        self,
+        use_index: Optional[bool] = None,
+        max_results: int = MAX_RESULTS,
+        max_workers: Optional[int] = None,
+    ):
+        """Initialize search tool.
+
+        Args:
+            use_index: Use a prebuilt trigram index when one exists. Defaults to
+                       CHATAGENT_SEARCH_INDEX (anything but "off" enables it).
+            max_results: Stop searching once this many matches are found
+            max_workers: Number of threads searching files (defaults to the CPU count, at most 8)
+        """
+        if use_index is None:
+            use_index = os.getenv("CHATAGENT_SEARCH_INDEX", "auto").strip().lower() not in ("0", "false", "no", "off")
+        self.use_index = use_index
+        self.max_results = max_results
+        self.max_workers = max_workers or min(8, os.cpu_count() or 4)
 
     @property
     def name(self) -> str:
@@ -108,6 +199,16 @@ class SearchTextTool(Tool):
             "required": ["pattern"],
         }
 
+    @property
+    def concurrency_safe(self) -> bool:
+        """Searching files has no side effects."""
+        return True
+
+    @property
+    def cache_ttl(self) -> Optional[float]:
+        """Matches stay valid until a searched file or walked directory changes."""
+        return CACHE_UNTIL_CHANGED
+
     def execute(
         self,
         pattern: str,
@@ -133,46 +234,131 @@ class SearchTextTool(Tool):
                 if not case_sensitive:
                     pattern = pattern.lower()
 
-            # Find files to search
-            files_to_search = []
-            if "**" in file_pattern:
-                files_to_search = list(path.rglob(file_pattern.replace("**/", "")))
+            if regex:
+                matcher = lambda line: compiled_pattern.search(line) is not None
+            elif case_sensitive:
+                matcher = lambda line: pattern in line
             else:
-                files_to_search = list(path.glob(file_pattern))
+                matcher = lambda line: pattern in line.lower()
 
-            results = []
-            for file_path in files_to_search:
-                if not file_path.is_file():
-                    continue
+            # Find files to search: index candidates if available, else walk the tree
+            candidates = self._indexed_candidates(path, pattern, file_pattern, regex)
+            if candidates is None:
+                candidates = (
+                    (rel_path, entry.path)
+                    for rel_path, entry in walk_files(path, max_depth=glob_depth(file_pattern))
+                    if matches_glob(rel_path, file_pattern)
+                )
+            candidates = iter(candidates)
 
-                try:
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        for line_num, line in enumerate(f, 1):
-                            match = False
-                            if regex:
-                                match = compiled_pattern.search(line) is not None
-                            else:
-                                search_line = line if case_sensitive else line.lower()
-                                match = pattern in search_line
-
-                            if match:
-                                rel_path = file_path.relative_to(path)
-                                results.append(f"{rel_path}:{line_num}: {line.rstrip()}")
-                except (UnicodeDecodeError, PermissionError):
-                    # Skip binary files or files we can't read
-                    continue
+            results, total, scanned, unscanned = self._search_files(candidates, matcher)
 
             if not results:
                 return f"No matches found for pattern: {pattern}"
 
-            result_text = f"Found {len(results)} match(es):\n\n"
-            # Limit results to avoid overwhelming output
-            if len(results) > 100:
-                result_text += "\n".join(results[:100])
-                result_text += f"\n\n... and {len(results) - 100} more matches"
-            else:
+            if unscanned is None:
+                result_text = f"Found {total} match(es):\n\n"
                 result_text += "\n".join(results)
+                if total > len(results):
+                    result_text += f"\n\n... and {total - len(results)} more matches"
+                return result_text
 
+            # Stopped early: count the files left (without reading them) to estimate the total
+            files_total = scanned + unscanned + sum(1 for _ in candidates)
+            estimate = round(total * files_total / scanned)
+            result_text = (
+                f"Found {total} match(es) in the first {scanned} of {files_total} file(s); "
+                f"stopped early, about {estimate} match(es) in total:\n\n"
+            )
+            result_text += "\n".join(results)
+            result_text += "\n\n... showing the first matches only; narrow the pattern, file_pattern or directory to see more"
             return result_text
         except Exception as e:
             return f"Error searching files: {str(e)}"
+
+    def _search_files(
+        self,
+        candidates: Iterator[Tuple[str, str]],
+        matcher: Callable[[str], bool],
+    ) -> Tuple[List[str], int, int, Optional[int]]:
+        """Search candidate files on the thread pool, in order, until enough matches are found.
+
+        Args:
+            candidates: (relative path, absolute path) pairs; left partially consumed
+                        if the search stops early
+            matcher: Returns True for matching lines
+
+        Returns:
+            (formatted matches (at most ``max_results``), matching lines found,
+            files scanned, files submitted but not scanned or None if every
+            candidate was scanned)
+        """
+        results: List[str] = []
+        total = 0
+        scanned = 0
+        window = self.max_workers * 4
+        pending: deque = deque()
+
+        def collect(rel_path: str, future: Any) -> None:
+            nonlocal total, scanned
+            matches, count = future.result()
+            scanned += 1
+            total += count
+            for line_num, line in matches[: self.max_results - len(results)]:
+                results.append(f"{rel_path}:{line_num}: {line}")
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="chatagent-search") as pool:
+            try:
+                for rel_path, file_path in candidates:
+                    # Recorded here: the worker threads do not share this context
+                    record_path(file_path)
+                    pending.append((rel_path, pool.submit(_search_file, file_path, matcher, self.max_results)))
+                    if len(pending) >= window:
+                        collect(*pending.popleft())
+                        if len(results) >= self.max_results:
+                            return results, total, scanned, len(pending)
+
+                while pending:
+                    collect(*pending.popleft())
+                    if len(results) >= self.max_results and pending:
+                        return results, total, scanned, len(pending)
+            finally:
+                for _, future in pending:
+                    future.cancel()
+
+        return results, total, scanned, None
+
+    def _indexed_candidates(
+        self,
+        path: Path,
+        pattern: str,
+        file_pattern: str,
+        regex: bool,
+    ) -> Optional[List[Path]]:
+        """Narrow the files to search with the trigram index, if one exists.
+
+        Args:
+            path: Directory being searched
+            pattern: Search pattern
+            file_pattern: File glob pattern
+            regex: Whether ``pattern`` is a regular expression
+
+        Returns:
+            (relative path, absolute path) pairs of candidate files below ``path``,
+            or None to fall back to walking the tree
+        """
+        if not self.use_index:
+            return None
+
+        index = find_index(path)
+        if index is None:
+            return None
+
+        index.update()
+        root = path.expanduser().resolve()
+        candidates = []
+        for file_path in index.candidates(required_literals(pattern, regex), root):
+            rel_path = file_path.relative_to(root).as_posix()
+            if matches_glob(rel_path, file_pattern):
+                candidates.append((rel_path, str(file_path)))
+        return candidates
@@ -0,0 +1,364 @@
+"""Persistent trigram index that narrows the files scanned by search_file_content."""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from re import _parser as sre_parse
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .result_cache import record_path
+from .walker import BINARY_SNIFF_BYTES, walk_files
+
+INDEX_VERSION = 1
+
+# Files larger than this are not indexed; they are always scanned instead
+MAX_INDEXED_FILE_SIZE = 1024 * 1024
+
+# Kinds of indexed files
+KIND_TEXT = "text"
+KIND_BINARY = "binary"
+KIND_LARGE = "large"
+
+# Trigram lookups need at least this many characters
+MIN_LITERAL_LENGTH = 3
+
+# One writer per index file within the process; SQLite locking covers other processes
+_update_locks: Dict[str, threading.Lock] = {}
+_update_locks_guard = threading.Lock()
+
+
+def default_index_dir() -> Path:
+    """Directory holding index databases (CHATAGENT_INDEX_DIR or ~/.cache/chatagent/index)."""
+    configured = os.getenv("CHATAGENT_INDEX_DIR")
+    if configured:
+        return Path(configured).expanduser()
+    return Path.home() / ".cache" / "chatagent" / "index"
+
+
+def index_file_for(root: Path, index_dir: Optional[Path] = None) -> Path:
+    """Get the database path of the index rooted at ``root``.
+
+    Args:
+        root: Resolved root directory
+        index_dir: Directory holding index databases
+
+    Returns:
+        Path of the index database
+    """
+    digest = hashlib.sha1(str(root).encode("utf-8")).hexdigest()[:12]
+    return (index_dir or default_index_dir()) / f"{root.name or 'root'}-{digest}.db"
+
+
+def find_index(directory: Path, index_dir: Optional[Path] = None) -> Optional["TrigramIndex"]:
+    """Find an existing index covering ``directory`` (itself or an ancestor).
+
+    Args:
+        directory: Directory about to be searched
+        index_dir: Directory holding index databases
+
+    Returns:
+        The index, or None if no index has been built for this tree
+    """
+    directory = directory.expanduser().resolve()
+    for root in (directory, *directory.parents):
+        if index_file_for(root, index_dir).exists():
+            return TrigramIndex(root, index_dir=index_dir)
+    return None
+
+
+def _literal_runs(parsed: Any, runs: List[str], current: List[str]) -> None:
+    """Collect literal strings every match of a parsed regex must contain."""
+    for op, av in parsed:
+        if op is sre_parse.LITERAL:
+            current.append(chr(av))
+        elif op is sre_parse.SUBPATTERN:
+            # A plain group matches exactly once: its literals continue the run
+            _literal_runs(av[-1], runs, current)
+        elif op is sre_parse.AT:
+            # Anchors are zero-width and do not break a run
+            continue
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT, sre_parse.POSSESSIVE_REPEAT):
+            runs.append("".join(current))
+            current.clear()
+            low, _, body = av
+            if low >= 1:
+                inner: List[str] = []
+                _literal_runs(body, runs, inner)
+                runs.append("".join(inner))
+        else:
+            runs.append("".join(current))
+            current.clear()
+
+
+def required_literals(pattern: str, regex: bool) -> List[str]:
+    """Extract substrings that every matching line must contain.
+
+    Args:
+        pattern: Search pattern
+        regex: Whether ``pattern`` is a regular expression
+
+    Returns:
+        Literals usable for a trigram lookup (empty if none are long enough)
+    """
+    if not regex:
+        return [pattern] if len(pattern) >= MIN_LITERAL_LENGTH else []
+
+    try:
+        parsed = sre_parse.parse(pattern)
+    except Exception:
+        return []
+
+    runs: List[str] = []
+    current: List[str] = []
+    _literal_runs(parsed, runs, current)
+    runs.append("".join(current))
+    return [run for run in runs if len(run) >= MIN_LITERAL_LENGTH and "\n" not in run]
+
+
+def _read_text(path: str, size: int) -> Tuple[str, Optional[str]]:
+    """Read a file for indexing.
+
+    Returns:
+        (kind, text) where text is only set for indexable text files
+    """
+    if size > MAX_INDEXED_FILE_SIZE:
+        return KIND_LARGE, None
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return KIND_BINARY, None
+    if b"\0" in data[:BINARY_SNIFF_BYTES]:
+        return KIND_BINARY, None
+    try:
+        return KIND_TEXT, data.decode("utf-8")
+    except UnicodeDecodeError:
+        return KIND_BINARY, None
+
+
+class TrigramIndex:
+    """On-disk trigram index of the text files below a root directory.
+
+    File contents are indexed in a contentless SQLite FTS5 table using the
+    ``trigram`` tokenizer, and a ``files`` table records each file's mtime and
+    size. ``update`` only re-reads files whose mtime or size changed. A search
+    looks up the literals its pattern requires and returns the candidate files;
+    the caller still confirms every match against the real file contents.
+
+    Contentless FTS5 rows cannot be deleted without their original text, so rows
+    of changed or removed files are left behind as unreachable "stale" rows and
+    the table is rebuilt once they outnumber the live ones.
+    """
+
+    def __init__(self, root: Path, index_dir: Optional[Path] = None):
+        """Initialize index.
+
+        Args:
+            root: Root directory of the indexed tree
+            index_dir: Directory holding index databases
+        """
+        self.root = Path(root).expanduser().resolve()
+        self.index_file = index_file_for(self.root, index_dir)
+
+    def exists(self) -> bool:
+        """Check whether the index has been built."""
+        return self.index_file.exists()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open (and if needed create) the index database."""
+        self.index_file.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.index_file, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                kind TEXT NOT NULL,
+                doc_id INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS files_doc_id ON files(doc_id);
+            CREATE VIRTUAL TABLE IF NOT EXISTS grams USING fts5(body, content='', tokenize='trigram');
+            """
+        )
+        version = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if version is None:
+            conn.execute("INSERT INTO meta VALUES ('version', ?)", (str(INDEX_VERSION),))
+            conn.execute("INSERT INTO meta VALUES ('root', ?)", (str(self.root),))
+            conn.commit()
+        elif int(version[0]) != INDEX_VERSION:
+            conn.close()
+            self.index_file.unlink()
+            return self._connect()
+        return conn
+
+    def _get_meta(self, conn: sqlite3.Connection, key: str, default: str = "") -> str:
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, conn: sqlite3.Connection, key: str, value: Any) -> None:
+        conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, str(value)))
+
+    def _lock(self) -> threading.Lock:
+        with _update_locks_guard:
+            return _update_locks.setdefault(str(self.index_file), threading.Lock())
+
+    def update(self, progress: Optional[Callable[[int], None]] = None) -> Dict[str, int]:
+        """Bring the index up to date with the files on disk.
+
+        Args:
+            progress: Optional callback receiving the number of files seen so far
+
+        Returns:
+            Counts of added, updated, removed and unchanged files
+        """
+        stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+
+        with self._lock():
+            conn = self._connect()
+            try:
+                known = {
+                    path: (mtime_ns, size, doc_id)
+                    for path, mtime_ns, size, doc_id in conn.execute(
+                        "SELECT path, mtime_ns, size, doc_id FROM files"
+                    )
+                }
+                stale = int(self._get_meta(conn, "stale_rows", "0"))
+
+                seen = 0
+                for rel_path, entry in walk_files(self.root):
+                    st = entry.stat()
+                    record_path(entry.path, st)
+                    seen += 1
+                    if progress and seen % 1000 == 0:
+                        progress(seen)
+
+                    previous = known.pop(rel_path, None)
+                    if previous and previous[0] == st.st_mtime_ns and previous[1] == st.st_size:
+                        stats["unchanged"] += 1
+                        continue
+
+                    if previous and previous[2] is not None:
+                        stale += 1
+                    stats["updated" if previous else "added"] += 1
+                    self._index_file(conn, rel_path, st)
+
+                for rel_path, (_, _, doc_id) in known.items():
+                    conn.execute("DELETE FROM files WHERE path = ?", (rel_path,))
+                    if doc_id is not None:
+                        stale += 1
+                    stats["removed"] += 1
+
+                live = conn.execute("SELECT COUNT(*) FROM files WHERE doc_id IS NOT NULL").fetchone()[0]
+                if stale > max(1000, live):
+                    self._rebuild_grams(conn)
+                    stale = 0
+
+                self._set_meta(conn, "stale_rows", stale)
+                self._set_meta(conn, "updated_at", time.time())
+                conn.commit()
+            finally:
+                conn.close()
+
+        return stats
+
+    def _index_file(self, conn: sqlite3.Connection, rel_path: str, st: os.stat_result) -> None:
+        """(Re)index one file."""
+        kind, text = _read_text(str(self.root / rel_path), st.st_size)
+        doc_id = None
+        if text is not None:
+            doc_id = conn.execute("INSERT INTO grams(body) VALUES (?)", (text,)).lastrowid
+        conn.execute(
+            "INSERT OR REPLACE INTO files (path, mtime_ns, size, kind, doc_id) VALUES (?, ?, ?, ?, ?)",
+            (rel_path, st.st_mtime_ns, st.st_size, kind, doc_id),
+        )
+
+    def _rebuild_grams(self, conn: sqlite3.Connection) -> None:
+        """Recreate the FTS table without stale rows."""
+        conn.execute("DELETE FROM grams")
+        rows = conn.execute("SELECT path FROM files WHERE kind = ?", (KIND_TEXT,)).fetchall()
+        for (rel_path,) in rows:
+            try:
+                st = os.stat(self.root / rel_path)
+            except OSError:
+                conn.execute("DELETE FROM files WHERE path = ?", (rel_path,))
+                continue
+            self._index_file(conn, rel_path, st)
+        conn.execute("INSERT INTO grams(grams) VALUES ('optimize')")
+
+    def candidates(self, literals: List[str], directory: Optional[Path] = None) -> List[Path]:
+        """List files that may contain all ``literals``.
+
+        Files too large to index are always included; binary files never are.
+
+        Args:
+            literals: Substrings every match must contain (case-insensitive lookup)
+            directory: Only return files below this directory
+
+        Returns:
+            Absolute candidate paths, sorted
+        """
+        prefix = ""
+        if directory is not None:
+            relative = Path(directory).expanduser().resolve().relative_to(self.root).as_posix()
+            prefix = "" if relative == "." else relative + "/"
+
+        usable = [lit for lit in literals if len(lit) >= MIN_LITERAL_LENGTH]
+        conn = self._connect()
+        try:
+            if usable:
+                query = " AND ".join('"' + lit.replace('"', '""') + '"' for lit in usable)
+                rows = conn.execute(
+                    "SELECT path FROM files WHERE doc_id IN (SELECT rowid FROM grams WHERE grams MATCH ?) "
+                    "OR kind = ?",
+                    (query, KIND_LARGE),
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT path FROM files WHERE kind IN (?, ?)", (KIND_TEXT, KIND_LARGE)
+                ).fetchall()
+        finally:
+            conn.close()
+
+        return sorted(self.root / path for (path,) in rows if path.startswith(prefix))
+
+    def status(self) -> Dict[str, Any]:
+        """Describe the index.
+
+        Returns:
+            Dictionary with root, index file, file counts by kind, stale rows,
+            database size and last update time (None if never built)
+        """
+        info: Dict[str, Any] = {
+            "root": str(self.root),
+            "index_file": str(self.index_file),
+            "exists": self.exists(),
+        }
+        if not info["exists"]:
+            return info
+
+        conn = self._connect()
+        try:
+            kinds = dict(conn.execute("SELECT kind, COUNT(*) FROM files GROUP BY kind").fetchall())
+            updated_at = self._get_meta(conn, "updated_at")
+            info.update({
+                "files": sum(kinds.values()),
+                "text_files": kinds.get(KIND_TEXT, 0),
+                "binary_files": kinds.get(KIND_BINARY, 0),
+                "large_files": kinds.get(KIND_LARGE, 0),
+                "stale_rows": int(self._get_meta(conn, "stale_rows", "0")),
+                "updated_at": float(updated_at) if updated_at else None,
+            })
+        finally:
+            conn.close()
+
+        info["size_bytes"] = sum(
+            f.stat().st_size for f in self.index_file.parent.glob(self.index_file.name + "*")
+        )
+        return info
@@ -1,13 +1,67 @@
 """Shell command execution tool."""
 
+import asyncio
+import os
+import shlex
+import signal
 import subprocess
-from typing import Any, Dict
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from .base import Tool
+from .shell_output import OUTPUT_HEAD_BYTES, OUTPUT_TAIL_BYTES, OutputCapture, OutputPump, remove_spill_files
+from .shell_jobs import ShellJobManager
+from .shell_session import ShellSession, ShellSessionError
 
 
 class ShellTool(Tool):
-    """Tool for executing shell commands."""
+    """Tool for executing shell commands.
+
+    By default commands run in one persistent shell session, so ``cd``,
+    exported variables and activated virtualenvs carry over between calls.
+    Set CHATAGENT_SHELL_SESSION=off (or pass ``persistent=False``) to run every
+    command in a fresh ``/bin/sh`` instead.
+
+    Output is streamed rather than buffered: only the first ``head_bytes`` and
+    last ``tail_bytes`` of each stream are returned, and longer output is
+    spilled to a temporary file the model can page through with ``read_file``.
+    Spill files are deleted by ``close`` (or when the tool is garbage
+    collected).
+    ``output_callback`` (if set) receives the text as it arrives, for live
+    display.
+
+    With ``background=true`` the command is started as a job in ``jobs`` and
+    the call returns at once; the shell_job_* tools check on it, read its
+    output and stop it.
+    """
+
+    def __init__(
+        self,
+        persistent: Optional[bool] = None,
+        head_bytes: int = OUTPUT_HEAD_BYTES,
+        tail_bytes: int = OUTPUT_TAIL_BYTES,
+        output_callback: Optional[Callable[[str], None]] = None,
+    ):
+        """Initialize tool.
+
+        Args:
+            persistent: Use a persistent shell session (defaults to on, except
+                on Windows or when CHATAGENT_SHELL_SESSION is "off")
+            head_bytes: Bytes of output kept from the start of each stream
+            tail_bytes: Bytes of output kept from the end of each stream
+            output_callback: Called with output text while a command runs
+        """
+        self.head_bytes = head_bytes
+        self.tail_bytes = tail_bytes
+        self.output_callback = output_callback
+        if persistent is None:
+            persistent = os.getenv("CHATAGENT_SHELL_SESSION", "on").lower() not in ("off", "0", "false", "no")
+        self.persistent = persistent and os.name == "posix"
+        self.session = ShellSession() if self.persistent else None
+        self.jobs = ShellJobManager()
+        # Spill files of this tool's commands, deleted on close
+        self._spill_paths: List[str] = []
+        self._finalizer = weakref.finalize(self, remove_spill_files, self._spill_paths)
 
     @property
     def name(self) -> str:
@@ -15,7 +69,13 @@ class ShellTool(Tool):
 
     @property
     def description(self) -> str:
-        return "Execute a shell command and return its output. Use with caution as it can execute any command."
+        description = "Execute a shell command and return its output. Use with caution as it can execute any command."
+        if self.persistent:
+            description += (
+                " Commands share one shell session: the working directory, exported variables "
+                "and activated environments persist between calls."
+            )
+        return description
 
     @property
     def parameters(self) -> Dict[str, Any]:
@@ -28,7 +88,10 @@ class ShellTool(Tool):
                 },
                 "working_directory": {
                     "type": "string",
-                    "description": "Working directory for the command (defaults to current directory)",
+                    "description": (
+                        "Working directory for the command (defaults to current directory). "
+                        "In a persistent session the shell stays in this directory afterwards."
+                    ),
                     "default": ".",
                 },
                 "timeout": {
@@ -36,6 +99,23 @@ class ShellTool(Tool):
                     "description": "Timeout in seconds (default: 30)",
                     "default": 30,
                 },
+                "background": {
+                    "type": "boolean",
+                    "description": (
+                        "Run the command in the background and return a job id immediately, for "
+                        "long builds and test runs. Check on it with shell_job_status, read its "
+                        "output with shell_job_output and stop it with shell_job_kill."
+                    ),
+                    "default": False,
+                },
+                "reset_session": {
+                    "type": "boolean",
+                    "description": (
+                        "Start a fresh shell session before running the command, discarding "
+                        "the working directory, variables and environments of the old one"
+                    ),
+                    "default": False,
+                },
             },
             "required": ["command"],
         }
@@ -45,30 +125,287 @@ class ShellTool(Tool):
         """Shell commands require user confirmation for safety."""
         return True
 
+    def _captures(self) -> Tuple[OutputCapture, OutputCapture]:
+        """Create bounded captures for a command's stdout and stderr."""
+        return (
+            OutputCapture("stdout", self.head_bytes, self.tail_bytes, self.output_callback, self._spill_paths),
+            OutputCapture("stderr", self.head_bytes, self.tail_bytes, self.output_callback, self._spill_paths),
+        )
+
+    def _format_result(self, stdout: OutputCapture, stderr: OutputCapture, returncode: Optional[int]) -> str:
+        """Format command output as the tool result."""
+        output = []
+        if stdout.total:
+            output.append(f"STDOUT:\n{stdout.render()}")
+        if stderr.total:
+            output.append(f"STDERR:\n{stderr.render()}")
+        output.append(f"\nReturn code: {returncode}")
+
+        return "\n\n".join(output) if output else "Command completed with no output"
+
+    def _format_timeout(self, timeout: float, stdout: OutputCapture, stderr: OutputCapture, note: str = "") -> str:
+        """Format the result of a command that timed out, with any partial output."""
+        result = f"Error: Command timed out after {timeout} seconds{note}"
+        if stdout.total or stderr.total:
+            result += "\n\nOutput before the timeout:\n\n" + self._format_result(stdout, stderr, None)
+        return result
+
+    def _kill_process_tree(self, process: Any) -> None:
+        """Kill a command together with any children it spawned.
+
+        The command runs in its own session, so killing its process group also
+        stops grandchildren that would otherwise keep the output pipes open.
+        """
+        try:
+            if os.name == "posix":
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+        except ProcessLookupError:
+            pass
+
+    def reset_session(self) -> None:
+        """Discard the persistent shell session, if any."""
+        if self.session is not None:
+            self.session.reset()
+
+    def close(self) -> None:
+        """Stop the persistent shell session, if any, and delete spill files.
+
+        The tool stays usable; later spill files are cleaned up the same way.
+        """
+        if self.session is not None:
+            self.session.close()
+        self._finalizer()
+        self._finalizer = weakref.finalize(self, remove_spill_files, self._spill_paths)
+
+    def _run_in_session(self, command: str, working_directory: str, timeout: float, reset_session: bool) -> str:
+        """Run a command in the persistent session.
+
+        Args:
+            command: Shell command
+            working_directory: Directory to change to first ("." keeps the current one)
+            timeout: Seconds before the command is interrupted
+            reset_session: Start a fresh session first
+
+        Returns:
+            Tool result
+        """
+        if reset_session:
+            self.session.reset()
+
+        stdout, stderr = self._captures()
+        try:
+            returncode, timed_out = self.session.run(
+                self._session_command(command, working_directory), stdout, stderr, timeout=timeout
+            )
+        except ShellSessionError as e:
+            return f"Error executing command: {str(e)}"
+        return self._session_result(timeout, stdout, stderr, returncode, timed_out)
+
+    async def _arun_in_session(self, command: str, working_directory: str, timeout: float, reset_session: bool) -> str:
+        """Run a command in the persistent session without holding a thread.
+
+        Args:
+            command: Shell command
+            working_directory: Directory to change to first ("." keeps the current one)
+            timeout: Seconds before the command is interrupted
+            reset_session: Start a fresh session first
+
+        Returns:
+            Tool result
+        """
+        if reset_session:
+            self.session.reset()
+
+        stdout, stderr = self._captures()
+        try:
+            returncode, timed_out = await self.session.arun(
+                self._session_command(command, working_directory), stdout, stderr, timeout=timeout
+            )
+        except ShellSessionError as e:
+            return f"Error executing command: {str(e)}"
+        return self._session_result(timeout, stdout, stderr, returncode, timed_out)
+
+    @staticmethod
+    def _session_command(command: str, working_directory: str) -> str:
+        """Prefix a command with a change to its working directory, if any."""
+        if working_directory and working_directory != ".":
+            command = f"cd -- {shlex.quote(os.path.expanduser(working_directory))} || return\n{command}"
+        return command
+
+    def _session_result(
+        self,
+        timeout: float,
+        stdout: OutputCapture,
+        stderr: OutputCapture,
+        returncode: Optional[int],
+        timed_out: bool,
+    ) -> str:
+        """Format the result of a command run in the persistent session."""
+        if timed_out:
+            if self.session.alive:
+                note = "; it was interrupted and the shell session is still running"
+            else:
+                note = "; it could not be interrupted, so the shell session was restarted"
+            return self._format_timeout(timeout, stdout, stderr, note)
+
+        result = self._format_result(stdout, stderr, returncode if returncode is not None else -1)
+        if not self.session.alive:
+            result += "\n\nThe shell session exited; the next command starts a new session."
+        return result
+
+    def _run_once(self, command: str, working_directory: str, timeout: float) -> str:
+        """Run a command in a new shell, streaming its output into bounded captures.
+
+        Args:
+            command: Shell command
+            working_directory: Working directory
+            timeout: Seconds before the command is killed
+
+        Returns:
+            Tool result
+        """
+        stdout, stderr = self._captures()
+        process = subprocess.Popen(
+            command,
+            shell=True,
+            cwd=working_directory,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            start_new_session=(os.name == "posix"),
+        )
+
+        if os.name != "posix":
+            # select() only works on sockets on Windows: read everything at once
+            try:
+                out, err = process.communicate(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                self._kill_process_tree(process)
+                process.communicate()
+                return f"Error: Command timed out after {timeout} seconds"
+            stdout.write(out)
+            stderr.write(err)
+            stdout.close()
+            stderr.close()
+            return self._format_result(stdout, stderr, process.returncode)
+
+        pump = OutputPump()
+        pump.add(process.stdout, stdout)
+        pump.add(process.stderr, stderr)
+        try:
+            finished = pump.run(timeout)
+            if not finished:
+                self._kill_process_tree(process)
+            returncode = process.wait()
+        finally:
+            pump.close()
+            stdout.close()
+            stderr.close()
+            process.stdout.close()
+            process.stderr.close()
+
+        if not finished:
+            return self._format_timeout(timeout, stdout, stderr)
+        return self._format_result(stdout, stderr, returncode)
+
+    def _start_background(self, command: str, working_directory: str) -> str:
+        """Start a command as a background job.
+
+        In a persistent session the job starts in the session's working
+        directory and exported environment.
+
+        Args:
+            command: Shell command
+            working_directory: Working directory (relative to the session's)
+
+        Returns:
+            Tool result with the job id
+        """
+        cwd, env, shell = os.getcwd(), None, None
+        if self.session is not None:
+            cwd, env = self.session.snapshot()
+            shell = self.session.shell
+        cwd = os.path.join(cwd, os.path.expanduser(working_directory or "."))
+
+        job = self.jobs.start(command, cwd=os.path.normpath(cwd), env=env, shell=shell)
+        return (
+            f"Started background job {job.job_id} (pid {job.process.pid}) in {job.cwd}\n"
+            f"Output is written to {job.log_path}. Use shell_job_status, shell_job_output "
+            f"and shell_job_kill with job_id=\"{job.job_id}\" to follow it."
+        )
+
     def execute(
-        self, command: str, working_directory: str = ".", timeout: float = 30
+        self,
+        command: str,
+        working_directory: str = ".",
+        timeout: float = 30,
+        reset_session: bool = False,
+        background: bool = False,
     ) -> str:
         """Execute shell command."""
         try:
-            result = subprocess.run(
+            if reset_session and self.session is not None:
+                self.session.reset()
+                reset_session = False
+            if background:
+                return self._start_background(command, working_directory)
+            if self.session is not None:
+                return self._run_in_session(command, working_directory, timeout, reset_session)
+            return self._run_once(command, working_directory, timeout)
+        except Exception as e:
+            return f"Error executing command: {str(e)}"
+
+    async def aexecute(
+        self,
+        command: str,
+        working_directory: str = ".",
+        timeout: float = 30,
+        reset_session: bool = False,
+        background: bool = False,
+    ) -> str:
+        """Execute shell command without blocking the event loop."""
+        if background:
+            return await asyncio.to_thread(
+                self.execute, command, working_directory, timeout, reset_session, background
+            )
+
+        try:
+            if self.session is not None:
+                return await self._arun_in_session(command, working_directory, timeout, reset_session)
+
+
+            process = await asyncio.create_subprocess_shell(
                 command,
-                shell=True,
                 cwd=working_directory,
-                capture_output=True,
-                text=True,
-                timeout=timeout,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                start_new_session=(os.name == "posix"),
             )
 
-            output = []
-            if result.stdout:
-                output.append(f"STDOUT:\n{result.stdout}")
-            if result.stderr:
-                output.append(f"STDERR:\n{result.stderr}")
-            output.append(f"\nReturn code: {result.returncode}")
+            stdout, stderr = self._captures()
+
+            async def drain(stream: asyncio.StreamReader, capture: OutputCapture) -> None:
+                while True:
+                    chunk = await stream.read(65536)
+                    if not chunk:
+                        break
+                    capture.write(chunk)
+
+            try:
+                await asyncio.wait_for(
+                    asyncio.gather(drain(process.stdout, stdout), drain(process.stderr, stderr), process.wait()),
+                    timeout=timeout,
+                )
+            except asyncio.TimeoutError:
+                self._kill_process_tree(process)
+                await process.wait()
+                return self._format_timeout(timeout, stdout, stderr)
+            finally:
+                stdout.close()
+                stderr.close()
 
-            return "\n\n".join(output) if output else "Command completed with no output"
+            return self._format_result(stdout, stderr, process.returncode)
 
-        except subprocess.TimeoutExpired:
-            return f"Error: Command timed out after {timeout} seconds"
         except Exception as e:
             return f"Error executing command: {str(e)}"
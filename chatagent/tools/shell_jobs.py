@@ -0,0 +1,396 @@
+"""Background shell jobs and the tools that inspect and stop them."""
+
+import os
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+import weakref
+from typing import Any, Dict, List, Optional
+
+from .base import Tool
+
+# Largest chunk of job output returned by one shell_job_output call
+JOB_OUTPUT_BYTES = 16 * 1024
+
+# Seconds a job gets to exit after SIGTERM before it is killed
+KILL_GRACE = 3.0
+
+
+class ShellJob:
+    """A shell command running in the background.
+
+    stdout and stderr go straight to a log file, so a job costs no memory or
+    threads however much it prints, and its output survives after it exits.
+    """
+
+    def __init__(self, job_id: str, command: str, process: subprocess.Popen, log_path: str, cwd: str):
+        """Initialize job.
+
+        Args:
+            job_id: Job identifier (e.g. "job_1")
+            command: Shell command
+            process: Running process
+            log_path: File receiving the combined output
+            cwd: Directory the job runs in
+        """
+        self.job_id = job_id
+        self.command = command
+        self.process = process
+        self.log_path = log_path
+        self.cwd = cwd
+        self.started = time.time()
+        self.ended: Optional[float] = None
+        self.killed = False
+        # Bytes of output already returned by shell_job_output
+        self.read_offset = 0
+
+    @property
+    def returncode(self) -> Optional[int]:
+        """Exit status, or None while the job is running."""
+        code = self.process.poll()
+        if code is not None and self.ended is None:
+            self.ended = time.time()
+        return code
+
+    @property
+    def running(self) -> bool:
+        """Whether the job is still running."""
+        return self.returncode is None
+
+    @property
+    def output_size(self) -> int:
+        """Bytes of output written so far."""
+        try:
+            return os.path.getsize(self.log_path)
+        except OSError:
+            return 0
+
+    def describe(self) -> str:
+        """One-line status of the job."""
+        code = self.returncode
+        elapsed = (self.ended or time.time()) - self.started
+        if code is None:
+            state = "running"
+        elif self.killed:
+            state = f"killed (return code {code})"
+        else:
+            state = f"exited with return code {code}"
+        return (
+            f"{self.job_id}: {state} after {elapsed:.1f}s, {self.output_size} bytes of output "
+            f"({self.output_size - self.read_offset} unread) - {self.command}"
+        )
+
+
+def _signal_job(job: ShellJob, sig: int) -> None:
+    """Send a signal to a job's process group."""
+    try:
+        if os.name == "posix":
+            os.killpg(job.process.pid, sig)
+        else:
+            job.process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def _kill_job(job: ShellJob) -> None:
+    """Stop a job and everything it started: SIGTERM, then SIGKILL."""
+    if not job.running:
+        return
+    job.killed = True
+    _signal_job(job, signal.SIGTERM)
+    try:
+        job.process.wait(timeout=KILL_GRACE)
+    except subprocess.TimeoutExpired:
+        _signal_job(job, signal.SIGKILL)
+        job.process.wait()
+
+
+def _close_jobs(jobs: Dict[str, ShellJob]) -> None:
+    """Stop every running job, delete the job logs and forget the jobs."""
+    for job in list(jobs.values()):
+        _kill_job(job)
+        try:
+            os.unlink(job.log_path)
+        except OSError:
+            pass
+    jobs.clear()
+
+
+class ShellJobManager:
+    """Start, track and stop background shell jobs.
+
+    ``close`` stops the jobs and deletes their logs. Managers that are not
+    closed do the same when they are garbage collected or the program exits;
+    the exit hook does not keep the manager alive.
+    """
+
+    def __init__(self):
+        """Initialize manager."""
+        self.jobs: Dict[str, ShellJob] = {}
+        self._next_id = 1
+        self._lock = threading.Lock()
+        self._finalizer = weakref.finalize(self, _close_jobs, self.jobs)
+
+    def start(
+        self,
+        command: str,
+        cwd: Optional[str] = None,
+        env: Optional[Dict[str, str]] = None,
+        shell: Optional[str] = None,
+    ) -> ShellJob:
+        """Start a command in the background.
+
+        Args:
+            command: Shell command
+            cwd: Working directory
+            env: Environment (defaults to this process's)
+            shell: Shell executable (defaults to /bin/sh)
+
+        Returns:
+            The started job
+        """
+        with self._lock:
+            job_id = f"job_{self._next_id}"
+            self._next_id += 1
+
+        fd, log_path = tempfile.mkstemp(prefix=f"chatagent-{job_id}-", suffix=".log")
+        with os.fdopen(fd, "wb") as log:
+            process = subprocess.Popen(
+                command,
+                shell=True,
+                executable=shell,
+                cwd=cwd,
+                env=env,
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                start_new_session=(os.name == "posix"),
+            )
+
+        job = ShellJob(job_id, command, process, log_path, cwd or os.getcwd())
+        with self._lock:
+            self.jobs[job_id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[ShellJob]:
+        """Look up a job by id."""
+        return self.jobs.get(job_id)
+
+    def all_jobs(self) -> List[ShellJob]:
+        """All jobs, oldest first."""
+        return list(self.jobs.values())
+
+    def read_output(self, job: ShellJob, offset: Optional[int] = None, max_bytes: int = JOB_OUTPUT_BYTES) -> str:
+        """Read a job's output from ``offset`` (default: where the last read stopped).
+
+        When more than ``max_bytes`` are pending, only the last ``max_bytes``
+        are returned and the skipped bytes are reported.
+
+        Args:
+            job: Job to read
+            offset: Byte offset to read from
+            max_bytes: Maximum bytes to return
+
+        Returns:
+            Tool result
+        """
+        start = job.read_offset if offset is None else max(0, offset)
+        end = job.output_size
+        skipped = max(0, end - start - max_bytes)
+
+        with open(job.log_path, "rb") as f:
+            f.seek(start + skipped)
+            data = f.read(end - start - skipped)
+        job.read_offset = end
+
+        result = f"{job.describe()}\n\nOutput bytes {start}-{end} of {end}:"
+        if skipped:
+            result += (
+                f"\n[... {skipped} earlier bytes skipped; the full log is {job.log_path}, "
+                f"readable with read_file ...]"
+            )
+        text = data.decode("utf-8", errors="replace")
+        result += f"\n{text}" if text else "\n(no new output)"
+        if job.running:
+            result += "\n\n[Job still running. Call shell_job_output again for new output.]"
+        return result
+
+    def kill(self, job: ShellJob) -> None:
+        """Stop a job and everything it started: SIGTERM, then SIGKILL."""
+        _kill_job(job)
+
+    def kill_all(self) -> None:
+        """Stop every running job."""
+        for job in self.all_jobs():
+            self.kill(job)
+
+    def close(self) -> None:
+        """Stop every running job and delete the job logs.
+
+        The manager stays usable; later jobs are cleaned up the same way.
+        """
+        self._finalizer()
+        self._finalizer = weakref.finalize(self, _close_jobs, self.jobs)
+
+
+class _ShellJobTool(Tool):
+    """Base class for tools operating on background shell jobs."""
+
+    def __init__(self, manager: ShellJobManager):
+        """Initialize tool.
+
+        Args:
+            manager: Job manager shared with run_shell_command
+        """
+        self.manager = manager
+
+    def _find(self, job_id: str) -> Any:
+        """Look up a job, returning an error string if it does not exist."""
+        job = self.manager.get(job_id)
+        if job is None:
+            known = ", ".join(self.manager.jobs) or "none"
+            return f"Error: Unknown job '{job_id}' (known jobs: {known})"
+        return job
+
+
+class ShellJobStatusTool(_ShellJobTool):
+    """Tool for checking on background shell jobs."""
+
+    @property
+    def name(self) -> str:
+        return "shell_job_status"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Check background jobs started with run_shell_command(background=true): whether they "
+            "are running, their return code, runtime and how much output is unread."
+        )
+
+    @property
+    def parameters(self) -> Dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "job_id": {
+                    "type": "string",
+                    "description": "Job to check (omit to list all jobs)",
+                },
+            },
+            "required": [],
+        }
+
+    @property
+    def concurrency_safe(self) -> bool:
+        """Checking job status has no side effects."""
+        return True
+
+    def execute(self, job_id: Optional[str] = None) -> str:
+        """Report job status."""
+        if job_id:
+            job = self._find(job_id)
+            return job if isinstance(job, str) else job.describe()
+
+        jobs = self.manager.all_jobs()
+        if not jobs:
+            return "No background jobs"
+        return "\n".join(job.describe() for job in jobs)
+
+
+class ShellJobOutputTool(_ShellJobTool):
+    """Tool for reading the output of a background shell job incrementally."""
+
+    @property
+    def name(self) -> str:
+        return "shell_job_output"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Read new output of a background job since the last call. If a lot of output is "
+            "pending, only the latest part is returned."
+        )
+
+    @property
+    def parameters(self) -> Dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "job_id": {
+                    "type": "string",
+                    "description": "Job to read",
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": "Byte offset to read from instead of where the last call stopped",
+                },
+                "wait": {
+                    "type": "number",
+                    "description": "Seconds to wait for the job to finish first (default: 0, at most 60)",
+                    "default": 0,
+                },
+            },
+            "required": ["job_id"],
+        }
+
+    @property
+    def concurrency_safe(self) -> bool:
+        """Reading job output only moves this job's read cursor."""
+        return True
+
+    def execute(self, job_id: str, offset: Optional[int] = None, wait: float = 0) -> str:
+        """Read job output."""
+        job = self._find(job_id)
+        if isinstance(job, str):
+            return job
+
+        try:
+            if wait and job.running:
+                try:
+                    job.process.wait(timeout=min(float(wait), 60))
+                except subprocess.TimeoutExpired:
+                    pass
+            return self.manager.read_output(job, offset)
+        except Exception as e:
+            return f"Error reading job output: {str(e)}"
+
+
+class ShellJobKillTool(_ShellJobTool):
+    """Tool for stopping a background shell job."""
+
+    @property
+    def name(self) -> str:
+        return "shell_job_kill"
+
+    @property
+    def description(self) -> str:
+        return "Stop a background job (and any processes it started)."
+
+    @property
+    def parameters(self) -> Dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "job_id": {
+                    "type": "string",
+                    "description": "Job to stop",
+                },
+            },
+            "required": ["job_id"],
+        }
+
+    def execute(self, job_id: str) -> str:
+        """Stop a job."""
+        job = self._find(job_id)
+        if isinstance(job, str):
+            return job
+        if not job.running:
+            return f"Job already finished: {job.describe()}"
+
+        try:
+            self.manager.kill(job)
+            return f"Stopped {job.describe()}"
+        except Exception as e:
+            return f"Error stopping job: {str(e)}"
@@ -0,0 +1,270 @@
+"""Bounded capture of streamed shell command output."""
+
+import asyncio
+import codecs
+import os
+import selectors
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+# Bytes kept from the start and the end of each stream; the middle is elided
+OUTPUT_HEAD_BYTES = 16 * 1024
+OUTPUT_TAIL_BYTES = 16 * 1024
+
+
+class OutputCapture:
+    """Keep the head and tail of a stream, spilling the full output to a file.
+
+    Memory use is bounded by ``head_bytes + tail_bytes`` however much the
+    command prints. As soon as the output outgrows that, everything (including
+    what was already kept) is written to a temporary file, so the elided middle
+    can still be read with ``read_file``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        head_bytes: int = OUTPUT_HEAD_BYTES,
+        tail_bytes: int = OUTPUT_TAIL_BYTES,
+        on_text: Optional[Callable[[str], None]] = None,
+        spill_paths: Optional[List[str]] = None,
+    ):
+        """Initialize capture.
+
+        Args:
+            name: Stream name ("stdout" or "stderr"), used in the spill file name
+            head_bytes: Bytes kept from the start of the stream
+            tail_bytes: Bytes kept from the end of the stream
+            on_text: Called with the decoded text of every chunk as it arrives
+            spill_paths: List the spill file path is appended to when it is
+                         created, so its owner can delete it later
+        """
+        self.name = name
+        self.head_bytes = head_bytes
+        self.tail_bytes = tail_bytes
+        self.on_text = on_text
+        self.spill_paths = spill_paths
+        self.total = 0
+        self.spill_path: Optional[str] = None
+        self._head = bytearray()
+        self._tail = bytearray()
+        self._spill = None
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    @property
+    def elided(self) -> int:
+        """Number of bytes left out of the rendered output."""
+        return self.total - len(self._head) - len(self._tail)
+
+    def write(self, data: bytes) -> None:
+        """Add a chunk of output.
+
+        Args:
+            data: Raw bytes read from the stream
+        """
+        if not data:
+            return
+        self.total += len(data)
+        if self.on_text is not None:
+            text = self._decoder.decode(data)
+            if text:
+                self.on_text(text)
+
+        if self._spill is None and self.total > self.head_bytes + self.tail_bytes:
+            self._open_spill()
+        if self._spill is not None:
+            self._spill.write(data)
+
+        room = self.head_bytes - len(self._head)
+        if room > 0:
+            self._head += data[:room]
+            data = data[room:]
+        if data:
+            self._tail += data
+            if len(self._tail) > self.tail_bytes:
+                del self._tail[:len(self._tail) - self.tail_bytes]
+
+    def _open_spill(self) -> None:
+        """Create the spill file and copy in what has been kept so far."""
+        fd, self.spill_path = tempfile.mkstemp(prefix="chatagent-shell-", suffix=f".{self.name}.log")
+        self._spill = os.fdopen(fd, "wb")
+        if self.spill_paths is not None:
+            self.spill_paths.append(self.spill_path)
+        self._spill.write(self._head)
+        self._spill.write(self._tail)
+
+    def close(self) -> None:
+        """Close the spill file."""
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+
+    def render(self) -> str:
+        """Render the kept output, with a marker where bytes were elided.
+
+        When bytes are elided, the head and tail are trimmed to whole lines.
+
+        Returns:
+            Decoded output
+        """
+        if not self.elided:
+            return (self._head + self._tail).decode("utf-8", errors="replace")
+
+        head = self._head[:self._head.rfind(b"\n") + 1] or self._head
+        tail = self._tail[self._tail.find(b"\n") + 1:] or self._tail
+        elided = self.total - len(head) - len(tail)
+        return (
+            f"{head.decode('utf-8', errors='replace')}"
+            f"[... {elided} bytes elided; the full {self.name} ({self.total} bytes) is in "
+            f"{self.spill_path}, use read_file with offset/limit or mode='tail' to inspect it ...]\n"
+            f"{tail.decode('utf-8', errors='replace')}"
+        )
+
+
+def remove_spill_files(paths: List[str]) -> None:
+    """Delete spill files and forget their paths."""
+    for path in paths:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+    paths.clear()
+
+
+class OutputPump:
+    """Read several pipes into captures until each ends or prints a sentinel.
+
+    With a sentinel, a stream counts as finished once ``b"\\n" + sentinel``
+    followed by a line break has been read; the sentinel is not passed to the
+    capture and whatever follows it on that line is kept in ``trailers``.
+    """
+
+    def __init__(self, sentinel: Optional[bytes] = None):
+        """Initialize pump.
+
+        Args:
+            sentinel: Marker that ends a stream (None to read until EOF)
+        """
+        self.sentinel = b"\n" + sentinel if sentinel else None
+        self.trailers: Dict[str, bytes] = {}
+        self._selector = selectors.DefaultSelector()
+        self._pending: Dict[str, bytearray] = {}
+
+    def add(self, stream, capture: OutputCapture) -> None:
+        """Start reading a pipe.
+
+        Args:
+            stream: Readable pipe (file object with ``fileno()``)
+            capture: Capture receiving its output
+        """
+        self._pending[capture.name] = bytearray()
+        self._selector.register(stream, selectors.EVENT_READ, capture)
+
+    @property
+    def finished(self) -> bool:
+        """Whether every stream has ended."""
+        return not self._selector.get_map()
+
+    def run(self, timeout: Optional[float]) -> bool:
+        """Read until every stream has ended or the timeout passes.
+
+        Args:
+            timeout: Seconds to wait (None for no limit)
+
+        Returns:
+            True if every stream ended
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.finished:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            for key, _ in self._selector.select(remaining):
+                self._read(key)
+        return True
+
+    async def arun(self, timeout: Optional[float]) -> bool:
+        """Read like ``run``, but wait for the pipes on the running event loop.
+
+        The pipes are watched with ``loop.add_reader``, so no thread is held
+        while the command runs.
+
+        Args:
+            timeout: Seconds to wait (None for no limit)
+
+        Returns:
+            True if every stream ended
+        """
+        if self.finished:
+            return True
+
+        loop = asyncio.get_running_loop()
+        done = loop.create_future()
+        keys = list(self._selector.get_map().values())
+
+        def on_ready(key: selectors.SelectorKey) -> None:
+            try:
+                self._read(key)
+            except Exception as e:
+                loop.remove_reader(key.fd)
+                if not done.done():
+                    done.set_exception(e)
+                return
+            if key.fd not in self._selector.get_map():
+                loop.remove_reader(key.fd)
+            if self.finished and not done.done():
+                done.set_result(True)
+
+        for key in keys:
+            loop.add_reader(key.fd, on_ready, key)
+        try:
+            await asyncio.wait_for(done, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            for key in keys:
+                loop.remove_reader(key.fd)
+
+    def _read(self, key: selectors.SelectorKey) -> None:
+        """Read one chunk from a ready pipe."""
+        capture: OutputCapture = key.data
+        pending = self._pending[capture.name]
+        chunk = os.read(key.fd, 65536)
+        if not chunk:
+            capture.write(bytes(pending))
+            pending.clear()
+            self._selector.unregister(key.fileobj)
+            return
+
+        pending += chunk
+        if self.sentinel is None:
+            capture.write(bytes(pending))
+            pending.clear()
+            return
+
+        index = pending.find(self.sentinel)
+        if index == -1:
+            # Hold back the end only if it could be the start of the sentinel
+            # (which contains no line break after its first byte)
+            keep = 0
+            start = pending.rfind(b"\n", max(0, len(pending) - len(self.sentinel) + 1))
+            if start != -1 and self.sentinel.startswith(bytes(pending[start:])):
+                keep = len(pending) - start
+            capture.write(bytes(pending[:len(pending) - keep]))
+            del pending[:len(pending) - keep]
+            return
+
+        rest = pending[index + len(self.sentinel):]
+        if b"\n" not in rest:
+            return
+        capture.write(bytes(pending[:index]))
+        self.trailers[capture.name] = bytes(rest.split(b"\n", 1)[0])
+        pending.clear()
+        self._selector.unregister(key.fileobj)
+
+    def close(self) -> None:
+        """Stop reading."""
+        self._selector.close()
+
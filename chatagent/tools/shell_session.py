@@ -0,0 +1,281 @@
+"""Long-lived shell session used by run_shell_command."""
+
+import asyncio
+import os
+import shlex
+import json
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+import uuid
+from typing import Dict, Optional, Tuple
+
+from .shell_output import OutputCapture, OutputPump
+
+# Seconds to wait after each interrupt signal before escalating
+INTERRUPT_GRACE = 2.0
+# Seconds between attempts to take the session lock from the event loop
+LOCK_POLL_INTERVAL = 0.01
+
+
+class ShellSessionError(Exception):
+    """Raised when the session shell cannot be started or dies."""
+
+
+class ShellSession:
+    """One shell process that runs commands one after another.
+
+    State such as the working directory, exported variables and activated
+    virtualenvs carries over between commands. Commands are written to the
+    shell's stdin and their end is detected by a random sentinel that the
+    shell prints (with the exit status) on stdout and stderr. Each command
+    reads stdin from ``/dev/null`` so it cannot consume the ones after it.
+
+    On timeout the running command is interrupted (SIGINT, then SIGTERM) while
+    the shell itself survives through its traps; only if that fails is the
+    whole session killed and restarted on the next command.
+    """
+
+    def __init__(self, cwd: Optional[str] = None, shell: Optional[str] = None):
+        """Initialize session. The shell is started on first use.
+
+        Args:
+            cwd: Initial working directory (defaults to the current directory)
+            shell: Shell executable (defaults to bash, or /bin/sh without it)
+        """
+        self.initial_cwd = cwd or os.getcwd()
+        self.shell = shell or shutil.which("bash") or "/bin/sh"
+        self.process: Optional[subprocess.Popen] = None
+        self.commands_run = 0
+        self._marker = ""
+        self._lock = threading.Lock()
+
+    @property
+    def alive(self) -> bool:
+        """Whether the shell process is running."""
+        return self.process is not None and self.process.poll() is None
+
+    def _start(self) -> None:
+        """Start the shell process."""
+        args = [self.shell]
+        if os.path.basename(self.shell) == "bash":
+            args += ["--noprofile", "--norc"]
+
+        self.process = subprocess.Popen(
+            args,
+            cwd=self.initial_cwd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            start_new_session=True,
+        )
+        self.commands_run = 0
+        self._marker = f"__CHATAGENT_{uuid.uuid4().hex}__"
+        # Commands run inside a function so an interrupt can abort the rest of
+        # the command list by returning from it. Traps with a handler are reset
+        # in children, so they still get the default action while the shell
+        # itself keeps running.
+        self._write(
+            "__chatagent_run() { eval \"$__chatagent_cmd\" </dev/null; }\n"
+            "trap 'return 130 2>/dev/null' INT\n"
+            "trap 'return 143 2>/dev/null' TERM\n"
+        )
+
+    def _write(self, text: str) -> None:
+        """Send text to the shell's stdin."""
+        assert self.process is not None and self.process.stdin is not None
+        self.process.stdin.write(text.encode("utf-8"))
+        self.process.stdin.flush()
+
+    def _signal(self, sig: int) -> None:
+        """Send a signal to every process in the session."""
+        try:
+            os.killpg(self.process.pid, sig)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    def run(
+        self,
+        command: str,
+        stdout: OutputCapture,
+        stderr: OutputCapture,
+        timeout: float = 30,
+    ) -> Tuple[Optional[int], bool]:
+        """Run a command in the session, streaming its output into captures.
+
+        Args:
+            command: Shell command
+            stdout: Capture for standard output
+            stderr: Capture for standard error
+            timeout: Seconds before the command is interrupted
+
+        Returns:
+            (exit status or None if the shell was killed, timed out)
+
+        Raises:
+            ShellSessionError: If the shell cannot be started
+        """
+        with self._lock:
+            pump = self._submit(command, stdout, stderr)
+            try:
+                return self._collect(pump, stdout, timeout)
+            finally:
+                pump.close()
+                stdout.close()
+                stderr.close()
+
+    async def arun(
+        self,
+        command: str,
+        stdout: OutputCapture,
+        stderr: OutputCapture,
+        timeout: float = 30,
+    ) -> Tuple[Optional[int], bool]:
+        """Run a command like ``run`` without blocking the event loop.
+
+        Output is read as the pipes become readable on the running loop, so a
+        long command does not hold a thread.
+
+        Args:
+            command: Shell command
+            stdout: Capture for standard output
+            stderr: Capture for standard error
+            timeout: Seconds before the command is interrupted
+
+        Returns:
+            (exit status or None if the shell was killed, timed out)
+
+        Raises:
+            ShellSessionError: If the shell cannot be started
+        """
+        # The lock is shared with synchronous callers; poll instead of blocking the loop
+        while not self._lock.acquire(blocking=False):
+            await asyncio.sleep(LOCK_POLL_INTERVAL)
+        try:
+            pump = self._submit(command, stdout, stderr)
+            try:
+                return await self._acollect(pump, stdout, timeout)
+            except asyncio.CancelledError:
+                # The command is still running and would answer the next one
+                self.close()
+                raise
+            finally:
+                pump.close()
+                stdout.close()
+                stderr.close()
+        finally:
+            self._lock.release()
+
+    def _submit(self, command: str, stdout: OutputCapture, stderr: OutputCapture) -> OutputPump:
+        """Start the shell if needed and send it a command (the lock must be held).
+
+        Returns:
+            Pump reading the command's output up to the sentinels
+        """
+        if not self.alive:
+            self.close()
+            try:
+                self._start()
+            except OSError as e:
+                raise ShellSessionError(f"Could not start {self.shell}: {e}") from e
+
+        marker = self._marker
+        self._write(
+            f"__chatagent_cmd={shlex.quote(command)}\n"
+            "__chatagent_run\n"
+            f"printf '\\n{marker}%s\\n' \"$?\"\n"
+            f"printf '\\n{marker}\\n' >&2\n"
+        )
+        self.commands_run += 1
+
+        pump = OutputPump(sentinel=marker.encode())
+        pump.add(self.process.stdout, stdout)
+        pump.add(self.process.stderr, stderr)
+        return pump
+
+    def _collect(self, pump: OutputPump, stdout: OutputCapture, timeout: float) -> Tuple[Optional[int], bool]:
+        """Pump output until both sentinels arrive, interrupting on timeout."""
+        timed_out = False
+        if not pump.run(timeout):
+            timed_out = True
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                self._signal(sig)
+                if pump.run(INTERRUPT_GRACE):
+                    break
+            else:
+                self.close()
+                return None, timed_out
+        return self._exit_status(pump, stdout), timed_out
+
+    async def _acollect(self, pump: OutputPump, stdout: OutputCapture, timeout: float) -> Tuple[Optional[int], bool]:
+        """Asynchronous version of ``_collect``."""
+        timed_out = False
+        if not await pump.arun(timeout):
+            timed_out = True
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                self._signal(sig)
+                if await pump.arun(INTERRUPT_GRACE):
+                    break
+            else:
+                self.close()
+                return None, timed_out
+        return self._exit_status(pump, stdout), timed_out
+
+    def _exit_status(self, pump: OutputPump, stdout: OutputCapture) -> Optional[int]:
+        """Get the command's exit status from the stdout sentinel trailer."""
+        trailer = pump.trailers.get(stdout.name, b"").strip()
+        if trailer.lstrip(b"-").isdigit():
+            return int(trailer)
+
+        # Both streams closed without a sentinel: the shell exited
+        try:
+            return self.process.wait(timeout=INTERRUPT_GRACE)
+        except subprocess.TimeoutExpired:
+            return None
+
+    def snapshot(self, timeout: float = 10) -> Tuple[str, Dict[str, str]]:
+        """Get the session's working directory and exported environment.
+
+        Used to start background jobs in the same state as the session.
+
+        Args:
+            timeout: Seconds to wait for the shell
+
+        Returns:
+            (working directory, environment variables)
+        """
+        if not self.alive:
+            return self.initial_cwd, dict(os.environ)
+
+        probe = "import json, os; print(json.dumps([os.getcwd(), dict(os.environ)]))"
+        stdout = OutputCapture("stdout", head_bytes=1024 * 1024, tail_bytes=0)
+        stderr = OutputCapture("stderr")
+        returncode, _ = self.run(f"{shlex.quote(sys.executable)} -c {shlex.quote(probe)}", stdout, stderr, timeout)
+        if returncode != 0:
+            raise ShellSessionError(f"Could not read the session environment: {stderr.render()}")
+        cwd, env = json.loads(stdout.render())
+        return cwd, env
+
+    def close(self) -> None:
+        """Kill the shell and anything it started."""
+        process, self.process = self.process, None
+        if process is None:
+            return
+        if process.poll() is None:
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                pass
+        for stream in (process.stdin, process.stdout, process.stderr):
+            try:
+                stream.close()
+            except OSError:
+                pass
+        process.wait()
+
+    def reset(self) -> None:
+        """Discard all session state; the next command starts a fresh shell."""
+        with self._lock:
+            self.close()
@@ -1,6 +1,6 @@
 """Skill activation tool."""
 
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
 from .base import Tool
 
@@ -41,6 +41,10 @@ class ActivateSkillTool(Tool):
             "required": ["skill_name", "task_description"],
         }
 
+    def modified_paths(self, **kwargs) -> Optional[List[str]]:
+        """Activating a skill changes no files."""
+        return []
+
     def execute(self, skill_name: str, task_description: str) -> str:
         """Activate a skill."""
         if not self.skill_manager:
@@ -51,3 +55,74 @@ class ActivateSkillTool(Tool):
             return result
         except Exception as e:
             return f"Error activating skill: {str(e)}"
+
+
+class SearchSkillsTool(Tool):
+    """Tool for finding skills that are not listed in the system prompt."""
+
+    def __init__(self, skill_manager=None):
+        """Initialize skill search tool.
+
+        Args:
+            skill_manager: SkillManager instance
+        """
+        self.skill_manager = skill_manager
+
+    @property
+    def name(self) -> str:
+        return "search_skills"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Search all available skills by keywords or task description. The system prompt only lists the "
+            "skills most relevant to the conversation; use this to discover others before calling activate_skill."
+        )
+
+    @property
+    def parameters(self) -> Dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Keywords or task description (e.g., 'merge pdf files', 'slides'); empty lists every skill",
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of skills to return (default: 5)",
+                    "default": 5,
+                },
+            },
+            "required": ["query"],
+        }
+
+    @property
+    def concurrency_safe(self) -> bool:
+        """Searching skills has no side effects."""
+        return True
+
+    def execute(self, query: str, limit: int = 5) -> str:
+        """Search skills."""
+        if not self.skill_manager:
+            return "Error: Skill manager not initialized"
+
+        try:
+            if query.strip():
+                names = [name for name, _ in self.skill_manager.search_skills(query, limit=max(1, int(limit)))]
+                if not names:
+                    return f"No skills match '{query}'. Call search_skills with an empty query to list every skill."
+                header = f"Skills matching '{query}' (best first):"
+            else:
+                names = sorted(self.skill_manager.list_available_skills())
+                header = f"All {len(names)} skills:"
+
+            lines = [header]
+            for name in names:
+                description = self.skill_manager.get_skill_description(name) or "No description"
+                if len(description) > 200:
+                    description = description[:200] + "..."
+                lines.append(f"• {name}: {description}")
+            return "\n".join(lines)
+        except Exception as e:
+            return f"Error searching skills: {str(e)}"
@@ -0,0 +1,255 @@
+"""Streaming, gitignore-aware file walker shared by the search tools."""
+
+import os
+import re
+from pathlib import Path, PurePosixPath
+from typing import Iterator, List, Optional, Tuple
+
+from .result_cache import record_path
+
+# Directories never worth walking into
+SKIP_DIRS = {
+    ".git", ".hg", ".svn", "node_modules", "__pycache__", ".venv", "venv",
+    ".mypy_cache", ".pytest_cache", ".ruff_cache", ".tox", ".nox",
+}
+
+# Number of leading bytes inspected to decide whether a file is binary
+BINARY_SNIFF_BYTES = 8192
+
+# (base directory relative to the root, compiled pattern, negated, directories only)
+IgnoreRule = Tuple[str, "re.Pattern[str]", bool, bool]
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Translate a gitignore glob (without leading "/" or trailing "/") to a regex."""
+    result = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            result.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            result.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            result.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            result.append("[^/]")
+            i += 1
+        elif pattern[i] == "[":
+            end = pattern.find("]", i + 2)
+            if end == -1:
+                result.append(re.escape(pattern[i]))
+                i += 1
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                result.append(f"[{body}]")
+                i = end + 1
+        elif pattern[i] == "\\" and i + 1 < len(pattern):
+            result.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            result.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(result)
+
+
+def parse_gitignore(text: str, base: str = "") -> List[IgnoreRule]:
+    """Parse the contents of a .gitignore file.
+
+    Args:
+        text: File contents
+        base: Directory containing the file, relative to the walk root ("" for the root)
+
+    Returns:
+        Ignore rules in file order
+    """
+    rules: List[IgnoreRule] = []
+    for line in text.splitlines():
+        line = line.rstrip()
+        if not line or line.startswith("#"):
+            continue
+
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:]
+        elif line.startswith("\\"):
+            line = line[1:]
+
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+
+        # Patterns with a slash (other than a trailing one) are relative to the .gitignore
+        anchored = "/" in line
+        line = line.lstrip("/")
+        regex = _glob_to_regex(line)
+        if not anchored:
+            regex = "(?:.*/)?" + regex
+        rules.append((base, re.compile(regex + r"\Z"), negated, dir_only))
+    return rules
+
+
+def is_ignored(rel_path: str, is_dir: bool, rules: List[IgnoreRule]) -> bool:
+    """Check a path against ignore rules (the last matching rule wins).
+
+    Args:
+        rel_path: Path relative to the walk root, using "/" separators
+        is_dir: Whether the path is a directory
+        rules: Rules collected from the root down to the path's parent
+
+    Returns:
+        True if the path is ignored
+    """
+    ignored = False
+    for base, pattern, negated, dir_only in rules:
+        if dir_only and not is_dir:
+            continue
+        if base:
+            if not rel_path.startswith(base + "/"):
+                continue
+            candidate = rel_path[len(base) + 1:]
+        else:
+            candidate = rel_path
+        if pattern.match(candidate):
+            ignored = not negated
+    return ignored
+
+
+def matches_glob(rel_path: str, pattern: str) -> bool:
+    """Check a relative path against a file pattern like ``Path.glob``/``rglob`` would.
+
+    Args:
+        rel_path: Path relative to the search directory, using "/" separators
+        pattern: Glob pattern ("**/" means any depth)
+
+    Returns:
+        True if the file would have been selected by the glob
+    """
+    path = PurePosixPath(rel_path)
+    if "**" in pattern:
+        return path.match(pattern.replace("**/", ""))
+    return len(path.parts) == len(PurePosixPath(pattern).parts) and path.match(pattern)
+
+
+def glob_depth(pattern: str) -> Optional[int]:
+    """Deepest directory level a file pattern can match (None if unbounded)."""
+    if "**" in pattern:
+        return None
+    return len(PurePosixPath(pattern).parts)
+
+
+def _ancestor_rules(root: Path) -> Tuple[str, List[IgnoreRule]]:
+    """Collect .gitignore rules from the directories between the repository root and ``root``.
+
+    Args:
+        root: Directory about to be walked
+
+    Returns:
+        (path of ``root`` relative to the repository root with a trailing "/",
+        rules from the ancestors' .gitignore files), or ("", []) outside a repository
+    """
+    root = root.resolve()
+    for top in (root, *root.parents):
+        if (top / ".git").exists():
+            break
+    else:
+        return "", []
+
+    rules: List[IgnoreRule] = []
+    relative = root.relative_to(top).parts
+    for depth in range(len(relative)):
+        directory = top.joinpath(*relative[:depth])
+        try:
+            text = (directory / ".gitignore").read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            continue
+        rules += parse_gitignore(text, "/".join(relative[:depth]))
+
+    return ("/".join(relative) + "/") if relative else "", rules
+
+
+def walk_files(
+    root: Path,
+    respect_gitignore: bool = True,
+    max_depth: Optional[int] = None,
+) -> Iterator[Tuple[str, os.DirEntry]]:
+    """Walk regular files below ``root`` depth-first, in sorted name order.
+
+    The files of a directory come before those of its subdirectories. Files are
+    yielded as soon as their directory has been listed, so callers can
+    stop early without walking the rest of the tree. VCS, virtualenv and cache
+    directories are skipped, as is anything excluded by ``.gitignore`` files
+    (each one applies to its own directory and below, including those of parent
+    directories up to the repository root). Symlinked directories are not followed.
+
+    Args:
+        root: Directory to walk
+        respect_gitignore: Honor ``.gitignore`` files
+        max_depth: Only yield files at most this many levels deep (1 = directly in root)
+
+    Yields:
+        (path relative to root using "/" separators, directory entry) pairs
+    """
+    # Ignore rules are matched against paths relative to the repository root
+    repo_prefix, initial_rules = _ancestor_rules(root) if respect_gitignore else ("", [])
+
+    # Stack of (directory path, relative prefix, depth, rules in effect)
+    stack: List[Tuple[str, str, int, List[IgnoreRule]]] = [(str(root), "", 1, initial_rules)]
+    while stack:
+        directory, prefix, depth, rules = stack.pop()
+        # Adding, removing or renaming an entry changes the directory's mtime
+        record_path(directory)
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+
+        if respect_gitignore and any(e.name == ".gitignore" for e in entries):
+            gitignore = os.path.join(directory, ".gitignore")
+            record_path(gitignore)
+            try:
+                with open(gitignore, encoding="utf-8", errors="replace") as f:
+                    rules = rules + parse_gitignore(f.read(), (repo_prefix + prefix).rstrip("/"))
+            except OSError:
+                pass
+
+        subdirs = []
+        for entry in entries:
+            rel_path = prefix + entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name in SKIP_DIRS or (max_depth is not None and depth >= max_depth):
+                        continue
+                    if rules and is_ignored(repo_prefix + rel_path, True, rules):
+                        continue
+                    subdirs.append((entry.path, rel_path + "/", depth + 1, rules))
+                elif entry.is_file():
+                    if rules and is_ignored(repo_prefix + rel_path, False, rules):
+                        continue
+                    yield rel_path, entry
+            except OSError:
+                continue
+
+        stack.extend(reversed(subdirs))
+
+
+def is_binary(path: str) -> bool:
+    """Decide whether a file is binary by looking for NUL bytes in its header.
+
+    Args:
+        path: File path
+
+    Returns:
+        True for binary (or unreadable) files
+    """
+    try:
+        with open(path, "rb") as f:
+            return b"\0" in f.read(BINARY_SNIFF_BYTES)
+    except OSError:
+        return True
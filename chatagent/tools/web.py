@@ -1,17 +1,135 @@
 """Web-related tools."""
 
+import asyncio
 import json
-from typing import Any, Dict
-from urllib.parse import quote_plus
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote_plus, urlsplit
 
 import httpx
 from bs4 import BeautifulSoup
 
 from .base import Tool
+from .http_client import get_http_client
+
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:  # optional, faster HTML parser
+    HTMLParser = None
+
+try:
+    import lxml  # noqa: F401
+    BS4_FEATURES = "lxml"
+except ImportError:
+    BS4_FEATURES = "html.parser"
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+}
+
+# Bytes downloaded per page at most; the rest of larger pages is never fetched
+MAX_FETCH_BYTES = 2 * 1024 * 1024
+
+# Characters of page text returned per call; longer pages are paginated
+CHUNK_CHARS = 10_000
+
+# Concurrent requests per host, and in total, when fetching several URLs
+PER_HOST_LIMIT = 2
+MAX_PARALLEL_FETCHES = 8
+
+# Seconds a web search result is reused for the same query in a session
+SEARCH_CACHE_TTL = 300
+
+# Extracted pages kept for cursor requests
+MAX_CACHED_PAGES = 32
+
+# Elements whose text is dropped when extracting page text
+SKIPPED_ELEMENTS = ["script", "style", "nav", "footer"]
+
+
+def html_to_text(html: str) -> str:
+    """Extract readable text from HTML.
+
+    Uses selectolax when installed, otherwise BeautifulSoup (with lxml when
+    installed, else Python's html.parser).
+
+    Args:
+        html: HTML document
+
+    Returns:
+        Text with one line per block and blank lines removed
+    """
+    if HTMLParser is not None:
+        tree = HTMLParser(html)
+        for node in tree.css(",".join(SKIPPED_ELEMENTS)):
+            node.decompose()
+        root = tree.body or tree.root
+        text = root.text(separator="\n") if root is not None else ""
+    else:
+        soup = BeautifulSoup(html, BS4_FEATURES)
+        for element in soup(SKIPPED_ELEMENTS):
+            element.decompose()
+        text = soup.get_text(separator="\n")
+
+    # Clean up whitespace
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    return "\n".join(chunk for chunk in chunks if chunk)
+
+
+def paginate(text: str, size: int = CHUNK_CHARS) -> List[Tuple[int, int]]:
+    """Split text into chunks of at most ``size`` characters, preferring line breaks.
+
+    Args:
+        text: Text to split
+        size: Maximum chunk length
+
+    Returns:
+        (start, end) offsets of every chunk
+    """
+    chunks = []
+    start = 0
+    while start < len(text) or not chunks:
+        end = min(start + size, len(text))
+        if end < len(text):
+            newline = text.rfind("\n", start, end)
+            if newline > start:
+                end = newline + 1
+        chunks.append((start, end))
+        start = end
+    return chunks
 
 
 class WebFetchTool(Tool):
-    """Tool for fetching web content."""
+    """Tool for fetching web content.
+
+    Several URLs can be fetched in one call; they are downloaded concurrently
+    with at most ``PER_HOST_LIMIT`` requests per host. Bodies are streamed
+    and the download stops at ``MAX_FETCH_BYTES``. Page text is returned in
+    chunks of ``CHUNK_CHARS`` characters, and the rest of a long page is
+    addressed with a cursor (served from memory, without refetching).
+    """
+
+    def __init__(
+        self,
+        async_client: Optional[httpx.AsyncClient] = None,
+        client: Optional[httpx.Client] = None,
+    ):
+        """Initialize web fetch tool.
+
+        Args:
+            async_client: Optional shared client used by ``aexecute``.
+                          A temporary client is created per call if omitted.
+            client: Optional client used by ``execute`` (defaults to the
+                    process-wide pooled, caching client)
+        """
+        self.async_client = async_client
+        self.client = client
+        # (url, extract_text) -> (status line, text, download truncated)
+        self._pages: "OrderedDict[Tuple[str, bool], Tuple[str, str, bool]]" = OrderedDict()
+        self._pages_lock = threading.Lock()
 
     @property
     def name(self) -> str:
@@ -19,7 +137,11 @@ class WebFetchTool(Tool):
 
     @property
     def description(self) -> str:
-        return "Fetch content from a URL and extract text. Returns the page content as text."
+        return (
+            "Fetch content from one or more URLs and extract text. Returns the page content as text. "
+            f"Long pages are returned in parts of {CHUNK_CHARS} characters; pass the cursor from a "
+            "truncated result to read the next part."
+        )
 
     @property
     def parameters(self) -> Dict[str, Any]:
@@ -30,13 +152,22 @@ class WebFetchTool(Tool):
                     "type": "string",
                     "description": "URL to fetch",
                 },
+                "urls": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Several URLs to fetch concurrently (instead of url)",
+                },
                 "extract_text": {
                     "type": "boolean",
                     "description": "Whether to extract only text content (default: True)",
                     "default": True,
                 },
+                "cursor": {
+                    "type": "string",
+                    "description": "Continuation cursor (e.g. 'chunk:2') from a truncated result for url",
+                },
             },
-            "required": ["url"],
+            "required": [],
         }
 
     @property
@@ -44,54 +175,208 @@ class WebFetchTool(Tool):
         """Web fetch requires user confirmation for safety."""
         return True
 
-    def execute(self, url: str, extract_text: bool = True) -> str:
-        """Fetch web content."""
-        try:
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            }
-
-            with httpx.Client(follow_redirects=True, timeout=30.0) as client:
-                response = client.get(url, headers=headers)
-                response.raise_for_status()
-
-                if extract_text:
-                    soup = BeautifulSoup(response.text, "html.parser")
-
-                    # Remove script and style elements
-                    for script in soup(["script", "style", "nav", "footer"]):
-                        script.decompose()
-
-                    # Get text
-                    text = soup.get_text()
-
-                    # Clean up whitespace
-                    lines = (line.strip() for line in text.splitlines())
-                    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-                    text = "\n".join(chunk for chunk in chunks if chunk)
-
-                    # Limit length
-                    if len(text) > 10000:
-                        text = text[:10000] + "\n\n[Content truncated...]"
+    @property
+    def concurrency_safe(self) -> bool:
+        """Fetching a URL has no local side effects."""
+        return True
 
-                    return f"URL: {url}\nStatus: {response.status_code}\n\n{text}"
-                else:
-                    content = response.text
-                    if len(content) > 10000:
-                        content = content[:10000] + "\n\n[Content truncated...]"
-                    return f"URL: {url}\nStatus: {response.status_code}\n\n{content}"
+    @property
+    def uses_network(self) -> bool:
+        """Fetching URLs needs the network."""
+        return True
 
-        except httpx.TimeoutException:
+    def _targets(self, url: Optional[str], urls: Optional[List[str]], cursor: Optional[str]) -> Any:
+        """Validate arguments.
+
+        Returns:
+            (list of URLs, chunk number) or an error string
+        """
+        targets = list(urls or [])
+        if url:
+            targets.insert(0, url)
+        targets = list(dict.fromkeys(targets))
+        if not targets:
+            return "Error: Provide url or urls"
+
+        chunk = 1
+        if cursor:
+            kind, _, position = cursor.partition(":")
+            if kind != "chunk" or not position.isdigit() or int(position) < 1:
+                return f"Error: Invalid cursor '{cursor}'"
+            if len(targets) > 1:
+                return "Error: cursor can only be used with a single url"
+            chunk = int(position)
+        return targets, chunk
+
+    def _remember(self, key: Tuple[str, bool], page: Tuple[str, str, bool]) -> None:
+        """Keep an extracted page for later cursor requests."""
+        with self._pages_lock:
+            self._pages[key] = page
+            self._pages.move_to_end(key)
+            while len(self._pages) > MAX_CACHED_PAGES:
+                self._pages.popitem(last=False)
+
+    def _cached_page(self, key: Tuple[str, bool]) -> Optional[Tuple[str, str, bool]]:
+        """Get a page extracted by an earlier call."""
+        with self._pages_lock:
+            return self._pages.get(key)
+
+    def _extract(self, url: str, response: httpx.Response, body: bytes, truncated: bool, extract_text: bool) -> Tuple[str, str, bool]:
+        """Turn a downloaded body into (status line, text, truncated)."""
+        status = f"{response.status_code}"
+        if response.extensions.get("chatagent_cache"):
+            status += f" (from cache, {response.extensions['chatagent_cache']})"
+
+        content = body.decode(response.encoding or "utf-8", errors="replace")
+        text = html_to_text(content) if extract_text else content
+        page = (status, text, truncated)
+        self._remember((url, extract_text), page)
+        return page
+
+    def _format_page(self, url: str, page: Tuple[str, str, bool], chunk: int) -> str:
+        """Render one chunk of a page as the tool result."""
+        status, text, truncated = page
+        chunks = paginate(text)
+        if chunk > len(chunks):
+            return f"Error: cursor chunk:{chunk} is beyond the end of {url} ({len(chunks)} part(s))"
+
+        start, end = chunks[chunk - 1]
+        result = f"URL: {url}\nStatus: {status}\n\n{text[start:end]}"
+        if truncated:
+            result += f"\n\n[Download stopped after {MAX_FETCH_BYTES} bytes; the rest of the page was not fetched]"
+        if chunk < len(chunks):
+            result += (
+                f"\n\n[Part {chunk} of {len(chunks)}, characters {start}-{end} of {len(text)}. "
+                f"To continue, call web_fetch with url=\"{url}\" and cursor=\"chunk:{chunk + 1}\"]"
+            )
+        return result
+
+    def _fetch(self, client: httpx.Client, url: str, extract_text: bool) -> Tuple[str, str, bool]:
+        """Download a page with a byte cap and extract it."""
+        with client.stream("GET", url, headers=DEFAULT_HEADERS, follow_redirects=True, timeout=30.0) as response:
+            response.raise_for_status()
+            body = bytearray()
+            truncated = False
+            for data in response.iter_bytes():
+                body += data
+                if len(body) >= MAX_FETCH_BYTES:
+                    truncated = len(body) > MAX_FETCH_BYTES or not response.is_stream_consumed
+                    del body[MAX_FETCH_BYTES:]
+                    break
+        return self._extract(url, response, bytes(body), truncated, extract_text)
+
+    async def _afetch(self, client: httpx.AsyncClient, url: str, extract_text: bool) -> Tuple[str, str, bool]:
+        """Download a page with a byte cap and extract it, asynchronously."""
+        async with client.stream("GET", url, headers=DEFAULT_HEADERS, follow_redirects=True, timeout=30.0) as response:
+            response.raise_for_status()
+            body = bytearray()
+            truncated = False
+            async for data in response.aiter_bytes():
+                body += data
+                if len(body) >= MAX_FETCH_BYTES:
+                    truncated = len(body) > MAX_FETCH_BYTES or not response.is_stream_consumed
+                    del body[MAX_FETCH_BYTES:]
+                    break
+        return await asyncio.to_thread(self._extract, url, response, bytes(body), truncated, extract_text)
+
+    def _error(self, url: str, error: Exception) -> str:
+        """Format a fetch error."""
+        if isinstance(error, httpx.TimeoutException):
             return f"Error: Request timed out for {url}"
-        except httpx.HTTPError as e:
-            return f"Error fetching URL: {str(e)}"
-        except Exception as e:
-            return f"Error: {str(e)}"
+        if isinstance(error, httpx.HTTPError):
+            return f"Error fetching URL: {str(error)}"
+        return f"Error: {str(error)}"
+
+    def _join(self, results: List[str]) -> str:
+        """Combine the results of several URLs."""
+        return "\n\n---\n\n".join(results)
+
+    def execute(
+        self,
+        url: Optional[str] = None,
+        extract_text: bool = True,
+        urls: Optional[List[str]] = None,
+        cursor: Optional[str] = None,
+    ) -> str:
+        """Fetch web content."""
+        targets = self._targets(url, urls, cursor)
+        if isinstance(targets, str):
+            return targets
+        targets, chunk = targets
+        client = self.client or get_http_client()
+        host_limits: Dict[str, threading.BoundedSemaphore] = {}
+        for target in targets:
+            host_limits.setdefault(urlsplit(target).netloc, threading.BoundedSemaphore(PER_HOST_LIMIT))
+
+        def fetch_one(target: str) -> str:
+            try:
+                page = self._cached_page((target, extract_text)) if chunk > 1 else None
+                if page is None:
+                    with host_limits[urlsplit(target).netloc]:
+                        page = self._fetch(client, target, extract_text)
+                return self._format_page(target, page, chunk)
+            except Exception as e:
+                return self._error(target, e)
+
+        if len(targets) == 1:
+            return fetch_one(targets[0])
+        with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_FETCHES, len(targets))) as executor:
+            return self._join(list(executor.map(fetch_one, targets)))
+
+    async def aexecute(
+        self,
+        url: Optional[str] = None,
+        extract_text: bool = True,
+        urls: Optional[List[str]] = None,
+        cursor: Optional[str] = None,
+    ) -> str:
+        """Fetch web content without blocking the event loop."""
+        targets = self._targets(url, urls, cursor)
+        if isinstance(targets, str):
+            return targets
+        targets, chunk = targets
+        host_limits: Dict[str, asyncio.Semaphore] = {}
+        for target in targets:
+            host_limits.setdefault(urlsplit(target).netloc, asyncio.Semaphore(PER_HOST_LIMIT))
+        overall = asyncio.Semaphore(MAX_PARALLEL_FETCHES)
+
+        async def fetch_one(client: httpx.AsyncClient, target: str) -> str:
+            try:
+                page = self._cached_page((target, extract_text)) if chunk > 1 else None
+                if page is None:
+                    async with overall, host_limits[urlsplit(target).netloc]:
+                        page = await self._afetch(client, target, extract_text)
+                return self._format_page(target, page, chunk)
+            except Exception as e:
+                return self._error(target, e)
+
+        if self.async_client is not None:
+            results = await asyncio.gather(*(fetch_one(self.async_client, target) for target in targets))
+        else:
+            async with httpx.AsyncClient(follow_redirects=True, timeout=30.0) as client:
+                results = await asyncio.gather(*(fetch_one(client, target) for target in targets))
+        return self._join(results)
 
 
 class GoogleSearchTool(Tool):
     """Tool for performing Google searches."""
 
+    def __init__(
+        self,
+        async_client: Optional[httpx.AsyncClient] = None,
+        client: Optional[httpx.Client] = None,
+    ):
+        """Initialize search tool.
+
+        Args:
+            async_client: Optional shared client used by ``aexecute``.
+                          A temporary client is created per call if omitted.
+            client: Optional client used by ``execute`` (defaults to the
+                    process-wide pooled, caching client)
+        """
+        self.async_client = async_client
+        self.client = client
+
     @property
     def name(self) -> str:
         return "google_web_search"
@@ -123,52 +408,86 @@ class GoogleSearchTool(Tool):
         """Web search requires user confirmation for safety."""
         return True
 
+    @property
+    def concurrency_safe(self) -> bool:
+        """Web searches have no local side effects."""
+        return True
+
+    @property
+    def uses_network(self) -> bool:
+        """Searching the web needs the network."""
+        return True
+
+    @property
+    def cache_ttl(self) -> Optional[float]:
+        """Search results are reused for a few minutes."""
+        return SEARCH_CACHE_TTL
+
+    def _search_url(self, query: str) -> str:
+        """Build the search URL for a query."""
+        # Use DuckDuckGo HTML as a Google alternative (no API key required)
+        encoded_query = quote_plus(query)
+        return f"https://html.duckduckgo.com/html/?q={encoded_query}"
+
+    def _format_results(self, query: str, html: str, num_results: int) -> str:
+        """Parse a search result page into the tool result."""
+        soup = BeautifulSoup(html, "html.parser")
+        results = []
+
+        # Parse DuckDuckGo results
+        for result_div in soup.find_all("div", class_="result", limit=num_results):
+            title_elem = result_div.find("a", class_="result__a")
+            snippet_elem = result_div.find("a", class_="result__snippet")
+
+            if title_elem:
+                title = title_elem.get_text(strip=True)
+                link = title_elem.get("href", "")
+                snippet = snippet_elem.get_text(strip=True) if snippet_elem else ""
+
+                results.append({
+                    "title": title,
+                    "url": link,
+                    "snippet": snippet,
+                })
+
+        if not results:
+            return f"No search results found for: {query}"
+
+        output = f"Search results for: {query}\n\n"
+        for i, result in enumerate(results, 1):
+            output += f"{i}. {result['title']}\n"
+            output += f"   URL: {result['url']}\n"
+            if result['snippet']:
+                output += f"   {result['snippet']}\n"
+            output += "\n"
+
+        return output
+
     def execute(self, query: str, num_results: int = 5) -> str:
         """Perform Google search."""
         try:
-            # Use DuckDuckGo HTML as a Google alternative (no API key required)
-            encoded_query = quote_plus(query)
-            url = f"https://html.duckduckgo.com/html/?q={encoded_query}"
-
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            }
-
-            with httpx.Client(timeout=30.0) as client:
-                response = client.get(url, headers=headers)
-                response.raise_for_status()
-
-                soup = BeautifulSoup(response.text, "html.parser")
-                results = []
-
-                # Parse DuckDuckGo results
-                for result_div in soup.find_all("div", class_="result", limit=num_results):
-                    title_elem = result_div.find("a", class_="result__a")
-                    snippet_elem = result_div.find("a", class_="result__snippet")
-
-                    if title_elem:
-                        title = title_elem.get_text(strip=True)
-                        link = title_elem.get("href", "")
-                        snippet = snippet_elem.get_text(strip=True) if snippet_elem else ""
-
-                        results.append({
-                            "title": title,
-                            "url": link,
-                            "snippet": snippet,
-                        })
-
-                if not results:
-                    return f"No search results found for: {query}"
-
-                output = f"Search results for: {query}\n\n"
-                for i, result in enumerate(results, 1):
-                    output += f"{i}. {result['title']}\n"
-                    output += f"   URL: {result['url']}\n"
-                    if result['snippet']:
-                        output += f"   {result['snippet']}\n"
-                    output += "\n"
-
-                return output
+            client = self.client or get_http_client()
+            response = client.get(self._search_url(query), headers=DEFAULT_HEADERS, timeout=30.0)
+            response.raise_for_status()
+            return self._format_results(query, response.text, num_results)
+
+        except httpx.HTTPError as e:
+            return f"Error performing search: {str(e)}"
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+    async def aexecute(self, query: str, num_results: int = 5) -> str:
+        """Perform Google search without blocking the event loop."""
+        try:
+            if self.async_client is not None:
+                response = await self.async_client.get(
+                    self._search_url(query), headers=DEFAULT_HEADERS, timeout=30.0
+                )
+            else:
+                async with httpx.AsyncClient(timeout=30.0) as client:
+                    response = await client.get(self._search_url(query), headers=DEFAULT_HEADERS)
+            response.raise_for_status()
+            return self._format_results(query, response.text, num_results)
 
         except httpx.HTTPError as e:
             return f"Error performing search: {str(e)}"
@@ -0,0 +1,206 @@
+"""Test AsyncChatAgent, AsyncLLMClient and async tool execution."""
+
+import asyncio
+import time
+from unittest.mock import Mock
+
+import httpx
+from openai.types.chat import ChatCompletion
+
+from chatagent import AsyncChatAgent
+from chatagent.tools import ShellTool, WebFetchTool
+
+
+def _response(content=None, tool_calls=None):
+    """Build a chat completion like the API would return."""
+    message = {"role": "assistant", "content": content}
+    if tool_calls:
+        message["tool_calls"] = tool_calls
+    return ChatCompletion.construct(
+        id="chatcmpl-1",
+        object="chat.completion",
+        created=0,
+        model="test-model",
+        choices=[{"index": 0, "finish_reason": "stop", "message": message}],
+    )
+
+
+class FakeAsyncLLM:
+    """Async LLM stand-in that first asks for a tool, then answers."""
+
+    def __init__(self, delay=0.1):
+        self.delay = delay
+        self.logger = Mock()
+        self.model = "test-model"
+        self.record_tool_call = Mock()
+        self.record_turn = Mock()
+
+    async def chat(self, messages, tools=None, **kwargs):
+        await asyncio.sleep(self.delay)
+        if messages[-1]["role"] == "user":
+            return _response(tool_calls=[{
+                "id": "call_1",
+                "type": "function",
+                "function": {"name": "cli_help", "arguments": '{"question": "commands"}'},
+            }])
+        return _response(content=f"answer after {messages[-1]['name']}")
+
+
+def test_many_concurrent_conversations():
+    """Test that one event loop drives many conversations at once."""
+
+    async def run():
+        llm = FakeAsyncLLM(delay=0.1)
+        async with httpx.AsyncClient() as http_client:
+            agents = [AsyncChatAgent(llm=llm, http_client=http_client) for _ in range(20)]
+            start = time.monotonic()
+            answers = await asyncio.gather(*(agent.chat("help") for agent in agents))
+            elapsed = time.monotonic() - start
+        return agents, answers, elapsed
+
+    agents, answers, elapsed = asyncio.run(run())
+
+    assert answers == ["answer after cli_help"] * 20
+    assert [m["role"] for m in agents[0].messages] == ["user", "assistant", "tool", "assistant"]
+    # Two LLM round-trips of 0.1s each; sequential execution would take 4s
+    assert elapsed < 1.5, f"Conversations did not overlap ({elapsed:.2f}s)"
+
+    print(f"✅ 20 conversations finished in {elapsed:.2f}s")
+
+
+def test_async_confirmation_callback():
+    """Test that coroutine confirmation callbacks are awaited."""
+    calls = []
+
+    async def confirm(name, description, args):
+        calls.append(name)
+        return False
+
+    async def run():
+        llm = FakeAsyncLLM(delay=0)
+        agent = AsyncChatAgent(llm=llm, confirmation_callback=confirm)
+        tool_call = Mock()
+        tool_call.function.name = "run_shell_command"
+        tool_call.function.arguments = '{"command": "echo hi"}'
+        results = await agent._aexecute_tool_calls([tool_call])
+        await agent.aclose()
+        return results
+
+    results = asyncio.run(run())
+
+    assert calls == ["run_shell_command"]
+    assert "cancelled by user" in results[0]
+
+    print("✅ Async confirmation callback is awaited")
+
+
+def test_shell_tool_aexecute():
+    """Test async shell execution and timeout handling."""
+    tool = ShellTool()
+
+    output = asyncio.run(tool.aexecute(command="echo async-shell"))
+    assert "async-shell" in output
+    assert "Return code: 0" in output
+
+    output = asyncio.run(tool.aexecute(command="sleep 5", timeout=0.2))
+    assert "timed out" in output
+
+    print("✅ ShellTool.aexecute runs commands and enforces timeouts")
+
+
+def test_concurrent_shell_sessions_hold_no_threads():
+    """Test that many session commands at once leave the default executor free."""
+    count = 40
+
+    async def run():
+        tools = [ShellTool() for _ in range(count)]
+        assert all(tool.session is not None for tool in tools)
+        try:
+            tasks = [
+                asyncio.create_task(tool.aexecute(command=f"sleep 1; cd /tmp; echo shell-{i}"))
+                for i, tool in enumerate(tools)
+            ]
+            await asyncio.sleep(0.3)
+            started = time.perf_counter()
+            await asyncio.to_thread(lambda: None)
+            waited = time.perf_counter() - started
+            outputs = await asyncio.gather(*tasks)
+            # Session state still carries over
+            pwd = await tools[0].aexecute(command="pwd")
+        finally:
+            for tool in tools:
+                tool.close()
+        return waited, outputs, pwd
+
+    started = time.perf_counter()
+    waited, outputs, pwd = asyncio.run(run())
+    elapsed = time.perf_counter() - started
+
+    assert waited < 0.5, f"to_thread waited {waited:.2f}s behind shell commands"
+    assert elapsed < 5, f"{count} one-second commands took {elapsed:.2f}s"
+    for i, output in enumerate(outputs):
+        assert f"shell-{i}" in output and "Return code: 0" in output
+    assert "/tmp" in pwd
+
+    print(f"✅ {count} concurrent shell sessions ran in {elapsed:.2f}s without holding threads")
+
+
+def test_aclose_stops_shell_sessions():
+    """Test that closing agents ends their persistent shell sessions."""
+
+    async def run():
+        llm = FakeAsyncLLM(delay=0)
+        agents = [AsyncChatAgent(llm=llm) for _ in range(3)]
+        for agent in agents:
+            assert "Return code: 0" in await agent.shell_tool.aexecute(command="echo hi")
+        processes = [agent.shell_tool.session.process for agent in agents]
+        assert all(process.poll() is None for process in processes)
+        for agent in agents:
+            await agent.aclose()
+        return processes
+
+    processes = asyncio.run(run())
+    assert all(process.poll() is not None for process in processes)
+
+    print("✅ aclose stops the shell session")
+
+
+def test_web_fetch_aexecute_uses_shared_client():
+    """Test that web_fetch uses the injected AsyncClient."""
+    requested = []
+
+    def handler(request):
+        requested.append(str(request.url))
+        return httpx.Response(200, text="<html><body><p>Hello async</p></body></html>")
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            tool = WebFetchTool(async_client=client)
+            return await tool.aexecute(url="https://example.com/page")
+
+    output = asyncio.run(run())
+
+    assert requested == ["https://example.com/page"]
+    assert "Hello async" in output
+
+    print("✅ WebFetchTool.aexecute uses the shared client")
+
+
+if __name__ == "__main__":
+    print("Testing async agent...")
+    print()
+
+    test_many_concurrent_conversations()
+    print()
+    test_async_confirmation_callback()
+    print()
+    test_shell_tool_aexecute()
+    print()
+    test_concurrent_shell_sessions_hold_no_threads()
+    print()
+    test_aclose_stops_shell_sessions()
+    print()
+    test_web_fetch_aexecute_uses_shared_client()
+    print()
+    print("=" * 50)
+    print("✅ All tests passed!")
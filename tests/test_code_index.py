@@ -0,0 +1,203 @@
+"""Test the symbol index behind codebase_investigator."""
+
+import os
+from unittest.mock import patch
+
+from chatagent.tools import CodebaseInvestigatorTool
+from chatagent.tools import code_index
+from chatagent.tools.code_index import CodeIndex, extract_symbols
+from chatagent.tools.result_cache import record_modification
+
+
+def _make_tree(root):
+    (root / "pkg").mkdir()
+    (root / "pkg" / "service.py").write_text(
+        "import os\n"
+        "from .util import helper as h\n"
+        "\n"
+        "TIMEOUT = 30\n"
+        "\n"
+        "class Service(Base):\n"
+        "    def run(self, job):\n"
+        "        return h(job)\n"
+        "\n"
+        "    async def stop(self):\n"
+        "        helper()\n"
+    )
+    (root / "pkg" / "util.py").write_text("def helper(value=None):\n    return os.path.join(value)\n")
+    (root / "web").mkdir()
+    (root / "web" / "app.ts").write_text(
+        "export class Router {}\n"
+        "export async function handle(req) {}\n"
+        "const render = (x) => x\n"
+    )
+    (root / "broken.py").write_text("def oops(:\n")
+    (root / "notes.txt").write_text("def not_code(): pass\n")
+
+
+def _touch(path, content):
+    path.write_text(content)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_extract_python_and_regex_languages():
+    """Test symbol extraction with ast and with regexes."""
+    result = extract_symbols("m.py", "class A:\n    X = 1\n    def f(self, y: int = 2):\n        g(y)\n")
+    assert [(s[1], s[2], s[5]) for s in result["symbols"]] == [
+        ("A", "class", "class A"),
+        ("A.X", "variable", "X = 1"),
+        ("A.f", "method", "def f(self, y: int=2)"),
+    ]
+    assert result["calls"] == [("A.f", "g", 4)]
+
+    result = extract_symbols("main.go", "package main\n\nfunc (s *Server) Serve() {}\ntype Server struct {}\n")
+    assert result["language"] == "go"
+    assert [(s[0], s[2], s[3]) for s in result["symbols"]] == [("Serve", "function", 3), ("Server", "type", 4)]
+
+    assert extract_symbols("bad.py", "def (")["status"].startswith("error")
+
+    print("✅ Symbols extracted from Python and regex languages")
+
+
+def test_queries(tmp_path):
+    """Test definition, caller, import, outline and search queries."""
+    root = tmp_path / "repo"
+    root.mkdir()
+    _make_tree(root)
+    index = CodeIndex(root, index_dir=tmp_path / "index")
+    assert index.update() == {"added": 4, "updated": 0, "removed": 0, "unchanged": 0}
+
+    rows = index.definitions("Service.run")
+    assert [(r["path"], r["line"], r["end_line"]) for r in rows] == [("pkg/service.py", 7, 8)]
+    assert [r["path"] for r in index.definitions("helper")] == ["pkg/util.py"]
+    assert [r["kind"] for r in index.definitions("TIMEOUT")] == ["variable"]
+    assert [r["signature"] for r in index.definitions("handle")] == ["export async function handle(req) {}"]
+
+    assert [(r["caller"], r["line"]) for r in index.callers("helper")] == [("Service.stop", 11)]
+    assert [(r["caller"], r["line"]) for r in index.callers("util.h")] == [("Service.run", 8)]
+
+    assert [(r["module"], r["alias"]) for r in index.importers("helper")] == [(".util", "h")]
+    assert [r["path"] for r in index.importers("os")] == ["pkg/service.py"]
+
+    assert [r["qualname"] for r in index.outline("pkg/service.py")] == [
+        "TIMEOUT", "Service", "Service.run", "Service.stop",
+    ]
+    assert [r["qualname"] for r in index.search("serv")] == ["Service"]
+
+    info = index.status()
+    assert info["languages"] == {"python": 3, "typescript": 1}
+    assert info["parse_errors"] == ["broken.py"]
+
+    print("✅ Definition, caller, import, outline and search queries work")
+
+
+def test_incremental_update(tmp_path):
+    """Test that only changed files are re-parsed."""
+    root = tmp_path / "repo"
+    root.mkdir()
+    _make_tree(root)
+    index = CodeIndex(root, index_dir=tmp_path / "index")
+    index.update()
+
+    _touch(root / "pkg" / "util.py", "def helper2():\n    pass\n")
+    (root / "broken.py").unlink()
+    with patch.object(code_index, "extract_symbols", wraps=code_index.extract_symbols) as extract:
+        assert index.update() == {"added": 0, "updated": 1, "removed": 1, "unchanged": 2}
+    assert [call.args[0] for call in extract.call_args_list] == ["pkg/util.py"]
+
+    assert index.definitions("helper") == []
+    assert [r["path"] for r in index.definitions("helper2")] == ["pkg/util.py"]
+    assert index.status()["parse_errors"] == []
+
+    print("✅ Index updates incrementally")
+
+
+def test_parallel_parse(tmp_path):
+    """Test parsing changed files in worker processes."""
+    root = tmp_path / "repo"
+    root.mkdir()
+    for i in range(20):
+        (root / f"mod{i}.py").write_text(f"def func{i}():\n    func{(i + 1) % 20}()\n")
+
+    index = CodeIndex(root, index_dir=tmp_path / "index")
+    with patch.object(code_index, "PARALLEL_THRESHOLD", 5):
+        assert index.update()["added"] == 20
+    assert [(r["path"], r["caller"]) for r in index.callers("func0")] == [("mod19.py", "func19")]
+
+    print("✅ Many changed files are parsed in parallel")
+
+
+def test_investigator_tool(tmp_path):
+    """Test the codebase_investigator queries and index reuse for subdirectories."""
+    root = tmp_path / "repo"
+    root.mkdir()
+    _make_tree(root)
+    tool = CodebaseInvestigatorTool(index_dir=tmp_path / "index")
+
+    overview = tool.execute("overview", directory=str(root))
+    assert "=== Code Index ===" in overview
+    assert "Indexed source files: python: 3, typescript: 1" in overview
+    assert "Files that failed to parse: broken.py" in overview
+
+    result = tool.execute("find run", directory=str(root), query="definition", name="Service.run")
+    assert result.startswith("Definitions of 'Service.run' (1, ")
+    assert "pkg/service.py:7-8  method Service.run: def run(self, job)" in result
+
+    # A subdirectory reuses the root's index, filtered to that directory
+    result = tool.execute("who calls", directory=str(root / "pkg"), query="callers", name="helper")
+    assert "pkg/service.py:11  in Service.stop" in result
+    assert len(list((tmp_path / "index").glob("*.code.db"))) == 1
+    assert "none found" in tool.execute("ts", directory=str(root / "pkg"), query="definition", name="Router")
+
+    result = tool.execute("outline", directory=str(root), query="outline", name="pkg/service.py")
+    assert "6-11  class Service(Base)" in result
+    assert "10-11      async def stop(self)" in result
+
+    assert tool.execute("x", directory=str(root), query="callers") == "Error: query 'callers' needs a name"
+
+    print("✅ codebase_investigator answers symbol queries")
+
+
+def test_investigator_throttles_updates(tmp_path):
+    """Test that back-to-back queries skip the walk unless files were modified."""
+    root = tmp_path / "repo"
+    root.mkdir()
+    _make_tree(root)
+    tool = CodebaseInvestigatorTool(index_dir=tmp_path / "index")
+
+    with patch.object(CodeIndex, "update", autospec=True, side_effect=CodeIndex.update) as update:
+        tool.execute("find", directory=str(root), query="definition", name="helper")
+        tool.execute("find", directory=str(root / "pkg"), query="callers", name="helper")
+        assert update.call_count == 1
+
+        # A tool call that may have written files forces an update
+        _touch(root / "pkg" / "util.py", "def assist():\n    pass\n")
+        record_modification()
+        assert "pkg/util.py:1-2  function assist" in tool.execute("find", directory=str(root), query="definition", name="assist")
+        assert update.call_count == 2
+
+        # So does the end of the interval
+        with patch.object(CodebaseInvestigatorTool, "UPDATE_INTERVAL", 0):
+            tool.execute("find", directory=str(root), query="definition", name="assist")
+        assert update.call_count == 3
+
+    print("✅ codebase_investigator skips redundant index updates")
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    print("Testing code index...")
+    print()
+
+    test_extract_python_and_regex_languages()
+    for test in (test_queries, test_incremental_update, test_parallel_parse, test_investigator_tool,
+                 test_investigator_throttles_updates):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+
+    print()
+    print("=" * 50)
+    print("✅ All tests passed!")
@@ -0,0 +1,157 @@
+"""Test token-budgeted context compaction."""
+
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from chatagent.context import ContextWindowManager, STUB_PREFIX
+
+
+def _turn(i, tool_output="x" * 2000):
+    """Build one user turn with a tool call and a large tool result."""
+    return [
+        {"role": "user", "content": f"question {i}"},
+        {
+            "role": "assistant",
+            "content": "",
+            "tool_calls": [{
+                "id": f"call_{i}",
+                "type": "function",
+                "function": {"name": "read_file", "arguments": '{"file_path": "a.txt"}'},
+            }],
+        },
+        {"role": "tool", "tool_call_id": f"call_{i}", "name": "read_file", "content": tool_output},
+        {"role": "assistant", "content": f"answer {i}"},
+    ]
+
+
+def _history(turns):
+    messages = []
+    for i in range(turns):
+        messages.extend(_turn(i))
+    return messages
+
+
+def test_split_recent_keeps_whole_turns():
+    """Test that recent turns start at a user message."""
+    manager = ContextWindowManager(keep_recent_turns=2)
+    older, recent = manager.split_recent(_history(5))
+
+    assert len(older) == 12
+    assert recent[0] == {"role": "user", "content": "question 3"}
+
+    print("✅ History splits on turn boundaries")
+
+
+def test_stub_tool_results_only_in_older_turns():
+    """Test that only older tool results are stubbed, and only once."""
+    manager = ContextWindowManager(keep_recent_turns=2)
+    messages, stubbed = manager.stub_tool_results(_history(5))
+
+    assert stubbed == 3
+    tool_messages = [m for m in messages if m["role"] == "tool"]
+    assert all(m["content"].startswith(STUB_PREFIX) for m in tool_messages[:3])
+    assert all(m["content"] == "x" * 2000 for m in tool_messages[3:])
+    assert manager.count_tokens(messages) < manager.count_tokens(_history(5))
+
+    _, stubbed_again = manager.stub_tool_results(messages)
+    assert stubbed_again == 0
+
+    print("✅ Old tool results replaced by stubs")
+
+
+def test_drop_oldest_turns():
+    """Test the last-resort truncation drops whole turns."""
+    manager = ContextWindowManager(max_tokens=1200, keep_recent_turns=1)
+    messages, dropped = manager.drop_oldest_turns(_history(4))
+
+    assert dropped % 4 == 0 and dropped > 0
+    assert messages[0]["role"] == "user"
+
+    print(f"✅ Dropped {dropped} messages in whole turns")
+
+
+def _make_agent(**kwargs):
+    with patch('chatagent.agent.LLMClient') as mock_llm_client:
+        mock_llm_client.return_value.logger = Mock()
+        mock_llm_client.return_value.model = "gpt-4"
+
+        from chatagent.agent import ChatAgent
+
+        return ChatAgent(**kwargs)
+
+
+def _summary_response(text):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+
+def test_agent_compact_summarizes_older_turns():
+    """Test that /compact replaces older turns with an LLM summary."""
+    agent = _make_agent(context_budget=100000)
+    agent.context.keep_recent_turns = 2
+    agent.messages = _history(5)
+    agent.llm.chat.return_value = _summary_response("- user asked 3 questions about a.txt")
+
+    stats = agent.compact(force=True)
+
+    assert stats["summarized"] == 12
+    assert stats["tokens_after"] < stats["tokens_before"]
+    assert agent.messages[0]["content"] == "question 3"
+    assert "=== Conversation Summary ===" in agent._build_system_prompt()
+    assert "user asked 3 questions" in agent._build_system_prompt()
+
+    request = agent.llm.chat.call_args.kwargs["messages"]
+    assert "question 0" in request[1]["content"]
+
+    print("✅ /compact summarizes older turns into the system prompt")
+
+
+def _system_tokens(agent):
+    return agent.context.estimate_tokens({"content": agent._build_system_prompt()})
+
+
+def test_auto_compact_stubs_before_summarizing():
+    """Test that the automatic policy stops after stubbing if that is enough."""
+    agent = _make_agent()
+    agent.context.max_tokens = _system_tokens(agent) + 1500
+    agent.context.keep_recent_turns = 2
+    agent.messages = _history(5)
+
+    agent._maybe_compact()
+
+    agent.llm.chat.assert_not_called()
+    assert len(agent.messages) == 20
+    assert agent.get_context_tokens() <= agent.context.max_tokens
+
+    print("✅ Automatic compaction stubs tool results without an LLM call")
+
+
+def test_auto_compact_falls_back_to_dropping():
+    """Test that failed summarization falls back to dropping old turns."""
+    agent = _make_agent()
+    agent.context.max_tokens = _system_tokens(agent) + 700
+    agent.context.keep_recent_turns = 1
+    agent.messages = _history(5)
+    agent.llm.chat.side_effect = RuntimeError("provider unavailable")
+
+    agent._maybe_compact()
+
+    assert agent.messages[0]["role"] == "user"
+    assert len(agent.messages) < 20
+    assert agent.get_context_tokens() <= agent.context.max_tokens
+
+    print("✅ Falls back to dropping turns when summarization fails")
+
+
+if __name__ == "__main__":
+    print("Testing context compaction...")
+    print()
+
+    test_split_recent_keeps_whole_turns()
+    test_stub_tool_results_only_in_older_turns()
+    test_drop_oldest_turns()
+    test_agent_compact_summarizes_older_turns()
+    test_auto_compact_stubs_before_summarizing()
+    test_auto_compact_falls_back_to_dropping()
+    print()
+    print("=" * 50)
+    print("✅ All tests passed!")
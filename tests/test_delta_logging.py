@@ -0,0 +1,142 @@
+"""Test delta-only, queue-backed request logging in LLMClient."""
+
+from logging.handlers import QueueHandler
+from unittest.mock import Mock, patch
+
+from openai.types.chat import ChatCompletion
+
+from chatagent.llm import LLMClient
+
+
+def _response(content):
+    return ChatCompletion.construct(
+        id="chatcmpl-1",
+        object="chat.completion",
+        created=0,
+        model="test-model",
+        choices=[{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+    )
+
+
+def _client(tmp_path, **kwargs):
+    client = LLMClient(api_key="test-key", model="test-model", log_file=str(tmp_path / "test.log"), **kwargs)
+    client.client = Mock()
+    client.client.chat.completions.create.return_value = _response("ok")
+    return client
+
+
+def _run_conversation(client, conversation_id="conv1"):
+    """Send three requests of a growing conversation with a stable system prompt."""
+    system = {"role": "system", "content": "SYSTEM PROMPT"}
+    history = [{"role": "user", "content": "first question"}]
+    client.chat(messages=[system] + history, conversation_id=conversation_id)
+
+    history += [{"role": "assistant", "content": "first answer"}, {"role": "user", "content": "second question"}]
+    client.chat(messages=[system] + history, conversation_id=conversation_id)
+
+    history += [{"role": "assistant", "content": "second answer"}, {"role": "user", "content": "third question"}]
+    client.chat(messages=[system] + history, conversation_id=conversation_id)
+
+    client.flush_logs()
+
+
+def test_async_logging_uses_queue_handler(tmp_path):
+    """Test that records go through a QueueHandler and reach the file."""
+    client = _client(tmp_path)
+
+    assert any(isinstance(h, QueueHandler) for h in client.logger.handlers)
+
+    client.logger.info("background record")
+    client.flush_logs()
+    assert "background record" in (tmp_path / "test.log").read_text()
+
+    print("✅ Log records are written by a background listener")
+
+
+def test_delta_mode_logs_each_message_once(tmp_path):
+    """Test that delta mode only logs messages added since the last request."""
+    client = _client(tmp_path, log_mode="delta")
+    _run_conversation(client)
+
+    log = (tmp_path / "test.log").read_text()
+    assert log.count("SYSTEM PROMPT") == 1
+    assert log.count("first question") == 1
+    assert log.count("second question") == 1
+    assert "offset 2" in log and "offset 4" in log
+    assert "already logged up to req_2" in log
+
+    print("✅ Delta mode logs every message exactly once")
+
+
+def test_delta_mode_relogs_after_divergence(tmp_path):
+    """Test that a changed system prompt or rewritten history is logged again."""
+    client = _client(tmp_path, log_mode="delta")
+
+    client.chat(messages=[{"role": "system", "content": "PROMPT A"}, {"role": "user", "content": "q1"}], conversation_id="c")
+    client.chat(messages=[{"role": "system", "content": "PROMPT B"}, {"role": "user", "content": "q1 compacted"}], conversation_id="c")
+    client.flush_logs()
+
+    log = (tmp_path / "test.log").read_text()
+    assert "PROMPT B" in log
+    assert "q1 compacted" in log
+    assert "system prompt changed" in log
+
+    print("✅ Changed messages are logged again")
+
+
+def test_delta_mode_fingerprints_only_new_messages(tmp_path):
+    """Test that resent history messages are not serialized again."""
+    client = _client(tmp_path, log_mode="delta")
+    system = {"role": "system", "content": "SYSTEM PROMPT"}
+    history = [{"role": "user", "content": f"message {i}"} for i in range(100)]
+    client.chat(messages=[system] + history, conversation_id="c")
+
+    history += [{"role": "assistant", "content": "answer"}, {"role": "user", "content": "next"}]
+    with patch.object(client, "_message_fingerprint", wraps=client._message_fingerprint) as fingerprint:
+        client.chat(messages=[system] + history, conversation_id="c")
+    # The system prompt and the two new messages
+    assert fingerprint.call_count == 3
+
+    # An equal message in a new dict still counts as already logged
+    history[0] = dict(history[0])
+    client.chat(messages=[system] + history + [{"role": "user", "content": "last"}], conversation_id="c")
+    client.flush_logs()
+
+    log = (tmp_path / "test.log").read_text()
+    assert log.count("message 0") == 1 and "offset 103" in log
+
+    print("✅ Delta mode fingerprints only new messages")
+
+
+def test_full_mode_logs_everything(tmp_path):
+    """Test that full mode keeps the original behaviour."""
+    client = _client(tmp_path, log_mode="full", async_logging=False)
+    _run_conversation(client)
+
+    log = (tmp_path / "test.log").read_text()
+    assert log.count("SYSTEM PROMPT") == 3
+    assert log.count("first question") == 3
+
+    print("✅ Full mode logs the whole conversation on every request")
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    print("Testing delta logging...")
+    print()
+
+    for test in (
+        test_async_logging_uses_queue_handler,
+        test_delta_mode_logs_each_message_once,
+        test_delta_mode_relogs_after_divergence,
+        test_delta_mode_fingerprints_only_new_messages,
+        test_full_mode_logs_everything,
+    ):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+
+    print()
+    print("=" * 50)
+    print("✅ All tests passed!")
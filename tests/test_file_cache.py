@@ -0,0 +1,140 @@
+"""Test the shared file content cache."""
+
+import os
+from unittest.mock import Mock, patch
+
+from chatagent.tools import EditTool, ReadFileTool, SearchTextTool, WriteFileTool
+from chatagent.tools.file_cache import FileContentCache, get_file_cache
+
+
+def _touch(path, seconds=1):
+    """Move a file's mtime forward so the change is always visible."""
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 1_000_000_000))
+
+
+def test_hits_misses_and_invalidation(tmp_path):
+    """Test that entries are reused until the file changes."""
+    cache = FileContentCache()
+    path = tmp_path / "a.txt"
+    path.write_text("one\r\ntwo\n")
+
+    assert cache.read_text(str(path)) == "one\ntwo\n"
+    assert cache.read_text(str(path)) == "one\ntwo\n"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    path.write_text("changed\n")
+    _touch(path)
+    assert cache.read_text(str(path)) == "changed\n"
+    assert cache.misses == 2
+
+    print("✅ Cache hits until the file's mtime or size changes")
+
+
+def test_decode_errors_are_cached(tmp_path):
+    """Test that binary files are remembered as undecodable."""
+    cache = FileContentCache()
+    path = tmp_path / "blob.bin"
+    path.write_bytes(b"\xff\xfe\x00binary")
+
+    for _ in range(2):
+        try:
+            cache.read_text(str(path))
+            assert False, "expected UnicodeDecodeError"
+        except UnicodeDecodeError:
+            pass
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    print("✅ Decode errors are cached")
+
+
+def test_lru_eviction_and_large_files(tmp_path):
+    """Test the memory cap and the per-entry limit."""
+    cache = FileContentCache(max_bytes=8000)
+    for name in ("a", "b", "c"):
+        (tmp_path / name).write_text(name * 1500)
+        cache.read_text(str(tmp_path / name))
+
+    stats = cache.stats()
+    assert stats["bytes"] <= 8000
+    assert stats["entries"] == 0  # every entry exceeds max_bytes // 8
+
+    cache = FileContentCache(max_bytes=4000)
+    names = [f"file{i}" for i in range(20)]
+    for name in names:
+        (tmp_path / name).write_text("x" * 400)
+        cache.read_text(str(tmp_path / name))
+    stats = cache.stats()
+    assert 0 < stats["entries"] < len(names)
+    assert stats["bytes"] <= 4000
+
+    # The most recently read file survives eviction, the oldest does not
+    cache.read_text(str(tmp_path / names[-1]))
+    cache.read_text(str(tmp_path / names[0]))
+    assert (cache.hits, cache.misses) == (1, len(names) + 1)
+
+    print("✅ LRU eviction keeps the cache under its cap")
+
+
+def test_tools_share_the_cache(tmp_path):
+    """Test that read, search, write and edit go through the shared cache."""
+    cache = get_file_cache()
+    cache.clear()
+    path = tmp_path / "module.py"
+    WriteFileTool().execute(str(path), "def foo():\n    return 1\n")
+
+    # The write populated the cache, so reads and searches are hits
+    assert "return 1" in ReadFileTool().execute(str(path))
+    assert "module.py:2:" in SearchTextTool(use_index=False).execute("return", directory=str(tmp_path))
+    assert cache.misses == 0
+    assert cache.hits == 2
+
+    assert EditTool().execute(str(path), "return 1", "return 2").startswith("Successfully")
+    assert ReadFileTool().execute(str(path)).endswith("return 2\n")
+    assert cache.misses == 0
+
+    # Changes made outside the tools are picked up
+    path.write_text("def foo():\n    return 3\n")
+    _touch(path)
+    assert ReadFileTool().execute(str(path)).endswith("return 3\n")
+    assert cache.misses == 1
+
+    print("✅ File tools share the cache and see external changes")
+
+
+@patch('chatagent.agent.LLMClient')
+def test_status_summary_reports_cache(mock_llm_class):
+    """Test that /status shows the cache statistics."""
+    from chatagent.agent import ChatAgent
+
+    mock_llm = mock_llm_class.return_value
+    mock_llm.logger = Mock()
+    mock_llm.model = "gpt-4"
+
+    agent = ChatAgent()
+    agent.messages = [{"role": "user", "content": "hi"}]
+    assert "File cache:" in agent.get_conversation_summary()
+
+    print("✅ Conversation summary reports file cache statistics")
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    print("Testing file content cache...")
+    print()
+
+    for test in (
+        test_hits_misses_and_invalidation,
+        test_decode_errors_are_cached,
+        test_lru_eviction_and_large_files,
+        test_tools_share_the_cache,
+    ):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    test_status_summary_reports_cache()
+
+    print()
+    print("=" * 50)
+    print("✅ All tests passed!")
@@ -0,0 +1,130 @@
+"""Test the gitignore-aware file walker and the search tools built on it."""
+
+from chatagent.tools import CodebaseInvestigatorTool, FindFilesTool, SearchTextTool
+from chatagent.tools.walker import is_ignored, parse_gitignore, walk_files
+
+
+def _make_repo(root):
+    (root / ".git").mkdir()
+    (root / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+    (root / ".gitignore").write_text("*.log\nbuild/\n!keep.log\n/docs/*.tmp\n")
+    (root / "main.py").write_text("print('needle')\n")
+    (root / "debug.log").write_text("needle\n")
+    (root / "keep.log").write_text("needle\n")
+    (root / "build").mkdir()
+    (root / "build" / "out.py").write_text("needle\n")
+    (root / "docs").mkdir()
+    (root / "docs" / "draft.tmp").write_text("needle\n")
+    (root / "docs" / "guide.md").write_text("needle\n")
+    (root / "node_modules").mkdir()
+    (root / "node_modules" / "lib.js").write_text("needle\n")
+    (root / "pkg").mkdir()
+    (root / "pkg" / ".gitignore").write_text("local.py\n")
+    (root / "pkg" / "local.py").write_text("needle\n")
+    (root / "pkg" / "mod.py").write_text("needle = 1\n")
+    (root / "pkg" / "data.bin").write_bytes(b"needle\0\0\0binary")
+
+
+def test_gitignore_rules():
+    """Test gitignore pattern semantics."""
+    rules = parse_gitignore("*.pyc\n/build\ndocs/**/*.tmp\nout/\n!important.pyc\n")
+
+    assert is_ignored("a/b/c.pyc", False, rules)
+    assert not is_ignored("a/important.pyc", False, rules)
+    assert is_ignored("build", True, rules)
+    assert not is_ignored("src/build", True, rules)
+    assert is_ignored("docs/x/y/z.tmp", False, rules)
+    assert is_ignored("src/out", True, rules)
+    assert not is_ignored("src/out", False, rules)
+
+    print("✅ gitignore patterns parsed")
+
+
+def test_walk_files_honors_gitignore(tmp_path):
+    """Test that the walker skips ignored, VCS and dependency directories."""
+    _make_repo(tmp_path)
+
+    files = [rel for rel, _ in walk_files(tmp_path)]
+    assert files == [".gitignore", "keep.log", "main.py", "docs/guide.md", "pkg/.gitignore", "pkg/data.bin", "pkg/mod.py"]
+
+    # Walking a subdirectory still applies the repository's root .gitignore
+    (tmp_path / "pkg" / "trace.log").write_text("needle\n")
+    assert [rel for rel, _ in walk_files(tmp_path / "pkg")] == [".gitignore", "data.bin", "mod.py"]
+
+    assert [rel for rel, _ in walk_files(tmp_path, max_depth=1)] == [".gitignore", "keep.log", "main.py"]
+
+    print("✅ Walker honors .gitignore files")
+
+
+def test_search_skips_ignored_and_binary_files(tmp_path):
+    """Test that search_file_content only reports tracked text files."""
+    _make_repo(tmp_path)
+
+    output = SearchTextTool(use_index=False).execute(pattern="needle", directory=str(tmp_path))
+
+    assert output.startswith("Found 4 match(es):")
+    for rel in ("main.py", "keep.log", "docs/guide.md", "pkg/mod.py"):
+        assert f"{rel}:1:" in output
+    for rel in ("debug.log", "build/out.py", "node_modules", "local.py", "data.bin"):
+        assert rel not in output
+
+    print("✅ Search skips ignored and binary files")
+
+
+def test_search_stops_early_with_estimate(tmp_path):
+    """Test early termination at the result limit with an estimated total."""
+    for i in range(40):
+        (tmp_path / f"file_{i:02d}.txt").write_text("match one\nmatch two\n")
+
+    tool = SearchTextTool(use_index=False, max_results=10, max_workers=2)
+    output = tool.execute(pattern="match", directory=str(tmp_path))
+
+    header, body = output.split("\n\n", 1)
+    assert "stopped early" in header
+    assert "of 40 file(s)" in header
+    assert "about 80 match(es)" in header
+    assert body.splitlines()[:2] == ["file_00.txt:1: match one", "file_00.txt:2: match two"]
+    assert len([line for line in body.splitlines() if line.startswith("file_")]) == 10
+
+    exact = SearchTextTool(use_index=False).execute(pattern="match", directory=str(tmp_path), file_pattern="file_0*.txt")
+    assert exact.startswith("Found 20 match(es):")
+
+    print("✅ Search stops at the result limit and estimates the total")
+
+
+def test_glob_and_investigator_reuse_walker(tmp_path):
+    """Test that glob and codebase_investigator skip ignored files too."""
+    _make_repo(tmp_path)
+
+    output = FindFilesTool().execute(pattern="**/*.py", directory=str(tmp_path))
+    assert output == "Found 2 file(s):\n\nmain.py\npkg/mod.py"
+    assert FindFilesTool().execute(pattern="pkg/*.py", directory=str(tmp_path)).endswith("pkg/mod.py")
+
+    report = CodebaseInvestigatorTool(index_dir=tmp_path / "index").execute(
+        task="python", directory=str(tmp_path), file_patterns=["*.py"]
+    )
+    assert ".py: 2 files" in report
+
+    print("✅ glob and codebase_investigator use the shared walker")
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    print("Testing file walker...")
+    print()
+
+    test_gitignore_rules()
+    for test in (
+        test_walk_files_honors_gitignore,
+        test_search_skips_ignored_and_binary_files,
+        test_search_stops_early_with_estimate,
+        test_glob_and_investigator_reuse_walker,
+    ):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+
+    print()
+    print("=" * 50)
+    print("✅ All tests passed!")
@@ -0,0 +1,207 @@
+"""Test the pooled web client and its on-disk HTTP cache."""
+
+import asyncio
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from chatagent.tools import WebFetchTool
+from chatagent.tools.http_client import HTTPCache, create_async_http_client, create_http_client
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Local stand-in for a web server with different caching headers."""
+
+    protocol_version = "HTTP/1.1"
+    requests = Counter()
+    not_modified = Counter()
+    client_ports = set()
+    version = "v1"
+
+    def do_GET(self):
+        type(self).requests[self.path] += 1
+        type(self).client_ports.add(self.client_address[1])
+
+        headers = {}
+        if self.path == "/fresh":
+            headers["Cache-Control"] = "max-age=60"
+        elif self.path == "/etag":
+            headers["Cache-Control"] = "no-cache"
+            headers["ETag"] = f'"{self.version}"'
+            if self.headers.get("If-None-Match") == f'"{self.version}"':
+                type(self).not_modified[self.path] += 1
+                self._send(304, b"", headers)
+                return
+        elif self.path == "/nostore":
+            headers["Cache-Control"] = "no-store"
+
+        body = f"<html><body><p>Page {self.path} {self.version}</p></body></html>".encode()
+        self._send(200, body, headers)
+
+    def _send(self, status, body, headers):
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve():
+    """Start the stand-in server and reset its counters."""
+    _Handler.requests = Counter()
+    _Handler.not_modified = Counter()
+    _Handler.client_ports = set()
+    _Handler.version = "v1"
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_fresh_responses_are_served_from_disk(tmp_path):
+    """Test that fresh responses skip the network, even across clients."""
+    server, base = _serve()
+    try:
+        with create_http_client(HTTPCache(tmp_path)) as client:
+            tool = WebFetchTool(client=client)
+            assert "Page /fresh v1" in tool.execute(f"{base}/fresh")
+            second = tool.execute(f"{base}/fresh")
+            assert "Status: 200 (from cache, hit)" in second
+            assert "Page /fresh v1" in second
+
+        # The cache is on disk, so a new client (a new session) reuses it
+        with create_http_client(HTTPCache(tmp_path)) as client:
+            assert "from cache" in WebFetchTool(client=client).execute(f"{base}/fresh")
+
+        assert _Handler.requests["/fresh"] == 1
+    finally:
+        server.shutdown()
+
+    print("✅ Fresh responses are served from the on-disk cache")
+
+
+def test_revalidation_and_no_store(tmp_path):
+    """Test ETag revalidation, changed content and no-store responses."""
+    server, base = _serve()
+    try:
+        cache = HTTPCache(tmp_path)
+        with create_http_client(cache) as client:
+            tool = WebFetchTool(client=client)
+            tool.execute(f"{base}/etag")
+            assert "(from cache, revalidated)" in tool.execute(f"{base}/etag")
+            assert _Handler.not_modified["/etag"] == 1
+
+            _Handler.version = "v2"
+            assert "Page /etag v2" in tool.execute(f"{base}/etag")
+
+            tool.execute(f"{base}/nostore")
+            assert "from cache" not in tool.execute(f"{base}/nostore")
+            assert _Handler.requests["/nostore"] == 2
+
+        assert cache.stats() == {"hits": 0, "revalidated": 1, "misses": 4}
+    finally:
+        server.shutdown()
+
+    print("✅ Stale entries are revalidated and no-store is honored")
+
+
+def test_default_ttl_and_size_cap(tmp_path):
+    """Test the configurable TTL and the size cap."""
+    server, base = _serve()
+    try:
+        with create_http_client(HTTPCache(tmp_path, ttl=0)) as client:
+            client.get(f"{base}/plain").read()
+            client.get(f"{base}/plain").read()
+        assert _Handler.requests["/plain"] == 2
+
+        cache = HTTPCache(tmp_path / "small", max_bytes=2000)
+        with create_http_client(cache) as client:
+            for i in range(10):
+                client.get(f"{base}/page{i}").read()
+        stored = sum(path.stat().st_size for path in (tmp_path / "small").iterdir())
+        assert stored <= 2000
+        assert len(list((tmp_path / "small").glob("*.json"))) < 10
+    finally:
+        server.shutdown()
+
+    print("✅ TTL and size cap are enforced")
+
+
+def test_client_is_pooled(tmp_path):
+    """Test that repeated fetches reuse one connection."""
+    server, base = _serve()
+    try:
+        with create_http_client(None) as client:
+            tool = WebFetchTool(client=client)
+            for _ in range(3):
+                tool.execute(f"{base}/plain")
+        assert _Handler.requests["/plain"] == 3
+        assert len(_Handler.client_ports) == 1
+    finally:
+        server.shutdown()
+
+    print("✅ Web tools reuse pooled connections")
+
+
+def test_async_client_uses_cache(tmp_path):
+    """Test the async transport."""
+    server, base = _serve()
+
+    async def run():
+        async with create_async_http_client(HTTPCache(tmp_path)) as client:
+            tool = WebFetchTool(async_client=client)
+            await tool.aexecute(url=f"{base}/fresh")
+            return await tool.aexecute(url=f"{base}/fresh")
+
+    try:
+        assert "(from cache, hit)" in asyncio.run(run())
+        assert _Handler.requests["/fresh"] == 1
+    finally:
+        server.shutdown()
+
+    print("✅ Async web fetches use the cache")
+
+
+def test_partial_reads_are_not_cached(tmp_path):
+    """Test that a body abandoned half-way is not stored."""
+    server, base = _serve()
+    try:
+        cache = HTTPCache(tmp_path)
+        with create_http_client(cache) as client:
+            with client.stream("GET", f"{base}/fresh") as response:
+                assert isinstance(response, httpx.Response)
+            client.get(f"{base}/fresh").read()
+        assert _Handler.requests["/fresh"] == 2
+    finally:
+        server.shutdown()
+
+    print("✅ Partially read bodies are not cached")
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    print("Testing HTTP client and cache...")
+    print()
+
+    for test in (
+        test_fresh_responses_are_served_from_disk,
+        test_revalidation_and_no_store,
+        test_default_ttl_and_size_cap,
+        test_client_is_pooled,
+        test_async_client_uses_cache,
+        test_partial_reads_are_not_cached,
+    ):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+
+    print()
+    print("=" * 50)
+    print("✅ All tests passed!")
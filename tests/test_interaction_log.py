@@ -0,0 +1,157 @@
+"""Test the structured JSONL interaction log and `chatagent stats`."""
+
+import gzip
+import json
+from unittest.mock import Mock, patch
+
+from openai.types.chat import ChatCompletion
+from rich.console import Console
+
+from chatagent.llm import LLMClient
+from chatagent.llm.interaction_log import InteractionLog
+from chatagent.stats import compute_stats, log_files, percentile, read_records, run_stats
+
+
+def _response(content, prompt_tokens=100, completion_tokens=20):
+    return ChatCompletion.construct(
+        id="chatcmpl-1",
+        object="chat.completion",
+        created=0,
+        model="test-model",
+        choices=[{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+        usage={"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens},
+    )
+
+
+def _records(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_llm_and_tool_calls_are_recorded(tmp_path):
+    """Test that each LLM call and tool execution produces one JSON record."""
+    jsonl = tmp_path / "interactions.jsonl"
+    client = LLMClient(api_key="test-key", model="test-model", log_file=str(tmp_path / "test.log"), interaction_log=str(jsonl))
+    client.client = Mock()
+    client.client.chat.completions.create.return_value = _response("ok")
+
+    client.chat(messages=[{"role": "user", "content": "hi"}], conversation_id="conv1")
+    client.record_tool_call("read_file", 0.25, "file contents", "conv1")
+    client.client.chat.completions.create.side_effect = RuntimeError("boom")
+    try:
+        client.chat(messages=[{"role": "user", "content": "hi"}])
+    except RuntimeError:
+        pass
+    client.flush_logs()
+
+    llm_call, tool_call, failed = _records(jsonl)
+    assert llm_call["type"] == "llm_call"
+    assert llm_call["request_id"] == "req_1"
+    assert llm_call["model"] == "test-model"
+    assert llm_call["prompt_tokens"] == 100 and llm_call["completion_tokens"] == 20
+    assert llm_call["latency_ms"] >= 0
+    assert tool_call == {**tool_call, "type": "tool_call", "tool": "read_file", "latency_ms": 250.0, "result_chars": 13, "error": False}
+    assert "RuntimeError: boom" in failed["error"]
+
+    print("✅ LLM calls and tool executions are written as JSONL records")
+
+
+def test_agent_records_tool_executions():
+    """Test that ChatAgent reports every executed tool to the LLM client."""
+    with patch('chatagent.agent.LLMClient') as mock_llm_client:
+        mock_llm_client.return_value.logger = Mock()
+        mock_llm_client.return_value.model = "gpt-4"
+
+        from chatagent.agent import ChatAgent
+
+        agent = ChatAgent()
+        tool = Mock(requires_confirmation=False)
+        tool.execute.return_value = "result"
+        result = agent._run_tool(tool, "fake_tool", {})
+
+        assert result == "result"
+        name, latency, recorded, conversation_id = agent.llm.record_tool_call.call_args.args
+        assert (name, recorded, conversation_id) == ("fake_tool", "result", agent.conversation_id)
+        assert latency >= 0
+
+    print("✅ ChatAgent records tool name, latency and result size")
+
+
+def test_rotation_compresses_backups(tmp_path):
+    """Test size-based rotation into gzip backups readable by stats."""
+    jsonl = tmp_path / "rotating.jsonl"
+    log = InteractionLog(str(jsonl), max_bytes=500, backup_count=3)
+    for i in range(40):
+        log.record("tool_call", tool="glob", latency_ms=float(i), result_chars=10)
+    log.flush()
+
+    files = log_files(str(jsonl))
+    assert files[-1] == str(jsonl)
+    assert [f.endswith(".gz") for f in files[:-1]] == [True] * 3
+    with gzip.open(files[0], "rt") as f:
+        assert json.loads(f.readline())["tool"] == "glob"
+
+    # Oldest backups beyond backup_count are discarded, the rest are read in order
+    latencies = [r["latency_ms"] for r in read_records(files)]
+    assert latencies == sorted(latencies)
+    assert latencies[-1] == 39.0
+
+    print("✅ Rotated logs are gzip-compressed and read back in order")
+
+
+def test_compute_stats():
+    """Test percentiles, throughput and slowest tool ranking."""
+    assert percentile([1, 2, 3, 4], 50) == 2.5
+    assert percentile([], 95) is None
+
+    records = [{"type": "llm_call", "latency_ms": 1000.0 * i, "completion_tokens": 50} for i in range(1, 5)]
+    records.append({"type": "llm_call", "latency_ms": 5.0, "error": "Timeout"})
+    records += [{"type": "tool_call", "tool": "web_fetch", "latency_ms": 900.0, "result_chars": 5000}] * 2
+    records += [{"type": "tool_call", "tool": "read_file", "latency_ms": 2.0, "result_chars": 100}]
+
+    stats = compute_stats(records)
+
+    assert stats["llm"]["calls"] == 5 and stats["llm"]["errors"] == 1
+    assert stats["llm"]["latency_ms"][50] == 2500.0
+    assert stats["llm"]["tokens_per_sec"] == 200 / 10
+    assert [t["tool"] for t in stats["slowest_tools"]] == ["web_fetch", "read_file"]
+    assert stats["slowest_tools"][0]["mean_result_chars"] == 5000
+
+    print("✅ Stats compute latency percentiles, tokens/sec and slowest tools")
+
+
+def test_run_stats_output(tmp_path):
+    """Test the `chatagent stats` report."""
+    jsonl = tmp_path / "stats.jsonl"
+    jsonl.write_text(
+        json.dumps({"type": "llm_call", "latency_ms": 1200.0, "prompt_tokens": 10, "completion_tokens": 30}) + "\n"
+        + json.dumps({"type": "tool_call", "tool": "run_shell_command", "latency_ms": 3000.0, "result_chars": 42}) + "\n"
+        + '{"type": "llm_call", "trunc'
+    )
+    console = Console(record=True, width=120)
+
+    assert run_stats([str(jsonl)], console=console) == 0
+    output = console.export_text()
+    assert "Latency p95" in output
+    assert "run_shell_command" in output
+
+    assert run_stats([str(tmp_path / "missing.jsonl")], console=console) == 1
+
+    print("✅ chatagent stats prints the report")
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    print("Testing interaction log...")
+    print()
+
+    for test in (test_llm_and_tool_calls_are_recorded, test_rotation_compresses_backups, test_run_stats_output):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    test_agent_records_tool_executions()
+    test_compute_stats()
+
+    print()
+    print("=" * 50)
+    print("✅ All tests passed!")
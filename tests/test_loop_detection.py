@@ -0,0 +1,118 @@
+"""Test loop detection in the tool-iteration loop."""
+
+import json
+import os
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from openai.types.chat import ChatCompletion
+
+from chatagent.loop_detection import LoopDetector, call_key
+from chatagent.stats import compute_stats
+
+
+def _call(name, **arguments):
+    return SimpleNamespace(function=SimpleNamespace(name=name, arguments=json.dumps(arguments)))
+
+
+def _response(tool_calls):
+    message = {"role": "assistant", "content": None, "tool_calls": tool_calls}
+    return ChatCompletion.construct(
+        id="chatcmpl-1",
+        object="chat.completion",
+        created=0,
+        model="test-model",
+        choices=[{"index": 0, "finish_reason": "tool_calls", "message": message}],
+    )
+
+
+def _make_agent(env=None):
+    with patch('chatagent.agent.LLMClient') as mock_llm_client, patch.dict(os.environ, env or {}):
+        mock_llm_client.return_value.logger = Mock()
+        mock_llm_client.return_value.model = "gpt-4"
+
+        from chatagent.agent import ChatAgent
+
+        return ChatAgent()
+
+
+def test_detector_flags_wasted_iterations():
+    """Test repeated calls, repeated errors and cycles."""
+    assert call_key("glob", '{"a": 1, "b": 2}') == call_key("glob", '{"b": 2, "a": 1}')
+
+    detector = LoopDetector(stop_after=2)
+    assert detector.observe([_call("glob", pattern="*.py")], ["a.py"]) is None
+    # Same call, new result: progress
+    assert detector.observe([_call("glob", pattern="*.py")], ["a.py\nb.py"]) is None
+    hint = detector.observe([_call("glob", pattern="*.py")], ["a.py\nb.py"])
+    assert "already returned exactly this result" in hint
+    assert (detector.wasted, detector.should_stop) == (1, False)
+
+    # A new call resets the streak; an error repeated with a different message still counts
+    assert detector.observe([_call("read_file", file_path="x")], ["Error: x not found"]) is None
+    hint = detector.observe([_call("read_file", file_path="x")], ["Error: x not found (again)"])
+    assert "keeps failing the same way" in hint
+    assert detector.streak == 1
+
+    # A, B, A, B
+    detector.reset()
+    detector.observe([_call("glob", pattern="*")], ["a"])
+    detector.observe([_call("list_directory")], ["b"])
+    assert "2 iterations ago" in detector.observe([_call("glob", pattern="*")], ["a"])
+    detector.observe([_call("list_directory")], ["b"])
+    assert (detector.wasted, detector.should_stop) == (2, True)
+
+    print("✅ Wasted iterations are detected")
+
+
+def test_agent_stops_a_looping_turn(tmp_path):
+    """Test that the agent hints, then stops a turn that keeps failing the same way."""
+    agent = _make_agent()
+    arguments = json.dumps({"pattern": "*.py", "directory": str(tmp_path / "missing")})
+    agent.llm.chat.return_value = _response([
+        {"id": "call_1", "type": "function", "function": {"name": "glob", "arguments": arguments}},
+    ])
+
+    response = agent.chat("Find the Python files")
+    assert "kept repeating the same tool calls" in response
+    assert agent.llm.chat.call_count == 4
+    agent.llm.record_turn.assert_called_once_with(4, 3, True, agent.conversation_id)
+
+    tool_results = [m["content"] for m in agent.messages if m["role"] == "tool"]
+    assert "[Loop detected" not in tool_results[0]
+    assert all("keeps failing the same way" in result for result in tool_results[1:])
+    assert "Wasted tool iterations: 3 (1 turns stopped early)" in agent.get_conversation_summary()
+
+    # Hints only
+    agent = _make_agent({"CHATAGENT_LOOP_STOP_AFTER": "0"})
+    agent.llm.chat.return_value = _response([
+        {"id": "call_1", "type": "function", "function": {"name": "glob", "arguments": arguments}},
+    ])
+    agent.chat("Find the Python files", max_iterations=6)
+    agent.llm.record_turn.assert_called_once_with(6, 5, False, agent.conversation_id)
+    assert _make_agent({"CHATAGENT_LOOP_STOP_AFTER": "off"}).loop_detector is None
+
+    stats = compute_stats([
+        {"type": "turn", "iterations": 2, "wasted_iterations": 0, "stopped": False},
+        {"type": "turn", "iterations": 4, "wasted_iterations": 3, "stopped": True},
+    ])
+    assert stats["turns"]["wasted_iterations"] == 3 and stats["turns"]["stopped"] == 1
+    assert stats["turns"]["max_iterations"] == 4
+
+    print("✅ Looping turns are stopped early")
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    print("Testing loop detection...")
+    print()
+
+    test_detector_flags_wasted_iterations()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_agent_stops_a_looping_turn(Path(tmp))
+
+    print()
+    print("=" * 50)
+    print("✅ All tests passed!")
@@ -0,0 +1,122 @@
+"""Test BM25 recall of saved memories into the system prompt."""
+
+import os
+from unittest.mock import Mock, patch
+
+from chatagent.retrieval import BM25Index, MemoryRecall, tokenize
+from chatagent.tools.memory_store import SQLiteMemoryStore
+
+
+def test_tokenize_and_bm25_ranking():
+    """Test term extraction and BM25 ordering."""
+    assert tokenize("What are the user_preferences?") == ["user", "preference"]
+
+    index = BM25Index([
+        tokenize("deploy through the staging cluster"),
+        tokenize("format code with black, black everywhere"),
+        tokenize("code review happens on fridays"),
+    ])
+    ranked = index.search(tokenize("how do I format code"))
+    assert [doc for doc, _ in ranked] == [1, 2]
+    assert ranked[0][1] > ranked[1][1] > 0
+    assert index.search(["unknown"]) == []
+    assert BM25Index([]).search(["anything"]) == []
+
+    print("✅ BM25 ranks documents sharing query terms")
+
+
+def test_recall_top_k_budget_and_index_cache(tmp_path):
+    """Test the top-k and token limits and that the index is reused."""
+    store = SQLiteMemoryStore(tmp_path / "memory.db")
+    store.save("formatter", "The project formats Python code with black", ["python"])
+    store.save("python_version", "The project targets Python 3.12", ["python"])
+    store.save("deploy", "Deploys go through the staging cluster")
+    store.save("python_notes", "Python " + "long note " * 200, ["python"])
+
+    recall = MemoryRecall(store, top_k=2, token_budget=100)
+    keys = [m["key"] for m in recall.recall("Which Python version and formatter should I use?")]
+    assert keys == ["python_version", "formatter"]
+    assert recall.recall("nothing relevant here") == []
+    assert recall.recall("the and of") == []
+    assert recall.builds == 1
+
+    # Saving a memory invalidates the cached index
+    store.save("deploy", "Deploys go straight to production")
+    assert [m["key"] for m in recall.recall("production deploys")] == ["deploy"]
+    assert recall.builds == 2
+
+    # The long memory does not fit the budget and is skipped
+    wide = MemoryRecall(store, top_k=10, token_budget=100)
+    assert "python_notes" not in [m["key"] for m in wide.recall("python")]
+
+    print("✅ Recall honours top-k and the token budget and caches its index")
+
+
+def test_recall_from_env(tmp_path):
+    """Test the environment settings."""
+    store = SQLiteMemoryStore(tmp_path / "memory.db")
+    with patch.dict(os.environ, {"CHATAGENT_MEMORY_RECALL": "off"}):
+        assert not MemoryRecall.from_env(store).enabled
+    with patch.dict(os.environ, {"CHATAGENT_MEMORY_RECALL": "3", "CHATAGENT_MEMORY_RECALL_TOKENS": "50"}):
+        recall = MemoryRecall.from_env(store)
+        assert (recall.top_k, recall.token_budget) == (3, 50)
+
+    print("✅ Recall is configured by the environment")
+
+
+def test_agent_injects_relevant_memories(tmp_path):
+    """Test that chat() shows only the relevant memories to the model."""
+    cwd = os.getcwd()
+    os.chdir(tmp_path)
+    try:
+        with patch('chatagent.agent.LLMClient') as mock_llm_client:
+            mock_llm_client.return_value.logger = Mock()
+            mock_llm_client.return_value.model = "gpt-4"
+
+            from chatagent.agent import ChatAgent
+
+            agent = ChatAgent()
+            agent.memory_tool.execute("formatter", "Format code with black", ["style"])
+            agent.memory_tool.execute("deploy", "Deploys go through staging")
+
+            message = Mock(content="Use black.", tool_calls=None)
+            agent.llm.chat.return_value = Mock(choices=[Mock(message=message)])
+
+            agent.chat("How should I format this code?")
+            system_prompt = agent.llm.chat.call_args.kwargs["messages"][0]["content"]
+            assert "=== Relevant Memories ===" in system_prompt
+            assert "• formatter: Format code with black (tags: style)" in system_prompt
+            assert "deploy" not in system_prompt
+
+            agent.chat("Thanks!")
+            system_prompt = agent.llm.chat.call_args.kwargs["messages"][0]["content"]
+            assert "=== Relevant Memories ===" not in system_prompt
+
+            agent.chat("How should I format this code?")
+            agent.clear_history()
+            assert agent.recalled_memories == []
+    finally:
+        os.chdir(cwd)
+
+    print("✅ The agent injects only relevant memories")
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    print("Testing memory recall...")
+    print()
+
+    test_tokenize_and_bm25_ranking()
+    for test in (
+        test_recall_top_k_budget_and_index_cache,
+        test_recall_from_env,
+        test_agent_injects_relevant_memories,
+    ):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+
+    print()
+    print("=" * 50)
+    print("✅ All tests passed!")
@@ -0,0 +1,127 @@
+"""Test the SQLite memory store behind save_memory."""
+
+import json
+import sqlite3
+import threading
+
+from chatagent.tools import SaveMemoryTool
+from chatagent.tools.memory_store import JSONMemoryStore, SQLiteMemoryStore
+
+
+def test_save_update_and_list(tmp_path):
+    """Test upserts keyed by memory key."""
+    tool = SaveMemoryTool(str(tmp_path / "memory.db"))
+
+    assert tool.execute("user_preference", "Uses black", ["style"]) == "Saved memory: user_preference"
+    assert tool.execute("project_context", "Python 3.12 CLI") == "Saved memory: project_context"
+    assert tool.execute("user_preference", "Uses ruff format", ["style", "tools"]) == "Updated memory: user_preference"
+
+    memories = tool.get_all_memories()
+    assert [m["key"] for m in memories] == ["user_preference", "project_context"]
+    assert memories[0]["value"] == "Uses ruff format"
+    assert memories[0]["tags"] == ["style", "tools"]
+    assert memories[1]["tags"] == []
+
+    conn = sqlite3.connect(tmp_path / "memory.db")
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    conn.close()
+
+    print("✅ Memories are upserted by key in a WAL database")
+
+
+def test_full_text_search(tmp_path):
+    """Test FTS search over key, value and tags."""
+    tool = SaveMemoryTool(str(tmp_path / "memory.db"))
+    tool.execute("user_preference", "Format code with black", ["style"])
+    tool.execute("deploy", "Deploys go through the staging cluster first", ["ops"])
+    tool.execute("editor", "Prefers vim keybindings")
+
+    assert [m["key"] for m in tool.search_memories("staging")] == ["deploy"]
+    assert sorted(m["key"] for m in tool.search_memories("pref")) == ["editor", "user_preference"]
+    assert [m["key"] for m in tool.search_memories("style")] == ["user_preference"]
+    assert [m["key"] for m in tool.search_memories("code black")] == ["user_preference"]
+    assert tool.search_memories("nothing matches") == []
+    assert tool.search_memories('"') == []
+
+    # The FTS index follows updates
+    tool.execute("deploy", "Deploys go straight to production", ["ops"])
+    assert tool.search_memories("staging") == []
+    assert [m["key"] for m in tool.search_memories("production")] == ["deploy"]
+
+    print("✅ Memories are found by full-text search")
+
+
+def test_migration_from_json(tmp_path):
+    """Test the one-time import of the legacy JSON file."""
+    legacy = tmp_path / "memory.json"
+    legacy.write_text(json.dumps({"memories": [
+        {"key": "old", "value": "From JSON", "timestamp": "2024-01-01T00:00:00", "tags": ["legacy"]},
+    ]}))
+
+    tool = SaveMemoryTool(str(tmp_path / "memory.db"))
+    assert tool.get_all_memories() == [
+        {"key": "old", "value": "From JSON", "timestamp": "2024-01-01T00:00:00", "tags": ["legacy"]},
+    ]
+    assert json.loads(legacy.read_text())["memories"][0]["key"] == "old"
+
+    # Later changes to the JSON file are not imported again
+    tool.execute("old", "Updated in SQLite")
+    legacy.write_text(json.dumps({"memories": [{"key": "other", "value": "x"}]}))
+    reopened = SaveMemoryTool(str(tmp_path / "memory.db"))
+    assert [(m["key"], m["value"]) for m in reopened.get_all_memories()] == [("old", "Updated in SQLite")]
+
+    print("✅ The legacy JSON file is imported once")
+
+
+def test_concurrent_saves(tmp_path):
+    """Test that saves from several stores at once are all kept."""
+    path = tmp_path / "memory.db"
+    SQLiteMemoryStore(path)
+
+    def save(worker):
+        store = SQLiteMemoryStore(path)
+        for i in range(25):
+            store.save(f"key_{worker}_{i}", f"value {i}")
+
+    threads = [threading.Thread(target=save, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert SQLiteMemoryStore(path).count() == 100
+
+    print("✅ Concurrent saves are all kept")
+
+
+def test_json_path_keeps_json_store(tmp_path):
+    """Test that an explicit .json path uses the JSON store."""
+    tool = SaveMemoryTool(str(tmp_path / "memory.json"))
+    assert isinstance(tool.store, JSONMemoryStore)
+    tool.execute("key", "value", ["tag"])
+    assert json.loads((tmp_path / "memory.json").read_text())["memories"][0]["key"] == "key"
+    assert [m["key"] for m in tool.search_memories("ta")] == ["key"]
+
+    print("✅ A .json memory file keeps using the JSON store")
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    print("Testing memory store...")
+    print()
+
+    for test in (
+        test_save_update_and_list,
+        test_full_text_search,
+        test_migration_from_json,
+        test_concurrent_saves,
+        test_json_path_keeps_json_store,
+    ):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+
+    print()
+    print("=" * 50)
+    print("✅ All tests passed!")
@@ -0,0 +1,152 @@
+"""Test parallel execution of concurrency-safe tool calls."""
+
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from chatagent.tools import Tool, ReadFileTool, WriteFileTool, ShellTool, WebFetchTool
+
+
+class SlowTool(Tool):
+    """Tool that sleeps and records which thread ran it."""
+
+    def __init__(self, name, safe=True, confirm=False, delay=0.2):
+        self._name = name
+        self._safe = safe
+        self._confirm = confirm
+        self.delay = delay
+        self.threads = []
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def description(self):
+        return "Slow test tool"
+
+    @property
+    def parameters(self):
+        return {"type": "object", "properties": {"value": {"type": "string"}}}
+
+    @property
+    def requires_confirmation(self):
+        return self._confirm
+
+    @property
+    def concurrency_safe(self):
+        return self._safe
+
+    def execute(self, value=""):
+        self.threads.append(threading.current_thread().name)
+        time.sleep(self.delay)
+        return f"{self._name}:{value}"
+
+
+def _tool_call(call_id, name, value):
+    """Build a tool call object like the ones returned by the LLM."""
+    return SimpleNamespace(
+        id=call_id,
+        function=SimpleNamespace(name=name, arguments=f'{{"value": "{value}"}}'),
+    )
+
+
+def _make_agent(**kwargs):
+    with patch('chatagent.agent.LLMClient') as mock_llm_client:
+        mock_llm_client.return_value.logger = Mock()
+        mock_llm_client.return_value.model = "gpt-4"
+
+        from chatagent.agent import ChatAgent
+
+        return ChatAgent(**kwargs)
+
+
+def test_concurrency_safe_declarations():
+    """Test that read-only tools are concurrency safe and writers are not."""
+    assert ReadFileTool().concurrency_safe is True
+    assert WebFetchTool().concurrency_safe is True
+    assert WriteFileTool().concurrency_safe is False
+    assert ShellTool().concurrency_safe is False
+
+    print("✅ Tools declare concurrency safety")
+
+
+def test_safe_tools_run_concurrently_in_order():
+    """Test that safe tool calls overlap but results keep request order."""
+    agent = _make_agent(max_parallel_tools=4)
+    slow = SlowTool("slow_read")
+    agent.tools.register(slow)
+
+    calls = [_tool_call(f"call_{i}", "slow_read", str(i)) for i in range(4)]
+
+    start = time.monotonic()
+    results = agent._execute_tool_calls(calls)
+    elapsed = time.monotonic() - start
+
+    assert results == [f"slow_read:{i}" for i in range(4)]
+    assert elapsed < 0.6, f"Expected concurrent execution, took {elapsed:.2f}s"
+    assert all(name.startswith("chatagent-tool") for name in slow.threads)
+
+    print(f"✅ 4 safe tool calls finished in {elapsed:.2f}s, results in order")
+
+
+def test_unsafe_tool_is_a_barrier():
+    """Test that an unsafe tool runs alone on the calling thread."""
+    agent = _make_agent()
+    reader = SlowTool("slow_read", delay=0.05)
+    writer = SlowTool("slow_write", safe=False, delay=0.05)
+    agent.tools.register(reader)
+    agent.tools.register(writer)
+
+    calls = [
+        _tool_call("a", "slow_read", "1"),
+        _tool_call("b", "slow_read", "2"),
+        _tool_call("c", "slow_write", "3"),
+        _tool_call("d", "slow_read", "4"),
+    ]
+    results = agent._execute_tool_calls(calls)
+
+    assert results == ["slow_read:1", "slow_read:2", "slow_write:3", "slow_read:4"]
+    assert writer.threads == [threading.current_thread().name]
+
+    print("✅ Unsafe tools act as barriers")
+
+
+def test_confirmations_are_serialized():
+    """Test that confirmation prompts run one at a time in request order."""
+    prompts = []
+
+    def confirm(name, description, args):
+        prompts.append((threading.current_thread().name, args["value"]))
+        return args["value"] != "2"
+
+    agent = _make_agent(confirmation_callback=confirm)
+    agent.tools.register(SlowTool("slow_fetch", confirm=True, delay=0.01))
+
+    calls = [_tool_call(str(i), "slow_fetch", str(i)) for i in range(1, 4)]
+    results = agent._execute_tool_calls(calls)
+
+    assert [value for _, value in prompts] == ["1", "2", "3"]
+    assert all(thread == threading.current_thread().name for thread, _ in prompts)
+    assert results[0] == "slow_fetch:1"
+    assert "cancelled by user" in results[1]
+    assert results[2] == "slow_fetch:3"
+
+    print("✅ Confirmation prompts stay serialized on the calling thread")
+
+
+if __name__ == "__main__":
+    print("Testing parallel tool execution...")
+    print()
+
+    test_concurrency_safe_declarations()
+    print()
+    test_safe_tools_run_concurrently_in_order()
+    print()
+    test_unsafe_tool_is_a_barrier()
+    print()
+    test_confirmations_are_serialized()
+    print()
+    print("=" * 50)
+    print("✅ All tests passed!")
@@ -0,0 +1,132 @@
+"""Test the cache-friendly system prompt layout and prompt cache measurement."""
+
+import os
+from unittest.mock import Mock, patch
+
+from openai.types.chat import ChatCompletion
+
+from chatagent.llm import LLMClient
+from chatagent.llm.client import cached_prompt_tokens
+from chatagent.stats import compute_stats
+
+
+def _make_agent(env=None):
+    with patch('chatagent.agent.LLMClient') as mock_llm_client, patch.dict(os.environ, env or {}):
+        mock_llm_client.return_value.logger = Mock()
+        mock_llm_client.return_value.model = "gpt-4"
+
+        from chatagent.agent import ChatAgent
+
+        return ChatAgent()
+
+
+def test_volatile_data_trails_the_prompt():
+    """Test that the date and per-turn data come after the stable prefix."""
+    agent = _make_agent({"CHATAGENT_SKILLS_IN_PROMPT": "all"})
+    agent.add_message("user", "Help me with a PDF")
+    agent._prepare_turn("Help me with a PDF")
+
+    stable, volatile = agent._system_prompt_segments()
+    assert "Current Date and Time:" not in stable
+    assert "Current Date and Time:" in volatile
+    assert "=== Available Skills ===" in stable
+
+    # The whole prompt is identical across the tool iterations of a turn...
+    prompt = agent._build_system_prompt()
+    assert agent._build_system_prompt() == prompt
+
+    # ...and the prefix survives a skill activation and a new turn
+    agent.skill_manager.activate_skill("pdf", "Merge files")
+    agent.add_message("user", "And split them")
+    agent._prepare_turn("And split them")
+    assert agent._build_system_prompt().startswith(stable)
+    assert "=== Active Skills ===" in agent._system_prompt_segments()[1]
+
+    print("✅ Volatile data trails a stable prompt prefix")
+
+
+def test_segments_are_memoized():
+    """Test that segments are rebuilt only when their inputs change."""
+    agent = _make_agent({"CHATAGENT_SKILLS_IN_PROMPT": "all"})
+
+    with patch.object(agent, "_build_instructions", wraps=agent._build_instructions) as instructions, \
+         patch.object(agent, "_build_skills_section", wraps=agent._build_skills_section) as skills:
+        agent._prompt_segments.clear()
+        for _ in range(3):
+            agent._build_system_prompt()
+        assert (instructions.call_count, skills.call_count) == (1, 1)
+
+        agent.project_instructions = "Use tabs."
+        agent.skill_manager.version += 1
+        prompt = agent._build_system_prompt()
+        assert (instructions.call_count, skills.call_count) == (2, 2)
+        assert prompt.startswith("=== Project Instructions ===\n\nUse tabs.")
+
+    print("✅ Prompt segments are memoized")
+
+
+def test_cache_control_breakpoint():
+    """Test that the stable prefix can carry a cache_control breakpoint."""
+    agent = _make_agent({"CHATAGENT_PROMPT_CACHE_CONTROL": "on"})
+    stable, volatile = agent._system_prompt_segments()
+
+    system = agent._messages_with_system()[0]
+    assert system["content"] == [
+        {"type": "text", "text": stable, "cache_control": {"type": "ephemeral"}},
+        {"type": "text", "text": volatile},
+    ]
+    assert isinstance(_make_agent()._messages_with_system()[0]["content"], str)
+
+    print("✅ cache_control breakpoint marks the stable prefix")
+
+
+def test_cached_tokens_are_measured(tmp_path):
+    """Test that cached prompt tokens are read from usage and aggregated."""
+    openai_usage = Mock(prompt_tokens_details=Mock(cached_tokens=80))
+    anthropic_usage = Mock(prompt_tokens_details=None, cache_read_input_tokens=60)
+    assert cached_prompt_tokens(openai_usage) == 80
+    assert cached_prompt_tokens(anthropic_usage) == 60
+    assert cached_prompt_tokens(Mock(spec=["prompt_tokens"])) is None
+
+    client = LLMClient(api_key="test-key", model="test-model", log_file=str(tmp_path / "test.log"), interaction_log="off")
+    client.client = Mock()
+    client.client.chat.completions.create.return_value = ChatCompletion.construct(
+        id="chatcmpl-1",
+        object="chat.completion",
+        created=0,
+        model="test-model",
+        choices=[{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "ok"}}],
+        usage={"prompt_tokens": 100, "completion_tokens": 5, "total_tokens": 105,
+               "prompt_tokens_details": {"cached_tokens": 75}},
+    )
+    client.chat(messages=[{"role": "user", "content": "hi"}])
+    client.chat(messages=[{"role": "user", "content": "hi"}])
+    assert client.usage_totals == {"prompt_tokens": 200, "cached_tokens": 150}
+
+    stats = compute_stats([
+        {"type": "llm_call", "prompt_tokens": 1000, "cached_tokens": 900},
+        {"type": "llm_call", "prompt_tokens": 1000, "cached_tokens": 100},
+        {"type": "llm_call", "prompt_tokens": 500},
+    ])
+    assert stats["llm"]["cached_tokens"] == 1000
+    assert stats["llm"]["cache_ratio"] == 0.5
+
+    print("✅ Cached prompt tokens are measured")
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    print("Testing prompt caching...")
+    print()
+
+    test_volatile_data_trails_the_prompt()
+    test_segments_are_memoized()
+    test_cache_control_breakpoint()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_cached_tokens_are_measured(Path(tmp))
+
+    print()
+    print("=" * 50)
+    print("✅ All tests passed!")
@@ -0,0 +1,127 @@
+"""Test ranged and paginated read_file."""
+
+import os
+
+from chatagent.tools import ReadFileTool
+from chatagent.tools import file_ops
+from chatagent.tools.line_index import get_line_index
+
+
+def _write_lines(path, count):
+    path.write_text("".join(f"line {i}\n" for i in range(1, count + 1)))
+
+
+def test_small_file_is_returned_whole(tmp_path):
+    """Test that small files keep the original output."""
+    path = tmp_path / "small.txt"
+    path.write_text("hello\nworld\n")
+
+    assert ReadFileTool().execute(str(path)) == f"File: {path}\n\nhello\nworld\n"
+
+    print("✅ Small files are returned unchanged")
+
+
+def test_line_ranges_and_tail(tmp_path):
+    """Test offset/limit and head/tail modes."""
+    path = tmp_path / "lines.txt"
+    _write_lines(path, 50)
+    tool = ReadFileTool()
+
+    output = tool.execute(str(path), offset=10, limit=3)
+    assert output.startswith(f"File: {path} (lines 10-12 of 50)\n\nline 10\nline 11\nline 12\n")
+    assert 'cursor="line:13"' in output
+
+    output = tool.execute(str(path), mode="tail", limit=2)
+    assert output == f"File: {path} (lines 49-50 of 50)\n\nline 49\nline 50\n"
+
+    output = tool.execute(str(path), mode="head", limit=1)
+    assert output.splitlines()[2] == "line 1"
+
+    assert tool.execute(str(path), offset=51).startswith("Error: offset 51 is beyond the end")
+
+    print("✅ Line ranges and head/tail modes work")
+
+
+def test_oversized_read_returns_cursor(tmp_path):
+    """Test that large reads are paginated and the cursor continues them."""
+    path = tmp_path / "big.log"
+    _write_lines(path, 20000)
+    tool = ReadFileTool()
+
+    first = tool.execute(str(path))
+    assert first.startswith(f"File: {path} (lines 1-2000 of 20000)")
+    assert first.endswith('[Truncated: 18000 more line(s). To continue, call read_file with cursor="line:2001"]')
+
+    second = tool.execute(str(path), cursor="line:2001")
+    assert "\nline 2001\n" in second
+    assert 'cursor="line:4001"' in second
+
+    last = tool.execute(str(path), cursor="line:18001")
+    assert last.startswith(f"File: {path} (lines 18001-20000 of 20000)")
+    assert "Truncated" not in last
+
+    assert tool.execute(str(path), cursor="page-2").startswith("Error: Invalid cursor")
+
+    print("✅ Oversized reads are paginated with a cursor")
+
+
+def test_byte_budget_and_byte_ranges(tmp_path):
+    """Test the byte budget, long lines and byte ranges."""
+    path = tmp_path / "minified.js"
+    path.write_text("x" * (file_ops.MAX_READ_BYTES * 2) + "\nshort line\n")
+    tool = ReadFileTool()
+
+    # A single line longer than the budget falls back to a byte range
+    output = tool.execute(str(path), offset=1)
+    assert f"(bytes 0-{file_ops.MAX_READ_BYTES} of" in output
+    assert f'cursor="byte:{file_ops.MAX_READ_BYTES}"' in output
+
+    output = tool.execute(str(path), byte_offset=file_ops.MAX_READ_BYTES * 2 + 1, byte_limit=5)
+    assert "\n\nshort\n\n" in output
+    assert 'cursor="byte:' + str(file_ops.MAX_READ_BYTES * 2 + 6) + '"' in output
+
+    print("✅ Byte budget and byte ranges work")
+
+
+def test_line_index_is_cached_and_invalidated(tmp_path):
+    """Test that the line index is reused until the file changes."""
+    path = tmp_path / "data.txt"
+    _write_lines(path, 10)
+
+    index = get_line_index(str(path))
+    assert index.line_count == 10
+    assert get_line_index(str(path)) is index
+
+    with open(path, "a") as f:
+        f.write("no trailing newline")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    updated = get_line_index(str(path))
+    assert updated is not index
+    assert updated.line_count == 11
+    assert ReadFileTool().execute(str(path), mode="tail", limit=1).endswith("\n\nno trailing newline")
+
+    print("✅ Line index is cached and rebuilt when the file changes")
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    print("Testing ranged read_file...")
+    print()
+
+    for test in (
+        test_small_file_is_returned_whole,
+        test_line_ranges_and_tail,
+        test_oversized_read_returns_cursor,
+        test_byte_budget_and_byte_ranges,
+        test_line_index_is_cached_and_invalidated,
+    ):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+
+    print()
+    print("=" * 50)
+    print("✅ All tests passed!")
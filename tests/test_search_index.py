@@ -0,0 +1,124 @@
+"""Test the persistent trigram index behind search_file_content."""
+
+import os
+from unittest.mock import patch
+
+from chatagent.tools import SearchTextTool
+from chatagent.tools.search_index import TrigramIndex, find_index, required_literals
+
+
+def _make_tree(root):
+    (root / "src").mkdir()
+    (root / "src" / "app.py").write_text("def handle_request(req):\n    return Response(req)\n")
+    (root / "src" / "util.py").write_text("def helper():\n    return 'HANDLE_REQUEST in caps'\n")
+    (root / "README.md").write_text("Call handle_request to serve.\n")
+    (root / "logo.png").write_bytes(b"\x89PNG\r\n\x1a\n\0\0handle_request")
+    (root / ".git").mkdir()
+    (root / ".git" / "config").write_text("handle_request should never be indexed\n")
+
+
+def _touch(path, content):
+    path.write_text(content)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_required_literals():
+    """Test extraction of the substrings a regex match must contain."""
+    assert required_literals("handle_request", regex=False) == ["handle_request"]
+    assert required_literals("ab", regex=False) == []
+    assert required_literals(r"def \w+_request\(", regex=True) == ["def ", "_request("]
+    assert required_literals(r"(foo|bar)_baz", regex=True) == ["_baz"]
+    assert required_literals(r"^class\s+Tool", regex=True) == ["class", "Tool"]
+    assert required_literals(r"a.*b", regex=True) == []
+
+    print("✅ Required literals extracted from patterns")
+
+
+def test_index_build_and_candidates(tmp_path):
+    """Test that the index narrows candidates and skips binaries and .git."""
+    root = tmp_path / "repo"
+    root.mkdir()
+    _make_tree(root)
+    index = TrigramIndex(root, index_dir=tmp_path / "index")
+
+    stats = index.update()
+    assert stats == {"added": 4, "updated": 0, "removed": 0, "unchanged": 0}
+
+    names = [p.name for p in index.candidates(["handle_request"])]
+    assert names == ["README.md", "app.py", "util.py"]
+    assert [p.name for p in index.candidates(["Response("])] == ["app.py"]
+    assert [p.name for p in index.candidates(["handle_request"], root / "src")] == ["app.py", "util.py"]
+
+    status = index.status()
+    assert status["text_files"] == 3 and status["binary_files"] == 1
+
+    print("✅ Index narrows candidate files")
+
+
+def test_incremental_update(tmp_path):
+    """Test that only changed files are re-read."""
+    root = tmp_path / "repo"
+    root.mkdir()
+    _make_tree(root)
+    index = TrigramIndex(root, index_dir=tmp_path / "index")
+    index.update()
+
+    _touch(root / "src" / "util.py", "def helper():\n    return 'renamed_symbol'\n")
+    (root / "README.md").unlink()
+    (root / "NEW.txt").write_text("renamed_symbol appears here too\n")
+
+    stats = index.update()
+    assert stats == {"added": 1, "updated": 1, "removed": 1, "unchanged": 2}
+    assert [p.name for p in index.candidates(["renamed_symbol"])] == ["NEW.txt", "util.py"]
+    assert [p.name for p in index.candidates(["handle_request"])] == ["app.py"]
+    assert index.status()["stale_rows"] == 2
+
+    print("✅ Index updates incrementally by mtime and size")
+
+
+def test_search_tool_uses_index(tmp_path):
+    """Test that indexed searches match unindexed ones and see fresh edits."""
+    root = tmp_path / "repo"
+    root.mkdir()
+    _make_tree(root)
+
+    with patch.dict(os.environ, {"CHATAGENT_INDEX_DIR": str(tmp_path / "index")}):
+        plain = SearchTextTool(use_index=False)
+        indexed = SearchTextTool(use_index=True)
+
+        assert find_index(root) is None
+        TrigramIndex(root).update()
+        assert find_index(root / "src").root == root.resolve()
+
+        for kwargs in (
+            {"pattern": "handle_request"},
+            {"pattern": "HANDLE_REQUEST", "case_sensitive": False, "file_pattern": "**/*.py"},
+            {"pattern": r"return \w+\(", "regex": True},
+            {"pattern": "def", "file_pattern": "src/*.py"},
+        ):
+            # The plain scan returns files in directory order, the index in path order
+            expected = sorted(plain.execute(directory=str(root), **kwargs).splitlines())
+            assert sorted(indexed.execute(directory=str(root), **kwargs).splitlines()) == expected
+
+        _touch(root / "src" / "app.py", "def fresh_edit():\n    pass\n")
+        assert "app.py:1: def fresh_edit():" in indexed.execute(pattern="fresh_edit", directory=str(root / "src"))
+
+    print("✅ search_file_content gives the same results with the index")
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    print("Testing search index...")
+    print()
+
+    test_required_literals()
+    for test in (test_index_build_and_candidates, test_incremental_update, test_search_tool_uses_index):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+
+    print()
+    print("=" * 50)
+    print("✅ All tests passed!")
@@ -0,0 +1,161 @@
+"""Test background shell jobs."""
+
+import asyncio
+import gc
+import os
+import time
+import weakref
+from unittest.mock import Mock, patch
+
+from chatagent.tools import ShellJobKillTool, ShellJobOutputTool, ShellJobStatusTool, ShellTool
+from chatagent.tools.shell_jobs import ShellJobManager
+
+
+def test_background_job_lifecycle(tmp_path):
+    """Test starting a job, following its output and collecting its status."""
+    tool = ShellTool(persistent=True)
+    status = ShellJobStatusTool(tool.jobs)
+    output = ShellJobOutputTool(tool.jobs)
+    try:
+        tool.execute(f"cd {tmp_path} && export BUILD_FLAVOR=release")
+
+        started = time.monotonic()
+        result = tool.execute(
+            'echo "$BUILD_FLAVOR in $(pwd)"; sleep 0.5; echo done; exit 4', background=True
+        )
+        assert time.monotonic() - started < 2
+        assert result.startswith("Started background job job_1")
+        assert "running" in status.execute("job_1")
+
+        first = output.execute("job_1", wait=10)
+        assert f"release in {tmp_path}\ndone" in first
+        assert "exited with return code 4" in first
+
+        # Output is incremental: nothing new after the first read
+        assert "(no new output)" in output.execute("job_1")
+        assert "release" in output.execute("job_1", offset=0)
+
+        assert "job_1: exited with return code 4" in status.execute()
+        assert status.execute("job_7").startswith("Error: Unknown job 'job_7'")
+    finally:
+        tool.close()
+        tool.jobs.kill_all()
+
+    print("✅ Background jobs inherit the session and report output and status")
+
+
+def test_kill_and_tail_of_large_output():
+    """Test stopping a job and reading only the latest part of a large backlog."""
+    manager = ShellJobManager()
+    output = ShellJobOutputTool(manager)
+    kill = ShellJobKillTool(manager)
+
+    job = manager.start("seq 1 100000; sleep 30")
+    while job.output_size < len("".join(f"{i}\n" for i in range(1, 100001))):
+        time.sleep(0.05)
+
+    result = output.execute(job.job_id)
+    assert "earlier bytes skipped" in result
+    assert "\n100000\n" in result
+    assert len(result) < 20000
+
+    started = time.monotonic()
+    assert kill.execute(job.job_id).startswith(f"Stopped {job.job_id}: killed")
+    assert time.monotonic() - started < 5
+    assert not job.running
+    assert "already finished" in kill.execute(job.job_id)
+
+    print("✅ Jobs can be stopped and large output is tailed")
+
+
+def test_background_in_one_shot_and_async_modes(tmp_path):
+    """Test background jobs without a persistent session and from the async path."""
+    tool = ShellTool(persistent=False)
+    try:
+        result = asyncio.run(tool.aexecute(command="pwd", working_directory=str(tmp_path), background=True))
+        assert "job_1" in result
+        assert str(tmp_path) in ShellJobOutputTool(tool.jobs).execute("job_1", wait=10)
+    finally:
+        tool.jobs.kill_all()
+
+    print("✅ Background jobs work without a session and from async agents")
+
+
+@patch('chatagent.agent.LLMClient')
+def test_job_tools_are_registered(mock_llm_class):
+    """Test that the agent exposes the job tools wired to its shell tool."""
+    from chatagent.agent import ChatAgent
+
+    mock_llm = mock_llm_class.return_value
+    mock_llm.logger = Mock()
+    mock_llm.model = "gpt-4"
+
+    agent = ChatAgent()
+    for name in ("shell_job_status", "shell_job_output", "shell_job_kill"):
+        tool = agent.tools.get(name)
+        assert tool is not None
+        assert tool.manager is agent.shell_tool.jobs
+
+    print("✅ Job tools are registered with the agent")
+
+
+def test_close_stops_jobs_and_deletes_logs():
+    """Test that closing or dropping a manager stops its jobs and removes their logs."""
+    manager = ShellJobManager()
+    job = manager.start("echo started; sleep 30")
+    manager.close()
+    assert not job.running and job.killed
+    assert not os.path.exists(job.log_path)
+    assert manager.jobs == {}
+
+    # Still usable after close; an unreferenced manager is collected and cleaned up
+    job = manager.start("sleep 30")
+    ref = weakref.ref(manager)
+    del manager
+    gc.collect()
+    assert ref() is None
+    assert not job.running
+    assert not os.path.exists(job.log_path)
+
+    print("✅ Closing a job manager stops its jobs and deletes their logs")
+
+
+@patch('chatagent.agent.LLMClient')
+def test_agent_close_stops_jobs(mock_llm_class):
+    """Test that closing the agent stops its background jobs."""
+    from chatagent.agent import ChatAgent
+
+    mock_llm = mock_llm_class.return_value
+    mock_llm.logger = Mock()
+    mock_llm.model = "gpt-4"
+
+    agent = ChatAgent()
+    agent.shell_tool.execute("sleep 30", background=True)
+    job = agent.shell_tool.jobs.get("job_1")
+    assert job.running
+    agent.close()
+    assert not job.running
+    assert not os.path.exists(job.log_path)
+
+    print("✅ Closing the agent stops its background jobs")
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    print("Testing background shell jobs...")
+    print()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        test_background_job_lifecycle(Path(tmp))
+    test_kill_and_tail_of_large_output()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_background_in_one_shot_and_async_modes(Path(tmp))
+    test_job_tools_are_registered()
+    test_close_stops_jobs_and_deletes_logs()
+    test_agent_close_stops_jobs()
+
+    print()
+    print("=" * 50)
+    print("✅ All tests passed!")
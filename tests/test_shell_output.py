@@ -0,0 +1,148 @@
+"""Test bounded, streamed shell command output."""
+
+import asyncio
+import gc
+import os
+from unittest.mock import Mock, patch
+
+from chatagent.tools import ShellTool
+from chatagent.tools.shell_output import OutputCapture, OutputPump
+
+
+def test_capture_keeps_head_and_tail():
+    """Test that a capture keeps both ends and spills the full output."""
+    capture = OutputCapture("stdout", head_bytes=10, tail_bytes=10)
+    data = b"".join(f"{i}\n".encode() for i in range(1000))
+    for start in range(0, len(data), 7):
+        capture.write(data[start:start + 7])
+    capture.close()
+
+    assert capture.total == len(data)
+    rendered = capture.render()
+    assert rendered.startswith("0\n1\n2\n3\n4\n")
+    assert rendered.endswith("]\n998\n999\n")
+    assert "bytes elided" in rendered
+
+    with open(capture.spill_path, "rb") as f:
+        assert f.read() == data
+    os.remove(capture.spill_path)
+
+    small = OutputCapture("stdout", head_bytes=10, tail_bytes=10)
+    small.write(b"short\n")
+    small.close()
+    assert small.render() == "short\n"
+    assert small.spill_path is None
+
+    print("✅ Captures keep the head and tail and spill the rest")
+
+
+def test_pump_stops_at_split_sentinel():
+    """Test that a sentinel split across reads is found and removed."""
+    read_fd, write_fd = os.pipe()
+    capture = OutputCapture("stdout")
+    pump = OutputPump(sentinel=b"__END__")
+    with os.fdopen(read_fd, "rb", buffering=0) as reader:
+        pump.add(reader, capture)
+        os.write(write_fd, b"hello\n__EN")
+        assert pump.run(0.1) is False
+        os.write(write_fd, b"D__0\nleftover")
+        assert pump.run(1) is True
+        pump.close()
+    os.close(write_fd)
+
+    assert capture.render() == "hello"
+    assert pump.trailers["stdout"] == b"0"
+
+    print("✅ The pump stops at a sentinel split across reads")
+
+
+def test_large_output_is_bounded():
+    """Test that huge output is elided in every execution mode."""
+    for persistent in (True, False):
+        tool = ShellTool(persistent=persistent, head_bytes=1000, tail_bytes=1000)
+        try:
+            output = tool.execute("seq 1 200000")
+            assert len(output) < 3000
+            assert output.startswith("STDOUT:\n1\n2\n")
+            assert "200000\n" in output
+            assert "Return code: 0" in output
+            spill_path = output.split(" is in ", 1)[1].split(",", 1)[0]
+            with open(spill_path) as f:
+                assert sum(1 for _ in f) == 200000
+        finally:
+            tool.close()
+        # Spill files are deleted when the tool is closed
+        assert not os.path.exists(spill_path)
+
+    for persistent in (True, False):
+        tool = ShellTool(persistent=persistent, head_bytes=1000, tail_bytes=1000)
+        try:
+            output = asyncio.run(tool.aexecute(command="seq 1 200000"))
+            assert len(output) < 3000 and "bytes elided" in output
+            spill_path = output.split(" is in ", 1)[1].split(",", 1)[0]
+            assert os.path.exists(spill_path)
+        finally:
+            tool.close()
+        assert not os.path.exists(spill_path)
+
+    # ... or when it is garbage collected
+    tool = ShellTool(persistent=False, head_bytes=10, tail_bytes=10)
+    output = tool.execute("seq 1 100")
+    spill_path = output.split(" is in ", 1)[1].split(",", 1)[0]
+    del tool
+    gc.collect()
+    assert not os.path.exists(spill_path)
+
+    print("✅ Large output is bounded and spilled to a file")
+
+
+def test_output_callback_and_partial_timeout_output():
+    """Test live output and output kept from a timed out command."""
+    chunks = []
+    tool = ShellTool(persistent=False, output_callback=chunks.append)
+    output = tool.execute("echo started; sleep 10", timeout=0.5)
+
+    assert "".join(chunks) == "started\n"
+    assert "timed out" in output
+    assert "started" in output
+
+    print("✅ Output is streamed live and kept on timeout")
+
+
+def test_cli_shows_shell_output():
+    """Test that the CLI shows the latest shell output under the spinner."""
+    with patch('chatagent.cli.load_dotenv'), patch('chatagent.cli.ChatAgent'):
+        from chatagent.cli import SHELL_OUTPUT_LINES, ChatAgentCLI
+
+        cli = ChatAgentCLI()
+        assert cli.agent.shell_tool.output_callback == cli.show_shell_output
+
+        cli.current_status = Mock()
+        cli.set_status("Running run_shell_command...")
+        cli.show_shell_output("line 1\nline ")
+        cli.show_shell_output("2\n" + "".join(f"more {i}\n" for i in range(10)))
+
+        group = cli.current_status.update.call_args[0][0]
+        header, lines = group.renderables
+        assert header.plain == "Running run_shell_command..."
+        assert lines.plain.splitlines() == [f"more {i}" for i in range(10 - SHELL_OUTPUT_LINES, 10)]
+
+        cli.set_status("Thinking...")
+        assert not cli.shell_output
+
+    print("✅ CLI shows live shell output")
+
+
+if __name__ == "__main__":
+    print("Testing shell output streaming...")
+    print()
+
+    test_capture_keeps_head_and_tail()
+    test_pump_stops_at_split_sentinel()
+    test_large_output_is_bounded()
+    test_output_callback_and_partial_timeout_output()
+    test_cli_shows_shell_output()
+
+    print()
+    print("=" * 50)
+    print("✅ All tests passed!")
@@ -0,0 +1,145 @@
+"""Test the persistent shell session of run_shell_command."""
+
+import time
+from unittest.mock import Mock, patch
+
+from chatagent.tools import ShellTool
+
+
+def test_state_persists_between_commands(tmp_path):
+    """Test that cd and exported variables carry over."""
+    tool = ShellTool(persistent=True)
+    try:
+        output = tool.execute(f"cd {tmp_path} && export GREETING=hello")
+        assert "Return code: 0" in output
+
+        output = tool.execute('pwd; echo "$GREETING"')
+        assert f"{tmp_path}\nhello" in output
+
+        output = tool.execute("echo oops >&2; false")
+        assert "STDERR:\noops" in output
+        assert "Return code: 1" in output
+    finally:
+        tool.close()
+
+    print("✅ Working directory and variables persist")
+
+
+def test_timeout_keeps_session(tmp_path):
+    """Test that a timed out command is interrupted without losing the session."""
+    tool = ShellTool(persistent=True)
+    try:
+        tool.execute("export KEEP=1", working_directory=str(tmp_path))
+
+        started = time.monotonic()
+        output = tool.execute("echo before; sleep 10; echo finished", timeout=0.5)
+        assert time.monotonic() - started < 5
+        assert "timed out after 0.5 seconds" in output
+        assert "still running" in output
+        assert "before" in output and "finished" not in output
+
+        output = tool.execute('echo "$KEEP"; pwd')
+        assert f"1\n{tmp_path}" in output
+    finally:
+        tool.close()
+
+    print("✅ Timeouts interrupt the command but keep the session")
+
+
+def test_reset_and_exit(tmp_path):
+    """Test explicit resets and shells that exit."""
+    tool = ShellTool(persistent=True)
+    try:
+        tool.execute("export GONE=1")
+        output = tool.execute('echo "[$GONE]"', reset_session=True)
+        assert "[]" in output
+
+        output = tool.execute("exit 3")
+        assert "Return code: 3" in output
+        assert "next command starts a new session" in output
+        assert "Return code: 0" in tool.execute("true")
+
+        # Commands cannot read the protocol from the shell's stdin
+        assert "Return code: 0" in tool.execute("cat")
+
+        output = tool.execute("echo ran", working_directory=str(tmp_path / "missing"))
+        assert "No such file or directory" in output
+        assert "ran" not in output
+    finally:
+        tool.close()
+
+    print("✅ Sessions can be reset and restart after exit")
+
+
+def test_one_shot_mode():
+    """Test that the session can be turned off."""
+    tool = ShellTool(persistent=False)
+    tool.execute("export GONE=1")
+    assert "[]" in tool.execute('echo "[$GONE]"')
+
+    with patch.dict("os.environ", {"CHATAGENT_SHELL_SESSION": "off"}):
+        assert ShellTool().session is None
+
+    print("✅ One-shot mode runs every command in a new shell")
+
+
+@patch('chatagent.agent.LLMClient')
+def test_clear_history_resets_session(mock_llm_class):
+    """Test that /clear starts a new shell session."""
+    from chatagent.agent import ChatAgent
+
+    mock_llm = mock_llm_class.return_value
+    mock_llm.logger = Mock()
+    mock_llm.model = "gpt-4"
+
+    agent = ChatAgent()
+    try:
+        agent.shell_tool.execute("export FROM_OLD_CONVERSATION=1")
+        agent.clear_history()
+        assert "[]" in agent.shell_tool.execute('echo "[$FROM_OLD_CONVERSATION]"')
+    finally:
+        agent.shell_tool.close()
+
+    print("✅ Clearing the conversation resets the shell session")
+
+
+@patch('chatagent.agent.LLMClient')
+def test_close_stops_session(mock_llm_class):
+    """Test that closing the agent kills its shell session."""
+    from chatagent.agent import ChatAgent
+
+    mock_llm = mock_llm_class.return_value
+    mock_llm.logger = Mock()
+    mock_llm.model = "gpt-4"
+
+    with ChatAgent() as agent:
+        agent.shell_tool.execute("echo hi")
+        process = agent.shell_tool.session.process
+        assert process.poll() is None
+    assert process.poll() is not None
+    assert not agent.shell_tool.session.alive
+
+    print("✅ Closing the agent stops the shell session")
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    print("Testing persistent shell session...")
+    print()
+
+    for test in (
+        test_state_persists_between_commands,
+        test_timeout_keeps_session,
+        test_reset_and_exit,
+    ):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    test_one_shot_mode()
+    test_clear_history_resets_session()
+    test_close_stops_session()
+
+    print()
+    print("=" * 50)
+    print("✅ All tests passed!")
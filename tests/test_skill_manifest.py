@@ -0,0 +1,135 @@
+"""Test the skill manifest cache, lazy skill bodies and startup timing."""
+
+import json
+import os
+from unittest.mock import Mock, patch
+
+from chatagent.skills import SkillManager
+from chatagent.skills.manifest import default_manifest_path
+
+
+def _write_skill(skills_dir, name, description, body):
+    skill_dir = skills_dir / name
+    skill_dir.mkdir(parents=True, exist_ok=True)
+    (skill_dir / "SKILL.md").write_text(f"---\nname: {name}\ndescription: {description}\n---\n\n# {name.title()} Guide\n\n{body}\n")
+
+
+def _touch(path, content):
+    path.write_text(content)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def _make_skills(tmp_path):
+    skills_dir = tmp_path / "skills"
+    _write_skill(skills_dir, "pdf", "Work with PDF files", "Use pypdf. " * 100)
+    _write_skill(skills_dir, "xlsx", "Work with spreadsheets", "Use openpyxl.")
+    (skills_dir / "empty").mkdir()
+    return skills_dir
+
+
+def test_manifest_reuses_unchanged_skills(tmp_path):
+    """Test that only new or changed SKILL.md files are parsed."""
+    skills_dir = _make_skills(tmp_path)
+    manifest = tmp_path / "manifest.json"
+
+    manager = SkillManager(str(skills_dir), manifest_path=manifest)
+    assert sorted(manager.list_available_skills()) == ["pdf", "xlsx"]
+    assert (manager.load_stats["cached"], manager.load_stats["parsed"]) == (0, 2)
+    assert manifest.exists()
+
+    with patch.object(SkillManager, "_parse_skill", wraps=manager._parse_skill) as parse:
+        manager = SkillManager(str(skills_dir), manifest_path=manifest)
+        assert parse.call_count == 0
+    assert manager.get_skill_info("pdf")["title"] == "Pdf Guide"
+    assert manager.get_skill_info("pdf")["description"] == "Work with PDF files"
+    assert (manager.load_stats["cached"], manager.load_stats["parsed"]) == (2, 0)
+
+    _touch(skills_dir / "xlsx" / "SKILL.md", "---\nname: xlsx\ndescription: Spreadsheets v2\n---\n# Excel\n")
+    manager.reload_skills()
+    assert manager.get_skill_description("xlsx") == "Spreadsheets v2"
+    assert (manager.load_stats["cached"], manager.load_stats["parsed"]) == (1, 1)
+
+    (skills_dir / "pdf" / "SKILL.md").unlink()
+    manager.reload_skills()
+    assert manager.list_available_skills() == ["xlsx"]
+    assert len(json.loads(manifest.read_text())["entries"]) == 1
+
+    print("✅ The manifest cache re-reads only changed skills")
+
+
+def test_bodies_load_lazily(tmp_path):
+    """Test that full skill bodies are only read on activation."""
+    skills_dir = _make_skills(tmp_path)
+    manager = SkillManager(str(skills_dir), manifest_path=tmp_path / "manifest.json")
+
+    assert len(manager.get_skill_info("pdf")["content"]) == 500
+    entries = json.loads((tmp_path / "manifest.json").read_text())["entries"]
+    assert all(len(entry["skill"]["content"]) <= 500 for entry in entries.values())
+    assert manager._bodies == {}
+
+    result = manager.activate_skill("pdf", "Merge two PDFs")
+    assert "=== Skill Instructions ===\n# Pdf Guide" in result
+    assert result.count("Use pypdf.") == 100
+
+    # The body is cached until the file changes
+    with patch("builtins.open", side_effect=AssertionError("re-read")):
+        assert manager.get_skill_body("pdf").startswith("# Pdf Guide")
+    _touch(skills_dir / "pdf" / "SKILL.md", "---\nname: pdf\n---\n# New body\n")
+    assert manager.get_skill_body("pdf") == "# New body"
+
+    print("✅ Skill bodies are loaded lazily on activation")
+
+
+def test_manifest_location(tmp_path):
+    """Test the default manifest path and disabling the cache."""
+    with patch.dict(os.environ, {"CHATAGENT_SKILL_CACHE_DIR": str(tmp_path / "cache")}):
+        path = default_manifest_path(tmp_path / "skills")
+        assert path.parent == tmp_path / "cache" and path.suffix == ".json"
+    with patch.dict(os.environ, {"CHATAGENT_SKILL_CACHE": "off"}):
+        assert default_manifest_path(tmp_path / "skills") is None
+        manager = SkillManager(str(_make_skills(tmp_path)))
+        assert manager.manifest_path is None
+        assert manager.load_stats["parsed"] == 2
+
+    # manifest_path=None keeps the manifest in memory even with caching on
+    with patch.dict(os.environ, {"CHATAGENT_SKILL_CACHE_DIR": str(tmp_path / "unused")}):
+        manager = SkillManager(str(tmp_path / "skills"), manifest_path=None)
+    assert manager.manifest_path is None and manager.load_stats["parsed"] == 2
+    assert not (tmp_path / "unused").exists()
+
+    print("✅ Manifest location is configurable")
+
+
+def test_startup_timing_breakdown():
+    """Test that the agent reports startup time per phase."""
+    with patch('chatagent.agent.LLMClient') as mock_llm_client:
+        mock_llm_client.return_value.logger = Mock()
+        mock_llm_client.return_value.model = "gpt-4"
+
+        from chatagent.agent import ChatAgent
+
+        agent = ChatAgent()
+        assert list(agent.startup_timings) == ["LLM client", "skills", "memory", "tools", "project instructions"]
+        startup = agent.describe_startup()
+        assert startup.startswith("Startup: ")
+        assert "skills " in startup and " cached, " in startup
+
+    print("✅ Startup timing breakdown is reported")
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    print("Testing skill manifest...")
+    print()
+
+    for test in (test_manifest_reuses_unchanged_skills, test_bodies_load_lazily, test_manifest_location):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    test_startup_timing_breakdown()
+
+    print()
+    print("=" * 50)
+    print("✅ All tests passed!")
@@ -0,0 +1,123 @@
+"""Test BM25 skill ranking, the search_skills tool and per-turn skill listing."""
+
+import os
+from unittest.mock import Mock, patch
+
+from chatagent.skills import SkillManager
+from chatagent.tools.skill import SearchSkillsTool
+
+SKILLS = {
+    "pdf": "Extract text from PDF documents, merge and split PDF files",
+    "xlsx": "Create and edit Excel spreadsheets with formulas",
+    "docx": "Create and edit Word documents",
+    "pptx": "Build PowerPoint presentations and slides",
+    "mcp-builder": "Build MCP servers that expose tools to language models",
+    "canvas-design": "Design posters and visual art as PNG images",
+    "webapp-testing": "Test web applications in a browser with Playwright",
+}
+
+# Keep test skill directories out of the user's manifest cache
+NO_SKILL_CACHE = {"CHATAGENT_SKILL_CACHE": "off"}
+
+
+def _make_manager(tmp_path):
+    skills_dir = tmp_path / "skills"
+    for name, description in SKILLS.items():
+        skill_dir = skills_dir / name
+        skill_dir.mkdir(parents=True)
+        (skill_dir / "SKILL.md").write_text(f"---\nname: {name}\ndescription: {description}\n---\n\n# {name}\n")
+    with patch.dict(os.environ, NO_SKILL_CACHE):
+        return SkillManager(str(skills_dir), manifest_path=None)
+
+
+def _make_agent(manager, env=None):
+    with patch('chatagent.agent.LLMClient') as mock_llm_client, \
+         patch('chatagent.agent.SkillManager', return_value=manager), \
+         patch.dict(os.environ, {**NO_SKILL_CACHE, **(env or {})}):
+        mock_llm_client.return_value.logger = Mock()
+        mock_llm_client.return_value.model = "gpt-4"
+
+        from chatagent.agent import ChatAgent
+
+        return ChatAgent()
+
+
+def test_search_skills_ranking(tmp_path):
+    """Test that skills are ranked by name, title and description."""
+    manager = _make_manager(tmp_path)
+
+    assert manager.search_skills("merge two PDF files")[0][0] == "pdf"
+    assert manager.search_skills("make a spreadsheet")[0][0] == "xlsx"
+    assert manager.search_skills("MCP server")[0][0] == "mcp-builder"
+    assert len(manager.search_skills("create documents", limit=2)) == 2
+    assert manager.search_skills("zebra") == []
+    assert manager.search_skills("") == []
+
+    print("✅ Skills are ranked by relevance")
+
+
+def test_search_skills_tool(tmp_path):
+    """Test the search_skills tool."""
+    tool = SearchSkillsTool(_make_manager(tmp_path))
+
+    result = tool.execute(query="slides for a talk", limit=1)
+    assert "pptx" in result and "pdf" not in result
+
+    assert "No skills match" in tool.execute(query="zebra")
+    listing = tool.execute(query="")
+    assert all(name in listing for name in SKILLS)
+
+    print("✅ search_skills tool works")
+
+
+def test_prompt_lists_relevant_skills(tmp_path):
+    """Test that only the skills relevant to the conversation are listed."""
+    agent = _make_agent(_make_manager(tmp_path), {"CHATAGENT_SKILLS_IN_PROMPT": "2"})
+    assert agent.skills_in_prompt == 2
+    assert agent.tools.get("search_skills") is not None
+
+    agent.add_message("user", "Please merge these PDF files")
+    agent._prepare_turn("Please merge these PDF files")
+    assert agent.selected_skills[0] == "pdf"
+
+    prompt = agent._build_system_prompt()
+    assert "• pdf:" in prompt
+    assert "• canvas-design:" not in prompt
+    assert f"{len(SKILLS) - len(agent.selected_skills)} more skills are available" in prompt
+
+    agent.clear_history()
+    assert agent.selected_skills == []
+    prompt = agent._build_system_prompt()
+    assert "• pdf:" not in prompt
+    assert f"{len(SKILLS)} more skills are available" in prompt
+
+    print("✅ Prompt lists only relevant skills")
+
+
+def test_prompt_lists_all_skills(tmp_path):
+    """Test that every skill is listed when there are few or "all" is set."""
+    manager = _make_manager(tmp_path)
+    for env in ({"CHATAGENT_SKILLS_IN_PROMPT": "all"}, {"CHATAGENT_SKILLS_IN_PROMPT": str(len(SKILLS))}):
+        agent = _make_agent(manager, env)
+        prompt = agent._build_system_prompt()
+        assert all(f"• {name}:" in prompt for name in SKILLS)
+        assert "more skills are available" not in prompt
+
+    print("✅ Prompt lists every skill when configured")
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    print("Testing skill selection...")
+    print()
+
+    for test in (test_search_skills_ranking, test_search_skills_tool,
+                 test_prompt_lists_relevant_skills, test_prompt_lists_all_skills):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+
+    print()
+    print("=" * 50)
+    print("✅ All tests passed!")
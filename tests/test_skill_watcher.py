@@ -0,0 +1,156 @@
+"""Test incremental skill reloading and the skill directory watcher."""
+
+import os
+import shutil
+from unittest.mock import Mock, patch
+
+from chatagent.skills import SkillManager
+
+
+def _write_skill(skills_dir, name, description):
+    skill_dir = skills_dir / name
+    skill_dir.mkdir(parents=True, exist_ok=True)
+    skill_md = skill_dir / "SKILL.md"
+    skill_md.write_text(f"---\nname: {name}\ndescription: {description}\n---\n\n# {name}\n\n{description}.\n")
+    # Make the change visible to mtime checks even within one clock tick
+    stat = skill_md.stat()
+    os.utime(skill_md, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def _make_manager(tmp_path):
+    skills_dir = tmp_path / "skills"
+    _write_skill(skills_dir, "pdf", "Work with PDF files")
+    _write_skill(skills_dir, "xlsx", "Work with spreadsheets")
+    return skills_dir, SkillManager(str(skills_dir), manifest_path=tmp_path / "manifest.json")
+
+
+def _check_watcher(tmp_path, use_inotify):
+    skills_dir, manager = _make_manager(tmp_path)
+    backend = manager.watch(poll_interval=0, use_inotify=use_inotify)
+    assert backend == ("inotify" if use_inotify else "poll")
+    manager.activate_skill("pdf", "Merge PDFs")
+
+    assert not any(manager.check_for_changes().values())
+    assert manager.reload_count == 0
+
+    _write_skill(skills_dir, "docx", "Work with Word documents")
+    _write_skill(skills_dir, "pdf", "Extract tables from PDF files")
+    with patch.object(SkillManager, "_parse_skill", wraps=manager._parse_skill) as parse:
+        changes = manager.check_for_changes()
+        assert parse.call_count == 2
+    assert changes == {"added": ["docx"], "updated": ["pdf"], "removed": []}
+    assert manager.reload_count == 1
+    assert manager.search_skills("word documents")[0][0] == "docx"
+    # The active skill is refreshed in place
+    assert manager.get_active_skills()["pdf"]["skill_info"]["description"] == "Extract tables from PDF files"
+    assert manager.get_active_skills()["pdf"]["task"] == "Merge PDFs"
+
+    shutil.rmtree(skills_dir / "xlsx")
+    assert manager.check_for_changes()["removed"] == ["xlsx"]
+    assert sorted(manager.list_available_skills()) == ["docx", "pdf"]
+    assert manager.reload_count == 2
+    manager.unwatch()
+    assert manager.watch_backend is None
+
+
+def test_inotify_watcher(tmp_path):
+    """Test that inotify events reload only the changed skills."""
+    _check_watcher(tmp_path, use_inotify=True)
+    print("✅ inotify watcher reloads changed skills")
+
+
+def test_polling_watcher(tmp_path):
+    """Test the mtime polling fallback."""
+    _check_watcher(tmp_path, use_inotify=False)
+    print("✅ Polling watcher reloads changed skills")
+
+
+def test_reload_is_incremental(tmp_path):
+    """Test that reload_skills only parses changed files and handles renames."""
+    skills_dir, manager = _make_manager(tmp_path)
+
+    with patch.object(SkillManager, "_parse_skill", wraps=manager._parse_skill) as parse:
+        assert not any(manager.reload_skills().values())
+        assert parse.call_count == 0
+    assert manager.reload_count == 0
+
+    # Renaming a skill in its frontmatter removes the old name
+    (skills_dir / "xlsx" / "SKILL.md").write_text("---\nname: sheets\ndescription: Spreadsheets\n---\n# Sheets\n")
+    changes = manager.reload_skills()
+    assert changes == {"added": ["sheets"], "updated": [], "removed": ["xlsx"]}
+    assert sorted(manager.list_available_skills()) == ["pdf", "sheets"]
+    assert manager.last_reload == changes
+
+    print("✅ Reloads are incremental")
+
+
+def test_agent_applies_skill_changes(tmp_path):
+    """Test that the agent picks up skill changes at the start of a turn."""
+    skills_dir, manager = _make_manager(tmp_path)
+
+    with patch('chatagent.agent.LLMClient') as mock_llm_client, \
+         patch('chatagent.agent.SkillManager', return_value=manager), \
+         patch.dict(os.environ, {"CHATAGENT_SKILL_WATCH": "poll", "CHATAGENT_SKILL_CACHE_DIR": str(tmp_path / "cache")}):
+        mock_llm_client.return_value.logger = Mock()
+        mock_llm_client.return_value.model = "gpt-4"
+
+        from chatagent.agent import ChatAgent
+
+        agent = ChatAgent()
+    assert manager.watch_backend == "poll"
+    manager._watcher.poll_interval = 0
+
+    _write_skill(skills_dir, "docx", "Work with Word documents")
+    agent.add_message("user", "Write a Word document")
+    agent._prepare_turn("Write a Word document")
+    assert "docx" in manager.list_available_skills()
+    assert "• docx:" in agent._build_system_prompt()
+    agent.add_message("assistant", "Done")
+    assert "Skill watcher: poll (1 reloads)" in agent.get_conversation_summary()
+
+    with patch.dict(os.environ, {"CHATAGENT_SKILL_WATCH": "off", "CHATAGENT_SKILL_CACHE_DIR": str(tmp_path / "cache")}), \
+         patch('chatagent.agent.LLMClient'), \
+         patch('chatagent.agent.SkillManager', return_value=SkillManager(str(skills_dir), manifest_path=None)):
+        assert ChatAgent().skill_manager.watch_backend is None
+
+    print("✅ Agent applies skill changes between turns")
+
+
+def test_agent_close_stops_watcher(tmp_path):
+    """Test that closing an agent releases its inotify instance."""
+    skills_dir, manager = _make_manager(tmp_path)
+
+    with patch('chatagent.agent.LLMClient') as mock_llm_client, \
+         patch('chatagent.agent.SkillManager', return_value=manager), \
+         patch.dict(os.environ, {"CHATAGENT_SKILL_WATCH": "auto", "CHATAGENT_SKILL_CACHE_DIR": str(tmp_path / "cache")}):
+        mock_llm_client.return_value.logger = Mock()
+        mock_llm_client.return_value.model = "gpt-4"
+
+        from chatagent.agent import ChatAgent
+
+        agent = ChatAgent()
+    watcher = manager._watcher
+    assert manager.watch_backend == "inotify" and watcher._fd is not None
+
+    agent.close()
+    assert manager.watch_backend is None
+    assert watcher._fd is None
+
+    print("✅ Closing the agent stops the skill watcher")
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    print("Testing skill watcher...")
+    print()
+
+    for test in (test_inotify_watcher, test_polling_watcher, test_reload_is_incremental,
+                 test_agent_applies_skill_changes, test_agent_close_stops_watcher):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+
+    print()
+    print("=" * 50)
+    print("✅ All tests passed!")
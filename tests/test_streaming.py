@@ -0,0 +1,202 @@
+"""Test streaming responses in LLMClient and ChatAgent."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+import httpx
+from openai import BadRequestError
+from openai.types.chat import ChatCompletion
+
+from chatagent.llm import AsyncLLMClient, LLMClient
+
+
+def _chunk(content=None, tool_calls=None, finish_reason=None):
+    """Build a fake streaming chunk."""
+    delta = SimpleNamespace(content=content, tool_calls=tool_calls)
+    choice = SimpleNamespace(delta=delta, finish_reason=finish_reason)
+    return SimpleNamespace(id="chatcmpl-1", model="test-model", created=0, usage=None, choices=[choice])
+
+
+def _tool_delta(index, id=None, name=None, arguments=None):
+    """Build a fake tool call fragment."""
+    return SimpleNamespace(
+        index=index,
+        id=id,
+        function=SimpleNamespace(name=name, arguments=arguments),
+    )
+
+
+def test_llm_client_assembles_stream(tmp_path):
+    """Test that text deltas are yielded and tool call fragments are assembled."""
+    client = LLMClient(api_key="test-key", model="test-model", log_file=str(tmp_path / "test.log"))
+
+    chunks = [
+        _chunk(content="Hel"),
+        _chunk(content="lo"),
+        _chunk(tool_calls=[_tool_delta(0, id="call_1", name="read_file", arguments='{"file_')]),
+        _chunk(tool_calls=[_tool_delta(0, arguments='path": "a.txt"}')]),
+        _chunk(tool_calls=[_tool_delta(1, id="call_2", name="glob", arguments='{"pattern": "*.py"}')]),
+        _chunk(finish_reason="tool_calls"),
+    ]
+    client.client = Mock()
+    client.client.chat.completions.create.return_value = iter(chunks)
+
+    events = list(client.chat_stream(messages=[{"role": "user", "content": "hi"}]))
+
+    texts = [e["content"] for e in events if e["type"] == "text"]
+    assert texts == ["Hel", "lo"]
+
+    tool_calls = [e["tool_call"] for e in events if e["type"] == "tool_call"]
+    assert [tc["id"] for tc in tool_calls] == ["call_1", "call_2"]
+    assert tool_calls[0]["function"]["arguments"] == '{"file_path": "a.txt"}'
+
+    response = events[-1]["response"]
+    assert isinstance(response, ChatCompletion)
+    message = response.choices[0].message
+    assert message.content == "Hello"
+    assert message.tool_calls[0].function.name == "read_file"
+    assert response.choices[0].finish_reason == "tool_calls"
+
+    kwargs = client.client.chat.completions.create.call_args.kwargs
+    assert kwargs["stream"] is True
+
+    print("✅ Stream deltas yielded and tool calls assembled")
+
+
+def _stream_events(content=None, tool_calls=None):
+    """Build the events LLMClient.chat_stream would yield for one response."""
+    events = []
+    if content:
+        events.append({"type": "text", "content": content})
+    message = {"role": "assistant", "content": content}
+    if tool_calls:
+        message["tool_calls"] = tool_calls
+        events.extend({"type": "tool_call", "tool_call": tc} for tc in tool_calls)
+    response = ChatCompletion.construct(
+        id="chatcmpl-1",
+        object="chat.completion",
+        created=0,
+        model="test-model",
+        choices=[{"index": 0, "finish_reason": "stop", "message": message}],
+    )
+    events.append({"type": "response", "response": response})
+    return iter(events)
+
+
+def test_agent_chat_stream_runs_tools(tmp_path):
+    """Test that ChatAgent.chat_stream yields text, tool and done events."""
+    target = tmp_path / "note.txt"
+    target.write_text("streamed file")
+
+    with patch('chatagent.agent.LLMClient') as mock_llm_client:
+        mock_llm_client.return_value.logger = Mock()
+        mock_llm_client.return_value.model = "gpt-4"
+
+        from chatagent.agent import ChatAgent
+
+        agent = ChatAgent()
+        tool_call = {
+            "id": "call_1",
+            "type": "function",
+            "function": {"name": "read_file", "arguments": f'{{"file_path": "{target}"}}'},
+        }
+        agent.llm.chat_stream.side_effect = [
+            _stream_events(tool_calls=[tool_call]),
+            _stream_events(content="Done reading."),
+        ]
+
+        events = list(agent.chat_stream("read the note"))
+        types = [e["type"] for e in events]
+
+        assert types == ["tool_call", "tool_result", "text", "done"]
+        assert "streamed file" in events[1]["content"]
+        assert events[-1]["content"] == "Done reading."
+
+        roles = [m["role"] for m in agent.messages]
+        assert roles == ["user", "assistant", "tool", "assistant"]
+
+        print("✅ chat_stream executes tools and finishes with done event")
+
+
+def _bad_request(message):
+    """Build the error an endpoint returns for an unsupported parameter."""
+    request = httpx.Request("POST", "https://example.invalid/v1/chat/completions")
+    response = httpx.Response(400, request=request)
+    return BadRequestError(message, response=response, body=None)
+
+
+def test_stream_options_fallback(tmp_path):
+    """Test that streaming retries without stream_options when the endpoint rejects it."""
+    client = LLMClient(api_key="test-key", model="test-model", log_file=str(tmp_path / "test.log"))
+    client.client = Mock()
+    create = client.client.chat.completions.create
+    create.side_effect = [_bad_request("Unrecognized request argument: stream_options"), iter([_chunk(content="Hi")])]
+
+    events = list(client.chat_stream(messages=[{"role": "user", "content": "hi"}]))
+    assert events[-1]["response"].choices[0].message.content == "Hi"
+    assert "stream_options" in create.call_args_list[0].kwargs
+    assert "stream_options" not in create.call_args_list[1].kwargs
+    assert client.stream_usage is False
+
+    # Later requests leave it out
+    create.side_effect = [_bad_request("Invalid model")]
+    try:
+        list(client.chat_stream(messages=[{"role": "user", "content": "hi"}]))
+        assert False, "BadRequestError not raised"
+    except BadRequestError:
+        pass
+    assert "stream_options" not in create.call_args.kwargs
+    assert create.call_count == 3
+
+    # Unrelated 400s are raised as-is while stream_options is sent
+    client.stream_usage = True
+    create.side_effect = [_bad_request("Invalid model")]
+    try:
+        list(client.chat_stream(messages=[{"role": "user", "content": "hi"}]))
+        assert False, "BadRequestError not raised"
+    except BadRequestError:
+        pass
+    assert create.call_count == 4 and client.stream_usage is True
+
+    with patch.dict("os.environ", {"CHATAGENT_STREAM_USAGE": "off"}):
+        client = LLMClient(api_key="test-key", model="test-model", log_file=str(tmp_path / "test.log"))
+    assert "stream_options" not in client._build_request([], None, 0.7, None, stream=True)
+
+    async def astream(chunks):
+        for chunk in chunks:
+            yield chunk
+
+    client = AsyncLLMClient(api_key="test-key", model="test-model", log_file=str(tmp_path / "test.log"))
+    client.client = Mock()
+    client.client.chat.completions.create = AsyncMock(
+        side_effect=[_bad_request("stream_options is not supported"), astream([_chunk(content="Hi")])]
+    )
+
+    async def collect():
+        return [event async for event in client.chat_stream(messages=[{"role": "user", "content": "hi"}])]
+
+    events = asyncio.run(collect())
+    assert events[-1]["response"].choices[0].message.content == "Hi"
+    assert client.client.chat.completions.create.await_count == 2
+    assert client.stream_usage is False
+
+    print("✅ Streaming falls back when stream_options is rejected")
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    print("Testing streaming responses...")
+    print()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        test_llm_client_assembles_stream(Path(tmp))
+        print()
+        test_agent_chat_stream_runs_tools(Path(tmp))
+        print()
+        test_stream_options_fallback(Path(tmp))
+        print()
+        print("=" * 50)
+        print("✅ All tests passed!")
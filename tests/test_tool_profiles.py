@@ -0,0 +1,188 @@
+"""Test memoized tool definitions and tool profiles."""
+
+import json
+import os
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from openai.types.chat import ChatCompletion
+
+from chatagent.llm import LLMClient
+from chatagent.tools import ToolRegistry, WebFetchTool
+from chatagent.tools.base import Tool
+
+
+class _FakeTool(Tool):
+    def __init__(self, name, read_only=True, uses_network=False):
+        self._name = name
+        self._read_only = read_only
+        self._uses_network = uses_network
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def description(self):
+        return f"The {self._name} tool"
+
+    @property
+    def parameters(self):
+        return {"type": "object", "properties": {}}
+
+    @property
+    def read_only(self):
+        return self._read_only
+
+    @property
+    def uses_network(self):
+        return self._uses_network
+
+    def execute(self, **kwargs):
+        return "ok"
+
+
+def _make_agent(env=None):
+    with patch('chatagent.agent.LLMClient') as mock_llm_client, patch.dict(os.environ, env or {}):
+        mock_llm_client.return_value.logger = Mock()
+        mock_llm_client.return_value.model = "gpt-4"
+
+        from chatagent.agent import ChatAgent
+
+        return ChatAgent()
+
+
+def test_definitions_are_memoized():
+    """Test that definitions are built once per subset and reset on register."""
+    registry = ToolRegistry()
+    registry.register(_FakeTool("read"))
+    registry.register(_FakeTool("write", read_only=False))
+
+    built = []
+    original = Tool.to_openai_format
+    with patch.object(_FakeTool, "to_openai_format", lambda self: built.append(self.name) or original(self)):
+        definitions = registry.to_openai_format()
+        assert registry.to_openai_format() is definitions
+        assert built == ["read", "write"]
+
+        subset = registry.to_openai_format(["write"])
+        assert registry.to_openai_format(("write",)) is subset
+        assert [d["function"]["name"] for d in subset] == ["write"]
+
+        registry.register(_FakeTool("fetch", uses_network=True))
+        assert len(registry.to_openai_format()) == 3
+        assert len(built) == 6
+
+    data = registry.to_json()
+    assert registry.to_json() is data
+    assert json.loads(data) == registry.to_openai_format()
+    assert b", " not in data
+
+    print("✅ Tool definitions are memoized")
+
+
+def test_profiles_select_tools():
+    """Test the read-only and no-web profiles."""
+    registry = ToolRegistry()
+    for tool in (_FakeTool("read"), _FakeTool("write", read_only=False), _FakeTool("fetch", uses_network=True)):
+        registry.register(tool)
+
+    assert registry.select("all") == ["read", "write", "fetch"]
+    assert registry.select("read-only") == ["read", "fetch"]
+    assert registry.select("no-web") == ["read", "write"]
+    assert registry.select("read-only+no-web") == ["read"]
+    try:
+        registry.select("fast")
+        assert False, "Unknown profiles should be rejected"
+    except ValueError as e:
+        assert "Unknown tool profile 'fast'" in str(e)
+
+    print("✅ Tool profiles select tools")
+
+
+def test_agent_sends_only_profile_tools():
+    """Test that the agent offers and runs only the tools of its profile."""
+    agent = _make_agent({"CHATAGENT_TOOL_PROFILE": "read-only"})
+    assert agent.tool_profile == "read-only"
+    assert "write_file" not in agent.active_tools and "read_file" in agent.active_tools
+
+    message = Mock(content="Done", tool_calls=None)
+    agent.llm.chat.return_value = Mock(choices=[Mock(message=message)])
+    agent.chat("Look around")
+    tools = agent.llm.chat.call_args.kwargs["tools"]
+    assert [t["function"]["name"] for t in tools] == agent.active_tools
+    assert tools is agent.tools.to_openai_format(agent.active_tools)
+
+    result = agent._execute_tool_call("write_file", json.dumps({"file_path": "x.txt", "content": "x"}))
+    assert "not available with the 'read-only' tool profile" in result
+    assert not os.path.exists("x.txt")
+
+    full_tokens = _make_agent().get_tool_tokens()
+    assert 0 < agent.get_tool_tokens() < full_tokens
+    agent.set_tool_profile("all")
+    assert agent.active_tools is None and agent.get_tool_tokens() == full_tokens
+    assert "(all profile" in agent.get_conversation_summary()
+
+    print("✅ Agent sends only the tools of its profile")
+
+
+def test_concurrent_calls_respect_profile():
+    """Test that concurrency-safe tools outside the profile are refused too."""
+    agent = _make_agent({"CHATAGENT_TOOL_PROFILE": "no-web"})
+    calls = [
+        SimpleNamespace(function=SimpleNamespace(name="web_fetch", arguments=json.dumps({"url": "https://example.com"}))),
+        SimpleNamespace(function=SimpleNamespace(name="list_directory", arguments="{}")),
+    ]
+
+    with patch.object(WebFetchTool, "execute", return_value="page") as fetch:
+        fetched, listed = agent._execute_tool_calls(calls)
+    assert not fetch.called
+    assert fetched.startswith("Error executing web_fetch:")
+    assert "not available with the 'no-web' tool profile" in fetched
+    assert listed.startswith("Directory: .")
+
+    print("✅ Concurrent tool calls respect the tool profile")
+
+
+def test_unchanged_tools_are_logged_once(tmp_path):
+    """Test that delta logging lists the tools only when they change."""
+    client = LLMClient(api_key="test-key", model="test-model", log_file=str(tmp_path / "test.log"), interaction_log="off")
+    client.client = Mock()
+    client.client.chat.completions.create.return_value = ChatCompletion.construct(
+        id="chatcmpl-1",
+        object="chat.completion",
+        created=0,
+        model="test-model",
+        choices=[{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "ok"}}],
+    )
+    registry = ToolRegistry()
+    registry.register(_FakeTool("read"))
+
+    for _ in range(3):
+        client.chat(messages=[{"role": "user", "content": "hi"}], tools=registry.to_openai_format())
+    client.flush_logs()
+
+    log = (tmp_path / "test.log").read_text()
+    assert log.count("  - read") == 1
+    assert log.count("Tools (1 available, unchanged)") == 2
+
+    print("✅ Unchanged tool lists are logged once")
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    print("Testing tool profiles...")
+    print()
+
+    test_definitions_are_memoized()
+    test_profiles_select_tools()
+    test_agent_sends_only_profile_tools()
+    test_concurrent_calls_respect_profile()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_unchanged_tools_are_logged_once(Path(tmp))
+
+    print()
+    print("=" * 50)
+    print("✅ All tests passed!")
@@ -0,0 +1,134 @@
+"""Test the session cache of tool results."""
+
+import asyncio
+import json
+import os
+from unittest.mock import Mock, patch
+
+from chatagent.stats import compute_stats
+from chatagent.tools import FindFilesTool, GoogleSearchTool, SearchTextTool
+from chatagent.tools.result_cache import ToolResultCache, modification_count, recording
+
+
+def _make_agent(env=None):
+    with patch('chatagent.agent.LLMClient') as mock_llm_client, patch.dict(os.environ, env or {}):
+        mock_llm_client.return_value.logger = Mock()
+        mock_llm_client.return_value.model = "gpt-4"
+
+        from chatagent.agent import ChatAgent
+
+        return ChatAgent()
+
+
+def _touch(path, text):
+    """Write a file and move its mtime forward so the change is visible within one clock tick."""
+    path.write_text(text)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_cache_tracks_file_dependencies(tmp_path):
+    """Test that cached results are dropped when a file they read changes."""
+    (tmp_path / "a.py").write_text("needle\n")
+    (tmp_path / "b.py").write_text("hay\n")
+    cache = ToolResultCache()
+    search = SearchTextTool(use_index=False)
+    args = {"pattern": "needle", "directory": str(tmp_path)}
+
+    with recording() as dependencies:
+        result = search.execute(**args)
+    assert str(tmp_path) in dependencies and str(tmp_path / "b.py") in dependencies
+    cache.put(search.name, args, search.cache_ttl, dependencies, result)
+
+    # Argument order does not matter
+    assert cache.get(search.name, dict(reversed(list(args.items())))) == result
+    _touch(tmp_path / "b.py", "needle too\n")
+    assert cache.get(search.name, args) is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 0}
+
+    # Errors, expired entries and invalidated paths are not served
+    cache.put("glob", {"pattern": "*"}, 60, {}, "Error: Directory x does not exist")
+    cache.put("google_web_search", {"query": "q"}, 0, {}, "results")
+    assert cache.get("glob", {"pattern": "*"}) is None
+    assert cache.get("google_web_search", {"query": "q"}) is None
+
+    cache.put(search.name, args, search.cache_ttl, dependencies, result)
+    assert cache.invalidate([str(tmp_path.parent / "elsewhere.txt")]) == 0
+    assert cache.invalidate([str(tmp_path / "new.py")]) == 1
+
+    print("✅ Cached results follow the files they read")
+
+
+def test_agent_reuses_and_invalidates_results(tmp_path):
+    """Test that the agent serves repeated calls from the cache until a write."""
+    (tmp_path / "a.py").write_text("print('hi')\n")
+    agent = _make_agent()
+    glob_args = json.dumps({"pattern": "*.py", "directory": str(tmp_path)})
+
+    with patch.object(FindFilesTool, "execute", wraps=agent.tools.get("glob").execute) as execute:
+        first = agent._execute_tool_call("glob", glob_args)
+        assert agent._execute_tool_call("glob", glob_args) == first
+        assert execute.call_count == 1
+        assert agent.llm.record_tool_call.call_args.kwargs == {"cached": True}
+
+        # write_file drops the listing of the directory it writes to
+        modifications = modification_count()
+        agent._execute_tool_call("write_file", json.dumps({"file_path": str(tmp_path / "b.py"), "content": "x"}))
+        assert modification_count() == modifications + 1
+        assert "b.py" in agent._execute_tool_call("glob", glob_args)
+        assert execute.call_count == 2
+
+        # A shell command may change anything
+        agent.tool_cache.invalidate(None)
+        agent._execute_tool_call("glob", glob_args)
+        assert execute.call_count == 3
+
+    agent.add_message("user", "Find the Python files")
+    assert "Tool result cache: 1 hits / 3 misses" in agent.get_conversation_summary()
+    agent.clear_history()
+    assert agent.tool_cache.stats()["entries"] == 0
+    assert _make_agent({"CHATAGENT_TOOL_CACHE": "off"}).tool_cache is None
+
+    print("✅ Agent reuses tool results until files change")
+
+
+def test_async_agent_caches_web_search():
+    """Test that web searches are reused by the async agent within their TTL."""
+    from chatagent.async_agent import AsyncChatAgent
+
+    agent = AsyncChatAgent(llm=Mock(model="test-model"))
+
+    tool = agent.tools.get("google_web_search")
+    assert tool.cache_ttl == 300
+    with patch.object(GoogleSearchTool, "aexecute", return_value="Search results for: python") as aexecute:
+        for _ in range(2):
+            result = asyncio.run(agent._arun_tool(tool, "google_web_search", {"query": "python"}))
+        assert result == "Search results for: python"
+        assert aexecute.call_count == 1
+
+    stats = compute_stats([
+        {"type": "tool_call", "tool": "glob", "latency_ms": 40},
+        {"type": "tool_call", "tool": "glob", "latency_ms": 0, "cached": True},
+    ])
+    assert stats["slowest_tools"][0]["cached"] == 1
+    assert stats["slowest_tools"][0]["p50_ms"] == 40
+
+    print("✅ Web searches are reused within their TTL")
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    print("Testing tool result cache...")
+    print()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        test_cache_tracks_file_dependencies(Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_agent_reuses_and_invalidates_results(Path(tmp))
+    test_async_agent_caches_web_search()
+
+    print()
+    print("=" * 50)
+    print("✅ All tests passed!")
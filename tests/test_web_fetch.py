@@ -0,0 +1,196 @@
+"""Test concurrent, byte-capped and paginated web_fetch."""
+
+import asyncio
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from chatagent.tools import WebFetchTool
+from chatagent.tools import web
+from chatagent.tools.http_client import create_async_http_client, create_http_client
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Local stand-in server with slow, huge and long pages."""
+
+    protocol_version = "HTTP/1.1"
+    requests = Counter()
+    active = Counter()
+    max_active = Counter()
+    lock = threading.Lock()
+
+    def do_GET(self):
+        host = self.headers["Host"].split(":")[0]
+        cls = type(self)
+        with cls.lock:
+            cls.requests[self.path] += 1
+            cls.active[host] += 1
+            cls.max_active[host] = max(cls.max_active[host], cls.active[host])
+        try:
+            if self.path.startswith("/slow"):
+                time.sleep(0.3)
+                self._send(f"<p>slow page {self.path}</p>".encode())
+            elif self.path == "/huge":
+                self._send_chunked(b"<p>" + b"x" * 65536 + b"</p>\n", 200)
+            elif self.path == "/long":
+                body = "".join(f"<p>paragraph {i} {'words ' * 20}</p>" for i in range(300))
+                self._send(f"<html><script>var x = 1;</script><body>{body}</body></html>".encode())
+            else:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+        finally:
+            with cls.lock:
+                cls.active[host] -= 1
+
+    def _send(self, body):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_chunked(self, chunk, count):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for _ in range(count):
+                self.wfile.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve():
+    """Start the stand-in server and reset its counters."""
+    _Handler.requests = Counter()
+    _Handler.active = Counter()
+    _Handler.max_active = Counter()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, server.server_address[1]
+
+
+def test_urls_are_fetched_concurrently_per_host():
+    """Test the per-host limit while different hosts run in parallel."""
+    server, port = _serve()
+    try:
+        urls = [f"http://127.0.0.1:{port}/slow{i}" for i in range(4)]
+        urls += [f"http://localhost:{port}/slow{i}" for i in range(2)]
+        with create_http_client(None) as client:
+            started = time.monotonic()
+            output = WebFetchTool(client=client).execute(urls=urls)
+            elapsed = time.monotonic() - started
+
+        for url in urls:
+            assert f"URL: {url}\nStatus: 200" in output
+        assert output.count("\n\n---\n\n") == len(urls) - 1
+        assert _Handler.max_active["127.0.0.1"] == web.PER_HOST_LIMIT
+        assert _Handler.max_active["localhost"] == 2
+        assert elapsed < 1.5  # 4 requests to one host take two rounds of 0.3 s
+    finally:
+        server.shutdown()
+
+    print("✅ URLs are fetched concurrently with a per-host limit")
+
+
+def test_async_fetch_of_several_urls():
+    """Test multi-URL fetching on the async path."""
+    server, port = _serve()
+
+    async def run():
+        async with create_async_http_client(None) as client:
+            return await WebFetchTool(async_client=client).aexecute(
+                urls=[f"http://127.0.0.1:{port}/slow{i}" for i in range(3)] + [f"http://127.0.0.1:{port}/missing"]
+            )
+
+    try:
+        output = asyncio.run(run())
+        assert output.count("Status: 200") == 3
+        assert "Error fetching URL" in output and "404" in output
+        assert _Handler.max_active["127.0.0.1"] <= web.PER_HOST_LIMIT
+    finally:
+        server.shutdown()
+
+    print("✅ Async fetches of several URLs work")
+
+
+def test_download_stops_at_byte_cap():
+    """Test that a huge page is never fully downloaded."""
+    server, port = _serve()
+    try:
+        with create_http_client(None) as client:
+            output = WebFetchTool(client=client).execute(f"http://127.0.0.1:{port}/huge", extract_text=False)
+        assert f"[Download stopped after {web.MAX_FETCH_BYTES} bytes" in output
+        assert "cursor=\"chunk:2\"" in output
+    finally:
+        server.shutdown()
+
+    print("✅ Downloads stop at the byte cap")
+
+
+def test_long_pages_are_paginated_by_cursor():
+    """Test cursor pagination, served without refetching."""
+    server, port = _serve()
+    url = f"http://127.0.0.1:{port}/long"
+    try:
+        with create_http_client(None) as client:
+            tool = WebFetchTool(client=client)
+            first = tool.execute(url)
+            assert "var x" not in first
+            assert first.startswith(f"URL: {url}\nStatus: 200\n\nparagraph 0 words")
+            assert 'To continue, call web_fetch with url="' + url + '" and cursor="chunk:2"' in first
+
+            parts = [first]
+            cursor = "chunk:2"
+            while cursor:
+                part = tool.execute(url, cursor=cursor)
+                parts.append(part)
+                cursor = part.split('cursor="', 1)[1].split('"', 1)[0] if 'cursor="' in part else None
+
+            assert _Handler.requests["/long"] == 1
+            assert "paragraph 299" in parts[-1]
+            text = "\n".join(part.split("\n\n", 1)[1].split("\n\n[Part", 1)[0] for part in parts)
+            assert [f"paragraph {i} " in text for i in range(300)] == [True] * 300
+
+            assert tool.execute(url, cursor="chunk:99").startswith("Error: cursor chunk:99 is beyond")
+            assert tool.execute(url, cursor="page2").startswith("Error: Invalid cursor")
+            assert tool.execute().startswith("Error: Provide url or urls")
+    finally:
+        server.shutdown()
+
+    print("✅ Long pages are paginated with a cursor")
+
+
+def test_html_to_text_and_paginate():
+    """Test the extraction and pagination helpers."""
+    text = web.html_to_text("<html><head><style>p {}</style></head><body><p>Hello</p><nav>menu</nav><p>World</p></body></html>")
+    assert text == "Hello\nWorld"
+
+    chunks = web.paginate("line\n" * 10, size=12)
+    assert chunks[0] == (0, 10)
+    assert chunks[-1][1] == 50
+    assert web.paginate("") == [(0, 0)]
+
+    print("✅ HTML extraction and pagination helpers work")
+
+
+if __name__ == "__main__":
+    print("Testing web_fetch...")
+    print()
+
+    test_urls_are_fetched_concurrently_per_host()
+    test_async_fetch_of_several_urls()
+    test_download_stops_at_byte_cap()
+    test_long_pages_are_paginated_by_cursor()
+    test_html_to_text_and_paginate()
+
+    print()
+    print("=" * 50)
+    print("✅ All tests passed!")